@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from bson import ObjectId
 
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.collection_memberships_repository import CollectionMembershipRepository
+from app.repositories.engagement_repository import EngagementRepository
+from app.repositories.family.hub_items import HUB_ITEM_TARGET
+from app.services.reference_validator import reference_validator
+from app.utils.memory_utils import MEMORY_TARGET
 
 router = APIRouter()
 
@@ -152,12 +157,23 @@ async def delete_user(
     """Delete user and all their data"""
     user_object_id = ObjectId(user_id)
     
+    # Take the user's memories out of other users' collections before deleting them
+    memory_ids = await get_collection("memories").distinct("_id", {"owner_id": user_object_id})
+    await CollectionMembershipRepository().remove_memories(memory_ids)
+    collection_ids = await get_collection("collections").distinct("_id", {"owner_id": user_object_id})
+    await get_collection("collection_memories").delete_many({"collection_id": {"$in": collection_ids}})
+    engagements = EngagementRepository()
+    await engagements.delete_for_targets(MEMORY_TARGET, memory_ids)
+    hub_item_ids = await get_collection("hub_items").distinct("_id", {"owner_id": user_object_id})
+    await engagements.delete_for_targets(HUB_ITEM_TARGET, hub_item_ids)
+    
     # Delete user data
     await get_collection("memories").delete_many({"owner_id": user_object_id})
     await get_collection("files").delete_many({"owner_id": user_object_id})
     await get_collection("hub_items").delete_many({"owner_id": user_object_id})
     await get_collection("collections").delete_many({"owner_id": user_object_id})
     await get_collection("notifications").delete_many({"user_id": user_object_id})
+    await get_collection("notification_counters").delete_one({"_id": user_object_id})
     await get_collection("reminders").delete_many({"user_id": user_object_id})
     await get_collection("relationships").delete_many({
         "$or": [
@@ -171,6 +187,7 @@ async def delete_user(
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    reference_validator.forget_users([user_object_id])
     
     return {"message": "User and all data deleted"}
 
@@ -232,3 +249,156 @@ async def get_popular_tags(
     return {
         "tags": [{"tag": item["_id"], "count": item["count"]} for item in tags_data]
     }
+
+@router.get("/stats/cache")
+async def get_cache_stats(
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Get hit/miss/eviction counters for in-process caches"""
+    from app.core.cache import all_cache_stats
+    return {"caches": all_cache_stats()}
+
+@router.get("/stats/audit-writer")
+async def get_audit_writer_stats(
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Get queue depth, throughput and overflow counters for the background audit writer"""
+    from app.services.audit_log_writer import audit_log_writer
+    return audit_log_writer.stats()
+
+@router.get("/stats/counters")
+async def get_counter_stats(
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Get buffer, flush and shard counters for the engagement counter service"""
+    from app.services.counter_service import counter_service
+    return counter_service.stats()
+
+@router.get("/stats/query-shapes")
+async def get_query_shapes(
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Query shapes recorded by the profiler (QUERY_PROFILER_ENABLED), most frequent first"""
+    from app.core.config import settings
+    from app.db.query_profiler import query_profiler
+    return {
+        "enabled": settings.QUERY_PROFILER_ENABLED,
+        "shapes": [
+            {k: v for k, v in shape.items() if k != "sample"}
+            for shape in query_profiler.snapshot()
+        ]
+    }
+
+@router.get("/stats/db-pool")
+async def get_db_pool_stats(
+    admin: UserInDB = Depends(verify_admin)
+):
+    """MongoDB connection pool gauges and checkout wait times since startup"""
+    from app.db.mongodb import pool_metrics, client_options
+    return {"options": client_options(), "pool": pool_metrics.snapshot()}
+
+@router.get("/stats/index-migrations")
+async def get_index_migrations(
+    limit: int = Query(10, ge=1, le=100),
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Recent index registry runs, newest first, with per-index conflicts and errors"""
+    from app.utils.db_indexes import MIGRATIONS_COLLECTION, spec_hash
+    runs = await get_collection(MIGRATIONS_COLLECTION).find(
+        {}, {"_id": 0}
+    ).sort("version", -1).limit(limit).to_list(length=limit)
+    for run in runs:
+        run["results"] = [entry for entry in run.get("results", []) if entry["status"] not in ("ok", "dropped")]
+    return {"current_spec_hash": spec_hash(), "runs": runs}
+
+def _jsonable(value: Any) -> Any:
+    """Convert ObjectIds nested anywhere in an audit entry to strings"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    return value
+
+@router.get("/audit-logs")
+async def list_audit_logs(
+    start: Optional[datetime] = Query(None, description="Earliest created_at (UTC)"),
+    end: Optional[datetime] = Query(None, description="Latest created_at (UTC)"),
+    user_id: Optional[str] = Query(None),
+    event_type: Optional[str] = Query(None),
+    actor_id: Optional[str] = Query(None),
+    resource_type: Optional[str] = Query(None),
+    resource_id: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Search audit entries; only the monthly buckets the date range touches are queried"""
+    from app.repositories.audit_log_repository import AuditLogRepository
+    
+    query: Dict[str, Any] = {}
+    for field, value in (("user_id", user_id), ("actor_id", actor_id), ("resource_id", resource_id)):
+        if value:
+            query[field] = ObjectId(value) if ObjectId.is_valid(value) else value
+    if event_type:
+        query["event_type"] = event_type
+    if resource_type:
+        query["resource_type"] = resource_type
+    
+    entries = await AuditLogRepository().find_logs(query, start=start, end=end, limit=limit, skip=(page - 1) * limit)
+    return {
+        "entries": [_jsonable(entry) for entry in entries],
+        "page": page,
+        "limit": limit
+    }
+
+@router.get("/audit-logs/buckets")
+async def list_audit_buckets(
+    admin: UserInDB = Depends(verify_admin)
+):
+    """List live monthly audit buckets with their sizes, plus archived buckets"""
+    from app.repositories.audit_log_repository import AuditLogRepository
+    from app.services.audit_archive_service import get_audit_archive_service
+    
+    buckets = []
+    for name in await AuditLogRepository().list_buckets():
+        buckets.append({
+            "bucket": name,
+            "documents": await get_collection(name).estimated_document_count()
+        })
+    return {
+        "buckets": buckets,
+        "archives": await get_audit_archive_service().list_archives()
+    }
+
+@router.post("/audit-logs/buckets/{bucket}/archive")
+async def archive_audit_bucket(
+    bucket: str,
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Archive a monthly audit bucket to compressed NDJSON and drop it"""
+    from app.services.audit_archive_service import get_audit_archive_service
+    
+    try:
+        manifest = await get_audit_archive_service().archive_bucket(bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"archive": manifest}
+
+@router.get("/notifications/archives")
+async def list_notification_archives(
+    limit: int = Query(100, ge=1, le=1000),
+    admin: UserInDB = Depends(verify_admin)
+):
+    """List notification archive files, newest first"""
+    from app.services.notification_retention_service import get_notification_retention_service
+    return {"archives": await get_notification_retention_service().list_archives(limit)}
+
+@router.post("/notifications/retention/run")
+async def run_notification_retention(
+    admin: UserInDB = Depends(verify_admin)
+):
+    """Run the notification retention policy now instead of waiting for the daily job"""
+    from app.services.notification_retention_service import get_notification_retention_service
+    return {"summary": await get_notification_retention_service().maintain()}
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import Optional, Dict, Any
 from datetime import datetime
 from bson import ObjectId
 import os
@@ -10,20 +10,24 @@ import json
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.core.config import settings
+from app.utils.export_utils import (
+    BACKUP_COLLECTIONS,
+    NDJSON_MEDIA_TYPE,
+    clamp_batch_size,
+    iter_upload_lines,
+    stream_export,
+)
+from app.services.backup_restore_service import get_backup_restore_service
 
 router = APIRouter()
 
 EXPORT_DIR = "exports"
 os.makedirs(EXPORT_DIR, exist_ok=True)
 
-@router.post("/memories/json")
-async def export_memories_json(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    current_user: UserInDB = Depends(get_current_user)
-):
-    """Export memories as JSON"""
-    query = {"owner_id": ObjectId(current_user.id)}
+def _build_memories_query(user_id: str, start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+    """Build the owner/date-range filter shared by the JSON and NDJSON memory exports"""
+    query: Dict[str, Any] = {"owner_id": ObjectId(user_id)}
     
     if start_date:
         query["created_at"] = query.get("created_at", {})
@@ -33,7 +37,30 @@ async def export_memories_json(
         query["created_at"] = query.get("created_at", {})
         query["created_at"]["$lte"] = datetime.fromisoformat(end_date)
     
-    memories = await get_collection("memories").find(query).to_list(length=None)
+    return query
+
+def _export_collection(name: str):
+    """Export reads tolerate replication lag, so they may be served by a secondary"""
+    return get_collection(name, workload="export")
+
+def _ndjson_response(stream, filename: str) -> StreamingResponse:
+    """Wrap an NDJSON byte stream as an incremental download"""
+    return StreamingResponse(
+        stream,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.post("/memories/json")
+async def export_memories_json(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Export memories as JSON"""
+    query = _build_memories_query(current_user.id, start_date, end_date)
+    
+    memories = await _export_collection("memories").find(query).to_list(length=None)
     
     # Convert ObjectId to string for JSON serialization
     for memory in memories:
@@ -57,6 +84,22 @@ async def export_memories_json(
         "count": len(memories)
     }
 
+@router.get("/memories/ndjson")
+async def export_memories_ndjson(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    batch_size: Optional[int] = Query(None, description="Cursor batch size"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Stream memories as newline-delimited JSON without buffering the result set"""
+    query = _build_memories_query(current_user.id, start_date, end_date)
+    filename = f"memories_export_{current_user.id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.ndjson"
+    
+    return _ndjson_response(
+        stream_export(current_user.id, {"memories": query}, _export_collection, batch_size),
+        filename
+    )
+
 @router.post("/files/zip")
 async def export_files_zip(
     file_ids: Optional[list[str]] = None,
@@ -68,7 +111,7 @@ async def export_files_zip(
     if file_ids:
         query["_id"] = {"$in": [ObjectId(fid) for fid in file_ids]}
     
-    files = await get_collection("files").find(query).to_list(length=None)
+    files = await _export_collection("files").find(query).to_list(length=None)
     
     if not files:
         raise HTTPException(status_code=404, detail="No files found to export")
@@ -97,10 +140,10 @@ async def create_full_backup(
 ):
     """Create a full backup of all user data"""
     # Export all data
-    memories = await get_collection("memories").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
-    files = await get_collection("files").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
-    hub_items = await get_collection("hub_items").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
-    collections = await get_collection("collections").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
+    memories = await _export_collection("memories").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
+    files = await _export_collection("files").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
+    hub_items = await _export_collection("hub_items").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
+    collections = await _export_collection("collections").find({"owner_id": ObjectId(current_user.id)}).to_list(length=None)
     
     # Convert ObjectIds to strings
     def convert_doc(doc):
@@ -139,6 +182,78 @@ async def create_full_backup(
         }
     }
 
+@router.get("/full-backup/ndjson")
+async def stream_full_backup(
+    batch_size: Optional[int] = Query(None, description="Cursor batch size"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Stream a full backup of all user data as newline-delimited JSON"""
+    user_oid = ObjectId(current_user.id)
+    queries = {name: {owner_field: user_oid} for name, owner_field in BACKUP_COLLECTIONS.items()}
+    filename = f"full_backup_{current_user.id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.ndjson"
+    
+    return _ndjson_response(
+        stream_export(current_user.id, queries, _export_collection, batch_size),
+        filename
+    )
+
+@router.post("/import/ndjson")
+async def import_ndjson(
+    file: UploadFile = File(...),
+    batch_size: Optional[int] = Query(None, description="Documents per insert batch"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Restore an NDJSON export produced by /memories/ndjson or /full-backup/ndjson.
+    
+    The upload is read line by line and written in unordered batches, so memory
+    use stays flat regardless of backup size. Documents that already exist are
+    skipped rather than overwritten.
+    """
+    service = get_backup_restore_service(
+        batch_size=clamp_batch_size(batch_size, settings.IMPORT_BATCH_SIZE)
+    )
+    report = await service.restore_lines(iter_upload_lines(file), current_user.id)
+    
+    return {
+        "imported_at": datetime.utcnow().isoformat(),
+        "stats": report
+    }
+
+@router.post("/restore")
+async def restore_backup(
+    file: UploadFile = File(...),
+    remap_ids: bool = Query(False, description="Assign new IDs to every document (clone a backup)"),
+    overwrite: bool = Query(False, description="Replace documents that already exist"),
+    batch_size: Optional[int] = Query(None, description="Documents per write batch"),
+    max_concurrency: Optional[int] = Query(None, ge=1, le=16, description="Write batches in flight"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Restore an NDJSON backup, or a ZIP archive of NDJSON backups, into the current account.
+    
+    With remap_ids the backup is cloned: every document gets a fresh ObjectId and
+    references between restored documents are rewritten to match. The old-to-new
+    ID map is kept in memory, so clones are limited to IMPORT_REMAP_MAX_IDS documents.
+    """
+    service = get_backup_restore_service(
+        batch_size=clamp_batch_size(batch_size, settings.IMPORT_BATCH_SIZE),
+        max_concurrency=max_concurrency
+    )
+    filename = (file.filename or "").lower()
+    
+    if filename.endswith(".zip") or file.content_type in ("application/zip", "application/x-zip-compressed"):
+        report = await service.restore_zip(file.file, current_user.id, remap_ids, overwrite)
+    else:
+        report = await service.restore_lines(iter_upload_lines(file), current_user.id, remap_ids, overwrite)
+    
+    return {
+        "restored_at": datetime.utcnow().isoformat(),
+        "remap_ids": remap_ids,
+        "overwrite": overwrite,
+        "stats": report
+    }
+
 @router.get("/download/{filename}")
 async def download_export(
     filename: str,
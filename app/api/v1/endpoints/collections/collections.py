@@ -8,11 +8,14 @@ from app.schemas.collection import (
     CollectionUpdate,
     CollectionResponse,
     CollectionWithMemories,
+    CollectionMemoryMove,
     CollectionPrivacy
 )
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.collection_memberships_repository import CollectionMembershipRepository
+from app.repositories.projections import USER_CARD
 
 router = APIRouter()
 
@@ -23,25 +26,34 @@ def safe_object_id(id_str: str) -> ObjectId:
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid collection ID format")
 
-async def _prepare_collection_response(col_doc: dict, current_user_id: str, include_memories: bool = False) -> Union[CollectionResponse, CollectionWithMemories]:
+async def _prepare_collection_response(
+    col_doc: dict,
+    current_user_id: str,
+    include_memories: bool = False,
+    owner_name: Optional[str] = None
+) -> Union[CollectionResponse, CollectionWithMemories]:
     """Prepare collection document for API response with error handling"""
     try:
-        # Safely get owner information
-        owner = await get_collection("users").find_one({"_id": col_doc.get("owner_id")})
-        owner_name = "Unknown User"
-        if owner:
-            owner_name = owner.get("full_name") or owner.get("email", "Unknown User")
+        memberships = CollectionMembershipRepository()
         
-        # Count memories in collection
-        memory_count = await get_collection("collection_memories").count_documents({
-            "collection_id": col_doc["_id"]
-        })
+        # Safely get owner information (callers listing their own collections pass it in)
+        if owner_name is None:
+            owner = await get_collection("users").find_one({"_id": col_doc.get("owner_id")}, USER_CARD)
+            owner_name = "Unknown User"
+            if owner:
+                owner_name = owner.get("full_name") or owner.get("email", "Unknown User")
+        
+        # Memory count and automatic cover are cached on the collection
+        if "last_position" in col_doc:
+            memory_count = col_doc.get("memory_count", 0)
+        else:
+            memory_count = await memberships.count({"collection_id": col_doc["_id"]})
         
         base_data = {
             "id": str(col_doc["_id"]),
             "name": col_doc.get("name", "Untitled Collection"),
             "description": col_doc.get("description"),
-            "cover_image_url": col_doc.get("cover_image_url"),
+            "cover_image_url": col_doc.get("cover_image_url") or col_doc.get("auto_cover_url"),
             "privacy": col_doc.get("privacy", CollectionPrivacy.PRIVATE),
             "tags": col_doc.get("tags", []),
             "owner_id": str(col_doc.get("owner_id", "")),
@@ -54,11 +66,7 @@ async def _prepare_collection_response(col_doc: dict, current_user_id: str, incl
         
         if include_memories:
             try:
-                memory_docs = await get_collection("collection_memories").find({
-                    "collection_id": col_doc["_id"]
-                }).to_list(length=None)
-                
-                base_data["memory_ids"] = [str(doc["memory_id"]) for doc in memory_docs if "memory_id" in doc]
+                base_data["memory_ids"] = await memberships.member_ids(col_doc["_id"])
                 return CollectionWithMemories(**base_data)
             except Exception as e:
                 # If memory fetching fails, return without memories
@@ -83,6 +91,10 @@ async def create_collection(
             "privacy": collection.privacy or CollectionPrivacy.PRIVATE,
             "tags": collection.tags or [],
             "owner_id": ObjectId(current_user.id),
+            "memory_count": 0,
+            "last_position": 0,
+            "cover_memory_id": None,
+            "auto_cover_url": None,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
@@ -93,7 +105,7 @@ async def create_collection(
         if not col_doc:
             raise HTTPException(status_code=500, detail="Failed to create collection")
         
-        return await _prepare_collection_response(col_doc, current_user.id)
+        return await _prepare_collection_response(col_doc, current_user.id, owner_name=current_user.full_name or current_user.email)
     except HTTPException:
         raise
     except Exception as e:
@@ -122,10 +134,11 @@ async def list_collections(
         skip = (page - 1) * limit
         cursor = get_collection("collections").find(query).sort("updated_at", -1).skip(skip).limit(limit)
         
+        owner_name = current_user.full_name or current_user.email
         collections = []
         async for col_doc in cursor:
             try:
-                collections.append(await _prepare_collection_response(col_doc, current_user.id))
+                collections.append(await _prepare_collection_response(col_doc, current_user.id, owner_name=owner_name))
             except Exception:
                 # Skip collections that fail to process
                 continue
@@ -154,6 +167,7 @@ async def get_collection_detail(
         if not is_owner and collection_privacy == CollectionPrivacy.PRIVATE:
             raise HTTPException(status_code=403, detail="Not authorized to view this collection")
         
+        col_doc = await CollectionMembershipRepository().ensure_positions(col_doc)
         return await _prepare_collection_response(col_doc, current_user.id, include_memories=True)
     except HTTPException:
         raise
@@ -245,25 +259,14 @@ async def add_memory_to_collection(
         if str(col_doc.get("owner_id")) != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to modify this collection")
         
-        memory_doc = await get_collection("memories").find_one({"_id": mem_obj_id})
+        memory_doc = await get_collection("memories").find_one({"_id": mem_obj_id}, {"media_urls": 1})
         if not memory_doc:
             raise HTTPException(status_code=404, detail="Memory not found")
         
-        # Check if memory is already in collection
-        existing = await get_collection("collection_memories").find_one({
-            "collection_id": col_obj_id,
-            "memory_id": mem_obj_id
-        })
-        
-        if existing:
+        # The unique (collection_id, memory_id) index rejects duplicates
+        if not await CollectionMembershipRepository().add_memory(col_doc, memory_doc):
             return {"message": "Memory already in collection"}
         
-        await get_collection("collection_memories").insert_one({
-            "collection_id": col_obj_id,
-            "memory_id": mem_obj_id,
-            "added_at": datetime.utcnow()
-        })
-        
         return {"message": "Memory added to collection successfully"}
     except HTTPException:
         raise
@@ -288,12 +291,7 @@ async def remove_memory_from_collection(
         if str(col_doc.get("owner_id")) != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to modify this collection")
         
-        result = await get_collection("collection_memories").delete_one({
-            "collection_id": col_obj_id,
-            "memory_id": mem_obj_id
-        })
-        
-        if result.deleted_count == 0:
+        if not await CollectionMembershipRepository().remove_memory(col_doc, mem_obj_id):
             return {"message": "Memory not in collection"}
         
         return {"message": "Memory removed from collection successfully"}
@@ -302,12 +300,46 @@ async def remove_memory_from_collection(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error removing memory: {str(e)}")
 
+@router.put("/{collection_id}/memories/{memory_id}/position", status_code=status.HTTP_200_OK)
+async def move_memory_in_collection(
+    collection_id: str,
+    memory_id: str,
+    move: CollectionMemoryMove,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Move a memory after another memory of the collection, or to the front"""
+    try:
+        col_obj_id = safe_object_id(collection_id)
+        mem_obj_id = safe_object_id(memory_id)
+        after_obj_id = safe_object_id(move.after_memory_id) if move.after_memory_id else None
+        
+        col_doc = await get_collection("collections").find_one({"_id": col_obj_id})
+        if not col_doc:
+            raise HTTPException(status_code=404, detail="Collection not found")
+        
+        if str(col_doc.get("owner_id")) != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to modify this collection")
+        
+        if after_obj_id == mem_obj_id:
+            raise HTTPException(status_code=400, detail="Cannot move a memory after itself")
+        
+        if not await CollectionMembershipRepository().move_memory(col_doc, mem_obj_id, after_obj_id):
+            raise HTTPException(status_code=404, detail="Memory not in collection")
+        
+        return {"message": "Memory moved successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error moving memory: {str(e)}")
+
 @router.get("/{collection_id}/memories", response_model=List[dict])
 async def get_collection_memories(
     collection_id: str,
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=200),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    """Get all memories in a collection"""
+    """Get one page of the memories in a collection, in collection order"""
     try:
         col_obj_id = safe_object_id(collection_id)
         col_doc = await get_collection("collections").find_one({"_id": col_obj_id})
@@ -322,32 +354,24 @@ async def get_collection_memories(
         if not is_owner and collection_privacy == CollectionPrivacy.PRIVATE:
             raise HTTPException(status_code=403, detail="Not authorized to view this collection")
         
-        memory_links = await get_collection("collection_memories").find({
-            "collection_id": col_obj_id
-        }).to_list(length=None)
-        
-        memories = []
-        for link in memory_links:
-            try:
-                memory_doc = await get_collection("memories").find_one({"_id": link.get("memory_id")})
-                if memory_doc:
-                    owner = await get_collection("users").find_one({"_id": memory_doc.get("owner_id")})
-                    
-                    memories.append({
-                        "id": str(memory_doc["_id"]),
-                        "title": memory_doc.get("title", "Untitled"),
-                        "content": memory_doc.get("content", ""),
-                        "image_url": memory_doc.get("media_urls", [None])[0] if memory_doc.get("media_urls") else None,
-                        "owner_name": owner.get("full_name", "Unknown") if owner else "Unknown",
-                        "created_at": memory_doc.get("created_at", datetime.utcnow()).isoformat(),
-                        "privacy": memory_doc.get("privacy", "private"),
-                        "tags": memory_doc.get("tags", [])
-                    })
-            except Exception:
-                # Skip memories that fail to process
-                continue
-        
-        return memories
+        memberships = CollectionMembershipRepository()
+        await memberships.ensure_positions(col_doc)
+        memory_docs = await memberships.find_page(col_obj_id, skip=(page - 1) * limit, limit=limit)
+        
+        return [
+            {
+                "id": str(memory_doc["_id"]),
+                "title": memory_doc.get("title", "Untitled"),
+                "content": memory_doc.get("content", ""),
+                "image_url": memory_doc.get("image_url"),
+                "owner_name": memory_doc.get("owner_name") or "Unknown",
+                "created_at": memory_doc.get("created_at", datetime.utcnow()).isoformat(),
+                "privacy": memory_doc.get("privacy", "private"),
+                "tags": memory_doc.get("tags", []),
+                "position": memory_doc.get("position")
+            }
+            for memory_doc in memory_docs
+        ]
     except HTTPException:
         raise
     except Exception as e:
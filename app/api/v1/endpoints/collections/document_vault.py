@@ -10,6 +10,7 @@ from app.models.document_vault import (
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
 
 router = APIRouter()
 
@@ -328,7 +329,7 @@ async def get_document_access_log(
         
         logs = []
         async for log_doc in logs_cursor:
-            user = await get_collection("users").find_one({"_id": log_doc["user_id"]})
+            user = await get_collection("users").find_one({"_id": log_doc["user_id"]}, USER_CARD)
             user_name = user.get("full_name") if user else "Unknown User"
             
             logs.append(DocumentAccessLogResponse(
@@ -13,6 +13,7 @@ import mimetypes
 
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
 from app.models.user import UserInDB
 from app.models.vault import (
     FileInDB, FileCreate, FileUpdate, FileResponse,
@@ -269,7 +270,7 @@ async def _prepare_file_response(file_doc: dict, current_user: UserInDB) -> dict
     
     # Add owner info
     if "owner" not in file_doc:
-        owner = await get_collection("users").find_one({"_id": ObjectId(file_doc["owner_id"])})
+        owner = await get_collection("users").find_one({"_id": ObjectId(file_doc["owner_id"])}, USER_CARD)
         if owner:
             file_doc["owner_name"] = owner.get("full_name")
             file_doc["owner_avatar"] = owner.get("avatar_url")
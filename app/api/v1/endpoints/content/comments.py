@@ -13,36 +13,58 @@ from app.schemas.comment import (
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
 
 router = APIRouter()
 
+async def _prepare_comment_responses(comment_docs: List[dict], current_user_id: str) -> List[CommentResponse]:
+    """Prepare a page of comment documents for API response, with one query each for authors, like counts and the viewer's likes"""
+    if not comment_docs:
+        return []
+    comment_oids = [doc["_id"] for doc in comment_docs]
+    author_oids = list({doc["author_id"] for doc in comment_docs})
+    
+    authors = {
+        author["_id"]: author
+        async for author in get_collection("users").find({"_id": {"$in": author_oids}}, USER_CARD)
+    }
+    likes_counts = {
+        group["_id"]: group["count"]
+        async for group in get_collection("comment_likes").aggregate([
+            {"$match": {"comment_id": {"$in": comment_oids}}},
+            {"$group": {"_id": "$comment_id", "count": {"$sum": 1}}}
+        ])
+    }
+    liked = {
+        like["comment_id"]
+        async for like in get_collection("comment_likes").find(
+            {"comment_id": {"$in": comment_oids}, "user_id": ObjectId(current_user_id)},
+            {"comment_id": 1}
+        )
+    }
+    
+    responses = []
+    for comment_doc in comment_docs:
+        author = authors.get(comment_doc["author_id"])
+        responses.append(CommentResponse(
+            id=str(comment_doc["_id"]),
+            content=comment_doc["content"],
+            target_type=comment_doc["target_type"],
+            target_id=str(comment_doc["target_id"]),
+            author_id=str(comment_doc["author_id"]),
+            author_name=author.get("full_name") if author else "Unknown User",
+            author_avatar=author.get("avatar_url") if author else None,
+            created_at=comment_doc["created_at"],
+            updated_at=comment_doc["updated_at"],
+            likes_count=likes_counts.get(comment_doc["_id"], 0),
+            is_liked=comment_doc["_id"] in liked,
+            is_author=str(comment_doc["author_id"]) == current_user_id
+        ))
+    return responses
+
 async def _prepare_comment_response(comment_doc: dict, current_user_id: str) -> CommentResponse:
     """Prepare comment document for API response"""
-    author = await get_collection("users").find_one({"_id": comment_doc["author_id"]})
-    
-    likes_count = await get_collection("comment_likes").count_documents({
-        "comment_id": comment_doc["_id"]
-    })
-    
-    is_liked = await get_collection("comment_likes").find_one({
-        "comment_id": comment_doc["_id"],
-        "user_id": ObjectId(current_user_id)
-    }) is not None
-    
-    return CommentResponse(
-        id=str(comment_doc["_id"]),
-        content=comment_doc["content"],
-        target_type=comment_doc["target_type"],
-        target_id=str(comment_doc["target_id"]),
-        author_id=str(comment_doc["author_id"]),
-        author_name=author.get("full_name") if author else "Unknown User",
-        author_avatar=author.get("avatar_url") if author else None,
-        created_at=comment_doc["created_at"],
-        updated_at=comment_doc["updated_at"],
-        likes_count=likes_count,
-        is_liked=is_liked,
-        is_author=str(comment_doc["author_id"]) == current_user_id
-    )
+    return (await _prepare_comment_responses([comment_doc], current_user_id))[0]
 
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def create_comment(
@@ -100,10 +122,7 @@ async def list_comments(
     pages = (total + limit - 1) // limit
     
     cursor = get_collection("comments").find(query).sort("created_at", -1).skip(skip).limit(limit)
-    
-    comments = []
-    async for comment_doc in cursor:
-        comments.append(await _prepare_comment_response(comment_doc, current_user.id))
+    comments = await _prepare_comment_responses(await cursor.to_list(length=limit), current_user.id)
     
     return CommentListResponse(
         comments=comments,
@@ -195,20 +214,15 @@ async def like_comment(
     if not comment_doc:
         raise HTTPException(status_code=404, detail="Comment not found")
     
-    existing_like = await get_collection("comment_likes").find_one({
-        "comment_id": ObjectId(comment_id),
-        "user_id": ObjectId(current_user.id)
-    })
+    result = await get_collection("comment_likes").update_one(
+        {"comment_id": ObjectId(comment_id), "user_id": ObjectId(current_user.id)},
+        {"$setOnInsert": {"created_at": datetime.utcnow()}},
+        upsert=True
+    )
     
-    if existing_like:
+    if result.upserted_id is None:
         return {"message": "Already liked"}
     
-    await get_collection("comment_likes").insert_one({
-        "comment_id": ObjectId(comment_id),
-        "user_id": ObjectId(current_user.id),
-        "created_at": datetime.utcnow()
-    })
-    
     return {"message": "Comment liked"}
 
 @router.delete("/{comment_id}/like", status_code=status.HTTP_200_OK)
@@ -1,87 +1,86 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from datetime import datetime
-from bson import ObjectId
 from pydantic import BaseModel
 from app.models.user import UserInDB
 from app.core.security import get_current_user
-from app.db.mongodb import get_database
+from app.repositories.content_reaction_repository import ContentReactionRepository
 
 router = APIRouter()
+reaction_repo = ContentReactionRepository()
+
+REACTION_TARGET_TYPES = ("memory", "comment", "story")
 
 class ReactionCreate(BaseModel):
     target_type: str  # "memory", "comment", "story"
     target_id: str
     emoji: str
 
+def _check_target_type(target_type: str) -> None:
+    if target_type not in REACTION_TARGET_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid target type. Must be one of: {list(REACTION_TARGET_TYPES)}")
+
 @router.post("/")
 async def add_reaction(
     reaction: ReactionCreate,
     current_user: UserInDB = Depends(get_current_user)
 ):
-    """Add a reaction to a memory, comment, or story"""
-    db = get_database()
+    """Add a reaction to a memory, comment, or story, or change the user's existing one"""
+    _check_target_type(reaction.target_type)
     
-    # Check if reaction already exists
-    existing = await db.reactions.find_one({
-        "user_id": str(current_user.id),
-        "target_type": reaction.target_type,
-        "target_id": reaction.target_id
-    })
-    
-    if existing:
-        # Update existing reaction
-        await db.reactions.update_one(
-            {"_id": existing["_id"]},
-            {"$set": {"emoji": reaction.emoji, "updated_at": datetime.utcnow()}}
-        )
-        reaction_data = existing
-        reaction_data["emoji"] = reaction.emoji
-    else:
-        # Create new reaction
-        reaction_data = {
-            "user_id": str(current_user.id),
-            "target_type": reaction.target_type,
-            "target_id": reaction.target_id,
-            "emoji": reaction.emoji,
-            "created_at": datetime.utcnow()
-        }
-        result = await db.reactions.insert_one(reaction_data)
-        reaction_data["_id"] = str(result.inserted_id)
+    reaction_data, _ = await reaction_repo.set_reaction(
+        str(current_user.id),
+        reaction.target_type,
+        reaction.target_id,
+        reaction.emoji
+    )
+    reaction_data["_id"] = str(reaction_data["_id"])
     
     return reaction_data
 
+# Declared before /{target_type}/{target_id}, which would otherwise match it
+@router.get("/user/stats")
+async def get_user_reaction_stats(
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Get statistics about user's reactions"""
+    summary = await reaction_repo.user_summary(str(current_user.id))
+    emoji_counts = summary["counts"]
+    
+    return {
+        "total_reactions": summary["total"],
+        "emoji_breakdown": emoji_counts,
+        "most_used_emoji": max(emoji_counts.items(), key=lambda x: x[1])[0] if emoji_counts else None
+    }
+
 @router.get("/{target_type}/{target_id}")
 async def get_reactions(
     target_type: str,
     target_id: str,
     current_user: UserInDB = Depends(get_current_user)
 ):
-    """Get all reactions for a target"""
-    db = get_database()
+    """
+    Get the reactions on a target, grouped by emoji.
     
-    reactions = await db.reactions.find({
-        "target_type": target_type,
-        "target_id": target_id
-    }).to_list(1000)
+    Counts come from the target's histogram; users lists the most recent
+    reactors with each emoji rather than every one.
+    """
+    _check_target_type(target_type)
     
-    # Group reactions by emoji
-    reaction_summary = {}
-    for reaction in reactions:
-        emoji = reaction["emoji"]
-        if emoji not in reaction_summary:
-            reaction_summary[emoji] = {
-                "emoji": emoji,
-                "count": 0,
-                "users": [],
-                "reacted_by_current_user": False
-            }
-        reaction_summary[emoji]["count"] += 1
-        reaction_summary[emoji]["users"].append(str(reaction["user_id"]))
-        if str(reaction["user_id"]) == str(current_user.id):
-            reaction_summary[emoji]["reacted_by_current_user"] = True
+    summary = await reaction_repo.target_summary(target_type, target_id)
+    user_emoji = await reaction_repo.user_reaction(str(current_user.id), target_type, target_id)
     
-    return list(reaction_summary.values())
+    recent_by_emoji = {}
+    for reactor in reversed(summary["recent"]):
+        recent_by_emoji.setdefault(reactor["reaction"], []).append(reactor["user_id"])
+    
+    return [
+        {
+            "emoji": emoji,
+            "count": count,
+            "users": recent_by_emoji.get(emoji, []),
+            "reacted_by_current_user": emoji == user_emoji
+        }
+        for emoji, count in summary["counts"].items()
+    ]
 
 @router.delete("/{target_type}/{target_id}")
 async def remove_reaction(
@@ -90,41 +89,13 @@ async def remove_reaction(
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Remove user's reaction from a target"""
-    db = get_database()
+    _check_target_type(target_type)
     
-    result = await db.reactions.delete_one({
-        "user_id": str(current_user.id),
-        "target_type": target_type,
-        "target_id": target_id
-    })
-    
-    if result.deleted_count == 0:
+    if not await reaction_repo.remove_reaction(str(current_user.id), target_type, target_id):
         raise HTTPException(status_code=404, detail="Reaction not found")
     
     return {"message": "Reaction removed"}
 
-@router.get("/user/stats")
-async def get_user_reaction_stats(
-    current_user: UserInDB = Depends(get_current_user)
-):
-    """Get statistics about user's reactions"""
-    db = get_database()
-    
-    reactions = await db.reactions.find({
-        "user_id": str(current_user.id)
-    }).to_list(10000)
-    
-    emoji_counts = {}
-    for reaction in reactions:
-        emoji = reaction["emoji"]
-        emoji_counts[emoji] = emoji_counts.get(emoji, 0) + 1
-    
-    return {
-        "total_reactions": len(reactions),
-        "emoji_breakdown": emoji_counts,
-        "most_used_emoji": max(emoji_counts.items(), key=lambda x: x[1])[0] if emoji_counts else None
-    }
-
 # Convenience endpoints for specific target types
 @router.post("/memory/{memory_id}")
 async def add_memory_reaction(
@@ -12,8 +12,10 @@ from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
 from app.utils.validators import validate_object_ids
+from app.utils.family_validators import validate_users_exist
 from app.utils.audit_logger import log_audit_event
 from app.models.responses import create_success_response, create_paginated_response, create_message_response
+from app.repositories.projections import ALBUM_SUMMARY, USER_CARD
 
 router = APIRouter()
 albums_repo = FamilyAlbumsRepository()
@@ -21,7 +23,7 @@ albums_repo = FamilyAlbumsRepository()
 
 async def get_creator_info(created_by_id: ObjectId) -> Dict[str, Any]:
     """Helper function to get creator information"""
-    creator = await get_collection("users").find_one({"_id": created_by_id})
+    creator = await get_collection("users").find_one({"_id": created_by_id}, USER_CARD)
     return {
         "full_name": creator.get("full_name") if creator else None,
         "avatar": creator.get("avatar") if creator else None
@@ -40,7 +42,7 @@ def build_album_response(album_doc: Dict[str, Any], creator_name: Optional[str]
         created_by_name=creator_name,
         family_circle_ids=[str(cid) for cid in album_doc.get("family_circle_ids", [])],
         member_ids=[str(mid) for mid in album_doc.get("member_ids", [])],
-        photos_count=len(album_doc.get("photos", [])),
+        photos_count=album_doc.get("photos_count", 0),
         created_at=album_doc["created_at"],
         updated_at=album_doc["updated_at"]
     )
@@ -59,7 +61,7 @@ async def create_family_album(
     - Logs album creation for audit trail
     """
     family_circle_oids = validate_object_ids(album.family_circle_ids, "family_circle_ids") if album.family_circle_ids else []
-    member_oids = validate_object_ids(album.member_ids, "member_ids") if album.member_ids else []
+    member_oids = await validate_users_exist(album.member_ids, "member_ids") if album.member_ids else []
     
     album_data = {
         "title": album.title,
@@ -69,7 +71,7 @@ async def create_family_album(
         "created_by": ObjectId(current_user.id),
         "family_circle_ids": family_circle_oids,
         "member_ids": member_oids,
-        "photos": [],
+        "photos_count": 0,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     }
@@ -112,7 +114,8 @@ async def list_family_albums(
     albums = await albums_repo.find_accessible_albums(
         user_id=str(current_user.id),
         skip=skip,
-        limit=page_size
+        limit=page_size,
+        projection=ALBUM_SUMMARY
     )
     
     total = await albums_repo.count_accessible_albums(str(current_user.id))
@@ -140,7 +143,7 @@ async def get_family_album(
     Get a specific album with access control.
     
     - Verifies user has access to view the album
-    - Returns complete album details including photos
+    - Returns album details; photos are listed page by page via /{album_id}/photos
     """
     await albums_repo.check_album_access(album_id, str(current_user.id), raise_error=True)
     
@@ -180,7 +183,7 @@ async def update_family_album(
     if "family_circle_ids" in update_data:
         update_data["family_circle_ids"] = validate_object_ids(update_data["family_circle_ids"], "family_circle_ids")
     if "member_ids" in update_data:
-        update_data["member_ids"] = validate_object_ids(update_data["member_ids"], "member_ids")
+        update_data["member_ids"] = await validate_users_exist(update_data["member_ids"], "member_ids")
     
     update_data["updated_at"] = datetime.utcnow()
     
@@ -232,7 +235,7 @@ async def delete_family_album(
         event_details={
             "album_id": album_id,
             "title": album_doc.get("title"),
-            "photos_count": len(album_doc.get("photos", []))
+            "photos_count": album_doc.get("photos_count", 0)
         }
     )
     
@@ -260,11 +263,10 @@ async def add_photo_to_album(
         "caption": photo.caption,
         "uploaded_by": ObjectId(current_user.id),
         "uploaded_by_name": current_user.full_name,
-        "likes": [],
         "uploaded_at": datetime.utcnow()
     }
     
-    await albums_repo.add_photo_to_album(album_id, photo_data)
+    photo_data = await albums_repo.add_photo_to_album(album_id, photo_data)
     
     await log_audit_event(
         user_id=str(current_user.id),
@@ -294,34 +296,51 @@ async def add_photo_to_album(
 @router.get("/{album_id}/photos")
 async def get_album_photos(
     album_id: str,
+    page: int = Query(1, ge=1, description="Page number (1-indexed)"),
+    page_size: int = Query(50, ge=1, le=200, description="Number of photos per page"),
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
-    Get all photos in an album.
+    Get one page of the photos in an album, in upload order.
     
     - Verifies user has access to view the album
-    - Returns all photos with likes count
+    - Returns photos with likes count and whether the user liked them
     """
     await albums_repo.check_album_access(album_id, str(current_user.id), raise_error=True)
     
-    album_doc = await albums_repo.find_by_id(album_id, raise_404=True)
+    album_doc = await albums_repo.find_by_id(album_id, raise_404=True, projection={"photos_count": 1})
     assert album_doc is not None
     
-    photos = []
-    for photo in album_doc.get("photos", []):
-        photos.append(AlbumPhotoResponse(
+    photo_docs = await albums_repo.photos.find_page(
+        album_doc["_id"],
+        skip=(page - 1) * page_size,
+        limit=page_size
+    )
+    liked = await albums_repo.photos.liked_photo_ids(
+        ObjectId(current_user.id),
+        [photo["_id"] for photo in photo_docs]
+    )
+    
+    photos = [
+        AlbumPhotoResponse(
             id=str(photo["_id"]),
             url=photo["url"],
             caption=photo.get("caption"),
             uploaded_by=str(photo["uploaded_by"]),
             uploaded_by_name=photo.get("uploaded_by_name"),
-            likes_count=len(photo.get("likes", [])),
+            likes_count=photo.get("like_count", 0),
+            is_liked=photo["_id"] in liked,
             uploaded_at=photo["uploaded_at"]
-        ))
+        )
+        for photo in photo_docs
+    ]
     
-    return create_success_response(
-        message=f"Retrieved {len(photos)} photos",
-        data=[p.model_dump() for p in photos]
+    return create_paginated_response(
+        items=[p.model_dump() for p in photos],
+        total=album_doc.get("photos_count", 0),
+        page=page,
+        page_size=page_size,
+        message=f"Retrieved {len(photos)} photos"
     )
 
 
@@ -338,20 +357,25 @@ async def delete_photo_from_album(
     - Photo uploader can delete their own photo
     - Logs deletion for audit trail
     """
-    album_doc = await albums_repo.find_by_id(album_id, raise_404=True)
+    album_doc = await albums_repo.find_by_id(album_id, raise_404=True, projection={"created_by": 1})
     assert album_doc is not None
     
     is_owner = str(album_doc["created_by"]) == current_user.id
     
     if not is_owner:
-        photo = next((p for p in album_doc.get("photos", []) if str(p["_id"]) == photo_id), None)
+        photo = await albums_repo.photos.find_one(
+            {"_id": albums_repo.validate_object_id(photo_id, "photo_id"), "album_id": album_doc["_id"]},
+            raise_404=False,
+            projection={"uploaded_by": 1}
+        )
         if not photo or str(photo["uploaded_by"]) != current_user.id:
             raise HTTPException(
                 status_code=403,
                 detail="You can only delete photos you uploaded unless you own the album"
             )
     
-    await albums_repo.remove_photo_from_album(album_id, photo_id)
+    if not await albums_repo.remove_photo_from_album(album_id, photo_id):
+        raise HTTPException(status_code=404, detail="Photo not found in album")
     
     await log_audit_event(
         user_id=str(current_user.id),
@@ -9,8 +9,10 @@ from .schemas import (
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_NAME
 from .repository import FamilyCalendarRepository
 from app.utils.validators import validate_object_ids
+from app.utils.family_validators import validate_users_exist
 from app.utils.audit_logger import log_audit_event
 from app.models.responses import create_success_response, create_paginated_response, create_message_response
 
@@ -23,7 +25,7 @@ async def get_attendee_info(attendee_ids: List[ObjectId]) -> List[str]:
     if not attendee_ids:
         return []
     
-    users_cursor = get_collection("users").find({"_id": {"$in": attendee_ids}})
+    users_cursor = get_collection("users").find({"_id": {"$in": attendee_ids}}, USER_NAME)
     attendee_names = []
     async for user in users_cursor:
         attendee_names.append(user.get("full_name", ""))
@@ -32,7 +34,7 @@ async def get_attendee_info(attendee_ids: List[ObjectId]) -> List[str]:
 
 async def get_creator_name(created_by_id: ObjectId) -> Optional[str]:
     """Helper function to get creator name"""
-    creator = await get_collection("users").find_one({"_id": created_by_id})
+    creator = await get_collection("users").find_one({"_id": created_by_id}, USER_NAME)
     return creator.get("full_name") if creator else None
 
 
@@ -80,7 +82,7 @@ async def create_family_event(
     if not family_circle_oids:
         family_circle_oids.append(ObjectId(current_user.id))
     
-    attendee_oids = validate_object_ids(event.attendee_ids, "attendee_ids") if event.attendee_ids else []
+    attendee_oids = await validate_users_exist(event.attendee_ids, "attendee_ids") if event.attendee_ids else []
     
     genealogy_person_oid = None
     if event.genealogy_person_id:
@@ -239,7 +241,7 @@ async def update_family_event(
     if "family_circle_ids" in update_data:
         update_data["family_circle_ids"] = validate_object_ids(update_data["family_circle_ids"], "family_circle_ids")
     if "attendee_ids" in update_data:
-        update_data["attendee_ids"] = validate_object_ids(update_data["attendee_ids"], "attendee_ids")
+        update_data["attendee_ids"] = await validate_users_exist(update_data["attendee_ids"], "attendee_ids")
     
     update_data["updated_at"] = datetime.utcnow()
     
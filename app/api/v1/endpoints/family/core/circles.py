@@ -23,8 +23,8 @@ from app.repositories.family_repository import (
 from app.utils.family_validators import (
     validate_family_ownership,
     validate_family_member_access,
-    validate_object_id_list,
     validate_user_exists,
+    validate_users_exist,
     validate_relationship_ownership,
     validate_invitation_token,
     validate_invitation_for_user,
@@ -52,7 +52,7 @@ async def create_family_circle(
 ):
     """Create a family circle with custom relationship categories and member profiles"""
     try:
-        member_oids = validate_object_id_list(circle.member_ids, "member_ids") if circle.member_ids else []
+        member_oids = await validate_users_exist(circle.member_ids, "member_ids") if circle.member_ids else []
         
         member_oids.append(ObjectId(current_user.id))
         member_oids = list(set(member_oids))
@@ -320,6 +320,7 @@ async def add_person_profile_to_circle(
                             "$set": {"updated_at": datetime.utcnow()}
                         }
                     )
+                    await family_repo.publish_dashboard_change(circle, {"member_ids": [user_oid]})
             except Exception:
                 # user_id is a UUID, not an ObjectId - skip adding to member_ids
                 pass
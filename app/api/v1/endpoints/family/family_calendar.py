@@ -9,6 +9,7 @@ from app.models.family.family_calendar import (
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_NAME
 from app.repositories.family_repository import FamilyCalendarRepository
 from app.utils.validators import validate_object_ids
 from app.utils.audit_logger import log_audit_event
@@ -23,7 +24,7 @@ async def get_attendee_info(attendee_ids: List[ObjectId]) -> List[str]:
     if not attendee_ids:
         return []
     
-    users_cursor = get_collection("users").find({"_id": {"$in": attendee_ids}})
+    users_cursor = get_collection("users").find({"_id": {"$in": attendee_ids}}, USER_NAME)
     attendee_names = []
     async for user in users_cursor:
         attendee_names.append(user.get("full_name", ""))
@@ -32,7 +33,7 @@ async def get_attendee_info(attendee_ids: List[ObjectId]) -> List[str]:
 
 async def get_creator_name(created_by_id: ObjectId) -> Optional[str]:
     """Helper function to get creator name"""
-    creator = await get_collection("users").find_one({"_id": created_by_id})
+    creator = await get_collection("users").find_one({"_id": created_by_id}, USER_NAME)
     return creator.get("full_name") if creator else None
 
 
@@ -253,6 +253,7 @@ async def redeem_invite_link(
                     "$set": {"updated_at": datetime.utcnow()}
                 }
             )
+            await family_repo.publish_dashboard_change(tree_circle, {"member_ids": [ObjectId(current_user.id)]})
     else:
         circle_data = {
             "name": "Family Tree Members",
@@ -94,7 +94,8 @@ async def search_platform_users(
     
     linked_persons = await genealogy_person_repo.find_many(
         {"family_id": ObjectId(current_user.id), "linked_user_id": {"$exists": True, "$ne": None}},
-        limit=1000
+        limit=1000,
+        projection={"linked_user_id": 1}
     )
     linked_user_ids = {str(person.get("linked_user_id")) for person in linked_persons if person.get("linked_user_id")}
     
@@ -253,41 +253,8 @@ async def list_health_records(
     current_user: UserInDB = Depends(get_current_user)
 ):
     """List all health records with optional filtering and pagination"""
-    user_oid = ObjectId(current_user.id)
-    
-    # Fetch user's tree memberships to determine family tree access
-    from app.repositories.family.tree_memberships import GenealogTreeMembershipRepository
-    tree_membership_repo = GenealogTreeMembershipRepository()
-    user_memberships = await tree_membership_repo.find_by_user(str(user_oid))
-    accessible_tree_ids = [m["tree_id"] for m in user_memberships]
-    
-    # Include user's own family tree (where they are the owner)
-    accessible_tree_ids.append(user_oid)
-    
-    # Construct query with strict visibility rules
-    query: Dict[str, Any] = {
-        "$or": [
-            # 1. User is directly involved (Creator, Subject, Assigned) - Show ALL statuses
-            {"family_id": user_oid},
-            {"subject_user_id": user_oid},
-            {"assigned_user_ids": user_oid},
-            {"created_by": user_oid},
-            
-            # 2. Family Tree Visibility - Show ONLY APPROVED
-            {
-                "visibility_type": "family_tree",
-                "approval_status": "approved",
-                "family_id": {"$in": accessible_tree_ids}
-            },
-            
-            # 3. Specific User Visibility - Show ONLY APPROVED
-            {
-                "visibility_type": "select_users",
-                "approval_status": "approved",
-                "visibility_user_ids": user_oid
-            }
-        ]
-    }
+    # Same rules as the dashboard and the record view (build_access_filter)
+    query: Dict[str, Any] = await health_records_repo.get_access_filter(str(current_user.id))
     
     if family_member_id:
         member_oid = health_records_repo.validate_object_id(family_member_id, "family_member_id")
@@ -297,47 +264,21 @@ async def list_health_records(
         query["record_type"] = record_type
     
     skip = (page - 1) * page_size
-    records = await health_records_repo.find_many(
-        filter_dict=query,
+    # Page, total, member names and user cards come back from one aggregation
+    page_data = await health_records_repo.find_page_with_details(
+        query,
         skip=skip,
         limit=page_size,
         sort_by="date",
         sort_order=-1
     )
+    total = page_data["total"]
+    user_lookup = page_data["user_lookup"]
     
-    total = await health_records_repo.count(query)
-    
-    # Batch-fetch all unique user IDs from records
-    unique_user_ids = set()
-    for record in records:
-        if record.get("created_by"):
-            unique_user_ids.add(str(record["created_by"]))
-        if record.get("subject_user_id"):
-            unique_user_ids.add(str(record["subject_user_id"]))
-        for uid in record.get("assigned_user_ids", []):
-            unique_user_ids.add(str(uid))
-    
-    # Fetch user information
-    user_lookup = {}
-    if unique_user_ids:
-        users = await users_repo.find_many(
-            filter_dict={"_id": {"$in": [ObjectId(uid) for uid in unique_user_ids]}},
-            limit=len(unique_user_ids)
-        )
-        user_lookup = {
-            str(user["_id"]): {
-                "full_name": user.get("full_name", ""),
-                "email": user.get("email", ""),
-                "avatar": user.get("avatar_url", "")
-            }
-            for user in users
-        }
-    
-    record_responses = []
-    for record_doc in records:
-        member_id = record_doc.get("family_member_id")
-        member_name = await get_member_name(member_id) if member_id else None
-        record_responses.append(health_record_to_response(record_doc, member_name, user_lookup))
+    record_responses = [
+        health_record_to_response(record_doc, record_doc.get("family_member_name"), user_lookup)
+        for record_doc in page_data["items"]
+    ]
     
     return create_paginated_response(
         items=record_responses,
@@ -353,170 +294,27 @@ async def get_shared_health_dashboard(
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Get comprehensive health dashboard with all accessible records and stats"""
-    user_oid = ObjectId(current_user.id)
-    
-    # Build aggregation pipeline to calculate statistics at database level
-    pipeline = [
-        # Stage 1: Match records accessible to user
-        {
-            "$match": {
-                "$or": [
-                    {
-                        "approval_status": "approved",
-                        "$or": [
-                            {"family_id": user_oid},
-                            {"subject_user_id": user_oid},
-                            {"assigned_user_ids": user_oid},
-                            {"created_by": user_oid}
-                        ]
-                    },
-                    {
-                        "approval_status": "pending_approval",
-                        "$or": [
-                            {"subject_user_id": user_oid},
-                            {"assigned_user_ids": user_oid}
-                        ]
-                    }
-                ]
-            }
-        },
-        # Stage 2: Use $facet to calculate multiple statistics in parallel
-        {
-            "$facet": {
-                "total_count": [
-                    {"$count": "count"}
-                ],
-                "pending_approvals": [
-                    {
-                        "$match": {
-                            "approval_status": "pending_approval",
-                            "$or": [
-                                {"subject_user_id": user_oid},
-                                {"assigned_user_ids": user_oid}
-                            ]
-                        }
-                    },
-                    {"$count": "count"}
-                ],
-                "records_by_type": [
-                    {
-                        "$group": {
-                            "_id": "$record_type",
-                            "count": {"$sum": 1}
-                        }
-                    }
-                ],
-                "recent_records": [
-                    {"$sort": {"created_at": -1}},
-                    {"$limit": 10}
-                ],
-                "pending_approval_records": [
-                    {
-                        "$match": {
-                            "approval_status": "pending_approval",
-                            "$or": [
-                                {"subject_user_id": user_oid},
-                                {"assigned_user_ids": user_oid}
-                            ]
-                        }
-                    },
-                    {"$sort": {"created_at": -1}},
-                    {"$limit": 20}
-                ]
-            }
-        }
-    ]
+    # Access rules are compiled into the $match of a single $facet aggregation
+    # that also joins reminders and user cards
+    dashboard = await health_records_repo.get_dashboard(str(current_user.id))
+    user_lookup = dashboard["user_lookup"]
+    user_reminders = dashboard["upcoming_reminders"]
     
-    # Execute aggregation
-    result = await health_records_repo.collection.aggregate(pipeline).to_list(length=1)
-    
-    if not result:
-        # No records found
-        stats = {
-            "total_records": 0,
-            "pending_approvals": 0,
-            "upcoming_reminders": 0,
-            "records_by_type": {},
-            "recent_records": []
-        }
-        return create_success_response(
-            message="Health dashboard retrieved successfully",
-            data={
-                "statistics": stats,
-                "pending_approvals": [],
-                "upcoming_reminders": []
-            }
-        )
-    
-    result_data = result[0]
-    
-    # Extract counts
-    total_count = result_data["total_count"][0]["count"] if result_data["total_count"] else 0
-    pending_count = result_data["pending_approvals"][0]["count"] if result_data["pending_approvals"] else 0
-    
-    # Build records_by_type dict
-    records_by_type = {}
-    for type_doc in result_data["records_by_type"]:
-        records_by_type[type_doc["_id"]] = type_doc["count"]
-    
-    # Batch-fetch all unique user IDs from recent records and pending approvals
-    unique_user_ids = set()
-    all_record_docs = result_data["recent_records"] + result_data["pending_approval_records"]
-    
-    for record in all_record_docs:
-        if record.get("created_by"):
-            unique_user_ids.add(str(record["created_by"]))
-        if record.get("subject_user_id"):
-            unique_user_ids.add(str(record["subject_user_id"]))
-        for uid in record.get("assigned_user_ids", []):
-            unique_user_ids.add(str(uid))
-    
-    # Fetch user information
-    user_lookup = {}
-    if unique_user_ids:
-        users = await users_repo.find_many(
-            filter_dict={"_id": {"$in": [ObjectId(uid) for uid in unique_user_ids]}},
-            limit=len(unique_user_ids)
-        )
-        user_lookup = {
-            str(user["_id"]): {
-                "full_name": user.get("full_name", ""),
-                "email": user.get("email", ""),
-                "avatar": user.get("avatar_url", "")
-            }
-            for user in users
-        }
-    
-    # Get recent reminders
-    user_reminders = await reminders_repo.find_many(
-        filter_dict={
-            "$or": [
-                {"assigned_user_id": user_oid},
-                {"created_by": user_oid}
-            ],
-            "status": {"$in": ["pending", "sent"]}
-        },
-        limit=10,
-        sort_by="due_at",
-        sort_order=1
-    )
-    
-    # Build stats object
     stats = {
-        "total_records": total_count,
-        "pending_approvals": pending_count,
-        "upcoming_reminders": len(user_reminders),
-        "records_by_type": records_by_type,
+        "total_records": dashboard["total_records"],
+        "pending_approvals": dashboard["pending_approvals"],
+        "upcoming_reminders": dashboard["upcoming_reminders_total"],
+        "records_by_type": dashboard["records_by_type"],
+        "records_by_status": dashboard["records_by_status"],
         "recent_records": [
-            health_record_to_response(record_doc, user_lookup=user_lookup)
-            for record_doc in result_data["recent_records"]
+            health_record_to_response(record_doc, record_doc.get("family_member_name"), user_lookup)
+            for record_doc in dashboard["recent_records"]
         ]
     }
     
-    # Build pending approvals list
     pending_approval_responses = [
         health_record_to_response(r, user_lookup=user_lookup)
-        for r in result_data["pending_approval_records"]
+        for r in dashboard["pending_records"]
     ]
     
     # Log dashboard access
@@ -536,7 +334,11 @@ async def get_shared_health_dashboard(
         data={
             "statistics": stats,
             "pending_approvals": pending_approval_responses,
-            "upcoming_reminders": [reminder_to_dict(r) for r in user_reminders]
+            "upcoming_reminders": [reminder_to_dict(r) for r in user_reminders],
+            "records": [
+                health_record_to_response(record_doc, record_doc.get("family_member_name"), user_lookup)
+                for record_doc in dashboard["first_page"]
+            ]
         }
     )
 
@@ -556,14 +358,8 @@ async def get_health_record(
     if not record_doc:
         raise HTTPException(status_code=404, detail="Health record not found")
     
-    user_oid = ObjectId(current_user.id)
-    
-    # Check if user has access to this record
-    is_creator = str(record_doc["family_id"]) == current_user.id or str(record_doc.get("created_by")) == current_user.id
-    is_subject = record_doc.get("subject_user_id") == user_oid
-    is_assigned = user_oid in record_doc.get("assigned_user_ids", [])
-    
-    if not (is_creator or is_subject or is_assigned):
+    # Same rules as the listing and dashboard, so every listed record opens
+    if not await health_records_repo.check_user_access(record_id, str(current_user.id)):
         raise HTTPException(status_code=403, detail="Not authorized to view this record")
     
     # Batch-fetch user information
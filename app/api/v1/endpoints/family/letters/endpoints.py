@@ -11,7 +11,7 @@ from app.models.user import UserInDB
 from app.core.security import get_current_user
 from .repository import LegacyLettersRepository
 from app.repositories.family_repository import UserRepository
-from app.utils.validators import validate_object_ids
+from app.utils.family_validators import validate_users_exist
 from app.utils.audit_logger import log_audit_event
 from app.models.responses import create_success_response, create_paginated_response, create_message_response
 
@@ -88,7 +88,7 @@ async def create_legacy_letter(
     - Determines status based on delivery date
     - Logs creation for audit trail
     """
-    recipient_oids = validate_object_ids(letter.recipient_ids, "recipient_ids")
+    recipient_oids = await validate_users_exist(letter.recipient_ids, "recipient_ids")
     
     if not recipient_oids:
         raise HTTPException(status_code=400, detail="At least one valid recipient required")
@@ -297,7 +297,7 @@ async def update_legacy_letter(
     update_data = {k: v for k, v in letter_update.model_dump(exclude_unset=True).items() if v is not None}
     
     if "recipient_ids" in update_data:
-        update_data["recipient_ids"] = validate_object_ids(update_data["recipient_ids"], "recipient_ids")
+        update_data["recipient_ids"] = await validate_users_exist(update_data["recipient_ids"], "recipient_ids")
     
     update_data["updated_at"] = datetime.utcnow()
     
@@ -1,6 +1,6 @@
 """Comment endpoints for milestone timeline."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Dict, List, Optional
 from bson import ObjectId
 
 from app.models.user import UserInDB
@@ -11,43 +11,44 @@ from app.models.timeline import (
     MilestoneCommentResponse
 )
 from app.repositories.timeline import CommentRepository, MilestoneRepository
-from app.models.responses import create_success_response
+from app.repositories.family.users import UserRepository
+from app.models.responses import create_success_response, create_paginated_response
 from app.utils.audit_logger import log_audit_event
 
 
 router = APIRouter()
 comment_repo = CommentRepository()
 milestone_repo = MilestoneRepository()
+user_repo = UserRepository()
 
 
-async def get_user_info(user_id: ObjectId) -> dict:
-    """Get basic user info."""
-    from app.repositories.family.users import UserRepository
-    user_repo = UserRepository()
-    user = await user_repo.find_one({"_id": user_id}, raise_404=False)
-    if user:
-        return {
-            "id": str(user["_id"]),
-            "name": user.get("full_name", "Unknown User"),
-            "avatar": user.get("avatar_url")
-        }
-    return {"id": str(user_id), "name": "Unknown User", "avatar": None}
+def collect_author_ids(comments: List[dict]) -> List[ObjectId]:
+    """Author ids of comments and all their nested replies."""
+    author_ids = []
+    for comment in comments:
+        author_ids.append(comment["author_id"])
+        author_ids.extend(collect_author_ids(comment.get("replies", [])))
+    return author_ids
 
 
-def build_comment_response(comment: dict, user_info: dict, replies: List[dict] = None) -> dict:
-    """Build comment response with user info."""
+def build_comment_response(comment: dict, authors: Dict[str, dict]) -> dict:
+    """Build comment response with author info and nested replies."""
+    author = authors.get(str(comment["author_id"])) or {}
+    replies = comment.get("replies", [])
     return MilestoneCommentResponse(
         id=str(comment["_id"]),
         milestone_id=str(comment["milestone_id"]),
         author_id=str(comment["author_id"]),
-        author_name=user_info["name"],
-        author_avatar=user_info["avatar"],
+        author_name=author.get("full_name", "Unknown User"),
+        author_avatar=author.get("avatar_url"),
         body=comment["body"],
         parent_comment_id=str(comment["parent_comment_id"]) if comment.get("parent_comment_id") else None,
         visibility=comment["visibility"],
+        depth=comment.get("depth", 0),
+        reply_count=comment.get("reply_count", 0),
         created_at=comment["created_at"],
         updated_at=comment["updated_at"],
-        replies=replies or []
+        replies=[build_comment_response(reply, authors) for reply in replies]
     ).model_dump()
 
 
@@ -68,14 +69,18 @@ async def create_comment(
         assert milestone is not None
         
         # Validate parent comment if provided
-        parent_oid = None
+        parent = None
         if comment.parent_comment_id:
             parent_oid = comment_repo.validate_object_id(
                 comment.parent_comment_id,
                 "parent_comment_id"
             )
             # Verify parent exists and belongs to same milestone
-            parent = await comment_repo.find_one({"_id": parent_oid}, raise_404=True)
+            parent = await comment_repo.find_one(
+                {"_id": parent_oid},
+                raise_404=True,
+                error_message="Parent comment not found"
+            )
             assert parent is not None
             if str(parent.get("milestone_id")) != milestone_id:
                 raise HTTPException(
@@ -83,16 +88,13 @@ async def create_comment(
                     detail="Parent comment does not belong to this milestone"
                 )
         
-        # Create comment
-        comment_data = {
-            "milestone_id": ObjectId(milestone_id),
-            "author_id": ObjectId(current_user.id),
-            "body": comment.body,
-            "parent_comment_id": parent_oid,
-            "visibility": comment.visibility
-        }
-        
-        created = await comment_repo.create(comment_data)
+        created = await comment_repo.create_comment(
+            milestone["_id"],
+            ObjectId(current_user.id),
+            comment.body,
+            comment.visibility,
+            parent=parent
+        )
         
         # Increment comment count on milestone
         await milestone_repo.increment_engagement(
@@ -110,10 +112,8 @@ async def create_comment(
             }
         )
         
-        # Get user info
-        user_info = await get_user_info(ObjectId(current_user.id))
-        
-        response = build_comment_response(created, user_info)
+        authors = await user_repo.get_user_cards([created["author_id"]])
+        response = build_comment_response(created, authors)
         
         return create_success_response(
             message="Comment created successfully",
@@ -131,9 +131,17 @@ async def create_comment(
 @router.get("/milestones/{milestone_id}/comments")
 async def get_comments(
     milestone_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    replies_per_thread: int = Query(3, ge=0, le=20),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    """Get all comments for a milestone (supports nested comments)."""
+    """
+    Get a page of a milestone's top-level comments.
+    
+    Each comment comes with its first replies_per_thread replies, nested, and
+    reply_count; the rest of a thread is fetched with the replies endpoint.
+    """
     try:
         # Verify milestone exists
         await milestone_repo.find_by_id(
@@ -142,25 +150,27 @@ async def get_comments(
             error_message="Milestone not found"
         )
         
-        # Get nested comments
-        comments = await comment_repo.get_nested_comments(milestone_id)
+        threads = await comment_repo.find_threads(
+            milestone_id,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            replies_per_thread=replies_per_thread
+        )
+        for thread in threads:
+            thread["replies"] = comment_repo.nest_replies(thread.get("replies", []))
         
-        # Enrich with user info
-        response_comments = []
-        for comment in comments:
-            user_info = await get_user_info(comment["author_id"])
-            
-            # Process replies recursively
-            replies = []
-            for reply in comment.get("replies", []):
-                reply_user_info = await get_user_info(reply["author_id"])
-                replies.append(build_comment_response(reply, reply_user_info))
-            
-            response_comments.append(build_comment_response(comment, user_info, replies))
+        total = await comment_repo.count({
+            "milestone_id": ObjectId(milestone_id),
+            "parent_comment_id": None
+        })
+        authors = await user_repo.get_user_cards(collect_author_ids(threads))
         
-        return create_success_response(
-            message="Comments retrieved successfully",
-            data=response_comments
+        return create_paginated_response(
+            items=[build_comment_response(thread, authors) for thread in threads],
+            total=total,
+            page=page,
+            page_size=page_size,
+            message="Comments retrieved successfully"
         )
     except HTTPException:
         raise
@@ -171,6 +181,53 @@ async def get_comments(
         )
 
 
+@router.get("/comments/{comment_id}/replies")
+async def get_replies(
+    comment_id: str,
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Load more replies under a comment, at any depth, in thread order.
+    
+    Replies are nested under their parents where the parent is in the same
+    page; the others are returned at the top level with their
+    parent_comment_id. Pass next_cursor back as after for the next page.
+    """
+    try:
+        comment = await comment_repo.find_by_id(
+            comment_id,
+            raise_404=True,
+            error_message="Comment not found"
+        )
+        assert comment is not None
+        
+        replies = await comment_repo.find_replies(comment_id, after=after, limit=limit + 1)
+        has_more = len(replies) > limit
+        replies = replies[:limit]
+        next_cursor = replies[-1]["path"] if has_more else None
+        
+        authors = await user_repo.get_user_cards([reply["author_id"] for reply in replies])
+        
+        return create_success_response(
+            message="Replies retrieved successfully",
+            data={
+                "replies": [build_comment_response(reply, authors) for reply in comment_repo.nest_replies(replies)],
+                "reply_count": comment.get("reply_count", 0),
+                "next_cursor": next_cursor,
+                "has_more": has_more
+            }
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve replies: {str(e)}"
+        )
+
+
 @router.put("/comments/{comment_id}")
 async def update_comment(
     comment_id: str,
@@ -195,7 +252,7 @@ async def update_comment(
                 detail="No fields to update"
             )
         
-        updated = await comment_repo.update(comment_id, update_data)
+        updated = await comment_repo.update_by_id(comment_id, update_data)
         
         await log_audit_event(
             user_id=str(current_user.id),
@@ -203,10 +260,8 @@ async def update_comment(
             event_details={"comment_id": comment_id}
         )
         
-        # Get user info
-        user_info = await get_user_info(ObjectId(current_user.id))
-        
-        response = build_comment_response(updated, user_info)
+        authors = await user_repo.get_user_cards([updated["author_id"]])
+        response = build_comment_response(updated, authors)
         
         return create_success_response(
             message="Comment updated successfully",
@@ -237,20 +292,20 @@ async def delete_comment(
         
         milestone_id = str(comment_doc["milestone_id"])
         
-        # Delete comment
-        await comment_repo.delete(comment_id)
+        # Delete comment with its replies
+        deleted = await comment_repo.delete_subtree(comment_doc)
         
         # Decrement comment count on milestone
         await milestone_repo.increment_engagement(
             milestone_id,
             "comments_count",
-            -1
+            -deleted
         )
         
         await log_audit_event(
             user_id=str(current_user.id),
             event_type="comment_deleted",
-            event_details={"comment_id": comment_id}
+            event_details={"comment_id": comment_id, "deleted_count": deleted}
         )
         
         return create_success_response(
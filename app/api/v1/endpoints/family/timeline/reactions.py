@@ -1,5 +1,6 @@
 """Reaction endpoints for milestone timeline."""
 from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, List
 from bson import ObjectId
 
 from app.models.user import UserInDB
@@ -11,25 +12,36 @@ from app.models.timeline import (
 from app.repositories.timeline import ReactionRepository, MilestoneRepository
 from app.models.responses import create_success_response
 from app.utils.audit_logger import log_audit_event
+from app.schemas.notification import NotificationType
+from app.services.notification_service import NotificationService
 
 
 router = APIRouter()
+notification_service = NotificationService()
 reaction_repo = ReactionRepository()
 milestone_repo = MilestoneRepository()
 
 
-async def get_user_info(user_id: ObjectId) -> dict:
-    """Get basic user info."""
+async def get_users_info(user_ids: List[ObjectId]) -> Dict[str, dict]:
+    """Basic info for several users, keyed by string ID."""
     from app.repositories.family.users import UserRepository
-    user_repo = UserRepository()
-    user = await user_repo.find_one({"_id": user_id}, raise_404=False)
-    if user:
-        return {
+    users = await UserRepository().find_many(
+        {"_id": {"$in": user_ids}},
+        limit=len(user_ids) or 1,
+        projection={"full_name": 1, "avatar_url": 1}
+    )
+    by_id = {
+        str(user["_id"]): {
             "id": str(user["_id"]),
             "name": user.get("full_name", "Unknown User"),
             "avatar": user.get("avatar_url")
         }
-    return {"id": str(user_id), "name": "Unknown User", "avatar": None}
+        for user in users
+    }
+    return {
+        str(user_id): by_id.get(str(user_id), {"id": str(user_id), "name": "Unknown User", "avatar": None})
+        for user_id in user_ids
+    }
 
 
 @router.post("/milestones/{milestone_id}/reactions", status_code=status.HTTP_201_CREATED)
@@ -41,24 +53,19 @@ async def add_or_update_reaction(
     """Add or update a reaction to a milestone."""
     try:
         # Verify milestone exists
-        await milestone_repo.find_by_id(
+        milestone = await milestone_repo.find_by_id(
             milestone_id,
             raise_404=True,
             error_message="Milestone not found"
         )
         
-        # Check if user already has a reaction
-        existing = await reaction_repo.find_user_reaction(
-            milestone_id,
-            str(current_user.id)
-        )
-        
-        # Upsert reaction
-        created_or_updated = await reaction_repo.upsert_reaction(
+        # Upsert reaction; previous is None when the reaction is new
+        created_or_updated, previous = await reaction_repo.upsert_reaction(
             milestone_id,
             str(current_user.id),
             reaction.reaction_type
         )
+        existing = previous is not None
         
         # If this is a new reaction, increment count
         if not existing:
@@ -67,6 +74,21 @@ async def add_or_update_reaction(
                 "reactions_count",
                 1
             )
+            
+            # Bursts of reactions on one milestone fold into a single notification
+            if milestone["owner_id"] != ObjectId(current_user.id):
+                actor_name = current_user.full_name or current_user.email
+                await notification_service.create_coalesced_notifications([{
+                    "user_id": str(milestone["owner_id"]),
+                    "type": NotificationType.REACTION.value,
+                    "title": f"{actor_name} reacted to your milestone",
+                    "message": f"{actor_name} reacted {reaction.reaction_type} to '{milestone.get('title', '')}'",
+                    "actor_id": str(current_user.id),
+                    "actor_name": actor_name,
+                    "actor_avatar": current_user.avatar_url,
+                    "target_type": "milestone",
+                    "target_id": milestone_id
+                }])
         
         await log_audit_event(
             user_id=str(current_user.id),
@@ -162,10 +184,12 @@ async def get_reactions_summary(
             str(current_user.id)
         )
         
-        # Enrich recent reactors with user info
+        # Enrich recent reactors with user info in one query
+        recent_reactors = summary.get("recent_reactors", [])[:10]
+        users = await get_users_info([ObjectId(reactor["actor_id"]) for reactor in recent_reactors])
         enriched_reactors = []
-        for reactor in summary.get("recent_reactors", [])[:10]:
-            user_info = await get_user_info(ObjectId(reactor["actor_id"]))
+        for reactor in recent_reactors:
+            user_info = users[reactor["actor_id"]]
             enriched_reactors.append({
                 "actor_id": reactor["actor_id"],
                 "actor_name": user_info["name"],
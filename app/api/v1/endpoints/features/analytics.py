@@ -15,17 +15,17 @@ async def get_analytics_overview(
 ):
     """Get analytics overview with key metrics"""
     # Count all content types
-    memories_count = await get_collection("memories").count_documents({"owner_id": ObjectId(current_user.id)})
-    files_count = await get_collection("files").count_documents({"owner_id": ObjectId(current_user.id)})
-    hub_items_count = await get_collection("hub_items").count_documents({"owner_id": ObjectId(current_user.id)})
-    collections_count = await get_collection("collections").count_documents({"owner_id": ObjectId(current_user.id)})
+    memories_count = await get_collection("memories", workload="analytics").count_documents({"owner_id": ObjectId(current_user.id)})
+    files_count = await get_collection("files", workload="analytics").count_documents({"owner_id": ObjectId(current_user.id)})
+    hub_items_count = await get_collection("hub_items", workload="analytics").count_documents({"owner_id": ObjectId(current_user.id)})
+    collections_count = await get_collection("collections", workload="analytics").count_documents({"owner_id": ObjectId(current_user.id)})
     
     # Count social metrics
-    followers_count = await get_collection("relationships").count_documents({
+    followers_count = await get_collection("relationships", workload="analytics").count_documents({
         "following_id": ObjectId(current_user.id),
         "status": "accepted"
     })
-    following_count = await get_collection("relationships").count_documents({
+    following_count = await get_collection("relationships", workload="analytics").count_documents({
         "follower_id": ObjectId(current_user.id),
         "status": "accepted"
     })
@@ -35,7 +35,7 @@ async def get_analytics_overview(
         {"$match": {"owner_id": ObjectId(current_user.id)}},
         {"$group": {"_id": None, "total_size": {"$sum": "$file_size"}}}
     ]
-    storage_result = await get_collection("files").aggregate(storage_pipeline).to_list(length=1)
+    storage_result = await get_collection("files", workload="analytics").aggregate(storage_pipeline).to_list(length=1)
     total_storage = storage_result[0]["total_size"] if storage_result else 0
     
     return {
@@ -79,7 +79,7 @@ async def get_activity_chart(
         {"$sort": {"_id": 1}}
     ]
     
-    memories_data = await get_collection("memories").aggregate(memories_pipeline).to_list(length=None)
+    memories_data = await get_collection("memories", workload="analytics").aggregate(memories_pipeline).to_list(length=None)
     
     # Get files uploaded per day
     files_pipeline = [
@@ -94,7 +94,7 @@ async def get_activity_chart(
         {"$sort": {"_id": 1}}
     ]
     
-    files_data = await get_collection("files").aggregate(files_pipeline).to_list(length=None)
+    files_data = await get_collection("files", workload="analytics").aggregate(files_pipeline).to_list(length=None)
     
     return {
         "period": period,
@@ -116,7 +116,7 @@ async def get_top_tags(
         {"$limit": limit}
     ]
     
-    tags_data = await get_collection("memories").aggregate(pipeline).to_list(length=None)
+    tags_data = await get_collection("memories", workload="analytics").aggregate(pipeline).to_list(length=None)
     
     return {
         "tags": [{"tag": item["_id"], "count": item["count"]} for item in tags_data]
@@ -146,7 +146,7 @@ async def get_mood_trends(
         {"$sort": {"count": -1}}
     ]
     
-    mood_data = await get_collection("memories").aggregate(pipeline).to_list(length=None)
+    mood_data = await get_collection("memories", workload="analytics").aggregate(pipeline).to_list(length=None)
     
     return {
         "period": period,
@@ -168,7 +168,7 @@ async def get_storage_breakdown(
         {"$sort": {"total_size": -1}}
     ]
     
-    storage_data = await get_collection("files").aggregate(pipeline).to_list(length=None)
+    storage_data = await get_collection("files", workload="analytics").aggregate(pipeline).to_list(length=None)
     
     return {
         "breakdown": [
@@ -1,17 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_database
+from app.utils.geo_utils import bbox_filter, geo_fields, geo_point, parse_bbox
 
 router = APIRouter()
 
 class Location(BaseModel):
-    latitude: float
-    longitude: float
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
     address: Optional[str] = None
     place_name: Optional[str] = None
     city: Optional[str] = None
@@ -34,6 +35,7 @@ async def create_place(
     
     place_data = {
         **place.dict(),
+        **geo_fields(place.location.latitude, place.location.longitude),
         "user_id": str(current_user.id),
         "memory_count": 0,
         "created_at": datetime.utcnow()
@@ -65,23 +67,49 @@ async def get_places(
 
 @router.get("/nearby")
 async def get_nearby_places(
-    latitude: float,
-    longitude: float,
-    radius: int = 10,  # km
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius: float = Query(10, gt=0, le=1000),  # km
+    limit: int = Query(50, ge=1, le=200),
     current_user: UserInDB = Depends(get_current_user)
 ):
-    """Get places near a location"""
+    """Get places within radius km of a location, nearest first"""
+    db = get_database()
+    
+    places = await db.places.aggregate([
+        {"$geoNear": {
+            "near": geo_point(latitude, longitude),
+            "key": "geo",
+            "distanceField": "distance_m",
+            "maxDistance": radius * 1000,
+            "spherical": True,
+            "query": {"user_id": str(current_user.id)}
+        }},
+        {"$limit": limit}
+    ]).to_list(limit)
+    
+    for place in places:
+        place["_id"] = str(place["_id"])
+    
+    return places
+
+@router.get("/within")
+async def get_places_within(
+    bbox: str = Query(..., description="Viewport as west,south,east,north"),
+    limit: int = Query(200, ge=1, le=500),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Get places inside a bounding box"""
     db = get_database()
     
-    # Simple distance calculation (for production, use geospatial queries)
     places = await db.places.find({
-        "user_id": str(current_user.id)
-    }).to_list(1000)
+        "user_id": str(current_user.id),
+        **bbox_filter("geo", *parse_bbox(bbox))
+    }).limit(limit).to_list(limit)
     
     for place in places:
         place["_id"] = str(place["_id"])
     
-    # In production, filter by actual distance
     return places
 
 @router.get("/{place_id}/memories")
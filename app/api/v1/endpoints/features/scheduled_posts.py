@@ -6,6 +6,7 @@ from pydantic import BaseModel
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_database
+from app.repositories.viewer_principals_repository import memory_visible_to
 
 router = APIRouter()
 
@@ -150,6 +151,7 @@ async def publish_now(
             "privacy": post["privacy"],
             "created_at": datetime.utcnow()
         }
+        memory_data["visible_to"] = memory_visible_to({"owner_id": post["user_id"], "privacy": post["privacy"]})
         await db.memories.insert_one(memory_data)
     
     # Mark as published
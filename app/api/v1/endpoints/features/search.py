@@ -34,7 +34,7 @@ async def advanced_search(
         if tags:
             memory_query["tags"] = {"$in": tags}
         
-        memories = await get_collection("memories").find(memory_query).limit(limit).to_list(length=None)
+        memories = await get_collection("memories", workload="search").find(memory_query).limit(limit).to_list(length=None)
         for memory in memories:
             results.append({
                 "type": "memory",
@@ -57,7 +57,7 @@ async def advanced_search(
         if tags:
             file_query["tags"] = {"$in": tags}
         
-        files = await get_collection("files").find(file_query).limit(limit).to_list(length=None)
+        files = await get_collection("files", workload="search").find(file_query).limit(limit).to_list(length=None)
         for file in files:
             results.append({
                 "type": "file",
@@ -80,7 +80,7 @@ async def advanced_search(
         if tags:
             hub_query["tags"] = {"$in": tags}
         
-        hub_items = await get_collection("hub_items").find(hub_query).limit(limit).to_list(length=None)
+        hub_items = await get_collection("hub_items", workload="search").find(hub_query).limit(limit).to_list(length=None)
         for item in hub_items:
             results.append({
                 "type": "hub_item",
@@ -103,7 +103,7 @@ async def advanced_search(
         if tags:
             col_query["tags"] = {"$in": tags}
         
-        collections = await get_collection("collections").find(col_query).limit(limit).to_list(length=None)
+        collections = await get_collection("collections", workload="search").find(col_query).limit(limit).to_list(length=None)
         for col in collections:
             results.append({
                 "type": "collection",
@@ -134,7 +134,7 @@ async def search_suggestions(
     suggestions = []
     
     # Get tag suggestions
-    tags_cursor = get_collection("memories").aggregate([
+    tags_cursor = get_collection("memories", workload="search").aggregate([
         {"$match": {"owner_id": ObjectId(current_user.id)}},
         {"$unwind": "$tags"},
         {"$match": {"tags": {"$regex": q, "$options": "i"}}},
@@ -151,7 +151,7 @@ async def search_suggestions(
         })
     
     # Get title suggestions from memories
-    memories = await get_collection("memories").find({
+    memories = await get_collection("memories", workload="search").find({
         "owner_id": ObjectId(current_user.id),
         "title": {"$regex": q, "$options": "i"}
     }).limit(5).to_list(length=None)
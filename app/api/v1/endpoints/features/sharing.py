@@ -9,6 +9,7 @@ import os
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
 
 router = APIRouter()
 
@@ -212,7 +213,7 @@ async def access_shared_resource(
     if resource_type == "memory":
         memory_doc = await get_collection("memories").find_one({"_id": resource_id})
         if memory_doc:
-            owner = await get_collection("users").find_one({"_id": memory_doc["owner_id"]})
+            owner = await get_collection("users").find_one({"_id": memory_doc["owner_id"]}, USER_CARD)
             resource_data = {
                 "id": str(memory_doc["_id"]),
                 "title": memory_doc["title"],
@@ -227,15 +228,17 @@ async def access_shared_resource(
     elif resource_type == "collection":
         col_doc = await get_collection("collections").find_one({"_id": resource_id})
         if col_doc:
-            owner = await get_collection("users").find_one({"_id": col_doc["owner_id"]})
-            memory_count = await get_collection("collection_memories").count_documents({
-                "collection_id": resource_id
-            })
+            owner = await get_collection("users").find_one({"_id": col_doc["owner_id"]}, USER_CARD)
+            memory_count = col_doc.get("memory_count")
+            if memory_count is None:
+                memory_count = await get_collection("collection_memories").count_documents({
+                    "collection_id": resource_id
+                })
             resource_data = {
                 "id": str(col_doc["_id"]),
                 "name": col_doc["name"],
                 "description": col_doc.get("description"),
-                "cover_image_url": col_doc.get("cover_image_url"),
+                "cover_image_url": col_doc.get("cover_image_url") or col_doc.get("auto_cover_url"),
                 "tags": col_doc.get("tags", []),
                 "memory_count": memory_count,
                 "owner_name": owner.get("full_name", "Unknown") if owner else "Unknown",
@@ -257,7 +260,7 @@ async def access_shared_resource(
     elif resource_type == "hub":
         hub_doc = await get_collection("hubs").find_one({"_id": resource_id})
         if hub_doc:
-            owner = await get_collection("users").find_one({"_id": hub_doc["owner_id"]})
+            owner = await get_collection("users").find_one({"_id": hub_doc["owner_id"]}, USER_CARD)
             member_count = await get_collection("hub_members").count_documents({"hub_id": resource_id})
             resource_data = {
                 "id": str(hub_doc["_id"]),
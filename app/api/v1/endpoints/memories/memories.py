@@ -13,19 +13,32 @@ import uuid
 
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.engagement_repository import EngagementRepository
+from app.repositories.family.memories import MemoryRepository
+from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository, memory_visible_to
 from app.models.memory import (
     MemoryCreate, MemoryInDB, MemoryUpdate, 
     MemoryResponse, MemorySearchParams, MemoryPrivacy
 )
 from app.models.user import UserInDB
+from app.utils.geo_utils import geo_fields, parse_bbox
 from app.utils.memory_utils import (
     process_memory_search_filters, 
     get_sort_params,
-    increment_memory_counter
+    increment_memory_counter,
+    MEMORY_TARGET
 )
 from app.core.config import settings
+from app.schemas.notification import NotificationType
+from app.services.counter_service import counter_service
+from app.services.notification_service import NotificationService
+from app.services.reference_validator import reference_validator, parse_object_ids
 
 router = APIRouter()
+notification_service = NotificationService()
+engagements = EngagementRepository()
+memory_repo = MemoryRepository()
+viewer_principals = ViewerPrincipalsRepository()
 
 # Configure upload directory
 UPLOAD_DIR = "uploads/memories"
@@ -70,54 +83,28 @@ async def create_memory(
     except json.JSONDecodeError:
         family_circles = []
     
-    # Validate allowed_user_ids - ensure they exist
+    # Validate references with one check per list; unknown or foreign IDs are dropped
     validated_allowed_users = []
     if privacy == MemoryPrivacy.SPECIFIC_USERS:
-        for user_id in allowed_users:
-            try:
-                user_oid = ObjectId(user_id)
-                user = await get_collection("users").find_one({"_id": user_oid})
-                if user:
-                    validated_allowed_users.append(user_id)
-            except:
-                continue
+        allowed_oids = parse_object_ids(allowed_users, "allowed_user_ids", strict=False)
+        existing_users = await reference_validator.existing_users(allowed_oids)
+        validated_allowed_users = [str(oid) for oid in allowed_oids if oid in existing_users]
 
-    # Validate tagged family members - ensure they are in user's family relationships
-    validated_family_tags = []
-    for family_member in tagged_family:
-        if not family_member.get("user_id"):
-            continue
-        
-        try:
-            member_oid = ObjectId(family_member["user_id"])
-        except:
-            continue
-            
-        # Verify this is actually a family relationship of the current user
-        relationship = await get_collection("family_relationships").find_one({
-            "user_id": ObjectId(current_user.id),
-            "related_user_id": member_oid
-        })
-        
-        if relationship:
-            validated_family_tags.append(family_member)
+    # Tagged family members must be in the user's family relationships
+    family_tags = [member for member in tagged_family if isinstance(member, dict) and member.get("user_id")]
+    relatives = await reference_validator.relatives_of(
+        str(current_user.id),
+        parse_object_ids([member["user_id"] for member in family_tags], strict=False)
+    )
+    validated_family_tags = [
+        member for member in family_tags
+        if ObjectId.is_valid(str(member["user_id"])) and ObjectId(str(member["user_id"])) in relatives
+    ]
     
-    # Validate family circles - ensure user is a member
-    validated_circles = []
-    for circle_id in family_circles:
-        try:
-            circle_oid = ObjectId(circle_id)
-        except:
-            continue
-            
-        # Verify user is a member of this circle
-        circle = await get_collection("family_circles").find_one({
-            "_id": circle_oid,
-            "member_ids": ObjectId(current_user.id)
-        })
-        
-        if circle:
-            validated_circles.append(circle_id)
+    # Family circles must be ones the user belongs to
+    circle_oids = parse_object_ids(family_circles, "family_circle_ids", strict=False)
+    member_circles = await reference_validator.circles_of(str(current_user.id), circle_oids)
+    validated_circles = [str(oid) for oid in circle_oids if oid in member_circles]
     
     # Save uploaded files
     media_urls = []
@@ -150,14 +137,16 @@ async def create_memory(
         "updated_at": datetime.utcnow(),
         "view_count": 0,
         "like_count": 0,
+        "bookmark_count": 0,
         "comment_count": 0
     }
+    memory_data["visible_to"] = memory_visible_to(memory_data)
     
     if location:
         try:
             lat, lng = map(float, location.split(','))
-            memory_data["location"] = {"lat": lat, "lng": lng}
-        except:
+            memory_data.update(location={"lat": lat, "lng": lng}, **geo_fields(lat, lng))
+        except ValueError:
             pass
     
     result = await get_collection("memories").insert_one(memory_data)
@@ -165,23 +154,26 @@ async def create_memory(
     if not memory:
         raise HTTPException(status_code=500, detail="Failed to create memory")
     
-    # Send notifications to tagged family members (using validated list)
-    for family_member in validated_family_tags:
-        if family_member.get("user_id"):
-            try:
-                await get_collection("notifications").insert_one({
-                    "user_id": ObjectId(family_member["user_id"]),
-                    "type": "family_tag",
-                    "title": f"{current_user.full_name} tagged you in a memory",
-                    "message": f"You were tagged as '{family_member.get('relation', 'family')}' in '{title}'",
-                    "link": f"/memories/{str(result.inserted_id)}",
-                    "read": False,
-                    "created_at": datetime.utcnow()
-                })
-            except:
-                pass  # Silent fail for notifications
+    # Notify tagged family members (using validated list) with one batched write
+    await notification_service.create_coalesced_notifications([
+        {
+            "user_id": family_member["user_id"],
+            "type": NotificationType.FAMILY_TAG.value,
+            "title": f"{current_user.full_name} tagged you in a memory",
+            "message": f"You were tagged as '{family_member.get('relation', 'family')}' in '{title}'",
+            "actor_id": str(current_user.id),
+            "actor_name": current_user.full_name,
+            "actor_avatar": current_user.avatar_url,
+            "target_type": "memory",
+            "target_id": str(result.inserted_id),
+            "link": f"/memories/{str(result.inserted_id)}"
+        }
+        for family_member in validated_family_tags
+        if family_member.get("user_id")
+    ])
     
-    return await _prepare_memory_response(memory, str(current_user.id))
+    await memory_repo.attach_viewer_context([memory], str(current_user.id))
+    return _prepare_memory_response(memory)
 
 @router.get("/media/{filename}")
 async def get_media(filename: str):
@@ -222,48 +214,55 @@ async def search_memories(
     
     skip = (page - 1) * limit
     cursor = get_collection("memories").find(filters).sort(sort).skip(skip).limit(limit)
+    memories = await memory_repo.attach_viewer_context(await cursor.to_list(length=limit), str(current_user.id))
     
-    memories = []
-    async for memory in cursor:
-        memories.append(await _prepare_memory_response(memory, str(current_user.id)))
-    
-    return memories
+    return [_prepare_memory_response(memory) for memory in memories]
+
+@router.get("/map/nearby", response_model=List[MemoryResponse])
+async def get_nearby_memories(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=1000),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Memories the viewer may see within radius_km of a point, nearest first"""
+    principals = await viewer_principals.get(str(current_user.id))
+    memories = await memory_repo.find_near(latitude, longitude, radius_km * 1000, principals, limit)
+    await memory_repo.attach_viewer_context(memories, str(current_user.id))
+    return [_prepare_memory_response(memory) for memory in memories]
+
+@router.get("/map/clusters")
+async def get_memory_clusters(
+    bbox: str = Query(..., description="Viewport as west,south,east,north"),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Memories the viewer may see inside a viewport, grouped into geohash cells"""
+    west, south, east, north = parse_bbox(bbox)
+    principals = await viewer_principals.get(str(current_user.id))
+    return await memory_repo.find_clusters(
+        west, south, east, north, principals, settings.MAP_CLUSTER_TARGET_CELLS
+    )
 
 @router.get("/{memory_id}", response_model=MemoryResponse)
 async def get_memory(
     memory_id: str,
     current_user: UserInDB = Depends(get_current_user)
 ):
-    memory = await get_collection("memories").find_one({"_id": ObjectId(memory_id)})
+    principals = await viewer_principals.get(str(current_user.id))
+    memory = await memory_repo.find_detail(memory_id, str(current_user.id), principals)
     if not memory:
         raise HTTPException(status_code=404, detail="Memory not found")
     
-    # Increment view count
+    # Buffered by the counter service, so the view costs no round trip
     await increment_memory_counter(memory_id, "view_count")
     
-    return await _prepare_memory_response(memory, str(current_user.id))
+    return _prepare_memory_response(memory)
 
-async def _prepare_memory_response(memory: dict, current_user_id: str) -> dict:
+def _prepare_memory_response(memory: dict) -> dict:
+    """Stringify the ids of a memory carrying its viewer context (see MemoryRepository)"""
     memory["id"] = str(memory["_id"])
     memory["owner_id"] = str(memory["owner_id"])
-    
-    # Add additional user data
-    user = await get_collection("users").find_one({"_id": ObjectId(memory["owner_id"])})
-    if user:
-        memory["owner_name"] = user.get("full_name")
-        memory["owner_avatar"] = user.get("avatar_url")
-    
-    # Check if current user has liked or bookmarked this memory
-    memory["is_liked"] = await get_collection("likes").find_one({
-        "memory_id": ObjectId(memory["_id"]),
-        "user_id": ObjectId(current_user_id)
-    }) is not None
-    
-    memory["is_bookmarked"] = await get_collection("bookmarks").find_one({
-        "memory_id": ObjectId(memory["_id"]),
-        "user_id": ObjectId(current_user_id)
-    }) is not None
-    
     return memory
 
 # Add more endpoints for likes, comments, bookmarks, etc.
@@ -272,49 +271,29 @@ async def like_memory(
     memory_id: str,
     current_user: UserInDB = Depends(get_current_user)
 ):
-    # Check if already liked
-    existing_like = await get_collection("likes").find_one({
-        "memory_id": ObjectId(memory_id),
-        "user_id": ObjectId(current_user.id)
-    })
+    memory_oid = ObjectId(memory_id)
+    user_oid = ObjectId(current_user.id)
     
-    if existing_like:
-        # Unlike
-        await get_collection("likes").delete_one({"_id": existing_like["_id"]})
-        await increment_memory_counter(memory_id, "like_count", -1)
-        return {"liked": False}
-    else:
-        # Like
-        await get_collection("likes").insert_one({
-            "memory_id": ObjectId(memory_id),
-            "user_id": ObjectId(current_user.id),
-            "created_at": datetime.utcnow()
-        })
-        await increment_memory_counter(memory_id, "like_count", 1)
-        return {"liked": True}
+    # Like, or unlike if already liked; like_count follows through the counter service
+    liked = await engagements.set(MEMORY_TARGET, memory_oid, user_oid, "like", True)
+    if not liked:
+        await engagements.set(MEMORY_TARGET, memory_oid, user_oid, "like", False)
+    like_count = await counter_service.value(MEMORY_TARGET, memory_oid, "like_count")
+    return {"liked": liked, "like_count": like_count}
 
 @router.post("/{memory_id}/bookmark")
 async def bookmark_memory(
     memory_id: str,
     current_user: UserInDB = Depends(get_current_user)
 ):
-    # Check if already bookmarked
-    existing_bookmark = await get_collection("bookmarks").find_one({
-        "memory_id": ObjectId(memory_id),
-        "user_id": ObjectId(current_user.id)
-    })
+    memory_oid = ObjectId(memory_id)
+    user_oid = ObjectId(current_user.id)
     
-    if existing_bookmark:
-        # Remove bookmark
-        await get_collection("bookmarks").delete_one({"_id": existing_bookmark["_id"]})
-        return {"bookmarked": False}
-    else:
-        # Add bookmark
-        await get_collection("bookmarks").insert_one({
-            "memory_id": ObjectId(memory_id),
-            "user_id": ObjectId(current_user.id),
-            "created_at": datetime.utcnow()
-        })
-        return {"bookmarked": True}
+    # Bookmark, or remove the bookmark if already bookmarked
+    bookmarked = await engagements.set(MEMORY_TARGET, memory_oid, user_oid, "bookmark", True)
+    if not bookmarked:
+        await engagements.set(MEMORY_TARGET, memory_oid, user_oid, "bookmark", False)
+    bookmark_count = await counter_service.value(MEMORY_TARGET, memory_oid, "bookmark_count")
+    return {"bookmarked": bookmarked, "bookmark_count": bookmark_count}
 
 # Add more endpoints as needed...
\ No newline at end of file
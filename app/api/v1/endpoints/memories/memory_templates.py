@@ -6,6 +6,7 @@ from pydantic import BaseModel
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_database
+from app.repositories.viewer_principals_repository import user_principal
 
 router = APIRouter()
 
@@ -122,7 +123,8 @@ async def use_template(
         "template_id": template_id,
         "template_name": template["name"],
         "data": data,
-        "created_at": datetime.utcnow()
+        "created_at": datetime.utcnow(),
+        "visible_to": [user_principal(current_user.id)]
     }
     
     result = await db.memories.insert_one(memory_data)
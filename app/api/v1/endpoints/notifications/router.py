@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from typing import List, Optional, Dict, Any
+import asyncio
 from datetime import datetime
 from bson import ObjectId
 import logging
@@ -11,15 +12,16 @@ from app.schemas.notification import (
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
+from app.repositories.family.notifications import NotificationRepository
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
+notification_repo = NotificationRepository()
 
-async def _prepare_notification_response(notif_doc: dict) -> NotificationResponse:
-    """Prepare notification document for API response"""
-    actor = await get_collection("users").find_one({"_id": notif_doc["actor_id"]})
-    
+def _prepare_notification_response(notif_doc: dict, actor: Dict[str, Any]) -> NotificationResponse:
+    """Prepare notification document for API response from its actor snapshot"""
     return NotificationResponse(
         id=str(notif_doc["_id"]),
         type=notif_doc["type"],
@@ -28,8 +30,8 @@ async def _prepare_notification_response(notif_doc: dict) -> NotificationRespons
         target_type=notif_doc.get("target_type"),
         target_id=str(notif_doc["target_id"]) if notif_doc.get("target_id") else None,
         actor_id=str(notif_doc["actor_id"]),
-        actor_name=actor.get("full_name") or actor.get("email") or "Unknown User" if actor else "Unknown User",
-        actor_avatar=actor.get("avatar_url") if actor else None,
+        actor_name=actor["actor_name"],
+        actor_avatar=actor["actor_avatar"],
         is_read=notif_doc.get("is_read", False),
         created_at=notif_doc["created_at"],
         health_record_id=str(notif_doc["health_record_id"]) if notif_doc.get("health_record_id") else None,
@@ -43,6 +45,10 @@ async def _prepare_notification_response(notif_doc: dict) -> NotificationRespons
         record_date=notif_doc.get("record_date"),
         approval_status=notif_doc.get("approval_status"),
         resolved_at=notif_doc.get("resolved_at"),
+        count=notif_doc.get("count", 1),
+        recent_actors=[
+            {**a, "id": str(a["id"])} for a in notif_doc.get("recent_actors", [])
+        ],
         metadata=notif_doc.get("metadata", {})
     )
 
@@ -63,20 +69,24 @@ async def list_notifications(
     if notification_type:
         query["type"] = notification_type
     
-    total = await get_collection("notifications").count_documents(query)
-    unread_count = await get_collection("notifications").count_documents({
-        "user_id": user_id_obj,
-        "is_read": False
-    })
-    
     skip = (page - 1) * limit
+    (notif_docs, total), unread_count = await asyncio.gather(
+        notification_repo.find_page(query, skip, limit),
+        notification_repo.get_unread_count(current_user.id)
+    )
     pages = (total + limit - 1) // limit
     
-    cursor = get_collection("notifications").find(query).sort("created_at", -1).skip(skip).limit(limit)
-    
-    notifications = []
-    async for notif_doc in cursor:
-        notifications.append(await _prepare_notification_response(notif_doc))
+    # Notifications written before actor snapshots existed are resolved in one lookup
+    legacy_actors = await notification_repo.actor_snapshots(
+        notif_doc["actor_id"] for notif_doc in notif_docs if "actor_name" not in notif_doc
+    )
+    notifications = [
+        _prepare_notification_response(
+            notif_doc,
+            notif_doc if "actor_name" in notif_doc else legacy_actors[notif_doc["actor_id"]]
+        )
+        for notif_doc in notif_docs
+    ]
     
     from app.models.responses import create_success_response
     
@@ -91,25 +101,22 @@ async def list_notifications(
         }
     )
 
+@router.get("/unread-count")
+async def get_unread_count(
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Unread badge count, read from the user's counter document"""
+    return {"unread_count": await notification_repo.get_unread_count(current_user.id)}
+
 @router.put("/{notification_id}/read", status_code=status.HTTP_200_OK)
 async def mark_as_read(
     notification_id: str,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Mark a notification as read"""
-    notif = await get_collection("notifications").find_one({
-        "_id": ObjectId(notification_id),
-        "user_id": ObjectId(current_user.id)
-    })
-    
-    if not notif:
+    if not await notification_repo.mark_read(current_user.id, notification_id):
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    await get_collection("notifications").update_one(
-        {"_id": ObjectId(notification_id)},
-        {"$set": {"is_read": True}}
-    )
-    
     return {"message": "Notification marked as read"}
 
 @router.put("/read-all", status_code=status.HTTP_200_OK)
@@ -117,12 +124,9 @@ async def mark_all_as_read(
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Mark all notifications as read"""
-    result = await get_collection("notifications").update_many(
-        {"user_id": ObjectId(current_user.id), "is_read": False},
-        {"$set": {"is_read": True}}
-    )
+    modified = await notification_repo.mark_all_read(current_user.id)
     
-    return {"message": f"{result.modified_count} notifications marked as read"}
+    return {"message": f"{modified} notifications marked as read"}
 
 @router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_notification(
@@ -130,12 +134,7 @@ async def delete_notification(
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Delete a notification"""
-    result = await get_collection("notifications").delete_one({
-        "_id": ObjectId(notification_id),
-        "user_id": ObjectId(current_user.id)
-    })
-    
-    if result.deleted_count == 0:
+    if not await notification_repo.delete_notification(current_user.id, notification_id):
         raise HTTPException(status_code=404, detail="Notification not found")
 
 @router.delete("/", status_code=status.HTTP_200_OK)
@@ -143,11 +142,9 @@ async def delete_all_notifications(
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Delete all notifications for current user"""
-    result = await get_collection("notifications").delete_many({
-        "user_id": ObjectId(current_user.id)
-    })
+    deleted = await notification_repo.delete_all(current_user.id)
     
-    return {"message": f"{result.deleted_count} notifications deleted"}
+    return {"message": f"{deleted} notifications deleted"}
 
 @router.get("/{notification_id}/details")
 async def get_notification_details(
@@ -193,7 +190,7 @@ async def get_notification_details(
         
         # Add assigner details
         if notif.get("assigner_id"):
-            assigner = await get_collection("users").find_one({"_id": notif["assigner_id"]})
+            assigner = await get_collection("users").find_one({"_id": notif["assigner_id"]}, USER_CARD)
             if assigner:
                 details.update({
                     "assigner_id": str(assigner["_id"]),
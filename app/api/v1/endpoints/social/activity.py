@@ -6,8 +6,11 @@ from bson import ObjectId
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
+from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository, followed_user_ids
 
 router = APIRouter()
+viewer_principals = ViewerPrincipalsRepository()
 
 # Register both routes to handle with and without trailing slash
 @router.get("/")
@@ -27,60 +30,13 @@ async def get_activity_feed(
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Get activity feed from followed users using MongoDB aggregation"""
-    current_user_id = ObjectId(current_user.id)
-    
-    # 1. Get users that current user follows
-    relationships = await get_collection("relationships").find({
-        "follower_id": current_user_id,
-        "status": "accepted"
-    }).to_list(length=None)
-    following_ids = [rel["following_id"] for rel in relationships]
-    
-    # 2. Get family members
-    family_rels = await get_collection("family_relationships").find({
-        "user_id": current_user_id
-    }).to_list(length=None)
-    family_ids = [rel["related_user_id"] for rel in family_rels]
-    
-    # 3. Get circles user is a member of
-    my_circles = await get_collection("family_circles").find({
-        "member_ids": current_user_id
-    }).to_list(length=None)
-    my_circle_ids = [str(circle["_id"]) for circle in my_circles]
+    # Own memories, public and friends memories of followed users, family,
+    # circle and directly shared memories: one $in over the viewer's principals
+    principals = await viewer_principals.get(str(current_user.id))
+    memory_match = await viewer_principals.visibility_filter(str(current_user.id), include_public=False)
+    following_ids = followed_user_ids(principals)
     
     skip = (page - 1) * limit
-    
-    # Complex match condition for memories
-    memory_match = {
-        "$or": [
-            # 1. Own memories
-            {"owner_id": current_user_id},
-            
-            # 2. Public/Friends memories from people I follow
-            {
-                "owner_id": {"$in": following_ids},
-                "privacy": {"$in": ["public", "friends"]} 
-            },
-            
-            # 3. Family memories from relatives
-            {
-                "owner_id": {"$in": family_ids},
-                "privacy": "family"
-            },
-            
-            # 4. Circle memories
-            {
-                "family_circle_ids": {"$in": my_circle_ids},
-                "privacy": "family_circle"
-            },
-            
-            # 5. Specific users (shared with me)
-            {
-                "allowed_user_ids": str(current_user_id),
-                "privacy": "specific_users"
-            }
-        ]
-    }
 
     # Use MongoDB aggregation with $unionWith and $facet for accurate pagination
     pipeline = [
@@ -147,7 +103,7 @@ async def get_activity_feed(
     
     activities = []
     for item in items:
-        owner = await get_collection("users").find_one({"_id": item["owner_id"]})
+        owner = await get_collection("users").find_one({"_id": item["owner_id"]}, USER_CARD)
         activity_data = {
             "type": item["type"],
             "id": str(item["_id"]),
@@ -189,9 +145,10 @@ async def get_user_activity(
     """Get activity for a specific user"""
     activities = []
     
-    # Get recent memories
+    # Get recent memories the viewer may see
     memories_cursor = get_collection("memories").find({
-        "owner_id": ObjectId(user_id)
+        "owner_id": ObjectId(user_id),
+        **await viewer_principals.visibility_filter(str(current_user.id))
     }).sort("created_at", -1).limit(limit)
     
     async for memory in memories_cursor:
@@ -11,6 +11,9 @@ from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
 from app.repositories.family_repository import HubItemsRepository
+from app.repositories.family.hub_items import HUB_ITEM_TARGET
+from app.repositories.projections import USER_CARD, HUB_ITEM_CARD
+from app.services.counter_service import counter_service
 from app.utils.audit_logger import log_audit_event
 from app.models.responses import create_success_response, create_paginated_response, create_message_response
 
@@ -20,7 +23,7 @@ hub_repo = HubItemsRepository()
 
 async def get_owner_info(owner_id: ObjectId) -> Dict[str, Any]:
     """Helper function to get owner information efficiently"""
-    owner = await get_collection("users").find_one({"_id": owner_id})
+    owner = await get_collection("users").find_one({"_id": owner_id}, USER_CARD)
     return {
         "full_name": owner.get("full_name") if owner else None,
         "avatar": owner.get("avatar") if owner else None
@@ -33,16 +36,14 @@ def build_item_response(
     owner_avatar: Optional[str] = None,
     user_id: Optional[str] = None
 ) -> HubItemResponse:
-    """Helper function to build item response with engagement info"""
-    likes = item_doc.get("likes", [])
-    bookmarks = item_doc.get("bookmarks", [])
+    """
+    Helper function to build item response with engagement info.
     
-    is_liked = False
-    is_bookmarked = False
-    if user_id:
-        user_oid = ObjectId(user_id)
-        is_liked = user_oid in likes
-        is_bookmarked = user_oid in bookmarks
+    is_liked and is_bookmarked are read from the item, as set by
+    HubItemsRepository.attach_viewer_engagement() for user_id.
+    """
+    is_liked = bool(user_id) and item_doc.get("is_liked", False)
+    is_bookmarked = bool(user_id) and item_doc.get("is_bookmarked", False)
     
     return HubItemResponse(
         _id=item_doc["_id"],
@@ -60,7 +61,7 @@ def build_item_response(
         created_at=item_doc["created_at"],
         updated_at=item_doc["updated_at"],
         view_count=item_doc.get("view_count", 0),
-        like_count=len(likes),
+        like_count=item_doc.get("like_count", 0),
         comment_count=item_doc.get("comment_count", 0),
         is_liked=is_liked,
         is_bookmarked=is_bookmarked
@@ -91,8 +92,8 @@ async def create_hub_item(
         "position": item.position,
         "owner_id": ObjectId(current_user.id),
         "view_count": 0,
-        "likes": [],
-        "bookmarks": [],
+        "like_count": 0,
+        "bookmark_count": 0,
         "comment_count": 0,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
@@ -147,8 +148,10 @@ async def list_hub_items(
         privacy=privacy_str,
         tag=tag,
         skip=skip,
-        limit=page_size
+        limit=page_size,
+        projection=HUB_ITEM_CARD
     )
+    await hub_repo.attach_viewer_engagement(items, str(current_user.id))
     
     total = await hub_repo.count_user_items(
         user_id=str(current_user.id),
@@ -195,6 +198,7 @@ async def get_hub_item(
     assert item_doc is not None
     
     await hub_repo.increment_view_count(item_id)
+    await hub_repo.attach_viewer_engagement([item_doc], str(current_user.id))
     
     owner_info = await get_owner_info(item_doc["owner_id"])
     response = build_item_response(item_doc, owner_info["full_name"], owner_info["avatar"], str(current_user.id))
@@ -225,6 +229,7 @@ async def update_hub_item(
     
     updated_item = await hub_repo.update_by_id(item_id, update_data)
     assert updated_item is not None
+    await hub_repo.attach_viewer_engagement([updated_item], str(current_user.id))
     
     await log_audit_event(
         user_id=str(current_user.id),
@@ -283,7 +288,7 @@ async def like_hub_item(
     """
     Like a hub item.
     
-    - Adds user to likes array (prevents duplicates)
+    - Records the like once per user and increments like_count
     - Returns updated like count
     """
     await hub_repo.check_item_access(item_id, str(current_user.id), raise_error=True)
@@ -297,8 +302,7 @@ async def like_hub_item(
     if not success:
         raise HTTPException(status_code=404, detail="Hub item not found or already liked")
     
-    item_doc = await hub_repo.find_by_id(item_id)
-    like_count = len(item_doc.get("likes", [])) if item_doc else 0
+    like_count = await counter_service.value(HUB_ITEM_TARGET, ObjectId(item_id), "like_count")
     
     return create_success_response(
         message="Hub item liked successfully",
@@ -314,7 +318,7 @@ async def unlike_hub_item(
     """
     Unlike a hub item.
     
-    - Removes user from likes array
+    - Removes the user's like and decrements like_count
     - Returns updated like count
     """
     await hub_repo.check_item_access(item_id, str(current_user.id), raise_error=True)
@@ -328,8 +332,7 @@ async def unlike_hub_item(
     if not success:
         raise HTTPException(status_code=404, detail="Hub item not found or not liked")
     
-    item_doc = await hub_repo.find_by_id(item_id)
-    like_count = len(item_doc.get("likes", [])) if item_doc else 0
+    like_count = await counter_service.value(HUB_ITEM_TARGET, ObjectId(item_id), "like_count")
     
     return create_success_response(
         message="Hub item unliked successfully",
@@ -345,7 +348,7 @@ async def bookmark_hub_item(
     """
     Bookmark a hub item.
     
-    - Adds user to bookmarks array (prevents duplicates)
+    - Records the bookmark once per user
     - Returns success status
     """
     await hub_repo.check_item_access(item_id, str(current_user.id), raise_error=True)
@@ -370,7 +373,7 @@ async def unbookmark_hub_item(
     """
     Remove bookmark from a hub item.
     
-    - Removes user from bookmarks array
+    - Removes the user's bookmark
     - Returns success status
     """
     await hub_repo.check_item_access(item_id, str(current_user.id), raise_error=True)
@@ -412,8 +415,10 @@ async def search_hub_items(
         query=query,
         item_types=item_type_strs,
         tags=tags,
-        limit=page_size
+        limit=page_size,
+        projection=HUB_ITEM_CARD
     )
+    await hub_repo.attach_viewer_engagement(items, str(current_user.id))
     
     item_responses = []
     for item_doc in items:
@@ -470,8 +475,10 @@ async def get_recent_hub_activity(
     """
     items = await hub_repo.get_recent_activity(
         user_id=str(current_user.id),
-        limit=limit
+        limit=limit,
+        projection=HUB_ITEM_CARD
     )
+    await hub_repo.attach_viewer_engagement(items, str(current_user.id))
     
     item_responses = []
     for item_doc in items:
@@ -498,7 +505,10 @@ async def get_hub_dashboard(
     - Provides overview of user's hub
     """
     stats = await hub_repo.get_stats(str(current_user.id))
-    recent_items = await hub_repo.get_recent_activity(str(current_user.id), limit=5)
+    recent_items = await hub_repo.get_recent_activity(
+        str(current_user.id), limit=5, projection=HUB_ITEM_CARD
+    )
+    await hub_repo.attach_viewer_engagement(recent_items, str(current_user.id))
     
     activity_responses = []
     for item_doc in recent_items:
@@ -11,6 +11,7 @@ from app.schemas.notification import HealthRecordNotificationDetail, Notificatio
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
 from app.models.responses import create_success_response
 
 logger = logging.getLogger(__name__)
@@ -63,7 +64,7 @@ async def get_notification_details(
         
         # Get assigner information
         assigner_id = notification.get("assigner_id") or health_record.get("created_by")
-        assigner = await get_collection("users").find_one({"_id": assigner_id})
+        assigner = await get_collection("users").find_one({"_id": assigner_id}, USER_CARD)
         
         assigner_name = notification.get("assigner_name") or (assigner.get("full_name") if assigner else "Unknown")
         assigner_avatar = assigner.get("avatar_url") if assigner else None
@@ -167,7 +168,7 @@ async def get_health_record_summary(
             raise HTTPException(status_code=403, detail="Not authorized to view this record")
         
         # Get creator information
-        creator = await get_collection("users").find_one({"_id": health_record.get("created_by")})
+        creator = await get_collection("users").find_one({"_id": health_record.get("created_by")}, USER_CARD)
         
         summary = {
             "id": str(health_record["_id"]),
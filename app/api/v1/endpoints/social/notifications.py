@@ -12,15 +12,18 @@ from app.schemas.notification import (
 from app.models.user import UserInDB
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import USER_CARD
 from app.core.websocket import connection_manager
+from app.repositories.family.notifications import NotificationRepository
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
+notification_repo = NotificationRepository()
 
 async def _prepare_notification_response(notif_doc: dict) -> NotificationResponse:
     """Prepare notification document for API response"""
-    actor = await get_collection("users").find_one({"_id": notif_doc["actor_id"]})
+    actor = await get_collection("users").find_one({"_id": notif_doc["actor_id"]}, USER_CARD)
     
     return NotificationResponse(
         id=str(notif_doc["_id"]),
@@ -45,6 +48,10 @@ async def _prepare_notification_response(notif_doc: dict) -> NotificationRespons
         record_date=notif_doc.get("record_date"),
         approval_status=notif_doc.get("approval_status"),
         resolved_at=notif_doc.get("resolved_at"),
+        count=notif_doc.get("count", 1),
+        recent_actors=[
+            {**a, "id": str(a["id"])} for a in notif_doc.get("recent_actors", [])
+        ],
         metadata=notif_doc.get("metadata", {})
     )
 
@@ -72,12 +79,14 @@ async def create_notification(
     """
     logger.info(f"Creating notification: user_id={user_id}, type={notification_type}, title={title}")
     
+    snapshots = await notification_repo.actor_snapshots([ObjectId(actor_id)])
     notification_data: Dict[str, Any] = {
         "user_id": ObjectId(user_id),
         "type": notification_type,
         "title": title,
         "message": message,
         "actor_id": ObjectId(actor_id),
+        **snapshots[ObjectId(actor_id)],
         "is_read": False,
         "created_at": datetime.utcnow()
     }
@@ -103,6 +112,7 @@ async def create_notification(
     
     result = await get_collection("notifications").insert_one(notification_data)
     notification_id = str(result.inserted_id)
+    await notification_repo.increment_unread({notification_data["user_id"]: 1})
     
     logger.info(f"Notification created in MongoDB: id={notification_id}, stored with user_id={notification_data['user_id']}")
     
@@ -272,7 +282,7 @@ async def get_notification_details(
         
         # Add assigner details
         if notif.get("assigner_id"):
-            assigner = await get_collection("users").find_one({"_id": notif["assigner_id"]})
+            assigner = await get_collection("users").find_one({"_id": notif["assigner_id"]}, USER_CARD)
             if assigner:
                 details.update({
                     "assigner_id": str(assigner["_id"]),
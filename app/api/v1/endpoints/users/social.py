@@ -12,8 +12,11 @@ from app.models.social import (
 )
 from app.core.security import get_current_user
 from app.db.mongodb import get_collection
+from app.repositories.projections import ID_ONLY, USER_CARD
+from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository
 
 router = APIRouter()
+viewer_principals = ViewerPrincipalsRepository()
 
 @router.post("/hubs", response_model=CollaborativeHubResponse, status_code=status.HTTP_201_CREATED)
 async def create_hub(
@@ -129,7 +132,7 @@ async def get_hub_members(
     
     members = []
     async for member_doc in cursor:
-        user_doc = await get_collection("users").find_one({"_id": member_doc["user_id"]})
+        user_doc = await get_collection("users").find_one({"_id": member_doc["user_id"]}, USER_CARD)
         members.append({
             "id": str(member_doc["_id"]),
             "user_id": str(member_doc["user_id"]),
@@ -167,7 +170,7 @@ async def get_hub_memories(
     
     memories = []
     async for memory_doc in cursor:
-        owner_doc = await get_collection("users").find_one({"_id": memory_doc["owner_id"]})
+        owner_doc = await get_collection("users").find_one({"_id": memory_doc["owner_id"]}, USER_CARD)
         
         memories.append({
             "id": str(memory_doc["_id"]),
@@ -213,7 +216,7 @@ async def create_invitation(
         raise HTTPException(status_code=500, detail="Failed to create invitation")
     
     hub_doc = await get_collection("hubs").find_one({"_id": invitation_doc["hub_id"]})
-    inviter_doc = await get_collection("users").find_one({"_id": invitation_doc["inviter_id"]})
+    inviter_doc = await get_collection("users").find_one({"_id": invitation_doc["inviter_id"]}, USER_CARD)
     
     return {
         "id": str(invitation_doc["_id"]),
@@ -327,7 +330,7 @@ async def follow_user(
     if user_id == str(current_user.id):
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
     
-    target_user = await get_collection("users").find_one({"_id": ObjectId(user_id)})
+    target_user = await get_collection("users").find_one({"_id": ObjectId(user_id)}, ID_ONLY)
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -347,6 +350,7 @@ async def follow_user(
     }
     
     await get_collection("relationships").insert_one(relationship_data)
+    await viewer_principals.invalidate([ObjectId(current_user.id)])
     
     return {"message": "Successfully followed user"}
 
@@ -363,6 +367,7 @@ async def unfollow_user(
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Not following this user")
+    await viewer_principals.invalidate([ObjectId(current_user.id)])
     
     return {"message": "Successfully unfollowed user"}
 
@@ -379,7 +384,7 @@ async def get_followers(
     
     followers = []
     async for rel_doc in cursor:
-        user_doc = await get_collection("users").find_one({"_id": rel_doc["follower_id"]})
+        user_doc = await get_collection("users").find_one({"_id": rel_doc["follower_id"]}, USER_CARD)
         if user_doc:
             followers.append({
                 "id": str(rel_doc["_id"]),
@@ -406,7 +411,7 @@ async def get_following(
     
     following = []
     async for rel_doc in cursor:
-        user_doc = await get_collection("users").find_one({"_id": rel_doc["following_id"]})
+        user_doc = await get_collection("users").find_one({"_id": rel_doc["following_id"]}, USER_CARD)
         if user_doc:
             following.append({
                 "id": str(rel_doc["_id"]),
@@ -432,7 +437,7 @@ async def get_my_following(current_user: UserInDB = Depends(get_current_user)):
 
 async def _prepare_hub_response(hub_doc, current_user_id: str):
     """Prepare hub response with additional data"""
-    owner_doc = await get_collection("users").find_one({"_id": hub_doc["owner_id"]})
+    owner_doc = await get_collection("users").find_one({"_id": hub_doc["owner_id"]}, USER_CARD)
     
     member = await get_collection("hub_members").find_one({
         "hub_id": hub_doc["_id"],
@@ -14,7 +14,7 @@ router = APIRouter()
 
 family_members_repo = FamilyMembersRepository()
 family_repo = FamilyRepository()
-users_repo = BaseRepository("users")
+users_repo = BaseRepository("users", workload="search")
 
 
 def format_family_member(member_doc: dict) -> dict:
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, BackgroundTasks
 from fastapi.responses import FileResponse
 from bson import ObjectId
 import os
@@ -14,8 +14,15 @@ from app.models.user import (
     UserInDB, UserCreate, UserUpdate, UserResponse, 
     UserProfileResponse, UserSettingsUpdate, UserRole
 )
+from app.repositories.family.notifications import NotificationRepository
+from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository, user_principal
 
 router = APIRouter()
+notification_repo = NotificationRepository()
+viewer_principals = ViewerPrincipalsRepository()
+
+# Profile fields snapshotted onto the notifications a user causes
+NOTIFICATION_SNAPSHOT_FIELDS = {"full_name", "email", "avatar_url"}
 
 # Configure upload directory
 AVATAR_UPLOAD_DIR = "uploads/avatars"
@@ -89,6 +96,7 @@ async def read_users_me(current_user: UserInDB = Depends(get_current_user)):
 @router.put("/me", response_model=UserResponse)
 async def update_user_me(
     user_update: UserUpdate,
+    background_tasks: BackgroundTasks,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """Update current user profile"""
@@ -119,6 +127,9 @@ async def update_user_me(
             {"$set": update_data}
         )
         
+        if NOTIFICATION_SNAPSHOT_FIELDS & update_data.keys():
+            background_tasks.add_task(notification_repo.refresh_actor_snapshot, str(current_user.id))
+        
         updated_user = await get_collection("users").find_one({"_id": ObjectId(current_user.id)})
         if not updated_user:
             raise HTTPException(status_code=404, detail="User not found after update")
@@ -160,6 +171,7 @@ async def change_password(
 
 @router.post("/me/avatar", response_model=UserResponse)
 async def upload_avatar(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: UserInDB = Depends(get_current_user)
 ):
@@ -192,6 +204,7 @@ async def upload_avatar(
             {"_id": ObjectId(current_user.id)},
             {"$set": {"avatar_url": avatar_url, "updated_at": datetime.utcnow()}}
         )
+        background_tasks.add_task(notification_repo.refresh_actor_snapshot, str(current_user.id))
         
         # Return updated user
         updated_user = await get_collection("users").find_one({"_id": ObjectId(current_user.id)})
@@ -253,10 +266,7 @@ async def get_user(
         stats = {
             "memories": await get_collection("memories").count_documents({
                 "owner_id": user_obj_id,
-                "$or": [
-                    {"privacy": "public"},
-                    {"owner_id": ObjectId(current_user.id)}
-                ]
+                **await viewer_principals.visibility_filter(str(current_user.id))
             }),
             "files": await get_collection("files").count_documents({
                 "owner_id": user_obj_id,
@@ -359,8 +369,9 @@ async def delete_user_me(
         # Anonymize user's data
         await get_collection("memories").update_many(
             {"owner_id": ObjectId(current_user.id)},
-            {"$set": {"privacy": "private"}}
+            {"$set": {"privacy": "private", "visible_to": [user_principal(current_user.id)]}}
         )
+        await notification_repo.refresh_actor_snapshot(str(current_user.id))
         
         return None
     except Exception as e:
@@ -456,13 +467,11 @@ async def get_user_profile(
             "following": await get_collection("relationships").count_documents({"follower_id": user_obj_id, "status": "accepted"})
         }
         
-        # Get recent public/friends memories (based on privacy and relationship)
-        memory_query: Dict[str, Any] = {"owner_id": user_obj_id}
-        if str(user_id) != str(current_user.id):
-            if relationship and relationship.get("status") == "accepted":
-                memory_query["privacy"] = {"$in": ["public", "friends"]}
-            else:
-                memory_query["privacy"] = "public"
+        # Get recent memories the viewer may see
+        memory_query: Dict[str, Any] = {
+            "owner_id": user_obj_id,
+            **await viewer_principals.visibility_filter(str(current_user.id))
+        }
         
         cursor = get_collection("memories").find(memory_query).sort("created_at", -1).limit(10)
         
@@ -0,0 +1,180 @@
+"""
+Bounded in-process async cache.
+
+Provides LRU capacity, per-entry TTL, invalidation by key prefix (e.g. every
+entry belonging to one user), single-flight loading so concurrent misses for
+the same key share one database call, and hit/miss/eviction counters.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+CacheKey = Tuple[Hashable, ...]
+
+_registry: Dict[str, "AsyncLRUCache"] = {}
+
+
+def freeze(value: Any) -> Hashable:
+    """Turn filters/params into a stable, hashable cache-key component"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        items = [freeze(v) for v in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, set) else items)
+    if value is None or isinstance(value, Hashable):
+        return value
+    return repr(value)
+
+
+class AsyncLRUCache:
+    """
+    LRU + TTL cache for async loaders.
+
+    Keys are tuples whose first element is the invalidation group (normally a
+    user ID), so invalidate_prefix() only touches that group's entries.
+    """
+
+    def __init__(self, name: str, capacity: int = 1024, default_ttl: float = 300):
+        self.name = name
+        self.capacity = capacity
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._groups: Dict[Hashable, Set[CacheKey]] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._generation: Dict[Hashable, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.coalesced = 0
+        _registry[name] = self
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        """Return (found, value) without loading"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: CacheKey, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least-recently-used entries past capacity"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (time.monotonic() + (ttl or self.default_ttl), value)
+        self._groups.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.capacity:
+            oldest, _ = self._entries.popitem(last=False)
+            self._forget_group_member(oldest)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the cached value or run loader once for all concurrent callers.
+
+        If the key's group is invalidated while the load is in flight, the
+        result is returned to the waiting callers but not cached.
+        """
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        generation = self._token(key[0])
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve the exception so an unawaited future does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if self._token(key[0]) == generation:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, key: CacheKey) -> None:
+        """Drop a single entry"""
+        if key in self._entries:
+            self._remove(key)
+            self.invalidations += 1
+
+    def invalidate_prefix(self, *prefix: Hashable) -> int:
+        """Drop every entry whose key starts with prefix; returns the number removed"""
+        if not prefix:
+            return self.clear()
+        group = prefix[0]
+        self._generation[group] = self._generation.get(group, 0) + 1
+        keys = [k for k in self._groups.get(group, ()) if k[:len(prefix)] == prefix]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> int:
+        """Drop everything"""
+        removed = len(self._entries)
+        self._epoch += 1
+        self._generation.clear()
+        self._entries.clear()
+        self._groups.clear()
+        self.invalidations += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _token(self, group: Hashable) -> Tuple[int, int]:
+        return self._epoch, self._generation.get(group, 0)
+
+    def _remove(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        self._forget_group_member(key)
+
+    def _forget_group_member(self, key: CacheKey) -> None:
+        members = self._groups.get(key[0])
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._groups[key[0]]
+
+
+def all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every cache created in this process"""
+    return {name: cache.stats() for name, cache in _registry.items()}
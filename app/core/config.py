@@ -18,11 +18,99 @@ class Settings(BaseSettings):
     # Database
     MONGODB_URL: str = "mongodb://localhost:27017"
     DB_NAME: str = "memory_hub"
+    MONGODB_MIN_POOL_SIZE: int = 5  # Connections kept open per server so bursts skip the handshake
+    MONGODB_MAX_POOL_SIZE: int = 100  # Connections per server; requests beyond this wait for a checkout
+    MONGODB_MAX_IDLE_TIME_MS: int = 300000  # Idle connections above the minimum are closed after this
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 5000  # Longest a request waits for a pooled connection
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000  # Fail fast instead of pymongo's 30s default when no server is reachable
+    MONGODB_CONNECT_TIMEOUT_MS: int = 10000
+    MONGODB_COMPRESSORS: str = "zstd,snappy,zlib"  # Negotiated in order; zstd/snappy need the zstandard/python-snappy packages
+    MONGODB_DEFAULT_MAX_TIME_MS: int = 15000  # Server-side limit on BaseRepository reads unless a call overrides it
+    # Workloads whose reads tolerate replication lag and are routed to secondaries when available
+    MONGODB_SECONDARY_READ_WORKLOADS: list = ["analytics", "search", "export"]
+    MONGODB_SECONDARY_MAX_STALENESS_SECONDS: int = 120  # Secondaries lagging more than this are skipped (minimum 90)
     
     # File Storage
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10 MB
     ALLOWED_FILE_EXTENSIONS: list = [".jpg", ".jpeg", ".png", ".gif", ".pdf", ".doc", ".docx", ".txt"]
-    
+
+    # Export / Import
+    EXPORT_CURSOR_BATCH_SIZE: int = 1000  # Documents fetched per cursor round trip
+    IMPORT_BATCH_SIZE: int = 500  # Documents per insert_many call
+    IMPORT_MAX_CONCURRENCY: int = 4  # Insert batches in flight during a restore
+    IMPORT_REMAP_MAX_IDS: int = 250000  # Documents a remap_ids restore may clone; its ID map (~200 bytes each) is held in memory
+
+    # Request instrumentation (GET /metrics, Prometheus text format)
+    METRICS_ENABLED: bool = True
+    METRICS_DEBUG: bool = False  # Track query shapes per request and log likely N+1 patterns
+    METRICS_N_PLUS_ONE_THRESHOLD: int = 10  # Same-shape queries in one request above this are flagged
+    METRICS_LOOP_LAG_INTERVAL_SECONDS: float = 0.5  # Event-loop lag probe period
+
+    # Query-shape profiler (development/CI; feeds scripts/index_advisor.py)
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_OUTPUT: str = "data/query_shapes.json"  # Shapes are merged into this file on shutdown
+
+    # Family dashboard snapshots (stale-while-revalidate)
+    DASHBOARD_SNAPSHOT_FRESH_SECONDS: int = 300  # Snapshots younger than this are served without a refresh
+    DASHBOARD_SNAPSHOT_MAX_STALE_SECONDS: int = 86400  # Older snapshots are recomputed before serving; also their TTL
+    DASHBOARD_SNAPSHOT_LOCAL_TTL_SECONDS: float = 10  # In-process copy; bounds how long other workers serve a staled snapshot
+
+    # Notification coalescing (repeat events on one target share a notification)
+    NOTIFICATION_COALESCE_WINDOW_SECONDS: int = 600  # Events for the same recipient, type and target within a window are merged
+    NOTIFICATION_COALESCE_MAX_ACTORS: int = 5  # Most recent distinct actors kept on a coalesced notification
+    NOTIFICATION_WS_DEBOUNCE_SECONDS: float = 2.0  # At most one WebSocket event per recipient per debounce window
+
+    # Notification retention
+    # Days a notification is kept once read, by type; other types stay until capped or archived
+    NOTIFICATION_READ_TTL_DAYS: dict = {
+        "reminder_due": 30,
+        "event_reminder": 30,
+        "health_reminder_assignment": 30,
+        "like": 30,
+        "reaction": 30,
+        "follow": 60,
+        "birthday": 60,
+        "anniversary": 60,
+    }
+    NOTIFICATION_MAX_PER_USER: int = 500  # Older notifications beyond this are archived and removed
+    NOTIFICATION_ARCHIVE_AFTER_DAYS: int = 180  # Age at which notifications move to cold storage
+    NOTIFICATION_ARCHIVE_BATCH_SIZE: int = 5000  # Notifications per archive file
+    NOTIFICATION_ARCHIVE_PREFIX: str = "notification_archives"  # Storage key prefix for archive files
+    NOTIFICATION_ARCHIVE_DIR: str = "data/notification_archives"  # Local archive target when R2 is not configured
+
+    # Audit logging (entries are queued and written in batches in the background)
+    AUDIT_QUEUE_MAX_SIZE: int = 10000  # Entries held in memory before the overflow policy applies
+    AUDIT_BATCH_SIZE: int = 500  # Entries per insert_many
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0  # Max time an entry waits in the queue
+    AUDIT_OVERFLOW_POLICY: str = "spill"  # spill | drop_oldest | drop_newest
+    AUDIT_SPILL_DIR: str = "data/audit_spill"  # NDJSON overflow files, relative to the project root
+    # Days to keep low-value audit entries, by event_type or action; others are kept until archival
+    AUDIT_TTL_DAYS: dict = {
+        "user_search": 30,
+        "dashboard_accessed": 30,
+        "VIEW_HEALTH_DASHBOARD": 90,
+        "parental_control_validation_success": 90,
+        "viewed": 90,
+    }
+    AUDIT_HOT_MONTHS: int = 12  # Monthly buckets kept in MongoDB before archival
+    AUDIT_ARCHIVE_PREFIX: str = "audit_archives"  # Storage key prefix for archived buckets
+    AUDIT_ARCHIVE_DIR: str = "data/audit_archives"  # Local archive target when R2 is not configured
+
+    # Engagement counters (views, likes, bookmarks; see app/services/counter_service.py)
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 1.0  # Max time an increment waits in the in-process buffer
+    COUNTER_HOT_KEY_THRESHOLD: int = 50  # A counter moving this much within one flush is written to shards
+    COUNTER_HOT_KEY_TTL_SECONDS: float = 60  # How long a hot counter keeps writing to shards
+    COUNTER_SHARDS: int = 16  # Shard documents per hot counter
+    COUNTER_FOLD_INTERVAL_SECONDS: float = 10.0  # How often shard values are folded into their targets
+
+    # Memory visibility (see app/repositories/viewer_principals_repository.py)
+    VIEWER_PRINCIPALS_LOCAL_TTL_SECONDS: float = 10  # In-process copy; bounds how long other workers miss a relationship change
+    VIEWER_PRINCIPALS_MAX_AGE_SECONDS: int = 3600  # Stored principal sets are rebuilt at least this often; also their TTL
+    REFERENCE_CACHE_TTL_SECONDS: float = 60  # How long a referenced user is remembered to exist; bounds how long other workers accept a deleted user (app/services/reference_validator.py)
+
+    # Memory map (see app/utils/geo_utils.py)
+    MAP_CLUSTER_TARGET_CELLS: int = 256  # Geohash cells a map viewport is split into; bounds the clusters returned
+
     # Google OAuth Settings
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
@@ -0,0 +1,313 @@
+"""
+Request-level performance instrumentation
+
+- MetricsMiddleware (ASGI) records per-route latency histograms and request /
+  response payload sizes, keyed by the route's path template.
+- MongoCommandMetrics (a pymongo CommandListener) counts and times every
+  command, globally and for the request that issued it; Motor runs commands
+  with the caller's context, so per-request totals are tracked in a ContextVar.
+- An event-loop lag probe measures how late a periodic sleep wakes up.
+
+Everything is rendered in the Prometheus text format by render_metrics() for
+GET /metrics. With METRICS_DEBUG on, a request that sends more than
+METRICS_N_PLUS_ONE_THRESHOLD commands of the same shape is logged as a likely
+N+1 query.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.db.query_profiler import command_shape
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Internal commands that say nothing about the application's queries
+_IGNORED_COMMANDS = {"hello", "isMaster", "ismaster", "ping", "endSessions", "saslStart", "saslContinue", "buildInfo"}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # One slot per bucket, then +Inf, sum
+                series = self._series[label_values] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for label_values, series in sorted(items):
+            for index, bound in enumerate(self.buckets):
+                bucket_labels = _labels(self.labels, label_values, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {series[index]:g}")
+            inf_labels = _labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {series[-2]:g}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {series[-2]:g}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {series[-1]:.6f}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labels, key)} {value:g}" for key, value in items)
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route", "status"), _LATENCY_BUCKETS
+)
+REQUEST_SIZE = Histogram("http_request_size_bytes", "Request body size by route template", ("method", "route"), _SIZE_BUCKETS)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size by route template", ("method", "route"), _SIZE_BUCKETS)
+REQUEST_MONGO_COMMANDS = Histogram(
+    "http_request_mongo_commands", "MongoDB commands sent while serving one request", ("method", "route"), _COUNT_BUCKETS
+)
+REQUEST_MONGO_SECONDS = Histogram(
+    "http_request_mongo_seconds", "Time spent in MongoDB commands while serving one request", ("method", "route"), _LATENCY_BUCKETS
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round-trip time", ("command", "collection"), _MONGO_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands", ("command",))
+N_PLUS_ONE = Counter(
+    "http_request_repeated_query_total",
+    "Requests that repeated one query shape more than METRICS_N_PLUS_ONE_THRESHOLD times",
+    ("method", "route")
+)
+EVENT_LOOP_LAG = Histogram("event_loop_lag_seconds", "How late the event loop wakes a periodic sleep", (), _LAG_BUCKETS)
+
+
+class RequestStats:
+    """MongoDB activity of the request being served"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.commands = 0
+        self.mongo_seconds = 0.0
+        self.shapes: Dict[str, int] = {}
+
+
+_current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("metrics_request", default=None)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every command and attributes it to the request that sent it"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # request_id -> (request stats, collection)
+        self._inflight: Dict[int, Tuple[Optional[RequestStats], str]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        stats = _current_request.get()
+        collection = event.command.get(event.command_name)
+        with self._lock:
+            self._inflight[event.request_id] = (stats, collection if isinstance(collection, str) else "")
+        if stats is not None and settings.METRICS_DEBUG:
+            try:
+                key = command_shape(event.command_name, event.command)
+            except Exception:
+                key = None
+            if key is not None:
+                with stats.lock:
+                    stats.shapes[key] = stats.shapes.get(key, 0) + 1
+
+    def _finish(self, event: Any) -> Optional[Tuple[Optional[RequestStats], str]]:
+        with self._lock:
+            entry = self._inflight.pop(event.request_id, None)
+        if entry is None:
+            return None
+        stats, collection = entry
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_DURATION.observe(seconds, event.command_name, collection)
+        if stats is not None:
+            with stats.lock:
+                stats.commands += 1
+                stats.mongo_seconds += seconds
+        return entry
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        if self._finish(event) is not None:
+            MONGO_COMMAND_FAILURES.inc(event.command_name)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, payload sizes and MongoDB usage per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        started = time.perf_counter()
+        sizes = {"request": 0, "response": 0}
+        status = {"code": 500}
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            _current_request.reset(token)
+            elapsed = time.perf_counter() - started
+            template = self._route_template(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.observe(elapsed, method, template, str(status["code"]))
+            REQUEST_SIZE.observe(sizes["request"], method, template)
+            RESPONSE_SIZE.observe(sizes["response"], method, template)
+            REQUEST_MONGO_COMMANDS.observe(stats.commands, method, template)
+            REQUEST_MONGO_SECONDS.observe(stats.mongo_seconds, method, template)
+            self._report_repeats(stats, method, template)
+
+    @staticmethod
+    def _route_template(scope) -> str:
+        """
+        The matched route's full path template, including router prefixes.
+
+        Routes reached through include_router keep their own, router-relative
+        path on scope["route"]; FastAPI records the mounted (prefixed) template
+        in the effective route context it stores under scope["fastapi"].
+        Path templates keep label cardinality bounded; unmatched paths share
+        one label.
+        """
+        context = scope.get("fastapi", {}).get("effective_route_context")
+        route = scope.get("route")
+        for candidate in (context, route):
+            template = getattr(candidate, "path_format", None)
+            if template:
+                return template
+        return getattr(route, "path", None) or "unmatched"
+
+    @staticmethod
+    def _report_repeats(stats: RequestStats, method: str, template: str) -> None:
+        threshold = settings.METRICS_N_PLUS_ONE_THRESHOLD
+        repeated = {shape: count for shape, count in stats.shapes.items() if count > threshold}
+        if not repeated:
+            return
+        N_PLUS_ONE.inc(method, template)
+        for shape, count in repeated.items():
+            logger.warning(f"Possible N+1 on {method} {template}: {count} queries of shape {shape}")
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    """Observe how far past interval each sleep wakes; runs until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - scheduled - interval))
+
+
+def _gauge(name: str, help_text: str, value: float) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value:g}"]
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    from app.db.mongodb import pool_metrics
+
+    lines: List[str] = []
+    for metric in (
+        REQUEST_LATENCY, REQUEST_SIZE, RESPONSE_SIZE, REQUEST_MONGO_COMMANDS, REQUEST_MONGO_SECONDS,
+        MONGO_COMMAND_DURATION, MONGO_COMMAND_FAILURES, N_PLUS_ONE, EVENT_LOOP_LAG,
+    ):
+        lines.extend(metric.render())
+
+    pool = pool_metrics.snapshot()
+    lines += _gauge("mongo_pool_open_connections", "Open pooled connections", pool["open_connections"])
+    lines += _gauge("mongo_pool_in_use_connections", "Connections checked out", pool["in_use"])
+    lines += _gauge("mongo_pool_waiting", "Operations waiting for a connection", pool["waiting"])
+    lines += _gauge("mongo_pool_max_size", "Configured maxPoolSize", pool["max_pool_size"])
+    lines += [
+        "# HELP mongo_pool_checkouts_total Connection checkouts",
+        "# TYPE mongo_pool_checkouts_total counter",
+        f"mongo_pool_checkouts_total {pool['checkouts']}",
+        "# HELP mongo_pool_checkout_wait_seconds_total Time spent waiting for connection checkouts",
+        "# TYPE mongo_pool_checkout_wait_seconds_total counter",
+        f"mongo_pool_checkout_wait_seconds_total {pool['checkout_wait_seconds_total']:.6f}",
+        "# HELP mongo_pool_checkout_failures_total Failed connection checkouts by reason",
+        "# TYPE mongo_pool_checkout_failures_total counter",
+    ]
+    lines += [
+        f'mongo_pool_checkout_failures_total{{reason="{_escape(reason)}"}} {count}'
+        for reason, count in sorted(pool["checkout_failures"].items())
+    ]
+    return "\n".join(lines) + "\n"
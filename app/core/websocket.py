@@ -121,6 +121,7 @@ class WSMessageType:
     NOTIFICATION_CREATED = "notification.created"
     NOTIFICATION_UPDATED = "notification.updated"
     NOTIFICATION_DELETED = "notification.deleted"
+    NOTIFICATION_DIGEST = "notification.digest"
     
     # Health records
     HEALTH_RECORD_ASSIGNED = "health_record.assigned"
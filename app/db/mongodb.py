@@ -1,15 +1,150 @@
+import importlib.util
+import threading
+import time
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from pymongo import monitoring
+from pymongo.read_preferences import SecondaryPreferred
+from typing import Any, Dict, List, Optional
 from app.core.config import settings
 
+# Compressors that need an optional package before pymongo can negotiate them
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy"}
+
 class MongoDB:
     client: Optional[AsyncIOMotorClient] = None
 
 db = MongoDB()
 
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool gauges and checkout wait times, aggregated over all servers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.open = 0
+            self.in_use = 0
+            self.waiting = 0
+            self.checkouts = 0
+            self.checkout_failures: Dict[str, int] = {}
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.pool_clears = 0
+
+    def _wait(self, event: Any) -> float:
+        # pymongo >= 4.7 reports the wait on the event; older versions are timed per thread
+        duration = getattr(event, "duration", None)
+        if duration is None:
+            started = getattr(self._local, "started", None)
+            duration = time.monotonic() - started if started is not None else 0.0
+        return duration
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        self._local.started = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        wait = self._wait(event)
+        with self._lock:
+            self.waiting -= 1
+            self.in_use += 1
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._lock:
+            self.waiting -= 1
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._lock:
+            self.open -= 1
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._lock:
+            self.pool_clears += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open_connections": self.open,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+                "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "checkout_wait_seconds_total": round(self.wait_seconds_total, 6),
+                "checkout_wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "checkout_wait_seconds_max": round(self.wait_seconds_max, 6),
+                "pool_clears": self.pool_clears,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+def available_compressors() -> List[str]:
+    """MONGODB_COMPRESSORS without the ones whose package is not installed"""
+    compressors = [name.strip() for name in settings.MONGODB_COMPRESSORS.split(",") if name.strip()]
+    return [
+        name for name in compressors
+        if name not in _COMPRESSOR_MODULES or importlib.util.find_spec(_COMPRESSOR_MODULES[name]) is not None
+    ]
+
+
+def client_options() -> Dict[str, Any]:
+    """Pool, timeout and compression options for the application's client"""
+    options: Dict[str, Any] = {
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+    }
+    compressors = available_compressors()
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+
 async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(settings.MONGODB_URL)
-    # Note: Indexes are created by utils/db_indexes.py via create_indexes() function
+    event_listeners = [pool_metrics]
+    if settings.METRICS_ENABLED:
+        from app.core.metrics import mongo_command_metrics
+        event_listeners.append(mongo_command_metrics)
+    if settings.QUERY_PROFILER_ENABLED:
+        from app.db.query_profiler import query_profiler
+        event_listeners.append(query_profiler)
+    db.client = AsyncIOMotorClient(settings.MONGODB_URL, event_listeners=event_listeners, **client_options())
+    # Note: Indexes are applied by utils/db_indexes.py via ensure_indexes() at startup
 
 async def close_mongo_connection():
     if db.client:
@@ -20,5 +155,14 @@ def get_database():
         raise RuntimeError("Database not connected")
     return db.client[settings.DB_NAME]
 
-def get_collection(collection_name: str):
-    return get_database()[collection_name]
\ No newline at end of file
+def get_collection(collection_name: str, workload: Optional[str] = None):
+    """
+    Collection handle; reads for a workload listed in MONGODB_SECONDARY_READ_WORKLOADS
+    (analytics, search, export) go to a secondary when one is available.
+    """
+    if workload and workload in settings.MONGODB_SECONDARY_READ_WORKLOADS:
+        return get_database().get_collection(
+            collection_name,
+            read_preference=SecondaryPreferred(max_staleness=settings.MONGODB_SECONDARY_MAX_STALENESS_SECONDS)
+        )
+    return get_database()[collection_name]
@@ -0,0 +1,189 @@
+"""
+Query-shape profiler for Motor/pymongo
+
+A pymongo CommandListener that records the shape of every read and write
+filter the app sends: which fields are matched by equality or by range, and
+the sort order, per collection. Values are dropped from the shape; one sample
+command per shape is kept (as relaxed Extended JSON) so scripts/index_advisor.py
+can replay it through explain() against a local mongod.
+
+Enabled with QUERY_PROFILER_ENABLED; shapes are merged into
+QUERY_PROFILER_OUTPUT on shutdown.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from bson.json_util import JSONOptions, JSONMode
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_JSON_OPTIONS = JSONOptions(json_mode=JSONMode.RELAXED, tz_aware=False)
+
+_RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$exists", "$regex", "$not"}
+_LOGICAL_OPERATORS = {"$or", "$and", "$nor"}
+
+# Commands whose filter and sort are recorded: command name -> (filter key, sort key)
+_PROFILED_COMMANDS = {
+    "find": ("filter", "sort"),
+    "count": ("query", None),
+    "distinct": ("query", None),
+    "findAndModify": ("query", "sort"),
+    "aggregate": (None, None),
+    "update": (None, None),
+    "delete": (None, None),
+}
+
+
+def _field_kind(value: Any) -> str:
+    """How a filter value constrains its field: eq, range, in or exists"""
+    if isinstance(value, dict) and value and all(str(k).startswith("$") for k in value):
+        operators = set(value)
+        if operators <= {"$in"}:
+            return "in"
+        if operators <= {"$exists"}:
+            return "exists"
+        if operators & _RANGE_OPERATORS:
+            return "range"
+        return "eq"
+    return "eq"
+
+
+def filter_shape(query: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Value-free shape of a filter: field -> kind, with logical operators kept as lists of shapes"""
+    shape: Dict[str, Any] = {}
+    for field, value in (query or {}).items():
+        if field in _LOGICAL_OPERATORS and isinstance(value, list):
+            shape[field] = [filter_shape(clause) for clause in value]
+        elif field.startswith("$"):
+            shape[field] = "expr"
+        else:
+            shape[field] = _field_kind(value)
+    return shape
+
+
+def _extract(command_name: str, command: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """(filter, sort) pairs a command applies to its collection"""
+    if command_name in ("update", "delete"):
+        key = "updates" if command_name == "update" else "deletes"
+        return [(statement.get("q") or {}, None) for statement in command.get(key, [])]
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        match = pipeline[0].get("$match") if pipeline and "$match" in pipeline[0] else {}
+        sort = pipeline[1].get("$sort") if len(pipeline) > 1 and "$sort" in pipeline[1] else None
+        return [(match, sort)]
+    filter_key, sort_key = _PROFILED_COMMANDS[command_name]
+    return [(command.get(filter_key) or {}, command.get(sort_key) if sort_key else None)]
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> Optional[str]:
+    """Value-free identity of a command's filters and sorts, or None for commands that are not profiled"""
+    collection = command.get(command_name)
+    if command_name not in _PROFILED_COMMANDS or not isinstance(collection, str):
+        return None
+    statements = [[filter_shape(query), list((sort or {}).items())] for query, sort in _extract(command_name, command)]
+    return json.dumps([command_name, collection, statements], sort_keys=True)
+
+
+class QueryShapeRecorder(monitoring.CommandListener):
+    """Counts query shapes per collection; safe to register on a live client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shapes: Dict[str, Dict[str, Any]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in _PROFILED_COMMANDS:
+            return
+        try:
+            collection = event.command.get(event.command_name)
+            if not isinstance(collection, str):
+                return
+            for query, sort in _extract(event.command_name, event.command):
+                self.record(event.database_name, collection, event.command_name, query, sort)
+        except Exception as e:
+            logger.debug(f"Query profiler could not record {event.command_name}: {str(e)}")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+    def record(
+        self,
+        database: str,
+        collection: str,
+        operation: str,
+        query: Dict[str, Any],
+        sort: Optional[Dict[str, Any]] = None
+    ) -> None:
+        shape = filter_shape(query)
+        sort_shape = [[field, direction] for field, direction in (sort or {}).items()]
+        key = json.dumps([collection, shape, sort_shape], sort_keys=True)
+        with self._lock:
+            entry = self._shapes.get(key)
+            if entry is None:
+                self._shapes[key] = {
+                    "database": database,
+                    "collection": collection,
+                    "operations": {operation: 1},
+                    "filter": shape,
+                    "sort": sort_shape,
+                    "count": 1,
+                    "sample": json_util.dumps({"filter": query, "sort": sort or {}}, json_options=_JSON_OPTIONS),
+                }
+            else:
+                entry["count"] += 1
+                entry["operations"][operation] = entry["operations"].get(operation, 0) + 1
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Recorded shapes, most frequent first"""
+        with self._lock:
+            shapes = [dict(entry, operations=dict(entry["operations"])) for entry in self._shapes.values()]
+        return sorted(shapes, key=lambda entry: entry["count"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+    def dump(self, path: str) -> int:
+        """Merge the recorded shapes into the JSON file at path; returns the number of shapes in it"""
+        if not os.path.isabs(path):
+            path = os.path.join(_PROJECT_ROOT, path)
+        merged = {json.dumps([s["collection"], s["filter"], s["sort"]], sort_keys=True): s for s in load_shapes(path)}
+        for shape in self.snapshot():
+            key = json.dumps([shape["collection"], shape["filter"], shape["sort"]], sort_keys=True)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = shape
+                continue
+            existing["count"] += shape["count"]
+            for operation, count in shape["operations"].items():
+                existing["operations"][operation] = existing["operations"].get(operation, 0) + count
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(sorted(merged.values(), key=lambda s: s["count"], reverse=True), f, indent=2)
+        return len(merged)
+
+
+def load_shapes(path: str) -> List[Dict[str, Any]]:
+    """Shapes previously written by QueryShapeRecorder.dump, or [] if there are none"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_sample(shape: Dict[str, Any]) -> Dict[str, Any]:
+    """The sample filter/sort of a shape with ObjectIds and dates restored"""
+    return json_util.loads(shape["sample"], json_options=_JSON_OPTIONS)
+
+
+query_profiler = QueryShapeRecorder()
@@ -11,6 +11,9 @@ from ..schemas.health_records import (
     RecordType,
     ApprovalStatus,
     HealthRecordApprovalRequest,
+    HealthRecordBatchCreate,
+    HealthRecordBatchApprovalRequest,
+    HealthRecordBatchRejectionRequest,
 )
 from ..services.health_record_service import HealthRecordService
 from ..repositories.health_records_repository import HealthRecordsRepository
@@ -85,6 +88,30 @@ async def get_member_name(member_id: Optional[ObjectId]) -> Optional[str]:
         return None
 
 
+async def get_member_names(member_ids: List[Any]) -> Dict[ObjectId, str]:
+    """Get family member names for several records with one query"""
+    member_oids = list({ObjectId(mid) for mid in member_ids if mid and ObjectId.is_valid(str(mid))})
+    if not member_oids:
+        return {}
+    try:
+        members = await family_members_repo.find_many({"_id": {"$in": member_oids}}, limit=len(member_oids))
+        return {member["_id"]: member.get("name") for member in members}
+    except Exception as e:
+        logger.error(f"Error getting member names: {str(e)}")
+        return {}
+
+
+def batch_to_response(record_docs: List[dict], member_names: Dict[ObjectId, str]) -> List[HealthRecordResponse]:
+    """Convert a batch of health record documents to response models"""
+    return [
+        health_record_to_response(
+            record_doc,
+            member_names.get(ObjectId(record_doc["family_member_id"])) if record_doc.get("family_member_id") else None
+        )
+        for record_doc in record_docs
+    ]
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED)
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_health_record(
@@ -130,6 +157,104 @@ async def create_health_record(
         raise HTTPException(status_code=500, detail="An internal server error occurred. Please contact support.")
 
 
+@router.post("/batch", status_code=status.HTTP_201_CREATED)
+async def create_health_records_batch(
+    batch: HealthRecordBatchCreate,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Create several health records at once (e.g. a vaccination history or lab panel)"""
+    try:
+        record_docs = await health_record_service.create_health_records_batch(
+            batch.records,
+            str(current_user.id),
+            current_user.full_name
+        )
+        
+        member_names = await get_member_names([record_doc.get("family_member_id") for record_doc in record_docs])
+        
+        return create_success_response(
+            message=f"{len(record_docs)} health records created successfully",
+            data=batch_to_response(record_docs, member_names)
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Validation error creating health records batch: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except PyMongoError as e:
+        logger.error(f"Database error creating health records batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error creating health records batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An internal server error occurred. Please contact support.")
+
+
+@router.post("/batch/approve", status_code=status.HTTP_200_OK)
+async def approve_health_records_batch(
+    request: HealthRecordBatchApprovalRequest,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Approve several health records created for you; ineligible records are listed under failed"""
+    try:
+        result = await health_record_service.approve_health_records_batch(
+            request.record_ids,
+            str(current_user.id),
+            current_user.full_name,
+            request.visibility_scope
+        )
+        
+        member_names = await get_member_names([record_doc.get("family_member_id") for record_doc in result["records"]])
+        
+        return create_success_response(
+            message=f"{len(result['records'])} health records approved",
+            data={
+                "records": batch_to_response(result["records"], member_names),
+                "failed": result["failed"]
+            }
+        )
+    except HTTPException:
+        raise
+    except PyMongoError as e:
+        logger.error(f"Database error approving health records batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error approving health records batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An internal server error occurred. Please contact support.")
+
+
+@router.post("/batch/reject", status_code=status.HTTP_200_OK)
+async def reject_health_records_batch(
+    request: HealthRecordBatchRejectionRequest,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Reject several health records created for you; ineligible records are listed under failed"""
+    try:
+        result = await health_record_service.reject_health_records_batch(
+            request.record_ids,
+            str(current_user.id),
+            current_user.full_name,
+            request.rejection_reason
+        )
+        
+        member_names = await get_member_names([record_doc.get("family_member_id") for record_doc in result["records"]])
+        
+        return create_success_response(
+            message=f"{len(result['records'])} health records rejected",
+            data={
+                "records": batch_to_response(result["records"], member_names),
+                "failed": result["failed"]
+            }
+        )
+    except HTTPException:
+        raise
+    except PyMongoError as e:
+        logger.error(f"Database error rejecting health records batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error rejecting health records batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An internal server error occurred. Please contact support.")
+
+
 @router.get("/")
 @router.get("")
 async def list_health_records(
@@ -146,48 +271,9 @@ async def list_health_records(
         except Exception:
             raise ValueError(f"Invalid user ID format: {current_user.id}")
         
-        # Build visibility-aware query
-        # Get user's family circles for visibility filtering
-        from app.repositories.family_repository import FamilyRepository
-        family_repo = FamilyRepository()
-        try:
-            user_circles = await family_repo.find_by_member(str(current_user.id), limit=100)
-            user_circle_ids = [circle["_id"] for circle in user_circles if circle and "_id" in circle]
-        except Exception:
-            user_circle_ids = []
-        
-        # Build query to include both approved and pending records
-        # Similar to dashboard endpoint - show pending records for assigned users
-        query: Dict[str, Any] = {
-            "$or": [
-                {
-                    # Approved records the user has access to
-                    "approval_status": "approved",
-                    "$or": [
-                        {"subject_user_id": user_oid},
-                        {"created_by": user_oid},
-                        {"assigned_user_ids": user_oid}
-                    ]
-                },
-                {
-                    # Pending records where user is subject, assigned, or creator
-                    "approval_status": "pending_approval",
-                    "$or": [
-                        {"subject_user_id": user_oid},
-                        {"assigned_user_ids": user_oid},
-                        {"created_by": user_oid}
-                    ]
-                }
-            ]
-        }
-        
-        # Add family/public visibility for approved records from user's circles
-        if user_circle_ids:
-            query["$or"].append({
-                "approval_status": "approved",
-                "family_id": {"$in": user_circle_ids},
-                "visibility_scope": {"$in": ["family", "public"]}
-            })
+        # Visibility rules are compiled into the aggregation's $match; the
+        # record view applies the same filter (build_access_filter)
+        query: Dict[str, Any] = await health_records_repo.get_access_filter(str(user_oid))
         
         if family_member_id:
             try:
@@ -200,22 +286,20 @@ async def list_health_records(
             query["record_type"] = record_type
         
         skip = (page - 1) * page_size
-        records = await health_records_repo.find_many(
-            filter_dict=query,
+        page_data = await health_records_repo.find_page_with_details(
+            query,
             skip=skip,
             limit=page_size,
             sort_by="date",
             sort_order=-1
         )
+        total = page_data["total"]
         
-        total = await health_records_repo.count(query)
-        
-        record_responses = []
-        for record_doc in records:
-            if record_doc:
-                member_id = record_doc.get("family_member_id")
-                member_name = await get_member_name(member_id) if member_id else None
-                record_responses.append(health_record_to_response(record_doc, member_name))
+        record_responses = [
+            health_record_to_response(record_doc, record_doc.get("family_member_name"))
+            for record_doc in page_data["items"]
+            if record_doc
+        ]
         
         return create_paginated_response(
             items=record_responses,
@@ -250,11 +334,7 @@ async def get_health_dashboard(
         for record_doc in dashboard_data.get("statistics", {}).get("recent_records", []):
             if isinstance(record_doc, dict):
                 try:
-                    member_id = record_doc.get("family_member_id")
-                    member_name = None
-                    if member_id:
-                        member_name = await get_member_name(member_id)
-                    recent_records.append(health_record_to_response(record_doc, member_name))
+                    recent_records.append(health_record_to_response(record_doc, record_doc.get("family_member_name")))
                 except Exception as e:
                     logger.error(f"Error processing recent record: {str(e)}")
                     continue
@@ -271,6 +351,12 @@ async def get_health_dashboard(
         stats = dashboard_data.get("statistics", {})
         stats["recent_records"] = recent_records
         
+        records = [
+            health_record_to_response(record_doc, record_doc.get("family_member_name"))
+            for record_doc in dashboard_data.get("records", [])
+            if record_doc
+        ]
+        
         reminders = []
         for reminder in dashboard_data.get("upcoming_reminders", []):
             if reminder:
@@ -292,7 +378,8 @@ async def get_health_dashboard(
             data={
                 "statistics": stats,
                 "pending_approvals": pending_approvals,
-                "upcoming_reminders": reminders
+                "upcoming_reminders": reminders,
+                "records": records
             }
         )
     except ValueError as e:
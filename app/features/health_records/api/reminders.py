@@ -9,6 +9,7 @@ from ..schemas.health_records import (
     HealthRecordReminderCreate,
     HealthRecordReminderUpdate,
     HealthRecordReminderResponse,
+    HealthRecordReminderBatchCreate,
     ReminderStatus,
 )
 from ..services.reminder_service import ReminderService
@@ -90,6 +91,40 @@ async def create_reminder(
         raise HTTPException(status_code=500, detail="An internal server error occurred. Please contact support.")
 
 
+@router.post("/batch", status_code=status.HTTP_201_CREATED)
+async def create_reminders_batch(
+    batch: HealthRecordReminderBatchCreate,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Schedule several health record reminders at once"""
+    try:
+        reminder_docs = await reminder_service.create_reminders_batch(
+            batch.reminders,
+            str(current_user.id),
+            current_user.full_name
+        )
+        
+        record_oids = list({reminder_doc["record_id"] for reminder_doc in reminder_docs})
+        records = await health_records_repo.find_many({"_id": {"$in": record_oids}}, limit=len(record_oids))
+        titles = {record["_id"]: record.get("title") for record in records}
+        
+        return create_success_response(
+            message=f"{len(reminder_docs)} reminders created successfully",
+            data=[reminder_to_response(reminder_doc, titles.get(reminder_doc["record_id"])) for reminder_doc in reminder_docs]
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Validation error creating reminders batch: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except PyMongoError as e:
+        logger.error(f"Database error creating reminders batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Error creating reminders batch: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An internal server error occurred. Please contact support.")
+
+
 @router.get("/")
 async def list_reminders(
     record_id: Optional[str] = Query(None, description="Filter by health record ID"),
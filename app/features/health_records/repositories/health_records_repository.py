@@ -1,9 +1,26 @@
-from typing import List, Dict, Any, Optional, Callable, Awaitable
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Set, Tuple, Hashable
 from bson import ObjectId
 from datetime import datetime
-import time
+from fastapi import HTTPException
 
+from app.core.cache import AsyncLRUCache, freeze
 from app.repositories.base_repository import BaseRepository
+from app.repositories.family.tree_memberships import GenealogTreeMembershipRepository
+from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository, circle_ids
+
+
+# Shared across repository instances; entries are grouped by user ID so a write
+# only evicts the users it touches.
+_records_cache = AsyncLRUCache("health_records", capacity=2048, default_ttl=300)
+
+# Fields that decide which users' cached listings a record appears in
+_AUDIENCE_PROJECTION = {"created_by": 1, "assigned_user_ids": 1, "subject_user_id": 1}
+
+# Reminder statuses shown as "upcoming" on the dashboard
+_UPCOMING_REMINDER_STATUSES = ["pending", "sent"]
+
+# Fields kept from joined user documents when enriching records
+_PERSON_FIELDS = ("full_name", "email", "avatar_url")
 
 
 class HealthRecordsRepository(BaseRepository):
@@ -11,57 +28,63 @@ class HealthRecordsRepository(BaseRepository):
     Repository for health records with subject association model and privacy controls.
     Supports SELF/FAMILY/FRIEND subject types with comprehensive query and authorization methods.
     
-    Implements async-compatible in-memory caching with 5-minute TTL for frequently accessed queries.
-    Cache is automatically cleared after create/update operations to ensure data consistency.
+    Per-user listings are cached in a bounded LRU cache with a 5-minute TTL.
+    Writes invalidate only the entries of users the affected records belong to
+    (creator, assignees and subject), before and after the change.
     """
     
-    _cache: Dict[str, tuple[float, Any]] = {}
+    cache = _records_cache
     
     def __init__(self):
         super().__init__("health_records")
     
     async def _get_cached(
         self,
-        cache_key: str,
+        cache_key: Tuple[Hashable, ...],
         fetch_func: Callable[[], Awaitable[Any]],
         ttl: int = 300
     ) -> Any:
         """
         Helper method to get data from cache or execute fetch function.
         
-        Implements TTL-based caching with automatic expiration. If cached data exists
-        and hasn't expired, returns cached value. Otherwise, executes fetch_func,
-        caches the result, and returns it.
+        Concurrent misses for the same key share a single fetch.
         
         Args:
-            cache_key: Unique key identifying the cached data
+            cache_key: Tuple key whose first element is the owning user ID
             fetch_func: Async function to fetch data if not in cache or expired
             ttl: Time-to-live in seconds (default: 300 = 5 minutes)
             
         Returns:
             Cached or freshly fetched data
         """
-        current_time = time.time()
-        
-        if cache_key in self._cache:
-            expiry_time, cached_data = self._cache[cache_key]
-            if current_time < expiry_time:
-                return cached_data
-        
-        fresh_data = await fetch_func()
-        self._cache[cache_key] = (current_time + ttl, fresh_data)
-        
-        return fresh_data
+        return await self.cache.get_or_load(cache_key, fetch_func, ttl)
+    
+    def _audience(self, doc: Optional[Dict[str, Any]]) -> Set[str]:
+        """User IDs whose cached listings may include this record"""
+        if not doc:
+            return set()
+        user_ids = {str(uid) for uid in doc.get("assigned_user_ids") or [] if uid}
+        for field in ("created_by", "subject_user_id"):
+            if doc.get(field):
+                user_ids.add(str(doc[field]))
+        return user_ids
     
-    def _clear_cache(self) -> None:
+    async def _audience_for(self, filter_dict: Dict[str, Any]) -> Set[str]:
+        """Collect the audience of every record matching filter_dict"""
+        user_ids: Set[str] = set()
+        async for doc in self.collection.find(filter_dict, _AUDIENCE_PROJECTION):
+            user_ids |= self._audience(doc)
+        return user_ids
+    
+    def _invalidate_users(self, user_ids: Set[str]) -> None:
         """
-        Clear all cached health records data.
+        Drop cached listings for the given users.
         
-        Called automatically after create/update operations to ensure
-        users always see the latest data. This prevents stale cache issues
-        where new or modified records wouldn't appear until TTL expiration.
+        Called after create/update/delete so affected users see the change
+        immediately while everyone else keeps their warm entries.
         """
-        self._cache.clear()
+        for user_id in user_ids:
+            self.cache.invalidate_prefix(user_id)
     
     async def find_by_subject_type(
         self,
@@ -110,7 +133,7 @@ class HealthRecordsRepository(BaseRepository):
         Uses indexed query on subject_user_id for optimal performance.
         
         CACHING: Results are cached for 5 minutes to improve performance for frequently
-        accessed user health records. Cache is automatically cleared on create/update.
+        accessed user health records. Entries are invalidated when the user's records change.
         
         Args:
             user_id: String representation of user ID
@@ -120,7 +143,7 @@ class HealthRecordsRepository(BaseRepository):
         Returns:
             List of health records for this user as subject
         """
-        cache_key = f"find_by_subject_user:{user_id}:{limit}:{offset}"
+        cache_key = (user_id, "find_by_subject_user", limit, offset)
         
         async def fetch_data() -> List[Dict[str, Any]]:
             user_oid = self.validate_object_id(user_id, "user_id")
@@ -223,7 +246,7 @@ class HealthRecordsRepository(BaseRepository):
         Uses indexed query on assigned_user_ids for optimal performance.
         
         CACHING: Results are cached for 5 minutes to improve performance for frequently
-        accessed assigned health records. Cache is automatically cleared on create/update.
+        accessed assigned health records. Entries are invalidated when the user's records change.
         
         Args:
             user_id: String representation of user ID
@@ -233,7 +256,7 @@ class HealthRecordsRepository(BaseRepository):
         Returns:
             List of health records assigned to this user
         """
-        cache_key = f"find_by_assigned_user:{user_id}:{limit}:{offset}"
+        cache_key = (user_id, "find_by_assigned_user", limit, offset)
         
         async def fetch_data() -> List[Dict[str, Any]]:
             user_oid = self.validate_object_id(user_id, "user_id")
@@ -260,10 +283,9 @@ class HealthRecordsRepository(BaseRepository):
         """
         Verify if user has access to a specific health record.
         
-        Checks access based on:
-        1. User is the creator of the record
-        2. User is in the assigned_user_ids list
-        3. User is the subject (for SELF type records)
+        Applies the same rules as the listings and dashboards
+        (build_access_filter), evaluated by the database as part of an _id
+        lookup, so only the _id of a matching record is transferred.
         
         Args:
             record_id: String representation of health record ID
@@ -273,26 +295,11 @@ class HealthRecordsRepository(BaseRepository):
             True if user has access, False otherwise
         """
         record_oid = self.validate_object_id(record_id, "record_id")
-        user_oid = self.validate_object_id(user_id, "user_id")
-        
-        record = await self.find_one(
-            {"_id": record_oid},
-            raise_404=False
-        )
-        
-        if not record:
-            return False
         
-        if record.get("created_by") == user_oid:
-            return True
-        
-        if user_oid in record.get("assigned_user_ids", []):
-            return True
-        
-        if record.get("subject_type") == "self" and record.get("subject_user_id") == user_oid:
-            return True
-        
-        return False
+        return await self.exists({
+            "_id": record_oid,
+            **await self.get_access_filter(user_id)
+        })
     
     async def get_accessible_records(
         self,
@@ -317,8 +324,8 @@ class HealthRecordsRepository(BaseRepository):
         - family_id: Filter by family circle
         
         CACHING: Results are cached for 5 minutes to improve performance for the main
-        listing query used by UI. Cache key includes all parameters. Cache is 
-        automatically cleared on create/update.
+        listing query used by UI. Cache key includes all parameters. Entries
+        are invalidated when the user's records change.
         
         Args:
             user_id: String representation of user ID
@@ -329,8 +336,7 @@ class HealthRecordsRepository(BaseRepository):
         Returns:
             List of accessible health records matching the filters
         """
-        filters_str = str(sorted(filters.items())) if filters else "none"
-        cache_key = f"get_accessible_records:{user_id}:{filters_str}:{limit}:{offset}"
+        cache_key = (user_id, "get_accessible_records", freeze(filters or {}), limit, offset)
         
         async def fetch_data() -> List[Dict[str, Any]]:
             user_oid = self.validate_object_id(user_id, "user_id")
@@ -372,6 +378,296 @@ class HealthRecordsRepository(BaseRepository):
         
         return await self._get_cached(cache_key, fetch_data)
     
+    async def get_user_circle_ids(self, user_id: str) -> List[ObjectId]:
+        """
+        IDs of the family circles the user owns or belongs to, used by visibility filters.
+        
+        Read from the user's viewer principals, which circle membership
+        changes invalidate (see DashboardSourceMixin.visibility_source).
+        """
+        return circle_ids(await ViewerPrincipalsRepository().get(user_id))
+    
+    async def get_user_tree_ids(self, user_id: str) -> List[ObjectId]:
+        """IDs of the genealogy trees the user is a member of."""
+        memberships = await GenealogTreeMembershipRepository().find_by_user(user_id)
+        return [membership["tree_id"] for membership in memberships]
+    
+    async def get_access_filter(self, user_id: str) -> Dict[str, Any]:
+        """build_access_filter for a user, with their circles and trees looked up."""
+        user_oid = self.validate_object_id(user_id, "user_id")
+        return self.build_access_filter(
+            user_oid,
+            await self.get_user_circle_ids(user_id),
+            await self.get_user_tree_ids(user_id)
+        )
+    
+    def build_access_filter(
+        self,
+        user_oid: ObjectId,
+        circle_ids: Optional[List[ObjectId]] = None,
+        tree_ids: Optional[List[ObjectId]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compile the health record visibility rules into a single match filter.
+        
+        This is the one definition of who may read a record: listings,
+        dashboards and check_user_access all apply it. Records are visible
+        when the user:
+        - Created, is the subject of, or is assigned to the record, or it is
+          their personal record (family_id is the user), in any status
+        - Belongs to the record's family tree and it is approved with
+          family_tree visibility
+        - Is one of the record's visibility_user_ids and it is approved with
+          select_users visibility
+        - Belongs to the record's family circle and it is approved with family/public scope
+        
+        Each branch is a flat equality on an indexed field so the planner can
+        serve the $or with index unions.
+        """
+        branches: List[Dict[str, Any]] = [
+            {"created_by": user_oid},
+            {"subject_user_id": user_oid},
+            {"assigned_user_ids": user_oid},
+            {"family_id": user_oid},
+            {
+                "visibility_type": "select_users",
+                "approval_status": "approved",
+                "visibility_user_ids": user_oid
+            },
+        ]
+        if tree_ids:
+            branches.append({
+                "visibility_type": "family_tree",
+                "approval_status": "approved",
+                "family_id": {"$in": tree_ids}
+            })
+        if circle_ids:
+            branches.append({
+                "family_id": {"$in": circle_ids},
+                "approval_status": "approved",
+                "visibility_scope": {"$in": ["family", "public"]}
+            })
+        return {"$or": branches}
+    
+    def build_pending_for_user_filter(self, user_oid: ObjectId) -> Dict[str, Any]:
+        """Records waiting for this user's approval"""
+        return {
+            "approval_status": "pending_approval",
+            "$or": [
+                {"subject_user_id": user_oid},
+                {"assigned_user_ids": user_oid}
+            ]
+        }
+    
+    def _member_name_stages(self) -> List[Dict[str, Any]]:
+        """Pipeline stages that attach family_member_name to each record"""
+        return [
+            {
+                "$lookup": {
+                    "from": "family_members",
+                    "localField": "family_member_id",
+                    "foreignField": "_id",
+                    "as": "_member"
+                }
+            },
+            {"$addFields": {"family_member_name": {"$arrayElemAt": ["$_member.name", 0]}}},
+            {"$project": {"_member": 0}}
+        ]
+    
+    def _people_stages(self, record_fields: List[str]) -> List[Dict[str, Any]]:
+        """
+        Pipeline stages that join creator, subject and assignee user cards for
+        every record array in record_fields, using one _id-indexed lookup.
+        """
+        id_sets: List[Any] = []
+        for field in record_fields:
+            id_sets.extend([
+                {"$ifNull": [f"${field}.created_by", []]},
+                {"$ifNull": [f"${field}.subject_user_id", []]},
+                {
+                    "$reduce": {
+                        "input": {"$ifNull": [f"${field}.assigned_user_ids", []]},
+                        "initialValue": [],
+                        "in": {"$concatArrays": ["$$value", {"$ifNull": ["$$this", []]}]}
+                    }
+                }
+            ])
+        return [
+            {"$addFields": {"_people_ids": {"$setUnion": id_sets}}},
+            {
+                "$lookup": {
+                    "from": "users",
+                    "localField": "_people_ids",
+                    "foreignField": "_id",
+                    "as": "people"
+                }
+            },
+            {
+                "$addFields": {
+                    "people": {
+                        "$map": {
+                            "input": "$people",
+                            "as": "p",
+                            "in": {"_id": "$$p._id", **{f: f"$$p.{f}" for f in _PERSON_FIELDS}}
+                        }
+                    }
+                }
+            },
+            {"$project": {"_people_ids": 0}}
+        ]
+    
+    @staticmethod
+    def build_user_lookup(people: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Shape joined user cards the way health record responses expect them"""
+        return {
+            str(person["_id"]): {
+                "full_name": person.get("full_name", ""),
+                "email": person.get("email", ""),
+                "avatar": person.get("avatar_url", "")
+            }
+            for person in people
+        }
+    
+    async def find_page_with_details(
+        self,
+        match: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 20,
+        sort_by: str = "date",
+        sort_order: int = -1
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of records, the total count, family member names and
+        user cards in a single aggregation.
+        
+        Returns:
+            Dict with items, total and user_lookup
+        """
+        pipeline = [
+            {"$match": match},
+            {
+                "$facet": {
+                    "items": [
+                        {"$sort": {sort_by: sort_order, "_id": sort_order}},
+                        {"$skip": skip},
+                        {"$limit": limit},
+                        *self._member_name_stages()
+                    ],
+                    "total": [{"$count": "count"}]
+                }
+            },
+            *self._people_stages(["items"])
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        data = result[0] if result else {"items": [], "total": [], "people": []}
+        return {
+            "items": data["items"],
+            "total": data["total"][0]["count"] if data["total"] else 0,
+            "user_lookup": self.build_user_lookup(data.get("people", []))
+        }
+    
+    async def get_dashboard(
+        self,
+        user_id: str,
+        recent_limit: int = 10,
+        pending_limit: int = 20,
+        page_size: int = 20,
+        reminder_limit: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Compute the whole health dashboard in one aggregation.
+        
+        A single $facet over the user's accessible records produces counts by
+        type and status, pending approvals, recent records and the first page;
+        reminders and user cards are joined onto the facet output.
+        
+        Args:
+            user_id: String representation of user ID
+            recent_limit: Number of most recently created records
+            pending_limit: Number of pending approvals to return
+            page_size: Size of the first page of records (sorted by date)
+            reminder_limit: Number of upcoming reminders to return
+            
+        Returns:
+            Dict with counts, record lists, reminders and user_lookup
+        """
+        user_oid = self.validate_object_id(user_id, "user_id")
+        pending_filter = self.build_pending_for_user_filter(user_oid)
+        
+        pipeline = [
+            {"$match": await self.get_access_filter(user_id)},
+            {
+                "$facet": {
+                    "total": [{"$count": "count"}],
+                    "by_type": [{"$group": {"_id": "$record_type", "count": {"$sum": 1}}}],
+                    "by_status": [{"$group": {"_id": "$approval_status", "count": {"$sum": 1}}}],
+                    "pending_count": [{"$match": pending_filter}, {"$count": "count"}],
+                    "pending_records": [
+                        {"$match": pending_filter},
+                        {"$sort": {"created_at": -1}},
+                        {"$limit": pending_limit}
+                    ],
+                    "recent_records": [
+                        {"$sort": {"created_at": -1}},
+                        {"$limit": recent_limit},
+                        *self._member_name_stages()
+                    ],
+                    "first_page": [
+                        {"$sort": {"date": -1, "_id": -1}},
+                        {"$limit": page_size},
+                        *self._member_name_stages()
+                    ]
+                }
+            },
+            {
+                "$lookup": {
+                    "from": "health_record_reminders",
+                    "pipeline": [
+                        {
+                            "$match": {
+                                "$or": [
+                                    {"assigned_user_id": user_oid},
+                                    {"created_by": user_oid}
+                                ],
+                                "status": {"$in": _UPCOMING_REMINDER_STATUSES}
+                            }
+                        },
+                        {
+                            "$facet": {
+                                "items": [{"$sort": {"due_at": 1}}, {"$limit": reminder_limit}],
+                                "total": [{"$count": "count"}]
+                            }
+                        }
+                    ],
+                    "as": "reminders"
+                }
+            },
+            *self._people_stages(["pending_records", "recent_records", "first_page"])
+        ]
+        
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        data = result[0] if result else {}
+        
+        def first_count(key: str) -> int:
+            values = data.get(key) or []
+            return values[0]["count"] if values else 0
+        
+        reminders = (data.get("reminders") or [{}])[0]
+        reminder_total = reminders.get("total") or []
+        
+        return {
+            "total_records": first_count("total"),
+            "pending_approvals": first_count("pending_count"),
+            "records_by_type": {d["_id"]: d["count"] for d in data.get("by_type", []) if d["_id"]},
+            "records_by_status": {d["_id"]: d["count"] for d in data.get("by_status", []) if d["_id"]},
+            "pending_records": data.get("pending_records", []),
+            "recent_records": data.get("recent_records", []),
+            "first_page": data.get("first_page", []),
+            "upcoming_reminders": reminders.get("items", []),
+            "upcoming_reminders_total": reminder_total[0]["count"] if reminder_total else 0,
+            "user_lookup": self.build_user_lookup(data.get("people", []))
+        }
+    
     async def get_shared_health_records(
         self,
         user_id: str,
@@ -453,11 +749,10 @@ class HealthRecordsRepository(BaseRepository):
     
     async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create a new health record and clear cache.
+        Create a new health record and invalidate its audience's cache.
         
-        Overrides BaseRepository.create() to automatically clear cached
-        health records after successful creation, ensuring users immediately
-        see new records without waiting for cache expiration.
+        Overrides BaseRepository.create() so the creator, assignees and subject
+        immediately see the new record without waiting for cache expiration.
         
         Args:
             data: Document data to insert
@@ -466,66 +761,128 @@ class HealthRecordsRepository(BaseRepository):
             Created health record document with _id
         """
         result = await super().create(data)
-        self._clear_cache()
+        self._invalidate_users(self._audience(result))
         return result
-    
+
+    async def create_many(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert several health records with a single insert_many.
+
+        The documents are returned with their _id and timestamps filled in, so
+        no read-back is needed; the union of every record's audience is
+        invalidated once.
+
+        Args:
+            documents: Health record documents to insert
+
+        Returns:
+            Inserted documents
+        """
+        if not documents:
+            return []
+
+        now = datetime.utcnow()
+        for doc in documents:
+            doc.setdefault("created_at", now)
+            doc.setdefault("updated_at", now)
+
+        try:
+            await self.collection.insert_many(documents)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to create documents: {str(e)}")
+
+        audience: Set[str] = set()
+        for doc in documents:
+            audience |= self._audience(doc)
+        self._invalidate_users(audience)
+        return documents
+
+    async def update_many_by_ids(
+        self,
+        record_oids: List[ObjectId],
+        update_data: Dict[str, Any],
+        extra_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply the same $set to several health records with one update_many.
+
+        Args:
+            record_oids: IDs of the records to update
+            update_data: Fields to set
+            extra_filter: Additional guard conditions (e.g. expected status)
+
+        Returns:
+            The updated documents
+        """
+        if not record_oids:
+            return []
+
+        filter_dict: Dict[str, Any] = {"_id": {"$in": record_oids}, **(extra_filter or {})}
+        update_data["updated_at"] = datetime.utcnow()
+        await self.collection.update_many(filter_dict, {"$set": update_data})
+
+        updated = await self.collection.find({"_id": {"$in": record_oids}}).to_list(length=len(record_oids))
+        audience: Set[str] = set()
+        for doc in updated:
+            audience |= self._audience(doc)
+        self._invalidate_users(audience)
+        return updated
+
     async def update_by_id(
         self,
         doc_id: str,
         update_data: Dict[str, Any],
-        raise_404: bool = True
+        raise_404: bool = True,
+        projection: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
-        Update a health record by ID and clear cache.
-        
-        Overrides BaseRepository.update_by_id() to automatically clear cached
-        health records after successful update, ensuring users see modified
-        records without waiting for cache expiration.
+        Update a health record by ID and invalidate its audience's cache.
         
         Args:
             doc_id: String representation of document ID
             update_data: Data to update
             raise_404: Whether to raise 404 if not found
+            projection: Fields of the updated record to return
             
         Returns:
             Updated health record document
         """
-        result = await super().update_by_id(doc_id, update_data, raise_404)
-        self._clear_cache()
-        return result
+        oid = self.validate_object_id(doc_id, "document ID")
+        return await self.update({"_id": oid}, update_data, raise_404, projection=projection)
     
     async def update(
         self,
         filter_dict: Dict[str, Any],
         update_data: Dict[str, Any],
-        raise_404: bool = True
+        raise_404: bool = True,
+        projection: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
-        Update a health record and clear cache.
+        Update a health record and invalidate its audience's cache.
         
-        Overrides BaseRepository.update() to automatically clear cached
-        health records after successful update, ensuring users see modified
-        records without waiting for cache expiration.
+        Both the previous and the new audience are invalidated, so users who
+        were unassigned stop seeing the record as well.
         
         Args:
             filter_dict: MongoDB filter criteria
             update_data: Data to update
             raise_404: Whether to raise 404 if not found
+            projection: Inclusion projection of the updated record to return;
+                the audience fields are always included
             
         Returns:
             Updated health record document
         """
-        result = await super().update(filter_dict, update_data, raise_404)
-        self._clear_cache()
+        before = await self.collection.find_one(filter_dict, _AUDIENCE_PROJECTION)
+        if projection:
+            projection = {**projection, **_AUDIENCE_PROJECTION}
+        result = await super().update(filter_dict, update_data, raise_404, projection=projection)
+        self._invalidate_users(self._audience(before) | self._audience(result))
         return result
     
     async def delete_by_id(self, doc_id: str, raise_404: bool = True) -> bool:
         """
-        Delete a health record by ID and clear cache.
-        
-        Overrides BaseRepository.delete_by_id() to automatically clear cached
-        health records after successful deletion, ensuring users don't see
-        deleted records in cached query results.
+        Delete a health record by ID and invalidate its audience's cache.
         
         Args:
             doc_id: String representation of document ID
@@ -534,9 +891,8 @@ class HealthRecordsRepository(BaseRepository):
         Returns:
             True if deleted
         """
-        result = await super().delete_by_id(doc_id, raise_404)
-        self._clear_cache()
-        return result
+        oid = self.validate_object_id(doc_id, "document ID")
+        return await self.delete({"_id": oid}, raise_404)
     
     async def delete(
         self,
@@ -544,11 +900,7 @@ class HealthRecordsRepository(BaseRepository):
         raise_404: bool = True
     ) -> bool:
         """
-        Delete a health record and clear cache.
-        
-        Overrides BaseRepository.delete() to automatically clear cached
-        health records after successful deletion, ensuring users don't see
-        deleted records in cached query results.
+        Delete a health record and invalidate its audience's cache.
         
         Args:
             filter_dict: MongoDB filter criteria
@@ -557,17 +909,14 @@ class HealthRecordsRepository(BaseRepository):
         Returns:
             True if deleted
         """
+        before = await self.collection.find_one(filter_dict, _AUDIENCE_PROJECTION)
         result = await super().delete(filter_dict, raise_404)
-        self._clear_cache()
+        self._invalidate_users(self._audience(before))
         return result
     
     async def delete_many(self, filter_dict: Dict[str, Any]) -> int:
         """
-        Delete multiple health records and clear cache.
-        
-        Overrides BaseRepository.delete_many() to automatically clear cached
-        health records after bulk deletion, ensuring users don't see
-        deleted records in cached query results.
+        Delete multiple health records and invalidate every affected user's cache.
         
         Args:
             filter_dict: MongoDB filter criteria
@@ -575,6 +924,7 @@ class HealthRecordsRepository(BaseRepository):
         Returns:
             Number of documents deleted
         """
+        audience = await self._audience_for(filter_dict)
         result = await super().delete_many(filter_dict)
-        self._clear_cache()
+        self._invalidate_users(audience)
         return result
@@ -320,3 +320,28 @@ class HealthRecordReminderResponse(BaseModel):
 class HealthRecordApprovalRequest(BaseModel):
     """Request schema for approving a health record with visibility selection"""
     visibility_scope: VisibilityScope = Field(..., description="Visibility scope for the approved record")
+
+
+MAX_BATCH_RECORDS = 100
+
+
+class HealthRecordBatchCreate(BaseModel):
+    """Request schema for creating several health records in one call"""
+    records: List[HealthRecordCreate] = Field(..., min_length=1, max_length=MAX_BATCH_RECORDS)
+
+
+class HealthRecordBatchApprovalRequest(BaseModel):
+    """Request schema for approving several health records with one visibility selection"""
+    record_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_RECORDS)
+    visibility_scope: VisibilityScope = Field(..., description="Visibility scope for the approved records")
+
+
+class HealthRecordBatchRejectionRequest(BaseModel):
+    """Request schema for rejecting several health records"""
+    record_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_RECORDS)
+    rejection_reason: Optional[str] = Field(None, max_length=500)
+
+
+class HealthRecordReminderBatchCreate(BaseModel):
+    """Request schema for scheduling several reminders in one call"""
+    reminders: List[HealthRecordReminderCreate] = Field(..., min_length=1, max_length=MAX_BATCH_RECORDS)
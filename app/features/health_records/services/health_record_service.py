@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from bson import ObjectId
 from datetime import datetime
 import logging
@@ -13,7 +13,7 @@ from ..schemas.health_records import (
 )
 from app.api.v1.endpoints.social.notifications import create_notification
 from app.schemas.notification import NotificationType, NotificationStatus
-from app.utils.audit_logger import log_audit_event
+from app.utils.audit_logger import log_audit_event, log_audit_events
 from app.repositories.family_repository import FamilyRepository, FamilyMembersRepository
 from app.services.notification_service import NotificationService
 from app.schemas.audit_log import AuditAction
@@ -59,60 +59,8 @@ class HealthRecordService:
         Returns:
             Created health record document
         """
-        family_id = await self._determine_family_id(record, current_user_id)
-        
-        record_data = {
-            "family_id": family_id,
-            "subject_type": record.subject_type,
-            "record_type": record.record_type,
-            "title": record.title,
-            "description": record.description,
-            "date": record.date,
-            "provider": record.provider,
-            "location": record.location,
-            "severity": record.severity,
-            "attachments": record.attachments or [],
-            "notes": record.notes,
-            "medications": record.medications or [],
-            "is_confidential": record.is_confidential if record.is_confidential is not None else False,
-            "is_hereditary": record.is_hereditary if record.is_hereditary is not None else False,
-            "inheritance_pattern": record.inheritance_pattern,
-            "age_of_onset": record.age_of_onset,
-            "affected_relatives": record.affected_relatives or [],
-            "genetic_test_results": record.genetic_test_results,
-            "created_by": ObjectId(current_user_id)
-        }
-        
-        if record.subject_user_id:
-            record_data["subject_user_id"] = self.repository.validate_object_id(record.subject_user_id, "subject_user_id")
-        
-        if record.subject_family_member_id:
-            record_data["subject_family_member_id"] = self.repository.validate_object_id(record.subject_family_member_id, "subject_family_member_id")
-        
-        if record.subject_friend_circle_id:
-            record_data["subject_friend_circle_id"] = self.repository.validate_object_id(record.subject_friend_circle_id, "subject_friend_circle_id")
-        
-        if record.assigned_user_ids:
-            record_data["assigned_user_ids"] = [
-                self.repository.validate_object_id(user_id, "assigned_user_id")
-                for user_id in record.assigned_user_ids
-            ]
-        
-        if record.family_member_id:
-            record_data["family_member_id"] = self.repository.validate_object_id(record.family_member_id, "family_member_id")
-        
-        if record.genealogy_person_id:
-            record_data["genealogy_person_id"] = self.repository.validate_object_id(record.genealogy_person_id, "genealogy_person_id")
-        
-        if record.subject_user_id and record.subject_user_id != current_user_id:
-            record_data["approval_status"] = "pending_approval"
-            record_data["requested_visibility"] = record.requested_visibility if record.requested_visibility else "private"
-            record_data["visibility_scope"] = "private"
-        else:
-            record_data["approval_status"] = "approved"
-            record_data["approved_at"] = datetime.utcnow()
-            record_data["approved_by"] = str(current_user_id)
-            record_data["visibility_scope"] = record.requested_visibility if record.requested_visibility else "private"
+        record_data = self._build_record_data(record, current_user_id)
+        record_data["family_id"] = await self._determine_family_id(record, current_user_id)
         
         record_doc = await self.repository.create(record_data)
         
@@ -151,6 +99,73 @@ class HealthRecordService:
         
         return record_doc
     
+    async def create_health_records_batch(
+        self,
+        records: List[HealthRecordCreate],
+        current_user_id: str,
+        current_user_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several health records in one pass.
+        
+        Every payload is validated before anything is written, family circles
+        are resolved with one query per kind of lookup, and the records are
+        inserted with a single insert_many. Each subject gets one notification
+        for the whole batch and audit entries are written in bulk.
+        
+        Args:
+            records: Health record creation payloads
+            current_user_id: ID of the user creating the records
+            current_user_name: Name of the user creating the records
+            
+        Returns:
+            Created health record documents, in request order
+        """
+        from fastapi import HTTPException, status
+        
+        documents = []
+        for index, record in enumerate(records):
+            try:
+                documents.append(self._build_record_data(record, current_user_id))
+            except HTTPException as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"records[{index}]: {e.detail}")
+        
+        family_ids = await self._determine_family_ids(records, current_user_id)
+        for document, family_id in zip(documents, family_ids):
+            document["family_id"] = family_id
+        
+        record_docs = await self.repository.create_many(documents)
+        
+        logger.info(f"Health records created in batch: count={len(record_docs)}, created_by={current_user_id}")
+        
+        pending_by_subject: Dict[str, List[Dict[str, Any]]] = {}
+        for record_doc in record_docs:
+            if record_doc.get("approval_status") == "pending_approval":
+                pending_by_subject.setdefault(str(record_doc["subject_user_id"]), []).append(record_doc)
+        
+        await self.notification_service.create_notifications_batch([
+            self._assignment_digest(subject_id, subject_records, current_user_id, current_user_name)
+            for subject_id, subject_records in pending_by_subject.items()
+        ])
+        
+        await log_audit_events([
+            {
+                "user_id": str(current_user_id),
+                "event_type": "CREATE_HEALTH_RECORD",
+                "event_details": {
+                    "resource_type": "health_record",
+                    "resource_id": str(record_doc["_id"]),
+                    "record_type": record.record_type,
+                    "subject_type": record.subject_type,
+                    "is_confidential": record.is_confidential,
+                    "batch_size": len(record_docs)
+                }
+            }
+            for record, record_doc in zip(records, record_docs)
+        ])
+        
+        return record_docs
+    
     async def update_health_record(
         self,
         record_id: str,
@@ -591,20 +606,125 @@ class HealthRecordService:
         
         return updated_record
     
+    async def approve_health_records_batch(
+        self,
+        record_ids: List[str],
+        current_user_id: str,
+        current_user_name: Optional[str] = None,
+        visibility_scope: Optional[VisibilityScope] = None
+    ) -> Dict[str, Any]:
+        """
+        Approve several health records created for you with one visibility selection.
+        
+        Records the user may not approve, or that are no longer pending, are
+        reported under "failed" instead of aborting the whole batch. The
+        eligible records are updated with a single update_many.
+        
+        Args:
+            record_ids: IDs of the records to approve
+            current_user_id: ID of the user approving the records
+            current_user_name: Name of the user approving the records
+            visibility_scope: Visibility scope for the approved records (required)
+            
+        Returns:
+            Dict with the approved record documents and the failed record IDs
+        """
+        from fastapi import HTTPException, status
+        
+        if not visibility_scope:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="visibility_scope is required when approving health records"
+            )
+        scope = visibility_scope.value if isinstance(visibility_scope, VisibilityScope) else str(visibility_scope)
+        
+        eligible, failed = await self._load_pending_for_decision(record_ids, current_user_id, "approve")
+        
+        updated = await self.repository.update_many_by_ids(
+            [record_doc["_id"] for record_doc in eligible],
+            {
+                "approval_status": "approved",
+                "approved_at": datetime.utcnow(),
+                "approved_by": str(current_user_id),
+                "visibility_scope": scope
+            },
+            extra_filter={"approval_status": {"$nin": ["approved", "rejected"]}}
+        )
+        approved = self._split_decided(updated, "approved", current_user_id, failed)
+        
+        await self._finish_batch_decision(
+            eligible,
+            approved,
+            current_user_id,
+            current_user_name,
+            decision="approved",
+            new_value={"approval_status": "approved", "visibility_scope": scope},
+            remarks=f"Health record approved with {scope} visibility",
+            detail_suffix=f" with {scope} visibility",
+            event_details={"visibility_scope": scope}
+        )
+        
+        return {"records": approved, "failed": failed}
+    
+    async def reject_health_records_batch(
+        self,
+        record_ids: List[str],
+        current_user_id: str,
+        current_user_name: Optional[str] = None,
+        rejection_reason: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Reject several health records created for you.
+        
+        Behaves like approve_health_records_batch: ineligible records are
+        reported under "failed" and the rest are updated with one update_many.
+        
+        Args:
+            record_ids: IDs of the records to reject
+            current_user_id: ID of the user rejecting the records
+            current_user_name: Name of the user rejecting the records
+            rejection_reason: Optional reason applied to every record
+            
+        Returns:
+            Dict with the rejected record documents and the failed record IDs
+        """
+        eligible, failed = await self._load_pending_for_decision(record_ids, current_user_id, "reject")
+        
+        update_data: Dict[str, Any] = {"approval_status": "rejected"}
+        if rejection_reason:
+            update_data["rejection_reason"] = rejection_reason
+        
+        updated = await self.repository.update_many_by_ids(
+            [record_doc["_id"] for record_doc in eligible],
+            update_data,
+            extra_filter={"approval_status": {"$nin": ["approved", "rejected"]}}
+        )
+        rejected = self._split_decided(updated, "rejected", current_user_id, failed)
+        
+        await self._finish_batch_decision(
+            eligible,
+            rejected,
+            current_user_id,
+            current_user_name,
+            decision="rejected",
+            new_value={"approval_status": "rejected"},
+            remarks=rejection_reason or "No reason provided",
+            detail_suffix=f". Reason: {rejection_reason}" if rejection_reason else "",
+            event_details={"rejection_reason": rejection_reason}
+        )
+        
+        return {"records": rejected, "failed": failed}
+    
     async def check_user_has_access(
         self,
         record_doc: Dict[str, Any],
         current_user_id: str
     ) -> bool:
         """
-        Check if user has access to modify a health record.
+        Check if user has access to a health record.
         
-        User has access if they:
-        - Created the record
-        - Are the subject (for SELF type)
-        - Are assigned to the record
-        - Are a member of the family circle (for FAMILY type)
-        - Own the record (family_id equals user_id for personal records)
+        Delegates to HealthRecordsRepository.check_user_access, so the rules
+        are the ones listings and dashboards apply (build_access_filter).
         
         Args:
             record_doc: Health record document
@@ -613,51 +733,75 @@ class HealthRecordService:
         Returns:
             True if user has access, False otherwise
         """
-        user_oid = ObjectId(current_user_id)
-        created_by = record_doc.get("created_by")
+        has_access = await self.repository.check_user_access(str(record_doc["_id"]), current_user_id)
+        if not has_access:
+            logger.warning(f"Access denied for user {current_user_id} to health record {record_doc.get('_id')}")
+        return has_access
+    
+    def _build_record_data(
+        self,
+        record: HealthRecordCreate,
+        current_user_id: str
+    ) -> Dict[str, Any]:
+        """
+        Validate a creation payload and build the document to insert (without family_id).
+        
+        Records created for another user start as pending approval; everything
+        else is auto-approved with the requested visibility.
+        """
+        record_data = {
+            "subject_type": record.subject_type,
+            "record_type": record.record_type,
+            "title": record.title,
+            "description": record.description,
+            "date": record.date,
+            "provider": record.provider,
+            "location": record.location,
+            "severity": record.severity,
+            "attachments": record.attachments or [],
+            "notes": record.notes,
+            "medications": record.medications or [],
+            "is_confidential": record.is_confidential if record.is_confidential is not None else False,
+            "is_hereditary": record.is_hereditary if record.is_hereditary is not None else False,
+            "inheritance_pattern": record.inheritance_pattern,
+            "age_of_onset": record.age_of_onset,
+            "affected_relatives": record.affected_relatives or [],
+            "genetic_test_results": record.genetic_test_results,
+            "created_by": ObjectId(current_user_id)
+        }
         
-        logger.info(f"Checking access for user {current_user_id} (ObjectId: {user_oid})")
-        logger.info(f"Record created_by: {created_by} (type: {type(created_by)})")
-        logger.info(f"Record subject_user_id: {record_doc.get('subject_user_id')}")
-        logger.info(f"Record assigned_user_ids: {record_doc.get('assigned_user_ids', [])}")
-        logger.info(f"Record family_id: {record_doc.get('family_id')}")
+        if record.subject_user_id:
+            record_data["subject_user_id"] = self.repository.validate_object_id(record.subject_user_id, "subject_user_id")
         
-        if created_by == user_oid:
-            logger.info(f"Access granted: user is creator (created_by={created_by} == user_oid={user_oid})")
-            return True
-        else:
-            logger.info(f"Creator check failed: {created_by} != {user_oid}")
+        if record.subject_family_member_id:
+            record_data["subject_family_member_id"] = self.repository.validate_object_id(record.subject_family_member_id, "subject_family_member_id")
+        
+        if record.subject_friend_circle_id:
+            record_data["subject_friend_circle_id"] = self.repository.validate_object_id(record.subject_friend_circle_id, "subject_friend_circle_id")
+        
+        if record.assigned_user_ids:
+            record_data["assigned_user_ids"] = [
+                self.repository.validate_object_id(user_id, "assigned_user_id")
+                for user_id in record.assigned_user_ids
+            ]
         
-        if record_doc.get("subject_type") == "self" and record_doc.get("subject_user_id") == user_oid:
-            logger.info("Access granted: user is subject")
-            return True
+        if record.family_member_id:
+            record_data["family_member_id"] = self.repository.validate_object_id(record.family_member_id, "family_member_id")
         
-        if user_oid in record_doc.get("assigned_user_ids", []):
-            logger.info("Access granted: user is assigned")
-            return True
+        if record.genealogy_person_id:
+            record_data["genealogy_person_id"] = self.repository.validate_object_id(record.genealogy_person_id, "genealogy_person_id")
         
-        if record_doc.get("family_id") == user_oid:
-            logger.info("Access granted: record family_id matches user_id")
-            return True
+        if record.subject_user_id and record.subject_user_id != current_user_id:
+            record_data["approval_status"] = "pending_approval"
+            record_data["requested_visibility"] = record.requested_visibility if record.requested_visibility else "private"
+            record_data["visibility_scope"] = "private"
+        else:
+            record_data["approval_status"] = "approved"
+            record_data["approved_at"] = datetime.utcnow()
+            record_data["approved_by"] = str(current_user_id)
+            record_data["visibility_scope"] = record.requested_visibility if record.requested_visibility else "private"
         
-        if record_doc.get("subject_type") == "family":
-            family_repo = FamilyRepository()
-            try:
-                family_id = record_doc.get("family_id")
-                if family_id:
-                    is_member = await family_repo.check_member_access(
-                        circle_id=str(family_id),
-                        user_id=current_user_id,
-                        raise_error=False
-                    )
-                    if is_member:
-                        logger.info("Access granted: user is family circle member")
-                        return True
-            except Exception:
-                pass
-        
-        logger.warning(f"Access denied for user {current_user_id} to health record {record_doc.get('_id')}")
-        return False
+        return record_data
     
     async def _determine_family_id(
         self,
@@ -705,6 +849,301 @@ class HealthRecordService:
         
         return ObjectId(current_user_id)
     
+    async def _determine_family_ids(
+        self,
+        records: List[HealthRecordCreate],
+        current_user_id: str
+    ) -> List[ObjectId]:
+        """
+        Batch version of _determine_family_id.
+        
+        Family members referenced by FAMILY records are fetched with one $in
+        query and the user's first family circle is looked up at most once.
+        """
+        member_oids = list({
+            ObjectId(record.subject_family_member_id)
+            for record in records
+            if record.subject_type == "family" and record.subject_family_member_id
+        })
+        member_families: Dict[ObjectId, ObjectId] = {}
+        if member_oids:
+            members = await FamilyMembersRepository().find_many(
+                {"_id": {"$in": member_oids}},
+                limit=len(member_oids)
+            )
+            member_families = {m["_id"]: m["family_id"] for m in members if m.get("family_id")}
+        
+        user_oid = ObjectId(current_user_id)
+        default_circle: Optional[ObjectId] = None
+        default_circle_loaded = False
+        
+        family_ids = []
+        for record in records:
+            if record.subject_type == "family":
+                family_id = member_families.get(ObjectId(record.subject_family_member_id)) if record.subject_family_member_id else None
+                if family_id is None:
+                    if not default_circle_loaded:
+                        user_circles = await FamilyRepository().find_by_member(current_user_id, limit=1)
+                        default_circle = user_circles[0]["_id"] if user_circles else None
+                        default_circle_loaded = True
+                    family_id = default_circle or user_oid
+                family_ids.append(family_id)
+            elif record.subject_type == "friend" and record.subject_friend_circle_id:
+                family_ids.append(ObjectId(record.subject_friend_circle_id))
+            else:
+                family_ids.append(user_oid)
+        return family_ids
+    
+    def _assignment_digest(
+        self,
+        subject_id: str,
+        record_docs: List[Dict[str, Any]],
+        current_user_id: str,
+        current_user_name: Optional[str]
+    ) -> Dict[str, Any]:
+        """One assignment notification covering every record created for a subject in a batch"""
+        creator = current_user_name or "Someone"
+        notification: Dict[str, Any] = {
+            "user_id": subject_id,
+            "type": NotificationType.HEALTH_RECORD_ASSIGNED.value,
+            "actor_id": str(current_user_id),
+            "target_type": "health_record",
+            "assigner_id": ObjectId(current_user_id),
+            "assigner_name": current_user_name or "Unknown",
+            "assigned_at": datetime.utcnow()
+        }
+        if len(record_docs) == 1:
+            record_doc = record_docs[0]
+            notification.update({
+                "title": "New Health Record Created for You",
+                "message": f"{creator} created a health record '{record_doc['title']}' for you. Please review and approve.",
+                "target_id": str(record_doc["_id"]),
+                "health_record_id": record_doc["_id"]
+            })
+        else:
+            notification.update({
+                "title": "New Health Records Created for You",
+                "message": f"{creator} created {len(record_docs)} health records for you: {self._title_list(record_docs)}. Please review and approve.",
+                "health_record_ids": [record_doc["_id"] for record_doc in record_docs],
+                "metadata": {"record_count": len(record_docs)}
+            })
+        return notification
+    
+    def _title_list(self, record_docs: List[Dict[str, Any]], limit: int = 3) -> str:
+        titles = [f"'{record_doc.get('title', 'Untitled')}'" for record_doc in record_docs[:limit]]
+        if len(record_docs) > limit:
+            titles.append(f"{len(record_docs) - limit} more")
+        return ", ".join(titles)
+    
+    async def _load_pending_for_decision(
+        self,
+        record_ids: List[str],
+        current_user_id: str,
+        verb: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """
+        Fetch the records of a batch approve/reject with one $in query.
+        
+        Returns the records the user may decide on and a list of
+        {"record_id", "detail"} entries for the ones they may not, using the
+        same rules and messages as the single-record endpoints.
+        """
+        failed: List[Dict[str, str]] = []
+        record_oids: List[ObjectId] = []
+        for record_id in dict.fromkeys(record_ids):
+            if ObjectId.is_valid(record_id):
+                record_oids.append(ObjectId(record_id))
+            else:
+                failed.append({"record_id": record_id, "detail": f"Invalid record ID: {record_id}"})
+        
+        found = await self.repository.find_many({"_id": {"$in": record_oids}}, limit=len(record_oids)) if record_oids else []
+        records_by_id = {record_doc["_id"]: record_doc for record_doc in found}
+        
+        user_oid = ObjectId(current_user_id)
+        eligible: List[Dict[str, Any]] = []
+        for record_oid in record_oids:
+            record_doc = records_by_id.get(record_oid)
+            detail = None
+            if not record_doc:
+                detail = "Health record not found"
+            elif record_doc.get("subject_user_id") != user_oid and user_oid not in record_doc.get("assigned_user_ids", []):
+                detail = f"Only the assigned user can {verb} this health record"
+            elif record_doc.get("approval_status", "approved") == "approved":
+                detail = "Health record is already approved"
+            elif record_doc.get("approval_status") == "rejected":
+                detail = "Health record is already rejected"
+            
+            if detail:
+                failed.append({"record_id": str(record_oid), "detail": detail})
+            else:
+                eligible.append(record_doc)
+        return eligible, failed
+    
+    def _split_decided(
+        self,
+        updated: List[Dict[str, Any]],
+        decision: str,
+        current_user_id: str,
+        failed: List[Dict[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """Keep the records this batch actually changed; ones decided concurrently go to failed"""
+        decided = []
+        for record_doc in updated:
+            if record_doc.get("approval_status") == decision and (
+                decision != "approved" or record_doc.get("approved_by") == str(current_user_id)
+            ):
+                decided.append(record_doc)
+            else:
+                failed.append({
+                    "record_id": str(record_doc["_id"]),
+                    "detail": f"Health record is already {record_doc.get('approval_status')}"
+                })
+        return decided
+    
+    async def _finish_batch_decision(
+        self,
+        previous: List[Dict[str, Any]],
+        decided: List[Dict[str, Any]],
+        current_user_id: str,
+        current_user_name: Optional[str],
+        decision: str,
+        new_value: Dict[str, Any],
+        remarks: str,
+        detail_suffix: str,
+        event_details: Dict[str, Any]
+    ):
+        """
+        Side effects of a batch approve/reject, each done once for the batch.
+        
+        Resolves the matching assignment notifications with one update_many,
+        writes both audit trails in bulk, sends each creator a single digest
+        and each affected user a single WebSocket event.
+        """
+        if not decided:
+            return
+        
+        previous_status = {record_doc["_id"]: record_doc.get("approval_status") for record_doc in previous}
+        record_oids = [record_doc["_id"] for record_doc in decided]
+        user_oid = ObjectId(current_user_id)
+        notification_status = NotificationStatus.APPROVED if decision == "approved" else NotificationStatus.REJECTED
+        
+        # Per-record notifications, and digests once every record they cover is decided
+        await get_collection("notifications").update_many(
+            {
+                "user_id": user_oid,
+                "type": NotificationType.HEALTH_RECORD_ASSIGNED.value,
+                "approval_status": NotificationStatus.PENDING.value,
+                "$or": [
+                    {"health_record_id": {"$in": record_oids}},
+                    {"health_record_ids": {"$in": record_oids, "$not": {"$elemMatch": {"$nin": record_oids}}}}
+                ]
+            },
+            {"$set": {
+                "approval_status": notification_status.value,
+                "resolved_at": datetime.utcnow(),
+                "resolved_by": user_oid,
+                "resolved_by_name": current_user_name or "Unknown"
+            }}
+        )
+        
+        action = AuditAction.APPROVED if decision == "approved" else AuditAction.REJECTED
+        await self.notification_service.create_audit_logs([
+            {
+                "resource_type": "health_record",
+                "resource_id": str(record_doc["_id"]),
+                "action": action,
+                "actor_id": current_user_id,
+                "actor_name": current_user_name or "Unknown",
+                "target_user_id": str(record_doc["created_by"]) if record_doc.get("created_by") else None,
+                "old_value": {"approval_status": previous_status.get(record_doc["_id"])},
+                "new_value": new_value,
+                "remarks": remarks,
+                "metadata": {
+                    "record_type": record_doc.get("record_type"),
+                    "record_title": record_doc.get("title"),
+                    "batch_size": len(decided)
+                }
+            }
+            for record_doc in decided
+        ])
+        
+        by_creator: Dict[str, List[Dict[str, Any]]] = {}
+        for record_doc in decided:
+            creator_id = str(record_doc["created_by"]) if record_doc.get("created_by") else None
+            if creator_id and creator_id != current_user_id:
+                by_creator.setdefault(creator_id, []).append(record_doc)
+        
+        actor = current_user_name or "Someone"
+        notification_type = NotificationType.HEALTH_RECORD_APPROVED if decision == "approved" else NotificationType.HEALTH_RECORD_REJECTED
+        digests = []
+        for creator_id, creator_records in by_creator.items():
+            digest: Dict[str, Any] = {
+                "user_id": creator_id,
+                "type": notification_type.value,
+                "actor_id": str(current_user_id),
+                "target_type": "health_record"
+            }
+            if len(creator_records) == 1:
+                digest.update({
+                    "title": f"Health Record {decision.capitalize()}",
+                    "message": f"{actor} {decision} the health record '{creator_records[0].get('title', 'Untitled')}' you created for them{detail_suffix}.",
+                    "target_id": str(creator_records[0]["_id"])
+                })
+            else:
+                digest.update({
+                    "title": f"Health Records {decision.capitalize()}",
+                    "message": f"{actor} {decision} {len(creator_records)} health records you created for them: {self._title_list(creator_records)}{detail_suffix}.",
+                    "health_record_ids": [record_doc["_id"] for record_doc in creator_records],
+                    "metadata": {"record_count": len(creator_records)}
+                })
+            digests.append(digest)
+        await self.notification_service.create_notifications_batch(digests)
+        
+        for creator_id, creator_records in by_creator.items():
+            try:
+                ws_message = create_ws_message(
+                    WSMessageType.NOTIFICATION_UPDATED,
+                    {
+                        "health_record_ids": [str(record_doc["_id"]) for record_doc in creator_records],
+                        "new_status": decision,
+                        f"{decision}_by": current_user_id,
+                        **event_details
+                    }
+                )
+                await connection_manager.send_personal_message(ws_message, creator_id)
+            except Exception as e:
+                logger.error(f"Failed to send WebSocket notification to creator: {str(e)}")
+        
+        try:
+            ws_message = create_ws_message(
+                WSMessageType.HEALTH_RECORD_APPROVED if decision == "approved" else WSMessageType.HEALTH_RECORD_REJECTED,
+                {
+                    "health_record_ids": [str(record_oid) for record_oid in record_oids],
+                    "status": decision,
+                    **event_details
+                }
+            )
+            await connection_manager.send_personal_message(ws_message, current_user_id)
+        except Exception as e:
+            logger.error(f"Failed to send WebSocket confirmation to {decision} batch: {str(e)}")
+        
+        event_type = "APPROVE_HEALTH_RECORD" if decision == "approved" else "REJECT_HEALTH_RECORD"
+        await log_audit_events([
+            {
+                "user_id": str(current_user_id),
+                "event_type": event_type,
+                "event_details": {
+                    "resource_type": "health_record",
+                    "resource_id": str(record_doc["_id"]),
+                    "record_type": record_doc.get("record_type"),
+                    "created_by": str(record_doc.get("created_by")) if record_doc.get("created_by") else None,
+                    "batch_size": len(decided),
+                    **event_details
+                }
+            }
+            for record_doc in decided
+        ])
+    
     async def get_health_dashboard(
         self,
         current_user_id: str
@@ -719,102 +1158,26 @@ class HealthRecordService:
             Dashboard data with statistics, pending approvals, and reminders
         """
         try:
-            user_oid = self.repository.validate_object_id(current_user_id, "user_id")
+            self.repository.validate_object_id(current_user_id, "user_id")
         except Exception as e:
             from fastapi import HTTPException
             raise HTTPException(status_code=400, detail=f"Invalid user ID: {str(e)}")
         
-        from app.repositories.base_repository import BaseRepository
-        reminders_repo = BaseRepository("health_record_reminders")
-        
-        family_repo = FamilyRepository()
-        try:
-            user_circles = await family_repo.find_by_member(current_user_id, limit=100)
-        except Exception:
-            user_circles = []
-        
-        user_circle_ids = [circle["_id"] for circle in user_circles if circle and "_id" in circle]
-        
-        # Build visibility-aware query
-        # Records visible to user are:
-        # 1. Approved records where user has access (created, subject, assigned, or family/public visibility)
-        # 2. Pending approval records where user is the subject/assignee (need their approval)
-        
-        approved_query_conditions: List[Dict[str, Any]] = [
-            # Always visible: user is subject
-            {"subject_user_id": user_oid},
-            # Always visible: user created the record
-            {"created_by": user_oid},
-            # Always visible: user is assigned
-            {"assigned_user_ids": user_oid}
-        ]
-        
-        # Add family/public visibility from user's circles
-        if user_circle_ids:
-            approved_query_conditions.append({
-                "family_id": {"$in": user_circle_ids},
-                "visibility_scope": {"$in": ["family", "public"]}
-            })
-        
-        # Query for ALL records the user should see:
-        # - Approved records they have access to
-        # - Pending records assigned to them (for approval)
-        all_records_query = {
-            "$or": [
-                {
-                    "approval_status": "approved",
-                    "$or": approved_query_conditions
-                },
-                {
-                    "approval_status": "pending_approval",
-                    "$or": [
-                        {"subject_user_id": user_oid},
-                        {"assigned_user_ids": user_oid},
-                        {"created_by": user_oid}
-                    ]
-                }
-            ]
-        }
-        
-        all_records = await self.repository.find_many(
-            filter_dict=all_records_query,
-            limit=1000
-        )
-        
-        # Get pending approvals (records awaiting this user's approval)
-        pending_approvals = [
-            r for r in all_records
-            if (r.get("subject_user_id") == user_oid or user_oid in r.get("assigned_user_ids", []))
-            and r.get("approval_status") == "pending_approval"
-        ]
-        
-        user_reminders = await reminders_repo.find_many(
-            filter_dict={
-                "$or": [
-                    {"assigned_user_id": user_oid},
-                    {"created_by": user_oid}
-                ],
-                "status": {"$in": ["pending", "sent"]}
-            },
-            limit=10,
-            sort_by="due_at",
-            sort_order=1
-        )
+        # Visibility rules are compiled into the aggregation's $match; counts,
+        # pending approvals, recent records, reminders and user cards all come
+        # back from a single round trip.
+        dashboard = await self.repository.get_dashboard(current_user_id)
         
         stats = {
-            "total_records": len(all_records),
-            "pending_approvals": len(pending_approvals),
-            "upcoming_reminders": len(user_reminders),
-            "records_by_type": {},
-            "recent_records": []
+            "total_records": dashboard["total_records"],
+            "pending_approvals": dashboard["pending_approvals"],
+            "upcoming_reminders": dashboard["upcoming_reminders_total"],
+            "records_by_type": dashboard["records_by_type"],
+            "records_by_status": dashboard["records_by_status"],
+            "recent_records": dashboard["recent_records"]
         }
-        
-        for record in all_records:
-            rec_type = record.get("record_type", "unknown")
-            stats["records_by_type"][rec_type] = stats["records_by_type"].get(rec_type, 0) + 1
-        
-        sorted_records = sorted(all_records, key=lambda x: x["created_at"], reverse=True)[:10]
-        stats["recent_records"] = sorted_records
+        pending_approvals = dashboard["pending_records"]
+        user_reminders = dashboard["upcoming_reminders"]
         
         await log_audit_event(
             user_id=str(current_user_id),
@@ -830,5 +1193,7 @@ class HealthRecordService:
         return {
             "statistics": stats,
             "pending_approvals": pending_approvals,
-            "upcoming_reminders": user_reminders
+            "upcoming_reminders": user_reminders,
+            "records": dashboard["first_page"],
+            "user_lookup": dashboard["user_lookup"]
         }
@@ -1,6 +1,7 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from bson import ObjectId
 from datetime import datetime
+from pymongo import InsertOne
 
 from app.repositories.base_repository import BaseRepository
 from ..schemas.health_records import (
@@ -10,8 +11,9 @@ from ..schemas.health_records import (
 )
 from app.api.v1.endpoints.social.notifications import create_notification
 from app.schemas.notification import NotificationType
-from app.utils.audit_logger import log_audit_event
+from app.utils.audit_logger import log_audit_event, log_audit_events
 from app.repositories.family_repository import FamilyRepository
+from app.services.notification_service import NotificationService
 
 
 class ReminderService:
@@ -27,6 +29,7 @@ class ReminderService:
     def __init__(self):
         self.reminders_repo = BaseRepository("health_record_reminders")
         self.health_records_repo = BaseRepository("health_records")
+        self.notification_service = NotificationService()
     
     async def create_reminder(
         self,
@@ -114,6 +117,137 @@ class ReminderService:
         
         return reminder_doc
     
+    async def create_reminders_batch(
+        self,
+        reminders: List[HealthRecordReminderCreate],
+        current_user_id: str,
+        current_user_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Schedule several reminders with a single bulk_write.
+        
+        The referenced health records are fetched with one $in query and
+        access is checked once per record. Each assignee gets one notification
+        for the whole batch and audit entries are written in bulk.
+        
+        Args:
+            reminders: Reminder creation payloads
+            current_user_id: ID of the user creating the reminders
+            current_user_name: Name of the user creating the reminders
+            
+        Returns:
+            Created reminder documents, in request order
+            
+        Raises:
+            HTTPException: If any reminder references an invalid or inaccessible record
+        """
+        from fastapi import HTTPException, status
+        
+        record_oids = []
+        assigned_oids = []
+        for index, reminder in enumerate(reminders):
+            try:
+                record_oids.append(self.reminders_repo.validate_object_id(reminder.record_id, "record_id"))
+                assigned_oids.append(self.reminders_repo.validate_object_id(reminder.assigned_user_id, "assigned_user_id"))
+            except HTTPException as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"reminders[{index}]: {e.detail}")
+        
+        unique_oids = list(dict.fromkeys(record_oids))
+        records = {
+            record["_id"]: record
+            for record in await self.health_records_repo.find_many({"_id": {"$in": unique_oids}}, limit=len(unique_oids))
+        }
+        for record_oid in unique_oids:
+            record = records.get(record_oid)
+            if not record:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Health record not found: {record_oid}"
+                )
+            if not await self._check_record_access(record, current_user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Not authorized to create reminder for record {record_oid}"
+                )
+        
+        now = datetime.utcnow()
+        reminder_docs = [
+            {
+                "record_id": record_oid,
+                "assigned_user_id": assigned_oid,
+                "reminder_type": reminder.reminder_type,
+                "title": reminder.title,
+                "description": reminder.description,
+                "due_at": reminder.due_at,
+                "repeat_frequency": reminder.repeat_frequency,
+                "repeat_count": reminder.repeat_count,
+                "delivery_channels": reminder.delivery_channels,
+                "status": ReminderStatus.PENDING,
+                "metadata": reminder.metadata,
+                "created_by": ObjectId(current_user_id),
+                "created_at": now,
+                "updated_at": now
+            }
+            for reminder, record_oid, assigned_oid in zip(reminders, record_oids, assigned_oids)
+        ]
+        
+        # InsertOne fills in each document's _id in place
+        await self.reminders_repo.collection.bulk_write(
+            [InsertOne(reminder_doc) for reminder_doc in reminder_docs],
+            ordered=False
+        )
+        
+        by_assignee: Dict[str, List[Dict[str, Any]]] = {}
+        for reminder_doc in reminder_docs:
+            assignee_id = str(reminder_doc["assigned_user_id"])
+            if assignee_id != current_user_id:
+                by_assignee.setdefault(assignee_id, []).append(reminder_doc)
+        
+        creator = current_user_name or "Someone"
+        notifications = []
+        for assignee_id, assignee_reminders in by_assignee.items():
+            if len(assignee_reminders) == 1:
+                reminder_doc = assignee_reminders[0]
+                notifications.append({
+                    "user_id": assignee_id,
+                    "type": NotificationType.HEALTH_REMINDER_ASSIGNMENT.value,
+                    "title": "Health Reminder Assigned to You",
+                    "message": f"{creator} created a health reminder '{reminder_doc['title']}' for you due on {reminder_doc['due_at'].strftime('%B %d, %Y')}.",
+                    "actor_id": str(current_user_id),
+                    "target_type": "health_reminder",
+                    "target_id": str(reminder_doc["_id"])
+                })
+            else:
+                first_due = min(reminder_doc["due_at"] for reminder_doc in assignee_reminders)
+                notifications.append({
+                    "user_id": assignee_id,
+                    "type": NotificationType.HEALTH_REMINDER_ASSIGNMENT.value,
+                    "title": "Health Reminders Assigned to You",
+                    "message": f"{creator} created {len(assignee_reminders)} health reminders for you, the first due on {first_due.strftime('%B %d, %Y')}.",
+                    "actor_id": str(current_user_id),
+                    "target_type": "health_reminder",
+                    "reminder_ids": [reminder_doc["_id"] for reminder_doc in assignee_reminders],
+                    "metadata": {"reminder_count": len(assignee_reminders)}
+                })
+        await self.notification_service.create_notifications_batch(notifications)
+        
+        await log_audit_events([
+            {
+                "user_id": str(current_user_id),
+                "event_type": "CREATE_HEALTH_REMINDER",
+                "event_details": {
+                    "resource_type": "health_record_reminder",
+                    "resource_id": str(reminder_doc["_id"]),
+                    "reminder_type": reminder_doc["reminder_type"],
+                    "record_id": str(reminder_doc["record_id"]),
+                    "batch_size": len(reminder_docs)
+                }
+            }
+            for reminder_doc in reminder_docs
+        ])
+        
+        return reminder_docs
+    
     async def update_reminder(
         self,
         reminder_id: str,
@@ -1,12 +1,16 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.db.mongodb import connect_to_mongo, close_mongo_connection
-from app.utils.db_indexes import create_all_indexes
+from app.utils.db_indexes import ensure_indexes
+from app.services.audit_log_writer import audit_log_writer
+from app.services.counter_service import counter_service
+from app.core.metrics import MetricsMiddleware, monitor_event_loop_lag, render_metrics
+import asyncio
 import os
 import logging
 
@@ -17,20 +21,36 @@ logging.basicConfig(level=logging.INFO)
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
-    # Initialize database indexes for optimal performance
+    # Apply the index registry; a single lookup when it is already applied
     try:
-        await create_all_indexes()
+        await ensure_indexes()
     except Exception as e:
         print(f"Warning: Failed to create indexes: {e}")
+    
+    # Audit entries are batched in the background from here on
+    await audit_log_writer.start()
+    # Engagement counters are buffered and flushed in batches
+    await counter_service.start()
         
     # Start Scheduler Service
     from app.services.scheduler_service import SchedulerService
     scheduler = SchedulerService()
     scheduler.start()
     
+    loop_lag_probe = None
+    if settings.METRICS_ENABLED:
+        loop_lag_probe = asyncio.create_task(monitor_event_loop_lag(settings.METRICS_LOOP_LAG_INTERVAL_SECONDS))
+    
     yield
     # Shutdown
+    if loop_lag_probe:
+        loop_lag_probe.cancel()
     scheduler.shutdown()
+    await counter_service.stop()
+    await audit_log_writer.stop()
+    if settings.QUERY_PROFILER_ENABLED:
+        from app.db.query_profiler import query_profiler
+        query_profiler.dump(settings.QUERY_PROFILER_OUTPUT)
     await close_mongo_connection()
 
 app = FastAPI(
@@ -41,14 +61,18 @@ app = FastAPI(
 
 )
 
-# Logging middleware to print request method and path
+# Logging middleware to print request method and path (debug level; timings are in /metrics)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    origin = request.headers.get("origin")
-    logging.info(f"Incoming request: {request.method} {request.url.path} | Origin: {origin}")
+    logging.debug("Incoming request: %s %s | Origin: %s", request.method, request.url.path, request.headers.get("origin"))
     response = await call_next(request)
     return response
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 
 # Build allowed origins list for CORS
 allowed_origins = [
@@ -77,6 +101,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, payload size and MongoDB usage. Added last, so it is the
+# outermost middleware and times the whole stack, CORS included
+app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(api_router, prefix="/api/v1")
 
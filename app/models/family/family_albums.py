@@ -28,7 +28,8 @@ class AlbumPhotoCreate(BaseModel):
 
 class AlbumPhotoInDB(AlbumPhotoBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
-    likes: List[PyObjectId] = Field(default_factory=list)
+    album_id: PyObjectId
+    like_count: int = 0
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Config:
@@ -44,6 +45,7 @@ class AlbumPhotoResponse(BaseModel):
     uploaded_by: str
     uploaded_by_name: Optional[str] = None
     likes_count: int = 0
+    is_liked: bool = False
     uploaded_at: datetime
 
 
@@ -77,7 +79,7 @@ class FamilyAlbumInDB(BaseModel):
     created_by: PyObjectId
     family_circle_ids: List[PyObjectId] = Field(default_factory=list)
     member_ids: List[PyObjectId] = Field(default_factory=list)
-    photos: List[AlbumPhotoInDB] = Field(default_factory=list)
+    photos_count: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -31,6 +31,11 @@ class MilestoneCommentInDB(BaseModel):
     author_id: PyObjectId
     body: str
     parent_comment_id: Optional[PyObjectId] = None
+    thread_id: Optional[PyObjectId] = None
+    ancestor_ids: List[PyObjectId] = Field(default_factory=list)
+    depth: int = 0
+    path: Optional[str] = None
+    reply_count: int = 0
     visibility: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -51,6 +56,8 @@ class MilestoneCommentResponse(BaseModel):
     body: str
     parent_comment_id: Optional[str] = None
     visibility: str
+    depth: int = 0
+    reply_count: int = 0
     created_at: datetime
     updated_at: datetime
     replies: List["MilestoneCommentResponse"] = Field(default_factory=list)
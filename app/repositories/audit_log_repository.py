@@ -1,116 +1,326 @@
 """
 Repository for audit log operations
+
+Audit entries are stored in monthly buckets (audit_logs_YYYY_MM) chosen from
+each entry's created_at. Reads fan out only to the buckets a date range
+touches, newest first, and stop as soon as the requested page is filled.
+Entries written before bucketing live in the legacy audit_logs collection,
+which is treated as the oldest bucket until it has been migrated.
 """
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from bson import ObjectId
 import logging
+import re
 
-from app.db.mongodb import get_collection
+from app.core.config import settings
+from app.db.mongodb import get_collection, get_database
+from app.services.audit_log_writer import audit_log_writer
 from app.schemas.audit_log import AuditLogCreate, AuditLogResponse, AuditAction
 
 logger = logging.getLogger(__name__)
 
+LEGACY_COLLECTION = "audit_logs"
+BUCKET_PREFIX = "audit_logs_"
+_BUCKET_PATTERN = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+
+# Buckets whose indexes were created by this process
+_ensured_buckets: set = set()
+
+
+def bucket_name(moment: datetime) -> str:
+    """Name of the monthly bucket an entry created at moment belongs to"""
+    return f"{BUCKET_PREFIX}{moment.year:04d}_{moment.month:02d}"
+
+
+def bucket_start(name: str) -> Optional[datetime]:
+    """First instant covered by a bucket, or None for non-bucket names"""
+    match = _BUCKET_PATTERN.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def next_month(moment: datetime) -> datetime:
+    """First instant of the month after moment"""
+    if moment.month == 12:
+        return datetime(moment.year + 1, 1, 1)
+    return datetime(moment.year, moment.month + 1, 1)
+
+
+def buckets_between(start: datetime, end: datetime) -> List[str]:
+    """Bucket names covering [start, end], newest first"""
+    names = []
+    month = datetime(start.year, start.month, 1)
+    while month <= end:
+        names.append(bucket_name(month))
+        month = next_month(month)
+    return list(reversed(names))
+
+
+def apply_retention(document: Dict[str, Any]) -> None:
+    """
+    Stamp expires_at on low-value entries so the bucket's TTL index removes them.
+
+    Tiers are configured in AUDIT_TTL_DAYS by event_type (log_audit_event) or
+    action (create_log); entries without a tier are kept until archival.
+    """
+    tier = document.get("event_type") or document.get("action")
+    if isinstance(tier, AuditAction):
+        tier = tier.value
+    days = settings.AUDIT_TTL_DAYS.get(tier) if tier else None
+    if days:
+        document["expires_at"] = document["created_at"] + timedelta(days=days)
+
 
 class AuditLogRepository:
     """Repository for managing audit logs"""
-    
+
     def __init__(self):
-        self.collection_name = "audit_logs"
-    
+        self.collection_name = LEGACY_COLLECTION
+
+    def route(self, document: Dict[str, Any]) -> str:
+        """Fill in created_at/expires_at and return the bucket the entry belongs to"""
+        document.setdefault("created_at", datetime.utcnow())
+        apply_retention(document)
+        return bucket_name(document["created_at"])
+
+    async def write(self, documents: List[Dict[str, Any]]) -> None:
+        """
+        Store raw audit documents in their monthly buckets.
+
+        Documents go through the background audit writer when it is running,
+        and are inserted directly otherwise.
+        """
+        by_bucket: Dict[str, List[Dict[str, Any]]] = {}
+        for document in documents:
+            by_bucket.setdefault(self.route(document), []).append(document)
+
+        for name, bucket_docs in by_bucket.items():
+            if audit_log_writer.running:
+                audit_log_writer.submit_many(name, bucket_docs)
+            else:
+                await self.ensure_bucket(name)
+                await get_collection(name).insert_many(bucket_docs, ordered=False)
+
+    async def ensure_bucket(self, name: str) -> None:
+        """
+        Create a bucket's indexes once per process.
+
+        Indexes are partial on the fields that distinguish the two entry shapes
+        (user events vs. resource actions), so each insert only maintains the
+        indexes that apply to it. expires_at drives the TTL tiers.
+        """
+        if name in _ensured_buckets:
+            return
+        collection = get_collection(name)
+        await collection.create_index(
+            [("user_id", 1), ("created_at", -1)],
+            partialFilterExpression={"user_id": {"$exists": True}}
+        )
+        await collection.create_index(
+            [("event_type", 1), ("created_at", -1)],
+            partialFilterExpression={"event_type": {"$exists": True}}
+        )
+        await collection.create_index(
+            [("resource_type", 1), ("resource_id", 1), ("created_at", -1)],
+            partialFilterExpression={"resource_type": {"$exists": True}}
+        )
+        await collection.create_index(
+            [("actor_id", 1), ("created_at", -1)],
+            partialFilterExpression={"actor_id": {"$exists": True}}
+        )
+        await collection.create_index(
+            "expires_at",
+            expireAfterSeconds=0,
+            partialFilterExpression={"expires_at": {"$exists": True}}
+        )
+        _ensured_buckets.add(name)
+
+    async def ensure_upcoming_buckets(self, now: Optional[datetime] = None) -> None:
+        """Prepare this month's and next month's buckets ahead of the first write"""
+        now = now or datetime.utcnow()
+        await self.ensure_bucket(bucket_name(now))
+        await self.ensure_bucket(bucket_name(next_month(now)))
+
+    async def list_buckets(self) -> List[str]:
+        """Existing bucket collections, newest first"""
+        names = await get_database().list_collection_names(
+            filter={"name": {"$regex": _BUCKET_PATTERN.pattern}}
+        )
+        return sorted(names, reverse=True)
+
+    async def _sources(self, start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+        """Collections that can hold entries in [start, end], newest first"""
+        existing = await self.list_buckets()
+        sources = existing
+        if existing and (start or end):
+            lower = start or bucket_start(existing[-1])
+            upper = end or datetime.utcnow()
+            wanted = set(buckets_between(lower, upper))
+            sources = [name for name in existing if name in wanted]
+
+        # The created_at filter keeps the unbucketed collection range-correct
+        if await get_database().list_collection_names(filter={"name": LEGACY_COLLECTION}):
+            sources.append(LEGACY_COLLECTION)
+        return sources
+
+    async def find_logs(
+        self,
+        query: Dict[str, Any],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100,
+        skip: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Find audit entries newest first across the buckets [start, end] touches.
+
+        Buckets are visited from newest to oldest; whole buckets are skipped by
+        count until the requested offset is reached, and no further buckets
+        are read once limit entries have been collected.
+        """
+        query = dict(query)
+        if start or end:
+            created_range: Dict[str, Any] = {}
+            if start:
+                created_range["$gte"] = start
+            if end:
+                created_range["$lte"] = end
+            query["created_at"] = created_range
+
+        results: List[Dict[str, Any]] = []
+        remaining_skip = skip
+        for name in await self._sources(start, end):
+            collection = get_collection(name)
+            if remaining_skip:
+                in_bucket = await collection.count_documents(query)
+                if in_bucket <= remaining_skip:
+                    remaining_skip -= in_bucket
+                    continue
+            wanted = limit - len(results)
+            cursor = collection.find(query).sort("created_at", -1).skip(remaining_skip).limit(wanted)
+            results.extend(await cursor.to_list(length=wanted))
+            remaining_skip = 0
+            if len(results) >= limit:
+                break
+        return results
+
     async def create_log(self, log_data: AuditLogCreate) -> Dict[str, Any]:
         """Create a new audit log entry"""
         try:
             log_dict = log_data.model_dump(exclude_none=True)
             log_dict["created_at"] = datetime.utcnow()
-            
+
             # Convert string IDs to ObjectIds
             if "resource_id" in log_dict and ObjectId.is_valid(log_dict["resource_id"]):
                 log_dict["resource_id"] = ObjectId(log_dict["resource_id"])
-            
+
             if "actor_id" in log_dict and ObjectId.is_valid(log_dict["actor_id"]):
                 log_dict["actor_id"] = ObjectId(log_dict["actor_id"])
-            
+
             if "target_user_id" in log_dict and log_dict["target_user_id"] and ObjectId.is_valid(log_dict["target_user_id"]):
                 log_dict["target_user_id"] = ObjectId(log_dict["target_user_id"])
-            
-            result = await get_collection(self.collection_name).insert_one(log_dict)
-            log_dict["_id"] = result.inserted_id
-            
+
+            # Queued for the next batch when the writer runs; the _id is assigned client-side
+            log_dict.setdefault("_id", ObjectId())
+            await self.write([log_dict])
+
             logger.info(f"Audit log created: {log_data.action} on {log_data.resource_type} by {log_data.actor_name}")
             return log_dict
-        
+
         except Exception as e:
             logger.error(f"Error creating audit log: {str(e)}")
             raise
-    
+
+    async def create_logs(self, logs: List[AuditLogCreate]) -> int:
+        """Create several audit log entries with a single insert; returns the number queued or written"""
+        if not logs:
+            return 0
+        try:
+            now = datetime.utcnow()
+            log_dicts = []
+            for log_data in logs:
+                log_dict = log_data.model_dump(exclude_none=True)
+                log_dict["created_at"] = now
+                for field in ("resource_id", "actor_id", "target_user_id"):
+                    if log_dict.get(field) and ObjectId.is_valid(log_dict[field]):
+                        log_dict[field] = ObjectId(log_dict[field])
+                log_dicts.append(log_dict)
+
+            await self.write(log_dicts)
+            logger.info(f"{len(log_dicts)} audit logs created: {logs[0].action} on {logs[0].resource_type}")
+            return len(log_dicts)
+
+        except Exception as e:
+            logger.error(f"Error creating audit logs: {str(e)}")
+            raise
+
     async def find_by_resource(
         self,
         resource_type: str,
         resource_id: str,
         limit: int = 100,
-        skip: int = 0
+        skip: int = 0,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """Find all audit logs for a specific resource"""
         try:
             resource_oid = ObjectId(resource_id) if ObjectId.is_valid(resource_id) else resource_id
-            
-            cursor = get_collection(self.collection_name).find({
-                "resource_type": resource_type,
-                "resource_id": resource_oid
-            }).sort("created_at", -1).skip(skip).limit(limit)
-            
-            logs = await cursor.to_list(length=limit)
-            return logs
-        
+
+            return await self.find_logs(
+                {"resource_type": resource_type, "resource_id": resource_oid},
+                start=start, end=end, limit=limit, skip=skip
+            )
+
         except Exception as e:
             logger.error(f"Error finding audit logs for resource {resource_id}: {str(e)}")
             return []
-    
+
     async def find_by_actor(
         self,
         actor_id: str,
         limit: int = 100,
-        skip: int = 0
+        skip: int = 0,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """Find all audit logs by a specific actor"""
         try:
             actor_oid = ObjectId(actor_id) if ObjectId.is_valid(actor_id) else actor_id
-            
-            cursor = get_collection(self.collection_name).find({
-                "actor_id": actor_oid
-            }).sort("created_at", -1).skip(skip).limit(limit)
-            
-            logs = await cursor.to_list(length=limit)
-            return logs
-        
+
+            return await self.find_logs(
+                {"actor_id": actor_oid},
+                start=start, end=end, limit=limit, skip=skip
+            )
+
         except Exception as e:
             logger.error(f"Error finding audit logs for actor {actor_id}: {str(e)}")
             return []
-    
+
     async def find_by_action(
         self,
         action: AuditAction,
         resource_type: Optional[str] = None,
         limit: int = 100,
-        skip: int = 0
+        skip: int = 0,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """Find all audit logs for a specific action type"""
         try:
             query: Dict[str, Any] = {"action": action}
-            
+
             if resource_type:
                 query["resource_type"] = resource_type
-            
-            cursor = get_collection(self.collection_name).find(query).sort("created_at", -1).skip(skip).limit(limit)
-            
-            logs = await cursor.to_list(length=limit)
-            return logs
-        
+
+            return await self.find_logs(query, start=start, end=end, limit=limit, skip=skip)
+
         except Exception as e:
             logger.error(f"Error finding audit logs for action {action}: {str(e)}")
             return []
-    
+
     def format_response(self, log_doc: Dict[str, Any]) -> AuditLogResponse:
         """Format audit log document as response"""
         return AuditLogResponse(
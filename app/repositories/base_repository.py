@@ -2,6 +2,7 @@ from typing import Optional, List, Dict, Any, TypeVar, Generic
 from bson import ObjectId
 from datetime import datetime
 from fastapi import HTTPException
+from app.core.config import settings
 from app.db.mongodb import get_collection
 
 T = TypeVar('T')
@@ -11,25 +12,37 @@ class BaseRepository(Generic[T]):
     """
     Generic base repository providing common CRUD operations for MongoDB collections.
     Eliminates code duplication and provides consistent data access patterns.
+    
+    Reads are bounded server-side by MONGODB_DEFAULT_MAX_TIME_MS; the read
+    methods take a max_time_ms argument to override it for one call. Methods
+    that return documents take an optional projection (see
+    app.repositories.projections for the shared presets).
     """
     
-    def __init__(self, collection_name: str):
+    def __init__(self, collection_name: str, workload: Optional[str] = None):
         """
         Initialize repository with collection name.
         
         Args:
             collection_name: Name of the MongoDB collection
+            workload: Read workload ("analytics", "search", "export"); reads of the
+                workloads in MONGODB_SECONDARY_READ_WORKLOADS prefer secondaries
         """
         self.collection_name = collection_name
+        self.workload = workload
         self._collection = None
     
     @property
     def collection(self):
         """Get the MongoDB collection instance."""
         if self._collection is None:
-            self._collection = get_collection(self.collection_name)
+            self._collection = get_collection(self.collection_name, self.workload)
         return self._collection
     
+    def max_time(self, max_time_ms: Optional[int] = None) -> int:
+        """Server-side time limit for a read: the per-call override or the configured default."""
+        return max_time_ms if max_time_ms is not None else settings.MONGODB_DEFAULT_MAX_TIME_MS
+    
     def validate_object_id(self, id_str: str, field_name: str = "ID") -> ObjectId:
         """
         Validate and convert string to ObjectId.
@@ -72,7 +85,9 @@ class BaseRepository(Generic[T]):
         self,
         filter_dict: Dict[str, Any],
         raise_404: bool = True,
-        error_message: str = "Document not found"
+        error_message: str = "Document not found",
+        max_time_ms: Optional[int] = None,
+        projection: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Find a single document by filter.
@@ -81,6 +96,8 @@ class BaseRepository(Generic[T]):
             filter_dict: MongoDB filter criteria
             raise_404: Whether to raise 404 if not found
             error_message: Custom error message
+            max_time_ms: Server-side time limit overriding the default
+            projection: Fields to return (default: the whole document)
             
         Returns:
             Document if found, None otherwise
@@ -88,7 +105,7 @@ class BaseRepository(Generic[T]):
         Raises:
             HTTPException: If document not found and raise_404=True
         """
-        doc = await self.collection.find_one(filter_dict)
+        doc = await self.collection.find_one(filter_dict, projection, max_time_ms=self.max_time(max_time_ms))
         if not doc and raise_404:
             raise HTTPException(status_code=404, detail=error_message)
         return doc
@@ -97,7 +114,8 @@ class BaseRepository(Generic[T]):
         self,
         doc_id: str,
         raise_404: bool = True,
-        error_message: str = "Document not found"
+        error_message: str = "Document not found",
+        projection: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Find a document by ID.
@@ -106,12 +124,13 @@ class BaseRepository(Generic[T]):
             doc_id: String representation of document ID
             raise_404: Whether to raise 404 if not found
             error_message: Custom error message
+            projection: Fields to return (default: the whole document)
             
         Returns:
             Document if found, None otherwise
         """
         oid = self.validate_object_id(doc_id, "document ID")
-        return await self.find_one({"_id": oid}, raise_404, error_message)
+        return await self.find_one({"_id": oid}, raise_404, error_message, projection=projection)
     
     async def find_many(
         self,
@@ -119,7 +138,9 @@ class BaseRepository(Generic[T]):
         skip: int = 0,
         limit: int = 50,
         sort_by: Optional[str] = None,
-        sort_order: int = -1
+        sort_order: int = -1,
+        max_time_ms: Optional[int] = None,
+        projection: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find multiple documents with pagination and sorting.
@@ -130,6 +151,8 @@ class BaseRepository(Generic[T]):
             limit: Maximum number of documents to return
             sort_by: Field name to sort by
             sort_order: Sort order (1 for ascending, -1 for descending)
+            max_time_ms: Server-side time limit overriding the default
+            projection: Fields to return (default: whole documents)
             
         Returns:
             List of documents
@@ -137,26 +160,27 @@ class BaseRepository(Generic[T]):
         if filter_dict is None:
             filter_dict = {}
         
-        cursor = self.collection.find(filter_dict).skip(skip).limit(limit)
+        cursor = self.collection.find(filter_dict, projection).skip(skip).limit(limit).max_time_ms(self.max_time(max_time_ms))
         
         if sort_by:
             cursor = cursor.sort(sort_by, sort_order)
         
         return await cursor.to_list(length=limit)
     
-    async def count(self, filter_dict: Optional[Dict[str, Any]] = None) -> int:
+    async def count(self, filter_dict: Optional[Dict[str, Any]] = None, max_time_ms: Optional[int] = None) -> int:
         """
         Count documents matching filter.
         
         Args:
             filter_dict: MongoDB filter criteria (default: {})
+            max_time_ms: Server-side time limit overriding the default
             
         Returns:
             Number of matching documents
         """
         if filter_dict is None:
             filter_dict = {}
-        return await self.collection.count_documents(filter_dict)
+        return await self.collection.count_documents(filter_dict, maxTimeMS=self.max_time(max_time_ms))
     
     async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -191,7 +215,8 @@ class BaseRepository(Generic[T]):
         self,
         filter_dict: Dict[str, Any],
         update_data: Dict[str, Any],
-        raise_404: bool = True
+        raise_404: bool = True,
+        projection: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Update a document.
@@ -200,6 +225,7 @@ class BaseRepository(Generic[T]):
             filter_dict: MongoDB filter criteria
             update_data: Data to update
             raise_404: Whether to raise 404 if not found
+            projection: Fields of the updated document to return
             
         Returns:
             Updated document
@@ -218,7 +244,7 @@ class BaseRepository(Generic[T]):
             if result.matched_count == 0 and raise_404:
                 raise HTTPException(status_code=404, detail="Document not found")
             
-            return await self.find_one(filter_dict, raise_404=False)
+            return await self.find_one(filter_dict, raise_404=False, projection=projection)
         except HTTPException:
             raise
         except Exception as e:
@@ -231,7 +257,8 @@ class BaseRepository(Generic[T]):
         self,
         doc_id: str,
         update_data: Dict[str, Any],
-        raise_404: bool = True
+        raise_404: bool = True,
+        projection: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Update a document by ID.
@@ -240,12 +267,13 @@ class BaseRepository(Generic[T]):
             doc_id: String representation of document ID
             update_data: Data to update
             raise_404: Whether to raise 404 if not found
+            projection: Fields of the updated document to return
             
         Returns:
             Updated document
         """
         oid = self.validate_object_id(doc_id, "document ID")
-        return await self.update({"_id": oid}, update_data, raise_404)
+        return await self.update({"_id": oid}, update_data, raise_404, projection=projection)
     
     async def delete(
         self,
@@ -307,22 +335,25 @@ class BaseRepository(Generic[T]):
         result = await self.collection.delete_many(filter_dict)
         return result.deleted_count
     
-    async def exists(self, filter_dict: Dict[str, Any]) -> bool:
+    async def exists(self, filter_dict: Dict[str, Any], max_time_ms: Optional[int] = None) -> bool:
         """
         Check if a document exists.
         
         Args:
             filter_dict: MongoDB filter criteria
+            max_time_ms: Server-side time limit overriding the default
             
         Returns:
             True if document exists
         """
-        doc = await self.collection.find_one(filter_dict, {"_id": 1})
+        doc = await self.collection.find_one(filter_dict, {"_id": 1}, max_time_ms=self.max_time(max_time_ms))
         return doc is not None
     
     async def aggregate(
         self,
         pipeline: List[Dict[str, Any]],
+        max_time_ms: Optional[int] = None,
+        projection: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> List[Dict[str, Any]]:
         """
@@ -330,12 +361,16 @@ class BaseRepository(Generic[T]):
         
         Args:
             pipeline: MongoDB aggregation pipeline
+            max_time_ms: Server-side time limit overriding the default
+            projection: Fields of each result to return, applied as a final $project
             **kwargs: Additional options for aggregation
             
         Returns:
             List of aggregation results
         """
-        cursor = self.collection.aggregate(pipeline, **kwargs)
+        if projection:
+            pipeline = pipeline + [{"$project": projection}]
+        cursor = self.collection.aggregate(pipeline, maxTimeMS=self.max_time(max_time_ms), **kwargs)
         return await cursor.to_list(length=None)
     
     async def aggregate_paginated(
@@ -343,6 +378,8 @@ class BaseRepository(Generic[T]):
         pipeline: List[Dict[str, Any]],
         skip: int = 0,
         limit: int = 20,
+        max_time_ms: Optional[int] = None,
+        projection: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -356,11 +393,14 @@ class BaseRepository(Generic[T]):
             pipeline: MongoDB aggregation pipeline (without $skip/$limit)
             skip: Number of documents to skip
             limit: Maximum number of documents to return
+            max_time_ms: Server-side time limit for each run, overriding the default
+            projection: Fields of each item to return, applied after $skip/$limit
             **kwargs: Additional options for aggregation
             
         Returns:
             PaginatedResponse-compatible dictionary with items and pagination metadata
         """
+        kwargs["maxTimeMS"] = self.max_time(max_time_ms)
         count_pipeline = pipeline + [{"$count": "total"}]
         count_result = await self.collection.aggregate(count_pipeline, **kwargs).to_list(length=1)
         total = count_result[0]["total"] if count_result else 0
@@ -369,6 +409,8 @@ class BaseRepository(Generic[T]):
             {"$skip": skip},
             {"$limit": limit}
         ]
+        if projection:
+            data_pipeline.append({"$project": projection})
         items = await self.collection.aggregate(data_pipeline, **kwargs).to_list(length=limit)
         
         page = (skip // limit) + 1 if limit > 0 else 1
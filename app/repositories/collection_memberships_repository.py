@@ -0,0 +1,300 @@
+from collections import Counter
+from typing import List, Dict, Any, Optional
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.db.mongodb import get_collection
+from .base_repository import BaseRepository
+from .projections import MEMORY_CARD
+
+# Distance between consecutive positions; a move takes the midpoint of its neighbours
+POSITION_GAP = 1024
+
+
+class CollectionMembershipRepository(BaseRepository):
+    """
+    Repository for the ordered memories of a collection (collection_memories).
+
+    Every link carries a position; the parent collection document caches
+    memory_count, last_position and the automatically chosen cover
+    (cover_memory_id, auto_cover_url) so list and detail views never count or
+    scan the links. Collections created before positions existed are backfilled
+    on first use by ensure_positions.
+    """
+
+    def __init__(self):
+        super().__init__("collection_memories")
+
+    @property
+    def collections(self):
+        """The parent collections collection, where the cached fields live."""
+        return get_collection("collections")
+
+    async def ensure_positions(self, col_doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Backfill positions, memory_count and cover for a collection without them.
+
+        Links are numbered in the order they were added, which is the order the
+        collection was shown in before. Running it twice assigns the same values.
+
+        Args:
+            col_doc: Collection document
+
+        Returns:
+            The collection document with the cached fields filled in
+        """
+        if "last_position" in col_doc:
+            return col_doc
+
+        col_oid = col_doc["_id"]
+        links = await self.collection.find(
+            {"collection_id": col_oid}, {"_id": 1}
+        ).sort([("added_at", 1), ("_id", 1)]).to_list(length=None)
+        if links:
+            await self.collection.bulk_write([
+                UpdateOne({"_id": link["_id"]}, {"$set": {"position": (index + 1) * POSITION_GAP}})
+                for index, link in enumerate(links)
+            ], ordered=False)
+
+        cached = {"memory_count": len(links), "last_position": len(links) * POSITION_GAP}
+        await self.collections.update_one(
+            {"_id": col_oid, "last_position": {"$exists": False}},
+            {"$set": cached}
+        )
+        col_doc.update(cached)
+        col_doc.update(await self.refresh_cover(col_oid))
+        return col_doc
+
+    async def add_memory(self, col_doc: Dict[str, Any], memory_doc: Dict[str, Any]) -> bool:
+        """
+        Append a memory to the end of a collection.
+
+        The position is reserved by incrementing last_position and memory_count
+        on the collection in the same update; the increment is reverted when the
+        unique (collection_id, memory_id) index rejects a duplicate.
+
+        Returns:
+            False if the memory was already in the collection
+        """
+        col_doc = await self.ensure_positions(col_doc)
+        col_oid = col_doc["_id"]
+        reserved = await self.collections.find_one_and_update(
+            {"_id": col_oid},
+            {"$inc": {"memory_count": 1, "last_position": POSITION_GAP}},
+            projection={"last_position": 1, "cover_memory_id": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+        try:
+            await self.collection.insert_one({
+                "collection_id": col_oid,
+                "memory_id": memory_doc["_id"],
+                "position": reserved["last_position"],
+                "added_at": datetime.utcnow()
+            })
+        except DuplicateKeyError:
+            await self.collections.update_one({"_id": col_oid}, {"$inc": {"memory_count": -1}})
+            return False
+
+        media_urls = memory_doc.get("media_urls") or []
+        if not reserved.get("cover_memory_id") and media_urls:
+            await self.collections.update_one(
+                {"_id": col_oid, "cover_memory_id": None},
+                {"$set": {"cover_memory_id": memory_doc["_id"], "auto_cover_url": media_urls[0]}}
+            )
+        return True
+
+    async def remove_memory(self, col_doc: Dict[str, Any], memory_oid: ObjectId) -> bool:
+        """
+        Remove a memory from a collection, choosing a new cover if it was the cover.
+
+        Returns:
+            False if the memory was not in the collection
+        """
+        col_doc = await self.ensure_positions(col_doc)
+        col_oid = col_doc["_id"]
+        result = await self.collection.delete_one({"collection_id": col_oid, "memory_id": memory_oid})
+        if result.deleted_count == 0:
+            return False
+
+        updated = await self.collections.find_one_and_update(
+            {"_id": col_oid},
+            {"$inc": {"memory_count": -1}},
+            projection={"cover_memory_id": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated and updated.get("cover_memory_id") == memory_oid:
+            await self.refresh_cover(col_oid)
+        return True
+
+    async def remove_memories(self, memory_oids: List[ObjectId]) -> None:
+        """Remove deleted memories from every collection holding them, keeping counts and covers in step."""
+        if not memory_oids:
+            return
+        links = await self.collection.find(
+            {"memory_id": {"$in": memory_oids}}, {"collection_id": 1}
+        ).to_list(length=None)
+        if not links:
+            return
+
+        await self.collection.delete_many({"memory_id": {"$in": memory_oids}})
+        removed = Counter(link["collection_id"] for link in links)
+        await self.collections.bulk_write([
+            UpdateOne({"_id": col_oid, "last_position": {"$exists": True}}, {"$inc": {"memory_count": -count}})
+            for col_oid, count in removed.items()
+        ], ordered=False)
+
+        async for col_doc in self.collections.find({"cover_memory_id": {"$in": memory_oids}}, {"_id": 1}):
+            await self.refresh_cover(col_doc["_id"])
+
+    async def move_memory(
+        self,
+        col_doc: Dict[str, Any],
+        memory_oid: ObjectId,
+        after_memory_oid: Optional[ObjectId] = None
+    ) -> bool:
+        """
+        Move a memory directly after another one, or to the front.
+
+        Only the moved link is rewritten: it takes the midpoint between its new
+        neighbours. When two neighbours are adjacent integers the collection is
+        renumbered first.
+
+        Args:
+            col_doc: Collection document
+            memory_oid: Memory to move
+            after_memory_oid: Memory to place it after; None moves it to the front
+
+        Returns:
+            False if either memory is not in the collection
+        """
+        col_doc = await self.ensure_positions(col_doc)
+        col_oid = col_doc["_id"]
+        if not await self.collection.find_one({"collection_id": col_oid, "memory_id": memory_oid}, {"_id": 1}):
+            return False
+
+        for attempt in range(2):
+            if after_memory_oid is None:
+                lower = 0
+            else:
+                anchor = await self.collection.find_one(
+                    {"collection_id": col_oid, "memory_id": after_memory_oid}, {"position": 1}
+                )
+                if not anchor:
+                    return False
+                lower = anchor["position"]
+
+            following = await self.collection.find_one(
+                {"collection_id": col_oid, "position": {"$gt": lower}, "memory_id": {"$ne": memory_oid}},
+                {"position": 1},
+                sort=[("position", 1)]
+            )
+            upper = following["position"] if following else lower + 2 * POSITION_GAP
+            if upper - lower >= 2 or attempt:
+                break
+            await self.renumber(col_oid)
+
+        position = (lower + upper) // 2
+        await self.collection.update_one(
+            {"collection_id": col_oid, "memory_id": memory_oid},
+            {"$set": {"position": position}}
+        )
+        await self.collections.update_one({"_id": col_oid}, {"$max": {"last_position": position}})
+        await self.refresh_cover(col_oid)
+        return True
+
+    async def renumber(self, col_oid: ObjectId) -> None:
+        """Spread a collection's positions POSITION_GAP apart again, keeping their order."""
+        links = await self.collection.find(
+            {"collection_id": col_oid}, {"_id": 1}
+        ).sort([("position", 1), ("_id", 1)]).to_list(length=None)
+        if links:
+            await self.collection.bulk_write([
+                UpdateOne({"_id": link["_id"]}, {"$set": {"position": (index + 1) * POSITION_GAP}})
+                for index, link in enumerate(links)
+            ], ordered=False)
+        await self.collections.update_one(
+            {"_id": col_oid},
+            {"$set": {"last_position": len(links) * POSITION_GAP}}
+        )
+
+    async def refresh_cover(self, col_oid: ObjectId) -> Dict[str, Any]:
+        """
+        Make the first memory with media the collection's automatic cover.
+
+        Returns:
+            The cover fields that were stored
+        """
+        first = await self.collection.aggregate([
+            {"$match": {"collection_id": col_oid}},
+            {"$sort": {"position": 1}},
+            {"$lookup": {
+                "from": "memories",
+                "let": {"memory_id": "$memory_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$memory_id"]}, "media_urls.0": {"$exists": True}}},
+                    {"$project": {"cover": {"$arrayElemAt": ["$media_urls", 0]}}}
+                ],
+                "as": "memory"
+            }},
+            {"$unwind": "$memory"},
+            {"$limit": 1},
+            {"$project": {"memory_id": 1, "cover": "$memory.cover"}}
+        ], maxTimeMS=self.max_time()).to_list(length=1)
+
+        cover = {
+            "cover_memory_id": first[0]["memory_id"] if first else None,
+            "auto_cover_url": first[0]["cover"] if first else None
+        }
+        await self.collections.update_one({"_id": col_oid}, {"$set": cover})
+        return cover
+
+    async def member_ids(self, col_oid: ObjectId) -> List[str]:
+        """Memory ids of a collection in display order."""
+        cursor = self.collection.find(
+            {"collection_id": col_oid}, {"memory_id": 1, "_id": 0}
+        ).sort("position", 1).max_time_ms(self.max_time())
+        return [str(link["memory_id"]) async for link in cursor]
+
+    async def find_page(self, col_oid: ObjectId, skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        One page of a collection's memories in display order.
+
+        Links are paged on the (collection_id, position) index before the
+        memories and their owners' names are joined in, so the cost follows the
+        page size rather than the collection size.
+
+        Returns:
+            Memory cards (MEMORY_CARD fields plus owner_name) with the link's position
+        """
+        return await self.aggregate([
+            {"$match": {"collection_id": col_oid}},
+            {"$sort": {"position": 1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$lookup": {
+                "from": "memories",
+                "let": {"memory_id": "$memory_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$memory_id"]}}},
+                    {"$project": MEMORY_CARD},
+                    {"$lookup": {
+                        "from": "users",
+                        "let": {"owner_id": "$owner_id"},
+                        "pipeline": [
+                            {"$match": {"$expr": {"$eq": ["$_id", "$$owner_id"]}}},
+                            {"$project": {"full_name": 1}}
+                        ],
+                        "as": "owner"
+                    }}
+                ],
+                "as": "memory"
+            }},
+            {"$unwind": "$memory"},
+            {"$replaceRoot": {"newRoot": {"$mergeObjects": [
+                "$memory",
+                {"position": "$position", "owner_name": {"$arrayElemAt": ["$memory.owner.full_name", 0]}}
+            ]}}},
+            {"$project": {"owner": 0}}
+        ])
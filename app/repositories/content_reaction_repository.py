@@ -0,0 +1,107 @@
+from typing import Dict, Any, Optional, Tuple
+from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from .base_repository import BaseRepository
+from .reaction_counts_repository import ReactionCountsRepository, reaction_key
+
+
+class ContentReactionRepository(BaseRepository):
+    """
+    Repository for emoji reactions on memories, comments and stories (reactions).
+
+    A user has at most one reaction per target, enforced by the unique
+    (target_type, target_id, user_id) index and written with a single upsert.
+    Every change is applied to the target's histogram and to the user's, so
+    summaries and user stats never scan the reactions.
+    """
+
+    def __init__(self):
+        super().__init__("reactions")
+        self.histograms = ReactionCountsRepository("reactions", "user_id", "emoji")
+
+    @staticmethod
+    def _target(target_type: str, target_id: str) -> Tuple[str, Dict[str, Any]]:
+        return f"{target_type}:{target_id}", {"target_type": target_type, "target_id": target_id}
+
+    @staticmethod
+    def _user(user_id: str) -> Tuple[str, Dict[str, Any]]:
+        return f"user:{user_id}", {"user_id": user_id}
+
+    async def set_reaction(
+        self,
+        user_id: str,
+        target_type: str,
+        target_id: str,
+        emoji: str
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Add a user's reaction to a target, or change it.
+
+        Returns:
+            (reaction document, previous emoji or None if the reaction is new)
+        """
+        emoji = reaction_key(emoji)
+        now = datetime.utcnow()
+        reaction_filter = {"target_type": target_type, "target_id": target_id, "user_id": user_id}
+        inserted_id = ObjectId()
+
+        # Two first reactions racing both try to insert; the loser retries as an update
+        for attempt in range(2):
+            try:
+                before = await self.collection.find_one_and_update(
+                    reaction_filter,
+                    {
+                        "$set": {"emoji": emoji, "updated_at": now},
+                        "$setOnInsert": {"_id": inserted_id, "created_at": now}
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.BEFORE
+                )
+                break
+            except DuplicateKeyError:
+                if attempt:
+                    raise
+
+        previous = before.get("emoji") if before else None
+        reaction = {**(before or {"_id": inserted_id, "created_at": now}), **reaction_filter, "emoji": emoji, "updated_at": now}
+
+        await self.histograms.record(*self._target(target_type, target_id), user_id, previous, emoji)
+        await self.histograms.record(*self._user(user_id), user_id, previous, emoji, track_recent=False)
+        return reaction, previous
+
+    async def remove_reaction(self, user_id: str, target_type: str, target_id: str) -> bool:
+        """
+        Remove a user's reaction from a target.
+
+        Returns:
+            False if the user had not reacted
+        """
+        removed = await self.collection.find_one_and_delete(
+            {"target_type": target_type, "target_id": target_id, "user_id": user_id},
+            projection={"emoji": 1}
+        )
+        if not removed:
+            return False
+
+        await self.histograms.record(*self._target(target_type, target_id), user_id, removed["emoji"], None)
+        await self.histograms.record(*self._user(user_id), user_id, removed["emoji"], None, track_recent=False)
+        return True
+
+    async def user_reaction(self, user_id: str, target_type: str, target_id: str) -> Optional[str]:
+        """The user's emoji on a target, if any."""
+        reaction = await self.find_one(
+            {"target_type": target_type, "target_id": target_id, "user_id": user_id},
+            raise_404=False,
+            projection={"emoji": 1}
+        )
+        return reaction["emoji"] if reaction else None
+
+    async def target_summary(self, target_type: str, target_id: str) -> Dict[str, Any]:
+        """Histogram of a target: counts per emoji, total and recent reactors."""
+        return await self.histograms.get(*self._target(target_type, target_id))
+
+    async def user_summary(self, user_id: str) -> Dict[str, Any]:
+        """Histogram of the emojis a user has reacted with."""
+        return await self.histograms.get(*self._user(user_id), track_recent=False)
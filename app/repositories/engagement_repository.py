@@ -0,0 +1,135 @@
+from typing import List, Dict, Any, Set
+from bson import ObjectId
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from app.db.mongodb import get_collection
+from app.services.counter_service import counter_service
+from app.utils.export_utils import insert_batch
+from .base_repository import BaseRepository
+
+# Engagement kind -> counter field on the target document
+ENGAGEMENT_COUNTERS: Dict[str, str] = {
+    "like": "like_count",
+    "bookmark": "bookmark_count",
+}
+
+
+class EngagementRepository(BaseRepository):
+    """
+    Repository for per-user engagement with any counted target (engagements).
+
+    One document per (target_type, target_id, user_id, kind), e.g. a user's
+    like of a memory or bookmark of a hub item; the unique index makes
+    toggles idempotent. The matching counter on the target (like_count,
+    bookmark_count) is kept through the counter service, so listings never
+    read engagement documents.
+    """
+
+    def __init__(self):
+        super().__init__("engagements")
+
+    async def set(
+        self,
+        target_type: str,
+        target_oid: ObjectId,
+        user_oid: ObjectId,
+        kind: str,
+        engaged: bool
+    ) -> bool:
+        """
+        Add or remove a user's engagement with a target, keeping its counter in step.
+
+        Returns:
+            True if the state changed; False if it was already as requested
+        """
+        counter = ENGAGEMENT_COUNTERS[kind]
+        key = {"target_type": target_type, "target_id": target_oid, "user_id": user_oid, "kind": kind}
+        if engaged:
+            try:
+                await self.collection.insert_one({**key, "created_at": datetime.utcnow()})
+            except DuplicateKeyError:
+                return False
+            delta = 1
+        else:
+            result = await self.collection.delete_one(key)
+            if result.deleted_count == 0:
+                return False
+            delta = -1
+
+        await counter_service.increment(target_type, target_oid, counter, delta)
+        return True
+
+    async def viewer_state(
+        self,
+        target_type: str,
+        user_oid: ObjectId,
+        target_oids: List[ObjectId]
+    ) -> Dict[ObjectId, Set[str]]:
+        """
+        Kinds of engagement a user has with each of a page of targets, in one query.
+
+        Returns:
+            Target ObjectId -> set of kinds; targets without engagement are absent
+        """
+        if not target_oids:
+            return {}
+        cursor = self.collection.find(
+            {"user_id": user_oid, "target_type": target_type, "target_id": {"$in": target_oids}},
+            {"target_id": 1, "kind": 1, "_id": 0}
+        ).max_time_ms(self.max_time())
+        state: Dict[ObjectId, Set[str]] = {}
+        async for engagement in cursor:
+            state.setdefault(engagement["target_id"], set()).add(engagement["kind"])
+        return state
+
+    async def delete_for_targets(self, target_type: str, target_oids: List[ObjectId]) -> int:
+        """Delete the engagement documents of deleted targets."""
+        if not target_oids:
+            return 0
+        result = await self.collection.delete_many(
+            {"target_type": target_type, "target_id": {"$in": target_oids}}
+        )
+        return result.deleted_count
+
+    async def import_engagements(
+        self,
+        target_type: str,
+        kind: str,
+        engagements: List[Dict[str, Any]]
+    ) -> Dict[str, int]:
+        """
+        Copy legacy engagement records ({target_id, user_id, created_at}) in.
+
+        Records already present are skipped by the unique index, so imports can
+        be re-run. Counters are not touched; follow with recount().
+
+        Returns:
+            Dict with inserted and skipped (already present) counts
+        """
+        documents = [
+            {
+                "target_type": target_type,
+                "target_id": engagement["target_id"],
+                "user_id": engagement["user_id"],
+                "kind": kind,
+                "created_at": engagement.get("created_at") or datetime.utcnow()
+            }
+            for engagement in engagements
+        ]
+        return await insert_batch(self.collection, documents)
+
+    async def recount(self, target_type: str, kind: str, target_oids: List[ObjectId]) -> None:
+        """Set the counters of the given targets from the engagement documents."""
+        if not target_oids:
+            return
+        counter = ENGAGEMENT_COUNTERS[kind]
+        counts = await self.collection.aggregate([
+            {"$match": {"target_type": target_type, "kind": kind, "target_id": {"$in": target_oids}}},
+            {"$group": {"_id": "$target_id", "count": {"$sum": 1}}}
+        ]).to_list(length=None)
+        by_target = {count["_id"]: count["count"] for count in counts}
+        await get_collection(counter_service.collection_for(target_type)).bulk_write([
+            UpdateOne({"_id": target_oid}, {"$set": {counter: by_target.get(target_oid, 0)}})
+            for target_oid in target_oids
+        ], ordered=False)
@@ -0,0 +1,130 @@
+"""Repository for family album photos."""
+from typing import List, Dict, Any, Set, Tuple
+from bson import ObjectId
+from datetime import datetime
+from app.db.mongodb import get_collection
+from app.utils.export_utils import insert_batch
+from ..base_repository import BaseRepository
+from ..engagement_repository import EngagementRepository
+
+# Target type of photo likes in engagements and the counter service
+PHOTO_TARGET = "album_photo"
+
+
+class AlbumPhotosRepository(BaseRepository):
+    """
+    Repository for album photos, one document per photo.
+
+    Photos carry their album_id and a like_count; who liked a photo lives in
+    engagements (target_type "album_photo"). Albums keep the photos_count,
+    maintained by FamilyAlbumsRepository.
+    """
+
+    def __init__(self):
+        super().__init__("album_photos")
+        self.engagements = EngagementRepository()
+
+    async def find_page(
+        self,
+        album_oid: ObjectId,
+        skip: int = 0,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of an album's photos in upload order.
+
+        Args:
+            album_oid: Album ObjectId
+            skip: Number of photos to skip
+            limit: Maximum number to return
+
+        Returns:
+            List of photo documents
+        """
+        cursor = self.collection.find({"album_id": album_oid}).sort(
+            [("uploaded_at", 1), ("_id", 1)]
+        ).skip(skip).limit(limit).max_time_ms(self.max_time())
+        return await cursor.to_list(length=limit)
+
+    async def liked_photo_ids(self, user_oid: ObjectId, photo_oids: List[ObjectId]) -> Set[ObjectId]:
+        """Which of photo_oids the user has liked, in one query."""
+        state = await self.engagements.viewer_state(PHOTO_TARGET, user_oid, photo_oids)
+        return {photo_oid for photo_oid, kinds in state.items() if "like" in kinds}
+
+    async def add_photo(self, album_oid: ObjectId, photo_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a photo into an album."""
+        photo = {**photo_data, "album_id": album_oid, "like_count": 0}
+        photo.setdefault("_id", ObjectId())
+        await self.collection.insert_one(photo)
+        return photo
+
+    async def remove_photo(self, album_oid: ObjectId, photo_oid: ObjectId) -> bool:
+        """Delete a photo and its likes; returns False if the album has no such photo."""
+        result = await self.collection.delete_one({"_id": photo_oid, "album_id": album_oid})
+        if result.deleted_count == 0:
+            return False
+        await self.engagements.delete_for_targets(PHOTO_TARGET, [photo_oid])
+        return True
+
+    async def delete_for_album(self, album_oid: ObjectId) -> int:
+        """Delete every photo of an album and their likes."""
+        photo_oids = await self.collection.distinct("_id", {"album_id": album_oid})
+        await self.engagements.delete_for_targets(PHOTO_TARGET, photo_oids)
+        result = await self.collection.delete_many({"album_id": album_oid})
+        return result.deleted_count
+
+    async def set_like(
+        self,
+        album_oid: ObjectId,
+        photo_oid: ObjectId,
+        user_oid: ObjectId,
+        liked: bool
+    ) -> bool:
+        """
+        Like or unlike a photo; its like_count follows through the counter service.
+
+        Returns:
+            True if the like state changed; False if the photo is not in the
+            album or was already in the requested state
+        """
+        if not await self.exists({"_id": photo_oid, "album_id": album_oid}):
+            return False
+        return await self.engagements.set(PHOTO_TARGET, photo_oid, user_oid, "like", liked)
+
+    async def extract_embedded(self, album: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Move an album's embedded photos array into album_photos and engagements.
+
+        Photos keep their _id, so re-running after an interruption skips what
+        was already copied. Counts are recomputed from the collections, which
+        also folds in likes made through the new collections before the album
+        was migrated.
+
+        Returns:
+            (photos, likes) copied
+        """
+        album_oid = album["_id"]
+        photos: List[Dict[str, Any]] = []
+        likes: List[Dict[str, Any]] = []
+        for embedded in album.get("photos") or []:
+            photo = {key: value for key, value in embedded.items() if key != "likes"}
+            photo["album_id"] = album_oid
+            photo.setdefault("uploaded_at", album.get("created_at") or datetime.utcnow())
+            photos.append(photo)
+            likes.extend(
+                {"target_id": photo["_id"], "user_id": user_oid, "created_at": photo["uploaded_at"]}
+                for user_oid in embedded.get("likes") or []
+            )
+
+        await insert_batch(self.collection, photos)
+        await self.engagements.import_engagements(PHOTO_TARGET, "like", likes)
+
+        photo_oids = await self.collection.distinct("_id", {"album_id": album_oid})
+        await self.engagements.recount(PHOTO_TARGET, "like", photo_oids)
+
+        photos_count = len(photo_oids)
+        await get_collection("family_albums").update_one(
+            {"_id": album_oid},
+            {"$set": {"photos_count": photos_count}, "$unset": {"photos": ""}}
+        )
+        return len(photos), len(likes)
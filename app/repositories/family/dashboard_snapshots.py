@@ -0,0 +1,197 @@
+"""Repository for per-user family dashboard snapshots and the change events that stale them."""
+import logging
+from typing import List, Dict, Any, Optional, Set
+from bson import ObjectId
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from app.core.cache import AsyncLRUCache
+from app.core.config import settings
+from ..base_repository import BaseRepository
+from ..viewer_principals_repository import ViewerPrincipalsRepository
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_SNAPSHOTS_COLLECTION = "dashboard_snapshots"
+
+# First level: this process's copy of recently served snapshots. Change events
+# drop it locally; other workers pick the change up within the TTL.
+_local_snapshots = AsyncLRUCache(
+    "dashboard_snapshots",
+    capacity=4096,
+    default_ttl=settings.DASHBOARD_SNAPSHOT_LOCAL_TTL_SECONDS
+)
+
+
+class DashboardSnapshotRepository(BaseRepository):
+    """
+    Repository for composed family dashboards, one document per user.
+
+    A snapshot holds the dashboard payload, refreshed_at, a stale flag and a
+    version that every change event increments, so a refresh that raced with a
+    change does not clear the stale flag the change set.
+    """
+
+    def __init__(self):
+        super().__init__(DASHBOARD_SNAPSHOTS_COLLECTION)
+
+    async def get(self, user_oid: ObjectId) -> Optional[Dict[str, Any]]:
+        """Snapshot for a user from the local cache, falling back to the collection."""
+        return await _local_snapshots.get_or_load(
+            (str(user_oid), "snapshot"),
+            lambda: self.find_one({"_id": user_oid}, raise_404=False)
+        )
+
+    async def current_version(self, user_oid: ObjectId) -> int:
+        """Version to save a refresh against; read before composing the payload."""
+        snapshot = await self.collection.find_one({"_id": user_oid}, {"version": 1})
+        return snapshot.get("version", 0) if snapshot else 0
+
+    async def save(
+        self,
+        user_oid: ObjectId,
+        payload: Dict[str, Any],
+        version: int,
+        refreshed_at: datetime
+    ) -> Dict[str, Any]:
+        """
+        Store a freshly composed payload.
+
+        The snapshot is only marked fresh if no change event arrived since
+        version was read; otherwise the payload is stored but stays stale.
+
+        Returns:
+            The snapshot as stored
+        """
+        fields = {
+            "payload": payload,
+            "refreshed_at": refreshed_at,
+            "expires_at": refreshed_at + timedelta(seconds=settings.DASHBOARD_SNAPSHOT_MAX_STALE_SECONDS)
+        }
+        snapshot = {"_id": user_oid, **fields, "stale": False, "version": version}
+        try:
+            await self.collection.update_one(
+                {"_id": user_oid, "version": version},
+                {"$set": {**fields, "stale": False}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            await self.collection.update_one({"_id": user_oid}, {"$set": fields})
+            snapshot["stale"] = True
+        _local_snapshots.invalidate_prefix(str(user_oid))
+        return snapshot
+
+    async def mark_stale(self, user_oids: Set[ObjectId]) -> None:
+        """Stale the snapshots of the given users."""
+        if not user_oids:
+            return
+        await self.collection.update_many(
+            {"_id": {"$in": list(user_oids)}},
+            {"$set": {"stale": True}, "$inc": {"version": 1}}
+        )
+        for user_oid in user_oids:
+            _local_snapshots.invalidate_prefix(str(user_oid))
+
+    async def mark_all_stale(self) -> None:
+        """
+        Stale every snapshot, for changes to content every dashboard may show.
+
+        Already-stale snapshots are included: their version must move too, or a
+        refresh composed before this change would mark them fresh.
+        """
+        await self.collection.update_many(
+            {},
+            {"$set": {"stale": True}, "$inc": {"version": 1}}
+        )
+        _local_snapshots.clear()
+
+
+class DashboardSourceMixin:
+    """
+    Publishes change events for a repository whose documents feed the family dashboard.
+
+    Mixed in ahead of BaseRepository. Subclasses set dashboard_audience_fields
+    and implement dashboard_audience(); create, update and delete then stale
+    the dashboards of every user the document was or is shown to. Methods that
+    write through self.collection directly call publish_dashboard_change.
+    
+    Repositories whose documents grant memory visibility (circles, family
+    relationships) set visibility_source, so the same audience also has its
+    viewer principals rebuilt.
+    """
+
+    dashboard_audience_fields: Dict[str, int] = {}
+    visibility_source: bool = False
+
+    def dashboard_audience(self, doc: Dict[str, Any]) -> Optional[Set[ObjectId]]:
+        """Users whose dashboard shows doc, or None if any dashboard may."""
+        raise NotImplementedError
+
+    async def publish_dashboard_change(self, *docs: Optional[Dict[str, Any]]) -> None:
+        """
+        Stale the dashboards showing any of docs (before and/or after the change).
+
+        Failures are logged rather than raised: the write has already happened
+        and the snapshot is still revalidated once past DASHBOARD_SNAPSHOT_FRESH_SECONDS.
+        """
+        user_oids: Set[ObjectId] = set()
+        everyone = False
+        for doc in docs:
+            if not doc:
+                continue
+            audience = self.dashboard_audience(doc)
+            if audience is None:
+                everyone = True
+                break
+            user_oids |= audience
+
+        try:
+            snapshots = DashboardSnapshotRepository()
+            if everyone:
+                await snapshots.mark_all_stale()
+            else:
+                await snapshots.mark_stale(user_oids)
+        except Exception as e:
+            logger.warning("Failed to stale dashboard snapshots for %s: %s", self.collection_name, e)
+
+        if self.visibility_source and user_oids:
+            try:
+                await ViewerPrincipalsRepository().invalidate(user_oids)
+            except Exception as e:
+                logger.warning("Failed to invalidate viewer principals for %s: %s", self.collection_name, e)
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        created = await super().create(data)
+        await self.publish_dashboard_change(created)
+        return created
+
+    async def update(
+        self,
+        filter_dict: Dict[str, Any],
+        update_data: Dict[str, Any],
+        raise_404: bool = True,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        before = await self.collection.find_one(filter_dict, self.dashboard_audience_fields)
+        updated = await super().update(filter_dict, update_data, raise_404, projection=projection)
+        after = updated
+        if projection is not None:
+            after = await self.collection.find_one(filter_dict, self.dashboard_audience_fields)
+        await self.publish_dashboard_change(before, after)
+        return updated
+
+    async def delete(self, filter_dict: Dict[str, Any], raise_404: bool = True) -> bool:
+        before = await self.collection.find_one(filter_dict, self.dashboard_audience_fields)
+        deleted = await super().delete(filter_dict, raise_404)
+        if deleted:
+            await self.publish_dashboard_change(before)
+        return deleted
+
+
+def audience_of(doc: Dict[str, Any], *fields: str) -> Set[ObjectId]:
+    """ObjectIds held in the given single-value or list fields of doc."""
+    user_oids: Set[ObjectId] = set()
+    for field in fields:
+        value = doc.get(field)
+        values: List[Any] = value if isinstance(value, list) else [value]
+        user_oids.update(v for v in values if isinstance(v, ObjectId))
+    return user_oids
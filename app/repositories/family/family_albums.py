@@ -1,25 +1,41 @@
 """Repository for family albums with photo management."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from bson import ObjectId
 from datetime import datetime
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 from ..base_repository import BaseRepository
+from .album_photos import AlbumPhotosRepository
+from .dashboard_snapshots import DashboardSourceMixin, audience_of
 
 
-class FamilyAlbumsRepository(BaseRepository):
+class FamilyAlbumsRepository(DashboardSourceMixin, BaseRepository):
     """
     Repository for family albums with photo management.
     Provides access control, privacy checks, and photo operations.
+    
+    Photos are stored in album_photos (see AlbumPhotosRepository); the album
+    document only keeps photos_count.
     """
     
+    dashboard_audience_fields = {"created_by": 1, "member_ids": 1, "privacy": 1}
+    
     def __init__(self):
         super().__init__("family_albums")
+        self.photos = AlbumPhotosRepository()
+    
+    def dashboard_audience(self, doc: Dict[str, Any]) -> Optional[Set[ObjectId]]:
+        """Public albums are listed on every dashboard."""
+        if doc.get("privacy") == "public":
+            return None
+        return audience_of(doc, "created_by", "member_ids")
     
     async def find_accessible_albums(
         self,
         user_id: str,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find all albums the user has access to (owned, member, or public).
@@ -28,6 +44,7 @@ class FamilyAlbumsRepository(BaseRepository):
             user_id: String representation of user ID
             skip: Number of documents to skip
             limit: Maximum number to return
+            projection: Fields to return, e.g. ALBUM_SUMMARY for list views
             
         Returns:
             List of accessible albums
@@ -45,7 +62,8 @@ class FamilyAlbumsRepository(BaseRepository):
             skip=skip,
             limit=limit,
             sort_by="updated_at",
-            sort_order=-1
+            sort_order=-1,
+            projection=projection
         )
     
     async def count_accessible_albums(self, user_id: str) -> int:
@@ -148,58 +166,65 @@ class FamilyAlbumsRepository(BaseRepository):
         photo_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
-        Add a photo to an album using atomic operation.
+        Add a photo to an album and bump its photos_count.
         
         Args:
             album_id: String representation of album ID
             photo_data: Photo document to add
             
         Returns:
-            Updated album document
+            Stored photo document
         """
         album_oid = self.validate_object_id(album_id, "album_id")
         
-        await self.collection.update_one(
+        album = await self.collection.find_one_and_update(
             {"_id": album_oid},
             {
-                "$push": {"photos": photo_data},
+                "$inc": {"photos_count": 1},
                 "$set": {"updated_at": datetime.utcnow()}
-            }
+            },
+            projection=self.dashboard_audience_fields,
+            return_document=ReturnDocument.AFTER
         )
+        if album is None:
+            raise HTTPException(status_code=404, detail="Album not found")
         
-        updated_album = await self.find_one({"_id": album_oid}, raise_404=True)
-        assert updated_album is not None
-        return updated_album
+        photo = await self.photos.add_photo(album_oid, photo_data)
+        await self.publish_dashboard_change(album)
+        return photo
     
     async def remove_photo_from_album(
         self,
         album_id: str,
         photo_id: str
-    ) -> Dict[str, Any]:
+    ) -> bool:
         """
-        Remove a photo from an album using atomic operation.
+        Remove a photo and its likes from an album.
         
         Args:
             album_id: String representation of album ID
             photo_id: String representation of photo ID
             
         Returns:
-            Updated album document
+            True if the photo was in the album
         """
         album_oid = self.validate_object_id(album_id, "album_id")
         photo_oid = self.validate_object_id(photo_id, "photo_id")
         
-        await self.collection.update_one(
+        if not await self.photos.remove_photo(album_oid, photo_oid):
+            return False
+        
+        album = await self.collection.find_one_and_update(
             {"_id": album_oid},
             {
-                "$pull": {"photos": {"_id": photo_oid}},
+                "$inc": {"photos_count": -1},
                 "$set": {"updated_at": datetime.utcnow()}
-            }
+            },
+            projection=self.dashboard_audience_fields,
+            return_document=ReturnDocument.AFTER
         )
-        
-        updated_album = await self.find_one({"_id": album_oid}, raise_404=True)
-        assert updated_album is not None
-        return updated_album
+        await self.publish_dashboard_change(album)
+        return True
     
     async def toggle_photo_like(
         self,
@@ -224,12 +249,13 @@ class FamilyAlbumsRepository(BaseRepository):
         photo_oid = self.validate_object_id(photo_id, "photo_id")
         user_oid = self.validate_object_id(user_id, "user_id")
         
-        operation = "$addToSet" if add_like else "$pull"
-        
-        result = await self.collection.update_one(
-            {"_id": album_oid, "photos._id": photo_oid},
-            {operation: {"photos.$.likes": user_oid}}
-        )
-        
-        return result.modified_count > 0
+        return await self.photos.set_like(album_oid, photo_oid, user_oid, add_like)
+    
+    async def delete(self, filter_dict: Dict[str, Any], raise_404: bool = True) -> bool:
+        """Delete an album together with its photos and their likes."""
+        album = await self.collection.find_one(filter_dict, {"_id": 1})
+        deleted = await super().delete(filter_dict, raise_404)
+        if deleted and album:
+            await self.photos.delete_for_album(album["_id"])
+        return deleted
 
@@ -1,20 +1,26 @@
 """Repository for family calendar events."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from bson import ObjectId
 from datetime import datetime, timedelta
 from fastapi import HTTPException
 from ..base_repository import BaseRepository
+from .dashboard_snapshots import DashboardSourceMixin, audience_of
 
 
-class FamilyCalendarRepository(BaseRepository):
+class FamilyCalendarRepository(DashboardSourceMixin, BaseRepository):
     """
     Repository for family calendar events with recurrence and conflict detection.
     Provides timezone-aware queries and attendee management.
     """
     
+    dashboard_audience_fields = {"created_by": 1, "attendee_ids": 1}
+    
     def __init__(self):
         super().__init__("family_events")
     
+    def dashboard_audience(self, doc: Dict[str, Any]) -> Optional[Set[ObjectId]]:
+        return audience_of(doc, "created_by", "attendee_ids")
+    
     async def find_user_events(
         self,
         user_id: str,
@@ -1,21 +1,28 @@
 """Repository for family operations."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from bson import ObjectId
 from datetime import datetime
 from fastapi import HTTPException
 from ..base_repository import BaseRepository
+from .dashboard_snapshots import DashboardSourceMixin, audience_of
 from .users import UserRepository
 
 
-class FamilyRepository(BaseRepository):
+class FamilyRepository(DashboardSourceMixin, BaseRepository):
     """
     Repository for Family Hub operations.
     Provides family-specific queries and authorization helpers.
     """
     
+    dashboard_audience_fields = {"owner_id": 1, "member_ids": 1}
+    visibility_source = True
+    
     def __init__(self):
         super().__init__("family_circles")
     
+    def dashboard_audience(self, doc: Dict[str, Any]) -> Optional[Set[ObjectId]]:
+        return audience_of(doc, "owner_id", "member_ids")
+    
     async def find_by_owner(
         self,
         owner_id: str,
@@ -210,6 +217,7 @@ class FamilyRepository(BaseRepository):
         
         updated_circle = await self.find_one({"_id": circle_oid}, raise_404=True)
         assert updated_circle is not None
+        await self.publish_dashboard_change(circle, updated_circle)
         return updated_circle
     
     async def remove_member(
@@ -256,6 +264,7 @@ class FamilyRepository(BaseRepository):
         
         updated_circle = await self.find_one({"_id": circle_oid}, raise_404=True)
         assert updated_circle is not None
+        await self.publish_dashboard_change(circle, updated_circle)
         return updated_circle
     
     async def search_circle_members(
@@ -1,20 +1,29 @@
 """Repository for family milestones."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from bson import ObjectId
 from datetime import datetime
 from fastapi import HTTPException
 from ..base_repository import BaseRepository
+from .dashboard_snapshots import DashboardSourceMixin, audience_of
 
 
-class FamilyMilestonesRepository(BaseRepository):
+class FamilyMilestonesRepository(DashboardSourceMixin, BaseRepository):
     """
     Repository for family milestones with photo management and like functionality.
     Provides queries for milestone tracking and social engagement.
     """
     
+    dashboard_audience_fields = {"created_by": 1, "family_circle_ids": 1}
+    
     def __init__(self):
         super().__init__("family_milestones")
     
+    def dashboard_audience(self, doc: Dict[str, Any]) -> Optional[Set[ObjectId]]:
+        """Milestones shared with circles match every user's find_user_milestones."""
+        if "family_circle_ids" in doc:
+            return None
+        return audience_of(doc, "created_by")
+    
     async def find_user_milestones(
         self,
         user_id: str,
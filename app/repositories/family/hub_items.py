@@ -3,17 +3,27 @@ from typing import List, Dict, Any, Optional
 from bson import ObjectId
 from datetime import datetime
 from fastapi import HTTPException
+from app.services.counter_service import counter_service
 from ..base_repository import BaseRepository
+from ..engagement_repository import EngagementRepository
+
+# Target type of hub items in engagements and the counter service
+HUB_ITEM_TARGET = "hub_item"
 
 
 class HubItemsRepository(BaseRepository):
     """
     Repository for collaborative hub items with privacy controls and social features.
     Provides access control, view tracking, and engagement features (likes, bookmarks).
+    
+    Likes and bookmarks are stored in engagements (see EngagementRepository);
+    items keep view_count, like_count and bookmark_count, written through the
+    counter service.
     """
     
     def __init__(self):
         super().__init__("hub_items")
+        self.engagements = EngagementRepository()
     
     async def find_user_items(
         self,
@@ -22,7 +32,8 @@ class HubItemsRepository(BaseRepository):
         privacy: Optional[str] = None,
         tag: Optional[str] = None,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find all hub items owned by a user with optional filtering.
@@ -34,6 +45,7 @@ class HubItemsRepository(BaseRepository):
             tag: Optional filter by tag
             skip: Number of documents to skip
             limit: Maximum number to return
+            projection: Fields to return, e.g. HUB_ITEM_CARD for list views
             
         Returns:
             List of hub items
@@ -54,7 +66,8 @@ class HubItemsRepository(BaseRepository):
             skip=skip,
             limit=limit,
             sort_by="updated_at",
-            sort_order=-1
+            sort_order=-1,
+            projection=projection
         )
     
     async def find_accessible_items(
@@ -64,7 +77,8 @@ class HubItemsRepository(BaseRepository):
         privacy: Optional[str] = None,
         tag: Optional[str] = None,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 50,
+        projection: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find all hub items accessible to a user (owned or public).
@@ -76,6 +90,7 @@ class HubItemsRepository(BaseRepository):
             tag: Optional filter by tag
             skip: Number of documents to skip
             limit: Maximum number to return
+            projection: Fields to return, e.g. HUB_ITEM_CARD for list views
             
         Returns:
             List of accessible hub items
@@ -101,7 +116,8 @@ class HubItemsRepository(BaseRepository):
             skip=skip,
             limit=limit,
             sort_by="updated_at",
-            sort_order=-1
+            sort_order=-1,
+            projection=projection
         )
     
     async def count_user_items(
@@ -238,22 +254,19 @@ class HubItemsRepository(BaseRepository):
         item_id: str
     ) -> bool:
         """
-        Increment the view count for a hub item.
+        Increment the view count for a hub item (buffered by the counter service).
         
         Args:
             item_id: String representation of item ID
             
         Returns:
-            True if operation successful
+            True once the increment is recorded
         """
         item_oid = self.validate_object_id(item_id, "item_id")
         
-        result = await self.collection.update_one(
-            {"_id": item_oid},
-            {"$inc": {"view_count": 1}}
-        )
+        await counter_service.increment(HUB_ITEM_TARGET, item_oid, "view_count")
         
-        return result.modified_count > 0
+        return True
     
     async def toggle_like(
         self,
@@ -270,19 +283,12 @@ class HubItemsRepository(BaseRepository):
             add_like: True to add like, False to remove
             
         Returns:
-            True if operation successful
+            True if the like state changed
         """
         item_oid = self.validate_object_id(item_id, "item_id")
         user_oid = self.validate_object_id(user_id, "user_id")
         
-        operation = "$addToSet" if add_like else "$pull"
-        
-        result = await self.collection.update_one(
-            {"_id": item_oid},
-            {operation: {"likes": user_oid}}
-        )
-        
-        return result.modified_count > 0
+        return await self.engagements.set(HUB_ITEM_TARGET, item_oid, user_oid, "like", add_like)
     
     async def toggle_bookmark(
         self,
@@ -299,19 +305,12 @@ class HubItemsRepository(BaseRepository):
             add_bookmark: True to add bookmark, False to remove
             
         Returns:
-            True if operation successful
+            True if the bookmark state changed
         """
         item_oid = self.validate_object_id(item_id, "item_id")
         user_oid = self.validate_object_id(user_id, "user_id")
         
-        operation = "$addToSet" if add_bookmark else "$pull"
-        
-        result = await self.collection.update_one(
-            {"_id": item_oid},
-            {operation: {"bookmarks": user_oid}}
-        )
-        
-        return result.modified_count > 0
+        return await self.engagements.set(HUB_ITEM_TARGET, item_oid, user_oid, "bookmark", add_bookmark)
     
     async def search_items(
         self,
@@ -319,7 +318,8 @@ class HubItemsRepository(BaseRepository):
         query: str,
         item_types: Optional[List[str]] = None,
         tags: Optional[List[str]] = None,
-        limit: int = 10
+        limit: int = 10,
+        projection: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search hub items with text search and filters.
@@ -330,6 +330,7 @@ class HubItemsRepository(BaseRepository):
             item_types: Optional filter by item types
             tags: Optional filter by tags
             limit: Maximum number of results
+            projection: Fields to return (default: whole items)
             
         Returns:
             List of matching hub items
@@ -353,7 +354,8 @@ class HubItemsRepository(BaseRepository):
             filter_dict,
             limit=limit,
             sort_by="updated_at",
-            sort_order=-1
+            sort_order=-1,
+            projection=projection
         )
     
     async def get_stats(
@@ -392,7 +394,7 @@ class HubItemsRepository(BaseRepository):
                 "$group": {
                     "_id": None,
                     "total_views": {"$sum": "$view_count"},
-                    "total_likes": {"$sum": {"$size": {"$ifNull": ["$likes", []]}}}
+                    "total_likes": {"$sum": "$like_count"}
                 }
             }
         ]
@@ -411,7 +413,8 @@ class HubItemsRepository(BaseRepository):
     async def get_recent_activity(
         self,
         user_id: str,
-        limit: int = 10
+        limit: int = 10,
+        projection: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Get recent activity for user's hub items.
@@ -419,6 +422,7 @@ class HubItemsRepository(BaseRepository):
         Args:
             user_id: String representation of user ID
             limit: Maximum number of activity items
+            projection: Fields to return (default: whole items)
             
         Returns:
             List of recent activity items
@@ -429,6 +433,40 @@ class HubItemsRepository(BaseRepository):
             {"owner_id": user_oid},
             limit=limit,
             sort_by="updated_at",
-            sort_order=-1
+            sort_order=-1,
+            projection=projection
         )
-
+    
+    async def attach_viewer_engagement(
+        self,
+        items: List[Dict[str, Any]],
+        user_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Set is_liked and is_bookmarked on a page of items for one viewer.
+        
+        Costs one query for the whole page.
+        
+        Args:
+            items: Hub item documents
+            user_id: String representation of the viewing user's ID
+            
+        Returns:
+            The same items
+        """
+        user_oid = self.validate_object_id(user_id, "user_id")
+        item_oids = [item["_id"] for item in items]
+        state = await self.engagements.viewer_state(HUB_ITEM_TARGET, user_oid, item_oids)
+        for item in items:
+            kinds = state.get(item["_id"], set())
+            item["is_liked"] = "like" in kinds
+            item["is_bookmarked"] = "bookmark" in kinds
+        return items
+    
+    async def delete(self, filter_dict: Dict[str, Any], raise_404: bool = True) -> bool:
+        """Delete an item together with its likes and bookmarks."""
+        item = await self.collection.find_one(filter_dict, {"_id": 1})
+        deleted = await super().delete(filter_dict, raise_404)
+        if deleted and item:
+            await self.engagements.delete_for_targets(HUB_ITEM_TARGET, [item["_id"]])
+        return deleted
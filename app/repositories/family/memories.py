@@ -2,17 +2,222 @@
 from typing import List, Dict, Any, Optional
 from bson import ObjectId
 from datetime import datetime
+from app.utils.geo_utils import bbox_filter, cluster_precision, geo_point
+from app.utils.memory_utils import MEMORY_TARGET
 from ..base_repository import BaseRepository
+from ..engagement_repository import EngagementRepository
+from ..projections import USER_CARD
+from .users import UserRepository
 
 
 class MemoryRepository(BaseRepository):
     """
     Repository for memories.
     Manages memory queries and associations with genealogy persons.
+    
+    Memory responses carry the owner's name and avatar and the viewer's
+    like/bookmark state: find_detail joins them into a single memory in one
+    aggregation, attach_viewer_context adds them to a page of memories with
+    one users query and one engagements query.
+    
+    Located memories carry a GeoJSON point in geo and its geohash; find_near
+    and find_clusters read them through the (geo, visible_to) 2dsphere index.
     """
     
     def __init__(self):
         super().__init__("memories")
+        self.engagements = EngagementRepository()
+        self.users = UserRepository()
+    
+    async def find_detail(
+        self,
+        memory_id: str,
+        viewer_id: str,
+        principals: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a memory with its owner card and the viewer's engagement in one round trip.
+        
+        Args:
+            memory_id: String representation of memory ID
+            viewer_id: String representation of the viewing user's ID
+            principals: The viewer's principals (ViewerPrincipalsRepository.get)
+            
+        Returns:
+            Memory with owner_name, owner_avatar, is_liked and is_bookmarked, or
+            None if it does not exist or is not visible to the viewer
+        """
+        memory_oid = self.validate_object_id(memory_id, "memory_id")
+        viewer_oid = self.validate_object_id(viewer_id, "user_id")
+        results = await self.aggregate([
+            {"$match": {"_id": memory_oid, "visible_to": {"$in": principals}}},
+            {"$limit": 1},
+            {"$lookup": {
+                "from": self.users.collection_name,
+                "let": {"owner_id": "$owner_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$owner_id"]}}},
+                    {"$project": USER_CARD}
+                ],
+                "as": "owner"
+            }},
+            {"$lookup": {
+                "from": self.engagements.collection_name,
+                "let": {"memory_id": "$_id"},
+                "pipeline": [
+                    {"$match": {
+                        "$expr": {"$eq": ["$target_id", "$$memory_id"]},
+                        "user_id": viewer_oid,
+                        "target_type": MEMORY_TARGET
+                    }},
+                    {"$project": {"kind": 1, "_id": 0}}
+                ],
+                "as": "viewer_engagement"
+            }}
+        ])
+        if not results:
+            return None
+        
+        memory = results[0]
+        owner = memory.pop("owner")
+        kinds = {engagement["kind"] for engagement in memory.pop("viewer_engagement")}
+        memory["owner_name"] = owner[0].get("full_name") if owner else None
+        memory["owner_avatar"] = owner[0].get("avatar_url") if owner else None
+        memory["is_liked"] = "like" in kinds
+        memory["is_bookmarked"] = "bookmark" in kinds
+        return memory
+    
+    async def attach_viewer_context(
+        self,
+        memories: List[Dict[str, Any]],
+        viewer_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Set owner_name, owner_avatar, is_liked and is_bookmarked on a page of memories.
+        
+        Costs one users query and one engagements query for the whole page.
+        
+        Args:
+            memories: Memory documents
+            viewer_id: String representation of the viewing user's ID
+            
+        Returns:
+            The same memories
+        """
+        if not memories:
+            return memories
+        viewer_oid = self.validate_object_id(viewer_id, "user_id")
+        owners = await self.users.get_user_cards([memory["owner_id"] for memory in memories])
+        state = await self.engagements.viewer_state(
+            MEMORY_TARGET, viewer_oid, [memory["_id"] for memory in memories]
+        )
+        for memory in memories:
+            owner = owners.get(str(memory["owner_id"])) or {}
+            kinds = state.get(memory["_id"], set())
+            memory["owner_name"] = owner.get("full_name")
+            memory["owner_avatar"] = owner.get("avatar_url")
+            memory["is_liked"] = "like" in kinds
+            memory["is_bookmarked"] = "bookmark" in kinds
+        return memories
+    
+    async def find_near(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_m: float,
+        principals: List[str],
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Memories visible to a viewer within radius_m of a point, nearest first.
+        
+        Args:
+            latitude: Latitude of the point
+            longitude: Longitude of the point
+            radius_m: Search radius in meters
+            principals: The viewer's principals (ViewerPrincipalsRepository.get)
+            limit: Maximum number to return
+            
+        Returns:
+            Memories with distance_m set
+        """
+        return await self.aggregate([
+            {"$geoNear": {
+                "near": geo_point(latitude, longitude),
+                "key": "geo",
+                "distanceField": "distance_m",
+                "maxDistance": radius_m,
+                "spherical": True,
+                "query": {"visible_to": {"$in": principals}}
+            }},
+            {"$limit": limit}
+        ])
+    
+    async def find_clusters(
+        self,
+        west: float,
+        south: float,
+        east: float,
+        north: float,
+        principals: List[str],
+        target_cells: int
+    ) -> Dict[str, Any]:
+        """
+        Group the memories visible to a viewer inside a bounding box by geohash cell.
+        
+        The cell size is chosen so the box spans at most target_cells cells,
+        which bounds the clusters returned however many memories are inside.
+        
+        Args:
+            west, south, east, north: The bounding box (west > east crosses the antimeridian)
+            principals: The viewer's principals (ViewerPrincipalsRepository.get)
+            target_cells: Maximum number of cells the box is split into
+            
+        Returns:
+            precision, total and clusters, each with geohash, count, the
+            centroid, the bounds of its memories and, for a single memory,
+            its memory_id
+        """
+        precision = cluster_precision(west, south, east, north, target_cells)
+        groups = await self.aggregate([
+            {"$match": {
+                **bbox_filter("geo", west, south, east, north),
+                "visible_to": {"$in": principals}
+            }},
+            {"$project": {
+                "cell": {"$substrCP": ["$geohash", 0, precision]},
+                "lng": {"$arrayElemAt": ["$geo.coordinates", 0]},
+                "lat": {"$arrayElemAt": ["$geo.coordinates", 1]}
+            }},
+            {"$group": {
+                "_id": "$cell",
+                "count": {"$sum": 1},
+                "longitude": {"$avg": "$lng"},
+                "latitude": {"$avg": "$lat"},
+                "west": {"$min": "$lng"},
+                "south": {"$min": "$lat"},
+                "east": {"$max": "$lng"},
+                "north": {"$max": "$lat"},
+                "memory_id": {"$first": "$_id"}
+            }},
+            {"$sort": {"count": -1}}
+        ])
+        
+        clusters = []
+        for group in groups:
+            clusters.append({
+                "geohash": group["_id"],
+                "count": group["count"],
+                "latitude": group["latitude"],
+                "longitude": group["longitude"],
+                "bounds": {key: group[key] for key in ("west", "south", "east", "north")},
+                "memory_id": str(group["memory_id"]) if group["count"] == 1 else None
+            })
+        return {
+            "precision": precision,
+            "total": sum(cluster["count"] for cluster in clusters),
+            "clusters": clusters
+        }
     
     async def find_by_genealogy_person(
         self,
@@ -1,9 +1,41 @@
 """Repository for notifications."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument, UpdateOne
+from app.core.config import settings
+from app.db.mongodb import get_collection
 from ..base_repository import BaseRepository
 
+# Per-user unread badge counts, kept in step with notifications via $inc
+UNREAD_COUNTERS_COLLECTION = "notification_counters"
+
+
+def actor_snapshot(user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Actor display fields stored on a notification when it is written"""
+    if not user:
+        return {"actor_name": "Unknown User", "actor_avatar": None}
+    return {
+        "actor_name": user.get("full_name") or user.get("email") or "Unknown User",
+        "actor_avatar": user.get("avatar_url")
+    }
+
+
+def read_expiry(now: datetime) -> Any:
+    """
+    Aggregation expression for expires_at when a notification is marked read.
+    
+    Types listed in NOTIFICATION_READ_TTL_DAYS get an expiry the TTL index acts
+    on; for other types the field is removed.
+    """
+    branches = [
+        {"case": {"$eq": ["$type", notification_type]}, "then": now + timedelta(days=days)}
+        for notification_type, days in settings.NOTIFICATION_READ_TTL_DAYS.items()
+    ]
+    if not branches:
+        return "$$REMOVE"
+    return {"$switch": {"branches": branches, "default": "$$REMOVE"}}
+
 
 class NotificationRepository(BaseRepository):
     """
@@ -49,10 +81,12 @@ class NotificationRepository(BaseRepository):
         
         # Use actor_id if provided, otherwise default to user_id
         actor_oid = self.validate_object_id(actor_id, "actor_id") if actor_id else user_oid
+        snapshots = await self.actor_snapshots([actor_oid])
         
         notification_data = {
             "user_id": user_oid,
             "actor_id": actor_oid,
+            **snapshots[actor_oid],
             "type": notification_type,
             "title": title,
             "message": message,
@@ -68,5 +102,138 @@ class NotificationRepository(BaseRepository):
         if approval_status:
             notification_data["approval_status"] = approval_status
         
-        return await self.create(notification_data)
+        created = await self.create(notification_data)
+        await self.increment_unread({user_oid: 1})
+        return created
+    
+    async def actor_snapshots(self, actor_ids: Iterable[ObjectId]) -> Dict[ObjectId, Dict[str, Any]]:
+        """
+        Actor name/avatar snapshots for several actors with one users query.
+        
+        Returns:
+            Snapshot per actor ObjectId; unknown actors get the "Unknown User" snapshot
+        """
+        actor_oids = list({ObjectId(actor_id) for actor_id in actor_ids})
+        if not actor_oids:
+            return {}
+        users = {
+            user["_id"]: user
+            async for user in get_collection("users").find(
+                {"_id": {"$in": actor_oids}},
+                {"full_name": 1, "email": 1, "avatar_url": 1}
+            )
+        }
+        return {actor_oid: actor_snapshot(users.get(actor_oid)) for actor_oid in actor_oids}
+    
+    async def refresh_actor_snapshot(self, actor_id: str) -> None:
+        """
+        Re-snapshot an actor's name and avatar on the notifications they caused.
+        
+        Called in the background after a profile change, so notifications
+        catch up lazily instead of being joined against users on every read.
+        """
+        actor_oid = ObjectId(actor_id)
+        snapshot = (await self.actor_snapshots([actor_oid]))[actor_oid]
+        await self.collection.update_many({"actor_id": actor_oid}, {"$set": snapshot})
+        await self.collection.update_many(
+            {"recent_actors.id": actor_oid},
+            {"$set": {
+                "recent_actors.$[actor].name": snapshot["actor_name"],
+                "recent_actors.$[actor].avatar": snapshot["actor_avatar"]
+            }},
+            array_filters=[{"actor.id": actor_oid}]
+        )
+    
+    async def increment_unread(self, deltas: Dict[ObjectId, int]) -> None:
+        """
+        Apply unread count changes per user.
+        
+        Counters are only adjusted once they exist; get_unread_count seeds a
+        missing counter from the notifications themselves.
+        """
+        operations = [
+            UpdateOne({"_id": user_oid}, {"$inc": {"unread": delta}})
+            for user_oid, delta in deltas.items() if delta
+        ]
+        if operations:
+            await get_collection(UNREAD_COUNTERS_COLLECTION).bulk_write(operations, ordered=False)
+    
+    async def get_unread_count(self, user_id: str) -> int:
+        """Unread badge count from the user's counter, seeding it with one count on first use"""
+        user_oid = ObjectId(user_id)
+        counters = get_collection(UNREAD_COUNTERS_COLLECTION)
+        counter = await counters.find_one({"_id": user_oid})
+        if counter is None:
+            unread = await self.collection.count_documents({"user_id": user_oid, "is_read": False})
+            counter = await counters.find_one_and_update(
+                {"_id": user_oid},
+                {"$setOnInsert": {"unread": unread}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        return max(counter.get("unread", 0), 0)
+    
+    async def find_page(
+        self,
+        query: Dict[str, Any],
+        skip: int,
+        limit: int
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of notifications, newest first, and the total matching query in one aggregation"""
+        result = await self.aggregate([
+            {"$match": query},
+            {"$facet": {
+                "items": [{"$sort": {"created_at": -1}}, {"$skip": skip}, {"$limit": limit}],
+                "total": [{"$count": "count"}]
+            }}
+        ])
+        facet = result[0] if result else {"items": [], "total": []}
+        total = facet["total"][0]["count"] if facet["total"] else 0
+        return facet["items"], total
+    
+    async def mark_read(self, user_id: str, notification_id: str) -> bool:
+        """Mark one notification read; returns False if it does not belong to the user"""
+        user_oid = ObjectId(user_id)
+        previous = await self.collection.find_one_and_update(
+            {"_id": ObjectId(notification_id), "user_id": user_oid},
+            [{"$set": {"is_read": True, "expires_at": read_expiry(datetime.utcnow())}}],
+            projection={"is_read": 1}
+        )
+        if previous is None:
+            return False
+        if not previous.get("is_read", False):
+            await self.increment_unread({user_oid: -1})
+        return True
+    
+    async def mark_all_read(self, user_id: str) -> int:
+        """Mark every unread notification of the user read; returns how many changed"""
+        user_oid = ObjectId(user_id)
+        result = await self.collection.update_many(
+            {"user_id": user_oid, "is_read": False},
+            [{"$set": {"is_read": True, "expires_at": read_expiry(datetime.utcnow())}}]
+        )
+        await self.increment_unread({user_oid: -result.modified_count})
+        return result.modified_count
+    
+    async def delete_notification(self, user_id: str, notification_id: str) -> bool:
+        """Delete one of the user's notifications; returns False if it was not found"""
+        user_oid = ObjectId(user_id)
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(notification_id), "user_id": user_oid},
+            projection={"is_read": 1}
+        )
+        if deleted is None:
+            return False
+        if not deleted.get("is_read", False):
+            await self.increment_unread({user_oid: -1})
+        return True
+    
+    async def delete_all(self, user_id: str) -> int:
+        """Delete all of the user's notifications and reset their unread counter"""
+        user_oid = ObjectId(user_id)
+        result = await self.collection.delete_many({"user_id": user_oid})
+        await get_collection(UNREAD_COUNTERS_COLLECTION).update_one(
+            {"_id": user_oid}, {"$set": {"unread": 0}}
+        )
+        return result.deleted_count
 
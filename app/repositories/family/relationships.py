@@ -1,17 +1,24 @@
 """Repository for familyrelationship operations."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from bson import ObjectId
 from datetime import datetime
 from fastapi import HTTPException
 from ..base_repository import BaseRepository
+from .dashboard_snapshots import DashboardSourceMixin, audience_of
 
 
-class FamilyRelationshipRepository(BaseRepository):
+class FamilyRelationshipRepository(DashboardSourceMixin, BaseRepository):
     """Repository for family relationships."""
     
+    dashboard_audience_fields = {"user_id": 1}
+    visibility_source = True
+    
     def __init__(self):
         super().__init__("family_relationships")
     
+    def dashboard_audience(self, doc: Dict[str, Any]) -> Optional[Set[ObjectId]]:
+        return audience_of(doc, "user_id")
+    
     async def find_by_user(
         self,
         user_id: str,
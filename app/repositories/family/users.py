@@ -2,6 +2,7 @@
 from typing import List, Dict, Any, Optional
 from bson import ObjectId
 from ..base_repository import BaseRepository
+from ..projections import USER_CARD, USER_NAME
 
 
 class UserRepository(BaseRepository):
@@ -48,7 +49,7 @@ class UserRepository(BaseRepository):
             User's full name if found, None otherwise
         """
         user_oid = self.validate_object_id(user_id, "user_id")
-        user = await self.find_one({"_id": user_oid}, raise_404=False)
+        user = await self.find_one({"_id": user_oid}, raise_404=False, projection=USER_NAME)
         return user.get("full_name") if user else None
     
     async def get_user_names(
@@ -67,10 +68,34 @@ class UserRepository(BaseRepository):
         user_oids = [self.validate_object_id(uid, "user_id") for uid in user_ids]
         users = await self.find_many(
             {"_id": {"$in": user_oids}},
-            limit=len(user_oids)
+            limit=len(user_oids),
+            projection=USER_NAME
         )
         return {str(user["_id"]): user.get("full_name", "") for user in users}
     
+    async def get_user_cards(
+        self,
+        user_oids: List[ObjectId]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several users' display fields in one query.
+        
+        Args:
+            user_oids: User ObjectIds (duplicates allowed)
+            
+        Returns:
+            Dictionary mapping user_id to the user's USER_CARD fields
+        """
+        unique_oids = list(set(user_oids))
+        if not unique_oids:
+            return {}
+        users = await self.find_many(
+            {"_id": {"$in": unique_oids}},
+            limit=len(unique_oids),
+            projection=USER_CARD
+        )
+        return {str(user["_id"]): user for user in users}
+    
     async def search_users(
         self,
         query: str,
@@ -86,7 +111,7 @@ class UserRepository(BaseRepository):
             limit: Maximum number of results
             
         Returns:
-            List of matching users
+            List of matching users (USER_CARD fields)
         """
         search_regex = {"$regex": query, "$options": "i"}
         filter_dict: Dict[str, Any] = {
@@ -101,4 +126,4 @@ class UserRepository(BaseRepository):
             exclude_oid = self.validate_object_id(exclude_user_id, "exclude_user_id")
             filter_dict["_id"] = {"$ne": exclude_oid}
         
-        return await self.find_many(filter_dict, limit=limit)
+        return await self.find_many(filter_dict, limit=limit, projection=USER_CARD)
@@ -0,0 +1,71 @@
+"""
+Named projection presets for hot read paths.
+
+Pass these as the projection argument of BaseRepository methods (or of a raw
+collection find) so only the fields a response actually renders are decoded
+and sent over the wire. Computed fields use aggregation expressions, which
+find projections accept on MongoDB 4.4+.
+"""
+from typing import Any, Dict
+
+# Existence checks
+ID_ONLY: Dict[str, Any] = {"_id": 1}
+
+# Name lookups for "created by" style labels
+USER_NAME: Dict[str, Any] = {"full_name": 1}
+
+# Author/owner/actor chips: everything a user reference renders, no settings or password hash
+USER_CARD: Dict[str, Any] = {
+    "full_name": 1,
+    "username": 1,
+    "email": 1,
+    "avatar_url": 1,
+    "avatar": 1,
+    "profile_photo": 1,
+    "bio": 1,
+}
+
+# Album list rows (photos live in album_photos; the album keeps their count)
+ALBUM_SUMMARY: Dict[str, Any] = {
+    "title": 1,
+    "description": 1,
+    "cover_photo": 1,
+    "privacy": 1,
+    "created_by": 1,
+    "family_circle_ids": 1,
+    "member_ids": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "photos_count": 1,
+}
+
+# Memory cards inside a collection: the first media URL stands in for the media list
+MEMORY_CARD: Dict[str, Any] = {
+    "title": 1,
+    "content": 1,
+    "owner_id": 1,
+    "created_at": 1,
+    "privacy": 1,
+    "tags": 1,
+    "image_url": {"$arrayElemAt": [{"$ifNull": ["$media_urls", []]}, 0]},
+}
+
+
+# Hub item list rows; is_liked/is_bookmarked come from HubItemsRepository.attach_viewer_engagement
+HUB_ITEM_CARD: Dict[str, Any] = {
+    "title": 1,
+    "description": 1,
+    "item_type": 1,
+    "content": 1,
+    "tags": 1,
+    "privacy": 1,
+    "is_pinned": 1,
+    "position": 1,
+    "owner_id": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "view_count": 1,
+    "comment_count": 1,
+    "like_count": 1,
+    "bookmark_count": 1,
+}
@@ -0,0 +1,144 @@
+from typing import List, Dict, Any, Optional
+from fastapi import HTTPException
+from app.db.mongodb import get_collection
+from .base_repository import BaseRepository
+
+# Reactors kept on a histogram for "recent reactors" displays
+RECENT_REACTORS = 10
+
+
+def _usable_key(value: str) -> bool:
+    return bool(value) and len(value) <= 32 and "." not in value and not value.startswith("$")
+
+
+def reaction_key(reaction: Any) -> str:
+    """
+    Reaction (emoji or reaction type) as a histogram field name.
+
+    Raises:
+        HTTPException: 400 if the value cannot be used as a field name
+    """
+    value = str(getattr(reaction, "value", reaction))
+    if not _usable_key(value):
+        raise HTTPException(status_code=400, detail="Invalid reaction")
+    return value
+
+
+class ReactionCountsRepository(BaseRepository):
+    """
+    Repository for reaction histograms (reaction_counts).
+
+    One document per reacted-to target (or per reacting user), keyed by a
+    string such as "memory:<id>", holding counts (reaction -> number), total
+    and, for targets, the most recent reactors. Reaction writes adjust it with
+    $inc, so a summary is a single _id lookup whatever the number of
+    reactions. A histogram that does not exist yet (reactions written before
+    histograms were kept) is rebuilt from the source collection with $group.
+    """
+
+    def __init__(self, source_collection: str, user_field: str, reaction_field: str):
+        super().__init__("reaction_counts")
+        self.source_collection = source_collection
+        self.user_field = user_field
+        self.reaction_field = reaction_field
+
+    @property
+    def source(self):
+        """The collection holding one reaction document per (user, target)."""
+        return get_collection(self.source_collection)
+
+    async def record(
+        self,
+        key: str,
+        source_filter: Dict[str, Any],
+        user_id: str,
+        old: Optional[str],
+        new: Optional[str],
+        track_recent: bool = True
+    ) -> None:
+        """
+        Apply one user's reaction change (added, changed or removed) to a histogram.
+
+        Args:
+            key: Histogram _id
+            source_filter: Filter selecting the histogram's reactions, for a rebuild
+            user_id: String representation of the reacting user's ID
+            old: Reaction before the change, None if there was none
+            new: Reaction after the change, None if it was removed
+            track_recent: Whether the histogram keeps recent reactors
+        """
+        if old == new:
+            return
+
+        inc: Dict[str, int] = {"total": (1 if new else 0) - (1 if old else 0)}
+        if old:
+            inc[f"counts.{old}"] = -1
+        if new:
+            inc[f"counts.{new}"] = 1
+        update: Dict[str, Any] = {"$inc": inc}
+        if track_recent:
+            update["$pull"] = {"recent": {"user_id": user_id}}
+
+        result = await self.collection.update_one({"_id": key}, update)
+        if result.matched_count == 0:
+            # The source already holds this change, so the rebuild includes it
+            await self.rebuild(key, source_filter, track_recent)
+            return
+
+        if track_recent and new:
+            await self.collection.update_one(
+                {"_id": key},
+                {"$push": {"recent": {
+                    "$each": [{"user_id": user_id, "reaction": new}],
+                    "$slice": -RECENT_REACTORS
+                }}}
+            )
+
+    async def get(
+        self,
+        key: str,
+        source_filter: Dict[str, Any],
+        track_recent: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Histogram for a key, rebuilding it with $group if it does not exist.
+
+        Returns:
+            Dict with counts (reactions with a non-zero count), total and recent
+            (oldest first)
+        """
+        histogram = await self.find_one({"_id": key}, raise_404=False)
+        if histogram is None:
+            histogram = await self.rebuild(key, source_filter, track_recent)
+        return {
+            "counts": {reaction: count for reaction, count in (histogram.get("counts") or {}).items() if count > 0},
+            "total": histogram.get("total", 0),
+            "recent": histogram.get("recent", [])
+        }
+
+    async def rebuild(
+        self,
+        key: str,
+        source_filter: Dict[str, Any],
+        track_recent: bool = True
+    ) -> Dict[str, Any]:
+        """Recompute a histogram from its reactions and store it."""
+        groups = await self.source.aggregate([
+            {"$match": source_filter},
+            {"$group": {"_id": f"${self.reaction_field}", "count": {"$sum": 1}}}
+        ], maxTimeMS=self.max_time()).to_list(length=None)
+        # Reactions stored before keys were validated are left out rather than failing the read
+        counts = {str(group["_id"]): group["count"] for group in groups if _usable_key(str(group["_id"] or ""))}
+        histogram: Dict[str, Any] = {"_id": key, "counts": counts, "total": sum(counts.values())}
+
+        if track_recent:
+            latest: List[Dict[str, Any]] = await self.source.find(
+                source_filter, {self.user_field: 1, self.reaction_field: 1}
+            ).sort("_id", -1).limit(RECENT_REACTORS).to_list(length=RECENT_REACTORS)
+            histogram["recent"] = [
+                {"user_id": str(reaction[self.user_field]), "reaction": str(reaction[self.reaction_field])}
+                for reaction in reversed(latest)
+            ]
+
+        await self.collection.replace_one({"_id": key}, histogram, upsert=True)
+        return histogram
@@ -7,38 +7,155 @@ from ..base_repository import BaseRepository
 
 
 class CommentRepository(BaseRepository):
-    """Repository for milestone comment operations."""
+    """
+    Repository for milestone comment operations.
+    
+    Comments form a tree stored with materialized paths. path joins the hex
+    ids of a comment's ancestors and its own with "/", so sorting by path
+    lists a thread depth-first with siblings in creation order (ObjectIds
+    grow over time), and every ancestor sorts before its descendants.
+    thread_id is the top-level comment's id, ancestor_ids the ids above the
+    comment, depth its nesting level, and reply_count on each comment counts
+    all its descendants.
+    """
     
     def __init__(self):
         super().__init__("milestone_comments")
     
-    async def find_by_milestone(
+    async def create_comment(
+        self,
+        milestone_oid: ObjectId,
+        author_oid: ObjectId,
+        body: str,
+        visibility: str,
+        parent: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a comment, as a reply when parent is given.
+        
+        Args:
+            milestone_oid: Milestone ObjectId
+            author_oid: Author ObjectId
+            body: Comment text
+            visibility: Comment visibility
+            parent: Parent comment document (with its tree fields)
+            
+        Returns:
+            The created comment
+        """
+        comment_oid = ObjectId()
+        if parent:
+            ancestor_ids = parent.get("ancestor_ids", []) + [parent["_id"]]
+            tree = {
+                "parent_comment_id": parent["_id"],
+                "thread_id": parent.get("thread_id", parent["_id"]),
+                "ancestor_ids": ancestor_ids,
+                "depth": len(ancestor_ids),
+                "path": f"{parent.get('path', str(parent['_id']))}/{comment_oid}"
+            }
+        else:
+            ancestor_ids = []
+            tree = {
+                "parent_comment_id": None,
+                "thread_id": comment_oid,
+                "ancestor_ids": [],
+                "depth": 0,
+                "path": str(comment_oid)
+            }
+        
+        created = await self.create({
+            "_id": comment_oid,
+            "milestone_id": milestone_oid,
+            "author_id": author_oid,
+            "body": body,
+            "visibility": visibility,
+            "reply_count": 0,
+            **tree
+        })
+        if ancestor_ids:
+            await self.collection.update_many(
+                {"_id": {"$in": ancestor_ids}},
+                {"$inc": {"reply_count": 1}}
+            )
+        return created
+    
+    async def find_threads(
         self,
         milestone_id: str,
         skip: int = 0,
-        limit: int = 50
+        limit: int = 20,
+        replies_per_thread: int = 3
     ) -> List[Dict[str, Any]]:
-        """Find all comments for a milestone."""
+        """
+        One page of a milestone's top-level comments, each with its first replies.
+        
+        A single aggregation: top-level comments are paged on the
+        (milestone_id, parent_comment_id, created_at) index and each one's
+        first replies_per_thread replies, in thread order, are joined in on the
+        (thread_id, path) index.
+        
+        Returns:
+            Top-level comments with replies: a flat list of replies in path order
+        """
         milestone_oid = self.validate_object_id(milestone_id, "milestone_id")
-        return await self.find_many(
-            {"milestone_id": milestone_oid, "parent_comment_id": None},  # Top-level only
-            skip=skip,
-            limit=limit,
-            sort_by="created_at",
-            sort_order=1  # Chronological order
-        )
+        return await self.aggregate([
+            {"$match": {"milestone_id": milestone_oid, "parent_comment_id": None}},
+            {"$sort": {"created_at": 1, "_id": 1}},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$lookup": {
+                "from": self.collection_name,
+                "let": {"thread_id": "$_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$thread_id", "$$thread_id"]}, "depth": {"$gt": 0}}},
+                    {"$sort": {"path": 1}},
+                    {"$limit": replies_per_thread}
+                ],
+                "as": "replies"
+            }}
+        ])
     
     async def find_replies(
         self,
-        parent_comment_id: str
+        comment_id: str,
+        after: Optional[str] = None,
+        limit: int = 20
     ) -> List[Dict[str, Any]]:
-        """Find all replies to a comment."""
-        parent_oid = self.validate_object_id(parent_comment_id, "parent_comment_id")
-        return await self.find_many(
-            {"parent_comment_id": parent_oid},
-            sort_by="created_at",
-            sort_order=1
-        )
+        """
+        Replies anywhere under a comment, in thread order, continuing after a cursor.
+        
+        Args:
+            comment_id: String representation of the comment ID
+            after: path of the last reply already loaded
+            limit: Maximum number to return
+            
+        Returns:
+            Flat list of replies in path order
+        """
+        comment_oid = self.validate_object_id(comment_id, "comment_id")
+        filter_dict: Dict[str, Any] = {"ancestor_ids": comment_oid}
+        if after:
+            filter_dict["path"] = {"$gt": after}
+        cursor = self.collection.find(filter_dict).sort("path", 1).limit(limit).max_time_ms(self.max_time())
+        return await cursor.to_list(length=limit)
+    
+    async def delete_subtree(self, comment: Dict[str, Any]) -> int:
+        """
+        Delete a comment and every reply under it, keeping reply counts in step.
+        
+        Returns:
+            Number of comments deleted
+        """
+        result = await self.collection.delete_many({
+            "$or": [{"_id": comment["_id"]}, {"ancestor_ids": comment["_id"]}]
+        })
+        deleted = result.deleted_count
+        if deleted and comment.get("ancestor_ids"):
+            await self.collection.update_many(
+                {"_id": {"$in": comment["ancestor_ids"]}},
+                {"$inc": {"reply_count": -deleted}}
+            )
+        return deleted
     
     async def check_authorship(
         self,
@@ -75,41 +192,25 @@ class CommentRepository(BaseRepository):
         milestone_oid = self.validate_object_id(milestone_id, "milestone_id")
         return await self.count({"milestone_id": milestone_oid})
     
-    async def get_nested_comments(
-        self,
-        milestone_id: str
-    ) -> List[Dict[str, Any]]:
+    @staticmethod
+    def nest_replies(replies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Get all comments with nested replies for a milestone.
+        Nest a path-ordered list of replies under their parents.
         
-        Returns top-level comments with their replies nested.
-        """
-        milestone_oid = self.validate_object_id(milestone_id, "milestone_id")
-        
-        # Get all comments for this milestone
-        all_comments = await self.find_many(
-            {"milestone_id": milestone_oid},
-            limit=500,
-            sort_by="created_at",
-            sort_order=1
-        )
+        Ancestors sort before their descendants, so a reply's parent, when it
+        is in the list at all, has already been seen.
         
-        # Separate top-level and replies
-        top_level = []
-        replies_map: Dict[str, List[Dict[str, Any]]] = {}
-        
-        for comment in all_comments:
-            if comment.get("parent_comment_id") is None:
-                top_level.append(comment)
+        Returns:
+            Replies whose parent is not in the list, each with its own replies nested
+        """
+        by_id: Dict[ObjectId, Dict[str, Any]] = {}
+        nested: List[Dict[str, Any]] = []
+        for reply in replies:
+            reply["replies"] = []
+            by_id[reply["_id"]] = reply
+            parent = by_id.get(reply.get("parent_comment_id"))
+            if parent is not None:
+                parent["replies"].append(reply)
             else:
-                parent_id = str(comment["parent_comment_id"])
-                if parent_id not in replies_map:
-                    replies_map[parent_id] = []
-                replies_map[parent_id].append(comment)
-        
-        # Attach replies to top-level comments
-        for comment in top_level:
-            comment_id = str(comment["_id"])
-            comment["replies"] = replies_map.get(comment_id, [])
-        
-        return top_level
+                nested.append(reply)
+        return nested
@@ -1,16 +1,24 @@
 """Repository for milestone reactions."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from bson import ObjectId
 from datetime import datetime
-from fastapi import HTTPException
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from ..base_repository import BaseRepository
+from ..reaction_counts_repository import ReactionCountsRepository, reaction_key
 
 
 class ReactionRepository(BaseRepository):
-    """Repository for milestone reaction operations."""
+    """
+    Repository for milestone reaction operations.
+    
+    Reactions are unique per (milestone, actor); each change is applied to the
+    milestone's histogram in reaction_counts, which summaries read.
+    """
     
     def __init__(self):
         super().__init__("milestone_reactions")
+        self.histograms = ReactionCountsRepository("milestone_reactions", "actor_id", "reaction_type")
     
     async def find_by_milestone(
         self,
@@ -47,9 +55,9 @@ class ReactionRepository(BaseRepository):
         milestone_id: str,
         user_id: str,
         reaction_type: str
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
         """
-        Create or update user's reaction to a milestone.
+        Create or update user's reaction to a milestone with a single upsert.
         
         Args:
             milestone_id: Milestone ID
@@ -57,40 +65,43 @@ class ReactionRepository(BaseRepository):
             reaction_type: Type of reaction
             
         Returns:
-            The created/updated reaction document
+            (reaction document, previous reaction type or None if the reaction is new)
         """
         milestone_oid = self.validate_object_id(milestone_id, "milestone_id")
         user_oid = self.validate_object_id(user_id, "user_id")
+        reaction_type = reaction_key(reaction_type)
+        now = datetime.utcnow()
+        reaction_filter = {"milestone_id": milestone_oid, "actor_id": user_oid}
+        inserted_id = ObjectId()
         
-        # Check if reaction exists
-        existing = await self.find_one(
-            {"milestone_id": milestone_oid, "actor_id": user_oid},
-            raise_404=False
-        )
+        # Two first reactions racing both try to insert; the loser retries as an update
+        for attempt in range(2):
+            try:
+                before = await self.collection.find_one_and_update(
+                    reaction_filter,
+                    {
+                        "$set": {"reaction_type": reaction_type, "created_at": now},
+                        "$setOnInsert": {"_id": inserted_id}
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.BEFORE
+                )
+                break
+            except DuplicateKeyError:
+                if attempt:
+                    raise
         
-        if existing:
-            # Update existing reaction
-            result = await self.collection.update_one(
-                {"_id": existing["_id"]},
-                {
-                    "$set": {
-                        "reaction_type": reaction_type,
-                        "created_at": datetime.utcnow()  # Update timestamp
-                    }
-                }
-            )
-            updated = await self.find_one({"_id": existing["_id"]}, raise_404=True)
-            assert updated is not None
-            return updated
-        else:
-            # Create new reaction
-            reaction_data = {
-                "milestone_id": milestone_oid,
-                "actor_id": user_oid,
-                "reaction_type": reaction_type,
-                "created_at": datetime.utcnow()
-            }
-            return await self.create(reaction_data)
+        previous = before.get("reaction_type") if before else None
+        reaction = {
+            "_id": before["_id"] if before else inserted_id,
+            **reaction_filter,
+            "reaction_type": reaction_type,
+            "created_at": now
+        }
+        await self.histograms.record(
+            f"milestone:{milestone_oid}", {"milestone_id": milestone_oid}, user_id, previous, reaction_type
+        )
+        return reaction, previous
     
     async def delete_user_reaction(
         self,
@@ -106,11 +117,17 @@ class ReactionRepository(BaseRepository):
         milestone_oid = self.validate_object_id(milestone_id, "milestone_id")
         user_oid = self.validate_object_id(user_id, "user_id")
         
-        result = await self.collection.delete_one(
-            {"milestone_id": milestone_oid, "actor_id": user_oid}
+        removed = await self.collection.find_one_and_delete(
+            {"milestone_id": milestone_oid, "actor_id": user_oid},
+            projection={"reaction_type": 1}
         )
+        if not removed:
+            return False
         
-        return result.deleted_count > 0
+        await self.histograms.record(
+            f"milestone:{milestone_oid}", {"milestone_id": milestone_oid}, user_id, removed["reaction_type"], None
+        )
+        return True
     
     async def get_reactions_summary(
         self,
@@ -120,6 +137,9 @@ class ReactionRepository(BaseRepository):
         """
         Get summary of all reactions for a milestone.
         
+        Reads the milestone's reaction histogram and, for current_user_id, their
+        reaction; neither depends on how many reactions there are.
+        
         Args:
             milestone_id: Milestone ID
             current_user_id: Optional current user ID to include their reaction
@@ -129,37 +149,21 @@ class ReactionRepository(BaseRepository):
         """
         milestone_oid = self.validate_object_id(milestone_id, "milestone_id")
         
-        # Get all reactions
-        reactions = await self.find_many(
-            {"milestone_id": milestone_oid},
-            limit=1000  # High limit for counting
-        )
+        histogram = await self.histograms.get(f"milestone:{milestone_oid}", {"milestone_id": milestone_oid})
         
-        # Count by type
-        reactions_by_type: Dict[str, int] = {}
         user_reaction = None
-        recent_reactors = []
+        if current_user_id:
+            reaction = await self.find_user_reaction(milestone_id, current_user_id)
+            user_reaction = reaction.get("reaction_type") if reaction else None
         
-        for reaction in reactions:
-            reaction_type = reaction.get("reaction_type", "like")
-            reactions_by_type[reaction_type] = reactions_by_type.get(reaction_type, 0) + 1
-            
-            # Check if this is current user's reaction
-            if current_user_id:
-                user_oid = self.validate_object_id(current_user_id, "user_id")
-                if reaction.get("actor_id") == user_oid:
-                    user_reaction = reaction_type
-            
-            # Collect recent reactors (limit to 10)
-            if len(recent_reactors) < 10:
-                recent_reactors.append({
-                    "actor_id": str(reaction.get("actor_id")),
-                    "reaction_type": reaction_type
-                })
+        recent_reactors = [
+            {"actor_id": reactor["user_id"], "reaction_type": reactor["reaction"]}
+            for reactor in reversed(histogram["recent"])
+        ]
         
         return {
-            "total_count": len(reactions),
-            "reactions_by_type": reactions_by_type,
+            "total_count": histogram["total"],
+            "reactions_by_type": histogram["counts"],
             "user_reaction": user_reaction,
             "recent_reactors": recent_reactors
         }
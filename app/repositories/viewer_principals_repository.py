@@ -0,0 +1,168 @@
+"""Repository for memory visibility principals and each viewer's principal set."""
+from typing import List, Dict, Any, Iterable
+from bson import ObjectId
+from datetime import datetime, timedelta
+from app.core.cache import AsyncLRUCache
+from app.core.config import settings
+from app.db.mongodb import get_collection
+from .base_repository import BaseRepository
+
+# Memories anyone may see
+PUBLIC_PRINCIPAL = "public"
+
+VIEWER_PRINCIPALS_COLLECTION = "viewer_principals"
+
+# This process's copy of recently used principal sets
+_local_principals = AsyncLRUCache(
+    "viewer_principals",
+    capacity=8192,
+    default_ttl=settings.VIEWER_PRINCIPALS_LOCAL_TTL_SECONDS
+)
+
+
+def user_principal(user_id: Any) -> str:
+    """The owner of a memory, or a user it is shared with."""
+    return f"user:{user_id}"
+
+
+def followers_principal(owner_id: Any) -> str:
+    """Everyone following owner_id."""
+    return f"followers:{owner_id}"
+
+
+def family_principal(owner_id: Any) -> str:
+    """Everyone owner_id is a relative of."""
+    return f"family:{owner_id}"
+
+
+def circle_principal(circle_id: Any) -> str:
+    """The owner and members of a family circle."""
+    return f"circle:{circle_id}"
+
+
+def memory_visible_to(memory: Dict[str, Any]) -> List[str]:
+    """
+    Principals allowed to see a memory, from its owner, privacy and audience fields.
+
+    Group principals are scoped to the owner (followers:<owner>, family:<owner>)
+    or to a circle, so following someone or joining a circle changes the
+    viewer's principal set, never the memories. Public memories also carry
+    followers:<owner> so feeds, which leave out the public principal, still
+    show them to followers.
+    """
+    owner_id = memory["owner_id"]
+    privacy = str(getattr(memory.get("privacy"), "value", memory.get("privacy") or "private"))
+    principals = [user_principal(owner_id)]
+    if privacy == "public":
+        principals += [PUBLIC_PRINCIPAL, followers_principal(owner_id)]
+    elif privacy == "friends":
+        principals.append(followers_principal(owner_id))
+    elif privacy == "family":
+        principals.append(family_principal(owner_id))
+    elif privacy == "family_circle":
+        principals += [circle_principal(circle_id) for circle_id in memory.get("family_circle_ids") or []]
+    elif privacy == "specific_users":
+        principals += [user_principal(user_id) for user_id in memory.get("allowed_user_ids") or []]
+    return principals
+
+
+def followed_user_ids(principals: Iterable[str]) -> List[ObjectId]:
+    """Users a viewer follows, read back from their principal set."""
+    prefix = followers_principal("")
+    return [ObjectId(p[len(prefix):]) for p in principals if p.startswith(prefix)]
+
+
+def circle_ids(principals: Iterable[str]) -> List[ObjectId]:
+    """Circles a viewer owns or belongs to, read back from their principal set."""
+    prefix = circle_principal("")
+    return [ObjectId(p[len(prefix):]) for p in principals if p.startswith(prefix)]
+
+
+class ViewerPrincipalsRepository(BaseRepository):
+    """
+    Repository for the principals each user holds (viewer_principals).
+
+    One document per user listing the principals memories may be shared
+    with that apply to them: public, their own user principal, followers:<X>
+    for everyone they follow, family:<X> for everyone they are a relative of
+    and circle:<id> for every circle they own or belong to. A memory read
+    then filters on visible_to with a single $in over this list.
+
+    Relationship and circle changes invalidate the affected users' documents;
+    the next read rebuilds them. expires_at bounds how long a set rebuilt
+    while such a change was in flight can be served.
+    """
+
+    def __init__(self):
+        super().__init__(VIEWER_PRINCIPALS_COLLECTION)
+
+    async def get(self, user_id: str) -> List[str]:
+        """A user's principals, from the local cache, the collection or a rebuild."""
+        user_oid = self.validate_object_id(user_id, "user_id")
+        return await _local_principals.get_or_load(
+            (str(user_oid), "principals"),
+            lambda: self._load(user_oid)
+        )
+
+    async def _load(self, user_oid: ObjectId) -> List[str]:
+        stored = await self.find_one({"_id": user_oid}, raise_404=False, projection={"principals": 1})
+        if stored is not None:
+            return stored["principals"]
+        return await self.rebuild(user_oid)
+
+    async def rebuild(self, user_oid: ObjectId) -> List[str]:
+        """Recompute a user's principals from relationships and circles, and store them."""
+        following = await get_collection("relationships").distinct(
+            "following_id", {"follower_id": user_oid, "status": "accepted"}
+        )
+        relatives = await get_collection("family_relationships").distinct(
+            "related_user_id", {"user_id": user_oid}
+        )
+        circles = await get_collection("family_circles").distinct(
+            "_id", {"$or": [{"member_ids": user_oid}, {"owner_id": user_oid}]}
+        )
+        principals = (
+            [PUBLIC_PRINCIPAL, user_principal(user_oid)]
+            + [followers_principal(owner_oid) for owner_oid in following]
+            + [family_principal(owner_oid) for owner_oid in relatives]
+            + [circle_principal(circle_oid) for circle_oid in circles]
+        )
+        now = datetime.utcnow()
+        await self.collection.replace_one(
+            {"_id": user_oid},
+            {
+                "_id": user_oid,
+                "principals": principals,
+                "refreshed_at": now,
+                "expires_at": now + timedelta(seconds=settings.VIEWER_PRINCIPALS_MAX_AGE_SECONDS)
+            },
+            upsert=True
+        )
+        return principals
+
+    async def invalidate(self, user_oids: Iterable[ObjectId]) -> None:
+        """Drop the principal sets of users whose relationships or circles changed."""
+        user_oids = list(user_oids)
+        if not user_oids:
+            return
+        await self.collection.delete_many({"_id": {"$in": user_oids}})
+        for user_oid in user_oids:
+            _local_principals.invalidate_prefix(str(user_oid))
+
+    async def visibility_filter(self, user_id: str, include_public: bool = True) -> Dict[str, Any]:
+        """
+        Memory filter matching what a user may see.
+
+        Args:
+            user_id: String representation of the viewing user's ID
+            include_public: False for feeds, which show public memories of
+                followed users only
+
+        Returns:
+            {"visible_to": {"$in": principals}}
+        """
+        principals = await self.get(user_id)
+        if not include_public:
+            principals = [p for p in principals if p != PUBLIC_PRINCIPAL]
+        return {"visible_to": {"$in": principals}}
+
@@ -38,3 +38,6 @@ class CollectionResponse(BaseModel):
 
 class CollectionWithMemories(CollectionResponse):
     memory_ids: List[str]
+
+class CollectionMemoryMove(BaseModel):
+    after_memory_id: Optional[str] = None  # None moves the memory to the front
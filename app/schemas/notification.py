@@ -12,15 +12,18 @@ class NotificationType(str, Enum):
     HUB_POST = "hub_post"
     COMMENT = "comment"
     LIKE = "like"
+    REACTION = "reaction"
     MENTION = "mention"
     SHARE = "share"
     FOLLOW = "follow"
+    FAMILY_TAG = "family_tag"
     EVENT_REMINDER = "event_reminder"
     BIRTHDAY = "birthday"
     ANNIVERSARY = "anniversary"
     HEALTH_RECORD_ASSIGNED = "health_record_assigned"
     HEALTH_RECORD_APPROVED = "health_record_approved"
     HEALTH_RECORD_REJECTED = "health_record_rejected"
+    HEALTH_REMINDER_ASSIGNMENT = "health_reminder_assignment"
     REMINDER_DUE = "reminder_due"
     SYSTEM = "system"
     GENEALOGY_APPROVAL_REQUEST = "genealogy_approval_request"
@@ -85,6 +88,9 @@ class NotificationResponse(BaseModel):
     record_date: Optional[str] = None
     approval_status: Optional[NotificationStatus] = None
     resolved_at: Optional[datetime] = None
+    # Coalesced notifications: events folded in and the latest distinct actors
+    count: int = 1
+    recent_actors: List[Dict[str, Any]] = []
     metadata: Dict[str, Any] = {}
 
 
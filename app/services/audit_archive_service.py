@@ -0,0 +1,112 @@
+"""
+Audit Archive Service - Moves old monthly audit buckets out of MongoDB
+
+Buckets older than AUDIT_HOT_MONTHS are streamed to gzip-compressed NDJSON
+(the same encoding as the export/backup tooling), uploaded to R2 when it is
+configured or kept under AUDIT_ARCHIVE_DIR otherwise, recorded in the
+audit_archives collection and then dropped.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.mongodb import get_collection
+from app.repositories.audit_log_repository import AuditLogRepository, bucket_start
+from app.utils.archive_utils import file_sha256, store_archive, write_gzip_ndjson
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MANIFEST_COLLECTION = "audit_archives"
+
+
+def _months_before(moment: datetime, months: int) -> datetime:
+    """First instant of the month that is `months` months before moment's month"""
+    index = moment.year * 12 + (moment.month - 1) - months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+class AuditArchiveService:
+    """Archives and prunes monthly audit log buckets"""
+
+    def __init__(self):
+        self.repo = AuditLogRepository()
+
+    async def maintain(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Prepare upcoming buckets and archive the ones past the hot window"""
+        now = now or datetime.utcnow()
+        await self.repo.ensure_upcoming_buckets(now)
+        return await self.archive_expired_buckets(now)
+
+    async def archive_expired_buckets(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Archive every bucket that ends before the AUDIT_HOT_MONTHS window"""
+        cutoff = _months_before(now or datetime.utcnow(), settings.AUDIT_HOT_MONTHS)
+        archived = []
+        for name in await self.repo.list_buckets():
+            started = bucket_start(name)
+            if started is not None and started < cutoff:
+                try:
+                    archived.append(await self.archive_bucket(name))
+                except Exception as e:
+                    logger.error(f"Failed to archive audit bucket {name}: {str(e)}", exc_info=True)
+        return archived
+
+    async def archive_bucket(self, name: str) -> Dict[str, Any]:
+        """
+        Archive one bucket and drop it.
+
+        The bucket is only dropped after the archive has been stored and the
+        number of archived entries matches the bucket's count.
+
+        Returns:
+            The manifest entry recorded in audit_archives
+        """
+        if bucket_start(name) is None:
+            raise ValueError(f"{name} is not an audit bucket")
+
+        collection = get_collection(name)
+        expected = await collection.count_documents({})
+
+        fd, tmp_path = tempfile.mkstemp(suffix=".ndjson.gz")
+        os.close(fd)
+        try:
+            written = await write_gzip_ndjson(tmp_path, name, collection.find({}).sort("created_at", 1))
+
+            if written != expected:
+                raise RuntimeError(f"Archived {written} entries from {name} but the bucket holds {expected}")
+
+            checksum = await asyncio.to_thread(file_sha256, tmp_path)
+            size = os.path.getsize(tmp_path)
+            key = f"{settings.AUDIT_ARCHIVE_PREFIX}/{name}.ndjson.gz"
+            stored = await asyncio.to_thread(
+                store_archive, tmp_path, key, {"bucket": name, "documents": written}, settings.AUDIT_ARCHIVE_DIR
+            )
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        manifest = {
+            "bucket": name,
+            "documents": written,
+            "compressed_bytes": size,
+            "sha256": checksum,
+            "archived_at": datetime.utcnow(),
+            **stored,
+        }
+        await get_collection(ARCHIVE_MANIFEST_COLLECTION).replace_one({"bucket": name}, manifest, upsert=True)
+        await collection.drop()
+
+        logger.info(f"Archived audit bucket {name}: {written} entries, {size} bytes to {stored['location']}")
+        return manifest
+
+    async def list_archives(self) -> List[Dict[str, Any]]:
+        """Manifest entries for archived buckets, newest first"""
+        cursor = get_collection(ARCHIVE_MANIFEST_COLLECTION).find({}, {"_id": 0}).sort("bucket", -1)
+        return await cursor.to_list(length=None)
+
+
+def get_audit_archive_service() -> AuditArchiveService:
+    return AuditArchiveService()
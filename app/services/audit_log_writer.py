@@ -0,0 +1,305 @@
+"""
+Asynchronous, batched audit-log writer.
+
+Audit entries are appended to a bounded in-memory queue and a background task
+flushes them with insert_many(ordered=False) whenever a batch fills up or the
+flush interval elapses, so logging an event costs a queue append instead of a
+database round trip.
+
+When the queue is full the configured overflow policy applies:
+- "spill": append the entry to an NDJSON file on disk (replayed later)
+- "drop_oldest": discard the oldest queued entry to make room
+- "drop_newest": discard the new entry
+
+Batches that fail to insert are spilled as well (or re-queued when spilling is
+disabled), and spill files are replayed once the queue has drained. Until the
+writer is started (scripts, tests) entries are written synchronously.
+"""
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, IO, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.mongodb import get_collection
+from app.utils.export_utils import decode_line, encode_line
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("spill", "drop_oldest", "drop_newest")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QueuedEntry = Tuple[str, Dict[str, Any]]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class AuditLogWriter:
+    """Bounded queue of audit documents with a background batch flusher"""
+
+    def __init__(
+        self,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        overflow_policy: Optional[str] = None,
+        spill_dir: Optional[str] = None,
+    ):
+        self.max_queue_size = max_queue_size or settings.AUDIT_QUEUE_MAX_SIZE
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        self.overflow_policy = overflow_policy or settings.AUDIT_OVERFLOW_POLICY
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy: {self.overflow_policy}")
+        spill_dir = spill_dir or settings.AUDIT_SPILL_DIR
+        self.spill_dir = spill_dir if os.path.isabs(spill_dir) else os.path.join(_PROJECT_ROOT, spill_dir)
+
+        self._queue: Deque[QueuedEntry] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._spill_file: Optional[IO[bytes]] = None
+        self._running = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.max_queue_depth = 0
+        self.last_flush_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def submit(self, collection: str, document: Dict[str, Any]) -> None:
+        """Queue one document for insertion; never blocks and never raises"""
+        self.submit_many(collection, [document])
+
+    def submit_many(self, collection: str, documents: List[Dict[str, Any]]) -> None:
+        """Queue several documents, applying the overflow policy when full"""
+        for document in documents:
+            # A client-side _id makes retries and spill replays idempotent
+            document.setdefault("_id", ObjectId())
+            self.enqueued += 1
+            if len(self._queue) >= self.max_queue_size:
+                if self.overflow_policy == "spill":
+                    self._spill([(collection, document)])
+                    continue
+                if self.overflow_policy == "drop_newest":
+                    self.dropped += 1
+                    continue
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append((collection, document))
+
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        if self._wakeup is not None and len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Start the background flusher (called from the app lifespan)"""
+        if self._running:
+            return
+        self._wakeup = asyncio.Event()
+        self._running = True
+        self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+        logger.info(
+            f"Audit log writer started (batch={self.batch_size}, interval={self.flush_interval}s, "
+            f"queue={self.max_queue_size}, overflow={self.overflow_policy})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still queued"""
+        if not self._running:
+            return
+        self._running = False
+        assert self._wakeup is not None
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        self._close_spill_file()
+        logger.info(f"Audit log writer stopped ({self.written} written, {len(self._queue)} left queued)")
+
+    async def flush(self) -> None:
+        """Write every entry queued at call time, in batch_size chunks"""
+        # Bounded so entries re-queued after a failed insert wait for the next cycle
+        for _ in range(math.ceil(len(self._queue) / self.batch_size)):
+            await self._flush_batch()
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                if not self._queue:
+                    await self._replay_spill()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Audit log writer flush failed: {str(e)}", exc_info=True)
+
+    async def _flush_batch(self) -> None:
+        batch: List[QueuedEntry] = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft())
+        if not batch:
+            return
+
+        by_collection: Dict[str, List[Dict[str, Any]]] = {}
+        for collection, document in batch:
+            by_collection.setdefault(collection, []).append(document)
+
+        started = time.perf_counter()
+        for collection, documents in by_collection.items():
+            try:
+                written = await self._insert(collection, documents)
+            except Exception as e:
+                self.failed_batches += 1
+                self.last_error = str(e)
+                logger.error(f"Failed to write {len(documents)} audit entries to {collection}: {str(e)}")
+                self._handle_failed([(collection, doc) for doc in documents])
+                continue
+            self.written += written
+        self.batches += 1
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _insert(self, collection: str, documents: List[Dict[str, Any]]) -> int:
+        try:
+            result = await get_collection(collection).insert_many(documents, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Duplicates mean the entry is already stored (e.g. a replayed spill)
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+            return e.details.get("nInserted", 0)
+
+    def _handle_failed(self, entries: List[QueuedEntry]) -> None:
+        if self.overflow_policy == "spill":
+            self._spill(entries)
+            return
+        room = self.max_queue_size - len(self._queue)
+        requeue = entries[:max(room, 0)]
+        self._queue.extendleft(reversed(requeue))
+        self.dropped += len(entries) - len(requeue)
+
+    def _spill_path(self) -> str:
+        return os.path.join(self.spill_dir, f"audit-{os.getpid()}.ndjson")
+
+    def _spill(self, entries: List[QueuedEntry]) -> None:
+        try:
+            if self._spill_file is None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self._spill_file = open(self._spill_path(), "ab")
+            for collection, document in entries:
+                self._spill_file.write(encode_line({"collection": collection, "document": document}))
+            self._spill_file.flush()
+            self.spilled += len(entries)
+        except OSError as e:
+            self.dropped += len(entries)
+            self.last_error = str(e)
+            logger.error(f"Failed to spill {len(entries)} audit entries to disk: {str(e)}")
+
+    def _close_spill_file(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _replayable_spill_files(self) -> List[str]:
+        """This process's spill file plus files left behind by processes that have exited"""
+        if not os.path.isdir(self.spill_dir):
+            return []
+        paths = []
+        for name in sorted(os.listdir(self.spill_dir)):
+            if not name.startswith("audit-") or not (name.endswith(".ndjson") or name.endswith(".ndjson.replaying")):
+                continue
+            pid = name[len("audit-"):].split(".", 1)[0]
+            if pid.isdigit() and (int(pid) == os.getpid() or not _pid_alive(int(pid))):
+                paths.append(os.path.join(self.spill_dir, name))
+        return paths
+
+    async def _replay_spill(self) -> None:
+        """Write spilled entries back to MongoDB once the queue has drained"""
+        paths = self._replayable_spill_files()
+        if not paths:
+            return
+        self._close_spill_file()
+        for path in paths:
+            replaying = path if path.endswith(".replaying") else path + ".replaying"
+            if replaying != path:
+                os.replace(path, replaying)
+            lines = await asyncio.to_thread(self._read_lines, replaying)
+            for start in range(0, len(lines), self.batch_size):
+                by_collection: Dict[str, List[Dict[str, Any]]] = {}
+                for line in lines[start:start + self.batch_size]:
+                    try:
+                        record = decode_line(line)
+                    except Exception:
+                        logger.warning(f"Skipping malformed audit spill line in {path}")
+                        continue
+                    by_collection.setdefault(record["collection"], []).append(record["document"])
+                for collection, documents in by_collection.items():
+                    try:
+                        self.written += await self._insert(collection, documents)
+                    except Exception as e:
+                        # The .replaying file stays and is retried next cycle; entries
+                        # carry their _id, so the ones already written are skipped
+                        self.last_error = str(e)
+                        logger.warning(f"Audit spill replay paused: {str(e)}")
+                        return
+                    self.replayed += len(documents)
+            os.remove(replaying)
+            logger.info(f"Replayed {len(lines)} spilled audit entries from {os.path.basename(path)}")
+
+    @staticmethod
+    def _read_lines(path: str) -> List[bytes]:
+        with open(path, "rb") as f:
+            return [line for line in f.read().split(b"\n") if line.strip()]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval,
+            "overflow_policy": self.overflow_policy,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "last_flush_ms": self.last_flush_ms,
+            "last_error": self.last_error,
+        }
+
+
+audit_log_writer = AuditLogWriter()
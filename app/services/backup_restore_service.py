@@ -0,0 +1,287 @@
+"""
+Backup Restore Service - Streams NDJSON/ZIP backups back into MongoDB
+
+Backups produced by /export/full-backup/ndjson (optionally zipped) are read
+line by line, ObjectIds are optionally remapped for cloning into another
+account, and documents are written in unordered batches with a bounded number
+of batches in flight at once.
+"""
+import asyncio
+import logging
+import time
+import zipfile
+from typing import Any, AsyncIterator, Dict, IO, List, Optional, Set
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.mongodb import get_collection
+from app.repositories.viewer_principals_repository import memory_visible_to
+from app.utils.export_utils import (
+    BACKUP_COLLECTIONS,
+    NDJSON_FORMAT,
+    decode_line,
+    insert_batch,
+    iter_chunked_lines,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RestoreStats:
+    """Running counters for a single restore, reported back to the caller"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.collections: Dict[str, Dict[str, int]] = {}
+        self.batches = 0
+        self.lines = 0
+
+    def record(self, name: str, inserted: int, skipped: int):
+        entry = self.collections.setdefault(name, {"inserted": 0, "skipped": 0})
+        entry["inserted"] += inserted
+        entry["skipped"] += skipped
+        self.batches += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        written = sum(c["inserted"] for c in self.collections.values())
+        return {
+            "collections": self.collections,
+            "lines_read": self.lines,
+            "documents_written": written,
+            "batches": self.batches,
+            "elapsed_seconds": round(elapsed, 3),
+            "documents_per_second": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+class IdRemapper:
+    """
+    Assigns fresh ObjectIds to restored documents and rewrites references.
+
+    Exports emit collections in dependency order (memories before the
+    collections that reference them), so a single pass can rewrite every
+    reference to a document that has already been seen. ObjectIds that were
+    never part of the backup, such as family circles or other users, are left
+    untouched.
+
+    The mapping holds one entry per restored document for the whole restore,
+    so unlike the rest of the stream its memory grows with the backup; it is
+    capped at IMPORT_REMAP_MAX_IDS documents.
+    """
+
+    def __init__(self, source_user_id: Optional[str], target_user_id: str, max_ids: Optional[int] = None):
+        self.max_ids = max_ids or settings.IMPORT_REMAP_MAX_IDS
+        self.assigned = 0
+        self.mapping: Dict[ObjectId, ObjectId] = {}
+        if source_user_id and ObjectId.is_valid(source_user_id):
+            self.mapping[ObjectId(source_user_id)] = ObjectId(target_user_id)
+
+    def assign(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        old_id = document.get("_id")
+        if isinstance(old_id, ObjectId):
+            if self.assigned >= self.max_ids:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Backups cloned with remap_ids are limited to {self.max_ids} documents"
+                )
+            self.mapping[old_id] = ObjectId()
+            self.assigned += 1
+        return self._rewrite(document)
+
+    def _rewrite(self, value: Any) -> Any:
+        if isinstance(value, ObjectId):
+            return self.mapping.get(value, value)
+        if isinstance(value, dict):
+            return {k: self._rewrite(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._rewrite(v) for v in value]
+        return value
+
+
+class BackupRestoreService:
+    """Restores a user's NDJSON backup with batched, bounded-parallel writes"""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.max_concurrency = max_concurrency or settings.IMPORT_MAX_CONCURRENCY
+
+    async def restore_lines(
+        self,
+        lines: AsyncIterator[bytes],
+        target_user_id: str,
+        remap_ids: bool = False,
+        overwrite: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Restore a backup from an async stream of NDJSON lines.
+
+        Args:
+            lines: NDJSON lines, header first
+            target_user_id: Account that will own the restored documents
+            remap_ids: Give every document a new _id (clone instead of restore)
+            overwrite: Replace existing documents instead of skipping them
+
+        Returns:
+            Per-collection counts and throughput figures
+        """
+        stats = RestoreStats()
+        target_oid = ObjectId(target_user_id)
+        buffers: Dict[str, List[Dict[str, Any]]] = {name: [] for name in BACKUP_COLLECTIONS}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending: Set[asyncio.Task] = set()
+        remapper: Optional[IdRemapper] = None
+        header: Optional[Dict[str, Any]] = None
+
+        async def submit(name: str):
+            documents, buffers[name] = buffers[name], []
+            if not documents:
+                return
+            # Backpressure: stop reading input until a write slot is free
+            await semaphore.acquire()
+            task = asyncio.create_task(self._write_batch(name, documents, overwrite, stats))
+            task.add_done_callback(lambda _t: semaphore.release())
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        try:
+            async for line in lines:
+                stats.lines += 1
+                try:
+                    record = decode_line(line)
+                except Exception:
+                    raise HTTPException(status_code=400, detail=f"Malformed NDJSON at line {stats.lines}")
+                if not isinstance(record, dict):
+                    raise HTTPException(status_code=400, detail=f"Malformed NDJSON at line {stats.lines}: not a record")
+
+                record_type = record.get("type")
+                if record_type == "header":
+                    header = self._check_header(record, target_user_id, remap_ids)
+                    if remap_ids:
+                        remapper = IdRemapper(header.get("user_id"), target_user_id)
+                    continue
+                if record_type != "document":
+                    continue
+                if header is None:
+                    raise HTTPException(status_code=400, detail="Backup is missing its header line")
+
+                name = record.get("collection")
+                if name not in BACKUP_COLLECTIONS:
+                    continue
+
+                document = record.get("document")
+                if not isinstance(document, dict):
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Malformed NDJSON at line {stats.lines}: document record has no document"
+                    )
+                if overwrite and "_id" not in document:
+                    # Overwrites are matched on _id
+                    raise HTTPException(status_code=400, detail=f"Malformed NDJSON at line {stats.lines}: document has no _id")
+                if remapper:
+                    document = remapper.assign(document)
+                document[BACKUP_COLLECTIONS[name]] = target_oid
+                if name == "memories":
+                    # Principals name the owner, so they follow the rewrite above
+                    document["visible_to"] = memory_visible_to(document)
+                buffers[name].append(document)
+                if len(buffers[name]) >= self.batch_size:
+                    await submit(name)
+
+            for name in BACKUP_COLLECTIONS:
+                await submit(name)
+            if pending:
+                await asyncio.gather(*list(pending))
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        report = stats.to_dict()
+        logger.info(
+            f"Restored {report['documents_written']} documents for user {target_user_id} "
+            f"in {report['elapsed_seconds']}s ({report['documents_per_second']} docs/s)"
+        )
+        return report
+
+    async def restore_zip(
+        self,
+        fileobj: IO[bytes],
+        target_user_id: str,
+        remap_ids: bool = False,
+        overwrite: bool = False,
+    ) -> Dict[str, Any]:
+        """Restore every .ndjson member of a ZIP archive, in archive order"""
+        try:
+            archive = zipfile.ZipFile(fileobj)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Uploaded file is not a valid ZIP archive")
+
+        members = [m for m in archive.namelist() if m.endswith(".ndjson")]
+        if not members:
+            raise HTTPException(status_code=400, detail="ZIP archive contains no .ndjson backup")
+
+        reports = []
+        with archive:
+            for member in members:
+                with archive.open(member) as stream:
+                    lines = iter_chunked_lines(lambda size: asyncio.to_thread(stream.read, size))
+                    report = await self.restore_lines(lines, target_user_id, remap_ids, overwrite)
+                    reports.append({"member": member, **report})
+        return {"archives": reports}
+
+    def _check_header(self, header: Dict[str, Any], target_user_id: str, remap_ids: bool) -> Dict[str, Any]:
+        if header.get("format") != NDJSON_FORMAT:
+            raise HTTPException(status_code=400, detail="Unsupported backup format")
+        # Restoring in place keeps _ids, which is only safe into the account that produced them
+        if not remap_ids and header.get("user_id") != target_user_id:
+            raise HTTPException(
+                status_code=403,
+                detail="Backup belongs to a different user; restore it with remap_ids to clone"
+            )
+        return header
+
+    async def _write_batch(
+        self,
+        name: str,
+        documents: List[Dict[str, Any]],
+        overwrite: bool,
+        stats: RestoreStats,
+    ):
+        collection = get_collection(name)
+        if not overwrite:
+            result = await insert_batch(collection, documents)
+            stats.record(name, result["inserted"], result["skipped"])
+            return
+
+        # Match on the owner too: an _id owned by another account fails the
+        # upsert with a duplicate key and is counted as skipped
+        owner_field = BACKUP_COLLECTIONS[name]
+        operations = [
+            ReplaceOne({"_id": doc["_id"], owner_field: doc[owner_field]}, doc, upsert=True)
+            for doc in documents
+        ]
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            stats.record(name, result.upserted_count + result.modified_count, 0)
+        except BulkWriteError as e:
+            details = e.details
+            written = details.get("nUpserted", 0) + details.get("nModified", 0)
+            stats.record(name, written, len(details.get("writeErrors", [])))
+            logger.warning(f"Restore batch for {name} had {len(details.get('writeErrors', []))} write errors")
+
+
+def get_backup_restore_service(
+    batch_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+) -> BackupRestoreService:
+    """Build a restore service; tuning knobs fall back to settings"""
+    return BackupRestoreService(batch_size=batch_size, max_concurrency=max_concurrency)
@@ -0,0 +1,305 @@
+"""
+Counter Service - Buffered, sharded engagement counters
+
+Every engagement counter (views, likes, bookmarks) is a numeric field on its
+target document, e.g. memories.view_count or hub_items.like_count, so list
+views read it with the document. Increments are not written one by one:
+
+- increment() adds to an in-process buffer keyed by (target type, target id,
+  field); a background task flushes the summed deltas every
+  COUNTER_FLUSH_INTERVAL_SECONDS with one bulk_write per collection.
+- A key whose delta in one flush reaches COUNTER_HOT_KEY_THRESHOLD is hot: for
+  COUNTER_HOT_KEY_TTL_SECONDS its increments go to one of COUNTER_SHARDS
+  documents in counter_shards instead of the target, so workers do not queue
+  on a single document. Shards are folded into the target every
+  COUNTER_FOLD_INTERVAL_SECONDS; each shard's value is claimed atomically, so
+  concurrent folds never count it twice, and put back if the target write
+  fails.
+
+Counters on targets therefore lag by up to a flush (a fold for hot keys);
+value() returns the exact figure when a response needs it. Until the service
+is started (scripts, tests) increments are written directly.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.mongodb import get_collection
+
+logger = logging.getLogger(__name__)
+
+# Target type -> collection holding its counters
+COUNTER_TARGETS: Dict[str, str] = {
+    "memory": "memories",
+    "hub_item": "hub_items",
+    "album_photo": "album_photos",
+}
+
+COUNTER_SHARDS_COLLECTION = "counter_shards"
+
+CounterKey = Tuple[str, ObjectId, str]
+
+
+class CounterService:
+    """Write-behind buffer of counter increments with sharding for hot keys"""
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        fold_interval: Optional[float] = None,
+        hot_threshold: Optional[int] = None,
+        hot_ttl: Optional[float] = None,
+        shard_count: Optional[int] = None,
+    ):
+        self.flush_interval = flush_interval or settings.COUNTER_FLUSH_INTERVAL_SECONDS
+        self.fold_interval = fold_interval or settings.COUNTER_FOLD_INTERVAL_SECONDS
+        self.hot_threshold = hot_threshold or settings.COUNTER_HOT_KEY_THRESHOLD
+        self.hot_ttl = hot_ttl or settings.COUNTER_HOT_KEY_TTL_SECONDS
+        self.shard_count = shard_count or settings.COUNTER_SHARDS
+
+        self._buffer: Dict[CounterKey, int] = {}
+        # Hot key -> monotonic time until which it stays on shards
+        self._hot: Dict[CounterKey, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._last_fold = 0.0
+
+        self.increments = 0
+        self.flushes = 0
+        self.written = 0
+        self.sharded = 0
+        self.folded = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @staticmethod
+    def collection_for(target_type: str) -> str:
+        try:
+            return COUNTER_TARGETS[target_type]
+        except KeyError:
+            raise ValueError(f"Unknown counter target type: {target_type}")
+
+    async def increment(self, target_type: str, target_id: ObjectId, field: str, delta: int = 1) -> None:
+        """Add delta to a target's counter; buffered while the service runs, so no round trip"""
+        collection = self.collection_for(target_type)
+        self.increments += 1
+        if not self._running:
+            await get_collection(collection).update_one({"_id": target_id}, {"$inc": {field: delta}})
+            return
+        key = (target_type, target_id, field)
+        self._buffer[key] = self._buffer.get(key, 0) + delta
+
+    async def value(self, target_type: str, target_id: ObjectId, field: str) -> int:
+        """Current value of a counter: stored, plus unfolded shards and this process's unflushed delta"""
+        stored = await get_collection(self.collection_for(target_type)).find_one({"_id": target_id}, {field: 1})
+        total = (stored or {}).get(field, 0) + self._buffer.get((target_type, target_id, field), 0)
+        shards = await get_collection(COUNTER_SHARDS_COLLECTION).aggregate([
+            {"$match": {"target_type": target_type, "target_id": target_id, "field": field}},
+            {"$group": {"_id": None, "value": {"$sum": "$value"}}}
+        ]).to_list(length=1)
+        if shards:
+            total += shards[0]["value"]
+        return total
+
+    async def start(self) -> None:
+        """Start the background flusher (called from the app lifespan)"""
+        if self._running:
+            return
+        self._running = True
+        self._last_fold = time.monotonic()
+        self._task = asyncio.create_task(self._run(), name="counter-service")
+        logger.info(
+            f"Counter service started (interval={self.flush_interval}s, hot threshold={self.hot_threshold}, "
+            f"shards={self.shard_count})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher, write the buffer and fold the shards"""
+        if not self._running:
+            return
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        await self.fold()
+        logger.info(f"Counter service stopped ({self.written} counter writes, {len(self._buffer)} left buffered)")
+
+    async def _run(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_fold >= self.fold_interval:
+                    self._last_fold = time.monotonic()
+                    await self.fold()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Counter flush failed: {str(e)}", exc_info=True)
+
+    async def flush(self) -> None:
+        """Write the buffered deltas: targets directly, hot keys to a random shard each"""
+        buffer, self._buffer = self._buffer, {}
+        if not buffer:
+            return
+
+        now = time.monotonic()
+        # Collection -> (key, update) pairs; writeErrors index into this list
+        by_collection: Dict[str, List[Tuple[CounterKey, UpdateOne]]] = {}
+        for (target_type, target_id, field), delta in buffer.items():
+            if delta == 0:
+                continue
+            key = (target_type, target_id, field)
+            if abs(delta) >= self.hot_threshold:
+                self._hot[key] = now + self.hot_ttl
+            if self._hot.get(key, 0) > now:
+                shard = random.randrange(self.shard_count)
+                collection = COUNTER_SHARDS_COLLECTION
+                update = UpdateOne(
+                    {"_id": f"{target_type}:{target_id}:{field}:{shard}"},
+                    {
+                        "$inc": {"value": delta},
+                        "$setOnInsert": {"target_type": target_type, "target_id": target_id, "field": field}
+                    },
+                    upsert=True
+                )
+            else:
+                collection = self.collection_for(target_type)
+                update = UpdateOne({"_id": target_id}, {"$inc": {field: delta}})
+            by_collection.setdefault(collection, []).append((key, update))
+        self._hot = {key: until for key, until in self._hot.items() if until > now}
+
+        started = time.perf_counter()
+        failed: List[CounterKey] = []
+        error: Optional[Exception] = None
+        for collection, writes in by_collection.items():
+            try:
+                await get_collection(collection).bulk_write([update for _, update in writes], ordered=False)
+            except BulkWriteError as e:
+                error = e
+                failed += [writes[write_error["index"]][0] for write_error in e.details.get("writeErrors", [])]
+            except Exception as e:
+                # Nothing is acknowledged per key, so this collection's batch is
+                # retried; if it was partially applied it over-counts by it
+                error = e
+                failed += [key for key, _ in writes]
+
+        # Only what did not reach the database goes back into the buffer
+        for key in failed:
+            self._buffer[key] = self._buffer.get(key, 0) + buffer[key]
+        if error is not None:
+            self.failed_flushes += 1
+            raise error
+        self.flushes += 1
+        self.written += sum(
+            len(writes) for collection, writes in by_collection.items() if collection != COUNTER_SHARDS_COLLECTION
+        )
+        self.sharded += len(by_collection.get(COUNTER_SHARDS_COLLECTION, []))
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    async def fold(self) -> int:
+        """
+        Move shard values into their targets.
+
+        Each shard is claimed by resetting it to 0 and reading what it held, so
+        increments landing meanwhile stay for the next fold. Claimed amounts
+        whose target write fails are added back to their shards for the next
+        fold. Emptied shards are removed, which keeps the collection as small
+        as the set of hot keys.
+
+        Returns:
+            Number of shards folded
+        """
+        shards = get_collection(COUNTER_SHARDS_COLLECTION)
+        claims: Dict[CounterKey, List[Tuple[str, int]]] = {}
+        async for shard in shards.find({"value": {"$ne": 0}}, {"_id": 1}):
+            claimed = await shards.find_one_and_update(
+                {"_id": shard["_id"], "value": {"$ne": 0}},
+                {"$set": {"value": 0}},
+                return_document=ReturnDocument.BEFORE
+            )
+            if not claimed:
+                continue
+            key = (claimed["target_type"], claimed["target_id"], claimed["field"])
+            claims.setdefault(key, []).append((claimed["_id"], claimed["value"]))
+
+        by_collection: Dict[str, List[CounterKey]] = {}
+        for key in claims:
+            by_collection.setdefault(self.collection_for(key[0]), []).append(key)
+
+        failed: List[CounterKey] = []
+        error: Optional[Exception] = None
+        for collection, keys in by_collection.items():
+            updates = [
+                UpdateOne({"_id": key[1]}, {"$inc": {key[2]: sum(value for _, value in claims[key])}})
+                for key in keys
+            ]
+            try:
+                await get_collection(collection).bulk_write(updates, ordered=False)
+            except BulkWriteError as e:
+                error = e
+                failed += [keys[write_error["index"]] for write_error in e.details.get("writeErrors", [])]
+            except Exception as e:
+                # Unacknowledged: retried whole, like a failed flush
+                error = e
+                failed += keys
+
+        if failed:
+            await shards.bulk_write([
+                UpdateOne(
+                    {"_id": shard_id},
+                    {
+                        "$inc": {"value": value},
+                        "$setOnInsert": {"target_type": target_type, "target_id": target_id, "field": field}
+                    },
+                    upsert=True
+                )
+                for target_type, target_id, field in failed
+                for shard_id, value in claims.pop((target_type, target_id, field))
+            ], ordered=False)
+
+        folded_ids = [shard_id for shard_claims in claims.values() for shard_id, _ in shard_claims]
+        if folded_ids:
+            await shards.delete_many({"_id": {"$in": folded_ids}, "value": 0})
+        self.folded += len(folded_ids)
+        if error is not None:
+            raise error
+        return len(folded_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "buffered_keys": len(self._buffer),
+            "hot_keys": len(self._hot),
+            "flush_interval_seconds": self.flush_interval,
+            "fold_interval_seconds": self.fold_interval,
+            "hot_threshold": self.hot_threshold,
+            "shard_count": self.shard_count,
+            "increments": self.increments,
+            "flushes": self.flushes,
+            "written": self.written,
+            "sharded": self.sharded,
+            "folded": self.folded,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": self.last_flush_ms,
+            "last_error": self.last_error,
+        }
+
+
+counter_service = CounterService()
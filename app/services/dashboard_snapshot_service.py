@@ -0,0 +1,231 @@
+"""
+Dashboard Snapshot Service - Serves the family dashboard from a per-user snapshot
+
+The dashboard payload (recent albums, upcoming events, recent milestones,
+circle and relationship counts) is composed once and stored per user. Reads
+are stale-while-revalidate:
+  - younger than DASHBOARD_SNAPSHOT_FRESH_SECONDS and not staled: served as is
+  - staled by a change event, or past the fresh window: served as is while a
+    background task recomposes it
+  - missing or older than DASHBOARD_SNAPSHOT_MAX_STALE_SECONDS: recomposed
+    before serving
+Change events come from the source repositories (see
+app.repositories.family.dashboard_snapshots.DashboardSourceMixin). Each user
+has at most one composition in flight per process.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.repositories.family_repository import (
+    FamilyAlbumsRepository,
+    FamilyCalendarRepository,
+    FamilyMilestonesRepository,
+    FamilyRepository,
+    FamilyRelationshipRepository
+)
+from app.repositories.family.dashboard_snapshots import DashboardSnapshotRepository
+from app.repositories.projections import ALBUM_SUMMARY
+
+logger = logging.getLogger(__name__)
+
+# Quick action buttons
+QUICK_ACTIONS: List[Dict[str, str]] = [
+    {
+        "id": "create_album",
+        "title": "Create Album",
+        "icon": "photo_album",
+        "route": "/family/albums/create"
+    },
+    {
+        "id": "add_event",
+        "title": "Add Event",
+        "icon": "event",
+        "route": "/family/calendar/create"
+    },
+    {
+        "id": "log_milestone",
+        "title": "Log Milestone",
+        "icon": "celebration",
+        "route": "/family/milestones/create"
+    },
+    {
+        "id": "add_recipe",
+        "title": "Add Recipe",
+        "icon": "restaurant",
+        "route": "/family/recipes/create"
+    },
+    {
+        "id": "view_tree",
+        "title": "Family Tree",
+        "icon": "account_tree",
+        "route": "/family/genealogy"
+    }
+]
+
+
+async def compose_dashboard(user_id: str) -> Dict[str, Any]:
+    """Build the dashboard payload from the source repositories, querying them concurrently"""
+    user_oid = ObjectId(user_id)
+    now = datetime.utcnow()
+
+    recent_albums_docs, upcoming_events_docs, recent_milestones_docs, family_circles_count, relationships_count = await asyncio.gather(
+        FamilyAlbumsRepository().find_accessible_albums(
+            user_id=user_id,
+            skip=0,
+            limit=5,
+            projection=ALBUM_SUMMARY
+        ),
+        FamilyCalendarRepository().find_user_events(
+            user_id=user_id,
+            start_date=now,
+            end_date=now + timedelta(days=30),
+            skip=0,
+            limit=10
+        ),
+        FamilyMilestonesRepository().find_user_milestones(
+            user_id=user_id,
+            skip=0,
+            limit=5
+        ),
+        FamilyRepository().count({
+            "$or": [
+                {"owner_id": user_oid},
+                {"member_ids": user_oid}
+            ]
+        }),
+        FamilyRelationshipRepository().count({
+            "user_id": user_oid
+        })
+    )
+
+    recent_albums = [
+        {
+            "id": str(album["_id"]),
+            "title": album["title"],
+            "photo_count": album.get("photos_count", 0),
+            "created_at": album["created_at"]
+        }
+        for album in recent_albums_docs
+    ]
+    upcoming_events = [
+        {
+            "id": str(event["_id"]),
+            "title": event["title"],
+            "event_type": event["event_type"],
+            "event_date": event["event_date"]
+        }
+        for event in upcoming_events_docs
+    ]
+    recent_milestones = [
+        {
+            "id": str(milestone["_id"]),
+            "title": milestone["title"],
+            "milestone_type": milestone["milestone_type"],
+            "milestone_date": milestone["milestone_date"]
+        }
+        for milestone in recent_milestones_docs
+    ]
+
+    # Recent activity aggregation
+    recent_activity = []
+    for album in recent_albums[:3]:
+        recent_activity.append({
+            "type": "album",
+            "id": album["id"],
+            "title": f"Created album '{album['title']}'",
+            "timestamp": album["created_at"]
+        })
+    for event in upcoming_events[:3]:
+        recent_activity.append({
+            "type": "event",
+            "id": event["id"],
+            "title": f"Upcoming: {event['title']}",
+            "timestamp": event["event_date"]
+        })
+    for milestone in recent_milestones[:3]:
+        recent_activity.append({
+            "type": "milestone",
+            "id": milestone["id"],
+            "title": f"Milestone: {milestone['title']}",
+            "timestamp": milestone["milestone_date"]
+        })
+
+    # Sort by timestamp and limit to 10 most recent
+    recent_activity.sort(key=lambda x: x["timestamp"], reverse=True)
+    recent_activity = recent_activity[:10]
+
+    return {
+        "recent_albums": recent_albums,
+        "upcoming_events": upcoming_events,
+        "recent_milestones": recent_milestones,
+        "recent_activity": recent_activity,
+        "quick_actions": QUICK_ACTIONS,
+        "stats": {
+            "family_circles": family_circles_count,
+            "relationships": relationships_count,
+            "albums": len(recent_albums),
+            "upcoming_events": len(upcoming_events),
+            "total_albums": len(recent_albums),
+            "total_events": len(upcoming_events),
+            "total_milestones": len(recent_milestones),
+            "total_recipes": 0  # TODO: Add recipes count
+        }
+    }
+
+
+class DashboardSnapshotService:
+    """Serves dashboard snapshots and keeps them fresh in the background"""
+
+    def __init__(self):
+        self.snapshots = DashboardSnapshotRepository()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def get(self, user_id: str) -> Dict[str, Any]:
+        """
+        Snapshot to serve for a user.
+
+        Returns:
+            The snapshot document: payload, refreshed_at and is_stale (True when
+            a refresh has been scheduled because the payload may be out of date)
+        """
+        snapshot = await self.snapshots.get(ObjectId(user_id))
+        now = datetime.utcnow()
+
+        if snapshot is None or now - snapshot["refreshed_at"] > timedelta(seconds=settings.DASHBOARD_SNAPSHOT_MAX_STALE_SECONDS):
+            snapshot = await asyncio.shield(self._refresh_task(user_id))
+            return {**snapshot, "is_stale": snapshot["stale"]}
+
+        is_stale = snapshot["stale"] or now - snapshot["refreshed_at"] > timedelta(seconds=settings.DASHBOARD_SNAPSHOT_FRESH_SECONDS)
+        if is_stale:
+            self._refresh_task(user_id)
+        return {**snapshot, "is_stale": is_stale}
+
+    async def refresh(self, user_id: str) -> Dict[str, Any]:
+        """Recompose and store a user's snapshot"""
+        user_oid = ObjectId(user_id)
+        version = await self.snapshots.current_version(user_oid)
+        refreshed_at = datetime.utcnow()
+        payload = await compose_dashboard(user_id)
+        return await self.snapshots.save(user_oid, payload, version, refreshed_at)
+
+    def _refresh_task(self, user_id: str) -> asyncio.Task:
+        """The user's in-flight refresh, starting one if there is none"""
+        task = self._refreshing.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self.refresh(user_id))
+            self._refreshing[user_id] = task
+            task.add_done_callback(lambda done: self._refresh_done(user_id, done))
+        return task
+
+    def _refresh_done(self, user_id: str, task: asyncio.Task) -> None:
+        self._refreshing.pop(user_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Dashboard snapshot refresh failed for user %s: %s", user_id, task.exception())
+
+
+dashboard_snapshot_service = DashboardSnapshotService()
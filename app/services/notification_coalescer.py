@@ -0,0 +1,219 @@
+"""
+Notification Coalescer - Folds bursts of similar notifications into one document
+
+Events for the same (recipient, type, target) inside one coalescing window are
+upserted into a single notification, keyed by coalesce_key, that carries an
+event count and the most recent distinct actors. All events of a call are
+written with one bulk_write, and WebSocket delivery is debounced so every
+recipient receives a single event per debounce window however many of their
+notifications changed in it.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.websocket import connection_manager, WSMessageType, create_ws_message
+from app.db.mongodb import get_collection
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+_DUPLICATE_KEY = 11000
+
+
+def coalesce_window(moment: datetime) -> Tuple[datetime, datetime]:
+    """Start and end of the fixed coalescing window containing moment"""
+    size = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS
+    index = int((moment - _EPOCH).total_seconds() // size)
+    start = _EPOCH + timedelta(seconds=index * size)
+    return start, start + timedelta(seconds=size)
+
+
+def coalesce_key(user_id: str, notification_type: str, target_type: Optional[str], target_id: Optional[str], window_start: datetime) -> str:
+    """Identity of the notification that events for one recipient, type and target share in a window"""
+    window = int((window_start - _EPOCH).total_seconds())
+    return f"{user_id}:{notification_type}:{target_type or ''}:{target_id or ''}:{window}"
+
+
+def _as_object_id(value: Any) -> Any:
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+
+def notification_ws_payload(document: Dict[str, Any]) -> Dict[str, Any]:
+    """WebSocket representation of a (possibly coalesced) notification"""
+    return {
+        "id": str(document["_id"]),
+        "type": document["type"],
+        "title": document["title"],
+        "message": document["message"],
+        "target_type": document.get("target_type"),
+        "target_id": str(document["target_id"]) if document.get("target_id") else None,
+        "count": document.get("count", 1),
+        "recent_actors": [
+            {**actor, "id": str(actor["id"])} for actor in document.get("recent_actors", [])
+        ],
+        "is_read": document.get("is_read", False),
+        "created_at": document["created_at"].isoformat(),
+        "updated_at": document["updated_at"].isoformat() if document.get("updated_at") else None
+    }
+
+
+class NotificationCoalescer:
+    """Upserts coalesced notifications and debounces their WebSocket events"""
+
+    def __init__(self):
+        # Per recipient: notifications changed since their last WebSocket event
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+
+    async def write(self, events: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[Tuple[Dict[str, Any], int, bool]]:
+        """
+        Upsert events into their coalesced notifications with a single bulk_write.
+
+        Each event takes user_id, type, title, message, actor_id and optionally
+        actor_name, actor_avatar, target_type, target_id and metadata; any other
+        keys are stored on the notification as-is. The latest event's text and
+        fields win, the count grows by the number of events folded in and the
+        actor list keeps the NOTIFICATION_COALESCE_MAX_ACTORS most recent actors.
+
+        Returns:
+            (notification, events folded in by this call, whether it turned
+            unread in this call) triples
+        """
+        if not events:
+            return []
+        now = now or datetime.utcnow()
+        # BSON dates keep milliseconds; truncate so unread_since compares equal after the round trip
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        window_start, window_end = coalesce_window(now)
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            key = coalesce_key(
+                str(event["user_id"]), event["type"], event.get("target_type"),
+                str(event["target_id"]) if event.get("target_id") else None, window_start
+            )
+            groups.setdefault(key, []).append(event)
+
+        operations = [UpdateOne({"coalesce_key": key}, self._upsert(key, group, now, window_end), upsert=True)
+                      for key, group in groups.items()]
+        await self._bulk_upsert(operations)
+
+        documents = await get_collection("notifications").find(
+            {"coalesce_key": {"$in": list(groups)}}
+        ).to_list(length=len(groups))
+        return [
+            (document, len(groups[document["coalesce_key"]]), document.get("unread_since") == now)
+            for document in documents
+        ]
+
+    def _upsert(self, key: str, group: List[Dict[str, Any]], now: datetime, window_end: datetime) -> List[Dict[str, Any]]:
+        """
+        Update pipeline for one coalesced notification.
+
+        A pipeline is used so the actor list can drop actors that act again
+        before appending them; caller values are wrapped in $literal so text
+        starting with "$" is never read as a field path.
+        """
+        latest = dict(group[-1])
+        user_id = latest.pop("user_id")
+        notification_type = latest.pop("type")
+        target_type = latest.pop("target_type", None)
+        target_id = latest.pop("target_id", None)
+
+        actors: Dict[str, Dict[str, Any]] = {}
+        for event in group:
+            actor_id = str(event["actor_id"])
+            actors.pop(actor_id, None)
+            actors[actor_id] = {
+                "id": ObjectId(actor_id),
+                "name": event.get("actor_name"),
+                "avatar": event.get("actor_avatar"),
+                "at": now
+            }
+        new_actors = list(actors.values())[-settings.NOTIFICATION_COALESCE_MAX_ACTORS:]
+
+        fields = {
+            "title": latest.pop("title"),
+            "message": latest.pop("message"),
+            "actor_id": ObjectId(str(latest.pop("actor_id"))),
+            "metadata": latest.pop("metadata", None) or {},
+            **{k: v for k, v in latest.items() if v is not None}
+        }
+
+        return [{"$set": {
+            "user_id": {"$literal": ObjectId(str(user_id))},
+            "type": {"$literal": notification_type},
+            "target_type": {"$literal": target_type},
+            "target_id": {"$literal": _as_object_id(target_id)},
+            "coalesce_key": {"$literal": key},
+            "created_at": {"$ifNull": ["$created_at", {"$literal": now}]},
+            "coalesce_until": {"$ifNull": ["$coalesce_until", {"$literal": window_end}]},
+            "updated_at": {"$literal": now},
+            # Expressions in one $set read the pre-update document, so this only moves for new or read notifications
+            "unread_since": {"$cond": [{"$eq": ["$is_read", False]}, "$unread_since", {"$literal": now}]},
+            "is_read": False,
+            # New activity reopens the notification, so a read expiry no longer applies
+            "expires_at": "$$REMOVE",
+            "count": {"$add": [{"$ifNull": ["$count", 0]}, len(group)]},
+            "recent_actors": {"$slice": [
+                {"$concatArrays": [
+                    {"$filter": {
+                        "input": {"$ifNull": ["$recent_actors", []]},
+                        "cond": {"$not": [{"$in": ["$$this.id", {"$literal": [a["id"] for a in new_actors]}]}]}
+                    }},
+                    {"$literal": new_actors}
+                ]},
+                -settings.NOTIFICATION_COALESCE_MAX_ACTORS
+            ]},
+            **{field: {"$literal": value} for field, value in fields.items()}
+        }}]
+
+    async def _bulk_upsert(self, operations: List[UpdateOne]) -> None:
+        """Run the upserts, retrying the ones that lost a concurrent insert race on coalesce_key"""
+        try:
+            await get_collection("notifications").bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != _DUPLICATE_KEY for error in errors):
+                raise
+            # The competing insert created the document; the retry updates it
+            retry = [operations[error["index"]] for error in errors]
+            await get_collection("notifications").bulk_write(retry, ordered=False)
+
+    def broadcast(self, user_id: str, document: Dict[str, Any]) -> None:
+        """Queue a changed notification for the recipient's next debounced WebSocket event"""
+        self._pending.setdefault(user_id, {})[str(document["_id"])] = notification_ws_payload(document)
+        if user_id not in self._timers:
+            self._timers[user_id] = asyncio.create_task(self._send_after_debounce(user_id))
+
+    async def _send_after_debounce(self, user_id: str) -> None:
+        try:
+            await asyncio.sleep(settings.NOTIFICATION_WS_DEBOUNCE_SECONDS)
+        finally:
+            self._timers.pop(user_id, None)
+            payloads = list(self._pending.pop(user_id, {}).values())
+
+        try:
+            if len(payloads) == 1:
+                message = create_ws_message(WSMessageType.NOTIFICATION_CREATED, payloads[0], user_id)
+            else:
+                message = create_ws_message(
+                    WSMessageType.NOTIFICATION_DIGEST,
+                    {"notifications": payloads, "total": len(payloads)},
+                    user_id
+                )
+            await connection_manager.send_personal_message(message, user_id)
+        except Exception as e:
+            logger.error(f"Error broadcasting coalesced notifications to {user_id}: {str(e)}")
+
+
+notification_coalescer = NotificationCoalescer()
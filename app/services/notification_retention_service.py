@@ -0,0 +1,166 @@
+"""
+Notification Retention Service - Keeps the notifications collection bounded
+
+Three mechanisms work together:
+- read notifications of short-lived types get an expires_at when they are
+  marked read, which the TTL index acts on (NOTIFICATION_READ_TTL_DAYS);
+- each user's history is capped at NOTIFICATION_MAX_PER_USER, oldest first;
+- notifications older than NOTIFICATION_ARCHIVE_AFTER_DAYS move to cold storage.
+
+Capped and aged notifications are written to gzip NDJSON archives (R2 when
+configured, NOTIFICATION_ARCHIVE_DIR otherwise) and recorded in
+notification_archives before they are deleted. Health record assignments
+still awaiting a decision are never archived.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.db.mongodb import get_collection
+from app.repositories.family.notifications import NotificationRepository, UNREAD_COUNTERS_COLLECTION
+from app.schemas.notification import NotificationStatus
+from app.utils.archive_utils import file_sha256, store_archive, write_gzip_ndjson
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MANIFEST_COLLECTION = "notification_archives"
+
+_NOT_PENDING = {"approval_status": {"$ne": NotificationStatus.PENDING.value}}
+
+
+async def _iterate(documents: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    for document in documents:
+        yield document
+
+
+class NotificationRetentionService:
+    """Applies the notification retention policy"""
+
+    def __init__(self):
+        self.repo = NotificationRepository()
+        self.collection = get_collection("notifications")
+
+    async def maintain(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Run every retention step; returns how many notifications each step touched"""
+        now = now or datetime.utcnow()
+        normalized = await self.normalize_read_flags()
+        capped = await self.enforce_user_caps()
+        aged = await self.archive_older_than(now - timedelta(days=settings.NOTIFICATION_ARCHIVE_AFTER_DAYS))
+        return {"normalized": normalized, "capped": capped, "archived": aged}
+
+    async def normalize_read_flags(self) -> int:
+        """
+        Move notifications written with the legacy "read" flag onto is_read.
+
+        Their owners' unread counters are reset so they are re-seeded with
+        these notifications included.
+        """
+        legacy = {"is_read": {"$exists": False}}
+        user_oids = await self.collection.distinct("user_id", legacy)
+        if not user_oids:
+            return 0
+        result = await self.collection.update_many(
+            legacy,
+            [{"$set": {"is_read": {"$ifNull": ["$read", False]}}}, {"$unset": "read"}]
+        )
+        await get_collection(UNREAD_COUNTERS_COLLECTION).delete_many({"_id": {"$in": user_oids}})
+        return result.modified_count
+
+    async def enforce_user_caps(self) -> int:
+        """Archive and remove each user's notifications beyond NOTIFICATION_MAX_PER_USER"""
+        cap = settings.NOTIFICATION_MAX_PER_USER
+        over_cap = await self.collection.aggregate([
+            {"$group": {"_id": "$user_id", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": cap}}}
+        ], allowDiskUse=True).to_list(length=None)
+
+        removed = 0
+        for entry in over_cap:
+            boundary = await self.collection.find(
+                {"user_id": entry["_id"]}, {"created_at": 1}
+            ).sort("created_at", -1).skip(cap).limit(1).to_list(length=1)
+            if boundary:
+                removed += await self._archive_and_delete(
+                    {"user_id": entry["_id"], "created_at": {"$lte": boundary[0]["created_at"]}, **_NOT_PENDING},
+                    reason="cap"
+                )
+        return removed
+
+    async def archive_older_than(self, cutoff: datetime) -> int:
+        """Archive and remove notifications created before cutoff"""
+        return await self._archive_and_delete({"created_at": {"$lt": cutoff}, **_NOT_PENDING}, reason="age")
+
+    async def _archive_and_delete(self, query: Dict[str, Any], reason: str) -> int:
+        """
+        Move matching notifications to cold storage in batches.
+
+        Each batch is deleted only after its archive has been stored and
+        recorded, and unread counters are lowered for unread ones removed.
+        """
+        removed = 0
+        batch_size = settings.NOTIFICATION_ARCHIVE_BATCH_SIZE
+        while True:
+            batch = await self.collection.find(query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                return removed
+
+            await self._archive_batch(batch, reason)
+            await self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+
+            unread: Dict[ObjectId, int] = {}
+            for doc in batch:
+                if doc.get("is_read") is False:
+                    unread[doc["user_id"]] = unread.get(doc["user_id"], 0) - 1
+            await self.repo.increment_unread(unread)
+
+            removed += len(batch)
+            if len(batch) < batch_size:
+                return removed
+
+    async def _archive_batch(self, batch: List[Dict[str, Any]], reason: str) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        fd, tmp_path = tempfile.mkstemp(suffix=".ndjson.gz")
+        os.close(fd)
+        try:
+            written = await write_gzip_ndjson(tmp_path, "notifications", _iterate(batch))
+            checksum = await asyncio.to_thread(file_sha256, tmp_path)
+            size = os.path.getsize(tmp_path)
+            key = f"{settings.NOTIFICATION_ARCHIVE_PREFIX}/{now:%Y/%m/%d}/{reason}-{batch[0]['_id']}.ndjson.gz"
+            stored = await asyncio.to_thread(
+                store_archive, tmp_path, key, {"reason": reason, "documents": written},
+                settings.NOTIFICATION_ARCHIVE_DIR
+            )
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        created = [doc["created_at"] for doc in batch if doc.get("created_at")]
+        manifest = {
+            "key": key,
+            "reason": reason,
+            "documents": written,
+            "compressed_bytes": size,
+            "sha256": checksum,
+            "oldest_created_at": min(created) if created else None,
+            "newest_created_at": max(created) if created else None,
+            "archived_at": now,
+            **stored,
+        }
+        await get_collection(ARCHIVE_MANIFEST_COLLECTION).replace_one({"key": key}, manifest, upsert=True)
+        logger.info(f"Archived {written} notifications ({reason}) to {stored['location']}")
+        return manifest
+
+    async def list_archives(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent archive manifest entries"""
+        cursor = get_collection(ARCHIVE_MANIFEST_COLLECTION).find({}, {"_id": 0}).sort("archived_at", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+
+def get_notification_retention_service() -> NotificationRetentionService:
+    return NotificationRetentionService()
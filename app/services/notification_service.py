@@ -1,36 +1,76 @@
 """
 Service for creating and broadcasting notifications with WebSocket support
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from bson import ObjectId
 import logging
 
 from app.db.mongodb import get_collection
 from app.core.websocket import connection_manager, WSMessageType, create_ws_message
+from app.services.notification_coalescer import notification_coalescer
+from app.repositories.family.notifications import NotificationRepository
 from app.schemas.notification import NotificationType, NotificationStatus
 from app.repositories.audit_log_repository import AuditLogRepository
 from app.schemas.audit_log import AuditLogCreate, AuditAction
 
 logger = logging.getLogger(__name__)
 
+# Notifications that each need their own document: approvals are resolved and
+# reminders fall due one by one, so they are never folded into another
+DISTINCT_NOTIFICATION_TYPES = {
+    NotificationType.HEALTH_RECORD_ASSIGNED.value,
+    NotificationType.HEALTH_REMINDER_ASSIGNMENT.value,
+    NotificationType.REMINDER_DUE.value,
+    NotificationType.EVENT_REMINDER.value,
+    NotificationType.GENEALOGY_APPROVAL_REQUEST.value,
+    NotificationType.CONNECTION_REQUEST.value,
+    NotificationType.HUB_INVITE.value,
+    NotificationType.HUB_JOIN_REQUEST.value,
+    "health_reminder",
+}
+
 
 class NotificationService:
     """Service for managing notifications with real-time updates"""
     
     def __init__(self):
         self.audit_repo = AuditLogRepository()
+        self.notification_repo = NotificationRepository()
     
     def _get_setting_key(self, notification_type: str) -> Optional[str]:
         """Map notification type to setting key"""
         # This mapping should align with the settings keys in the frontend/router
         if notification_type in [NotificationType.HEALTH_RECORD_ASSIGNED, NotificationType.HEALTH_RECORD_APPROVED, NotificationType.HEALTH_RECORD_REJECTED]:
             return "health_updates"
-        if notification_type in [NotificationType.FAMILY_INVITE, NotificationType.FAMILY_MEMBER_ADDED]:
+        if notification_type in ["family_invite", "family_member_added"]:
             return "family_activity"
         # Add other mappings as needed
         return None
 
+    async def _load_recipients(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Notification settings and push tokens of several recipients in one query"""
+        recipient_oids = list({ObjectId(user_id) for user_id in user_ids})
+        return {
+            str(user["_id"]): user
+            async for user in get_collection("users").find(
+                {"_id": {"$in": recipient_oids}},
+                {"settings.notifications": 1, "fcm_tokens": 1}
+            )
+        }
+
+    def _is_allowed(self, user: Optional[Dict[str, Any]], user_id: str, notification_type: str) -> bool:
+        """Whether the recipient exists and has not switched this notification type off"""
+        if not user:
+            logger.warning(f"User {user_id} not found for notification")
+            return False
+        settings = user.get("settings", {}).get("notifications", {})
+        setting_key = self._get_setting_key(notification_type)
+        if setting_key and not settings.get(setting_key, True):
+            logger.info(f"Notification {notification_type} suppressed for user {user_id} by setting {setting_key}")
+            return False
+        return True
+
     async def create_notification(
         self,
         user_id: str,
@@ -53,7 +93,26 @@ class NotificationService:
     ) -> Optional[Dict[str, Any]]:
         """
         Create a notification and broadcast via WebSocket, respecting user settings.
+        
+        Notifications outside DISTINCT_NOTIFICATION_TYPES that carry no health
+        record fields go through create_coalesced_notifications, so a burst of
+        events for one recipient, type and target becomes one notification.
         """
+        notification_type = getattr(type, "value", type)
+        has_record_fields = any([health_record_id, assigner_id, has_reminder, reminder_due_at, record_title])
+        if notification_type not in DISTINCT_NOTIFICATION_TYPES and not has_record_fields:
+            documents = await self.create_coalesced_notifications([{
+                "user_id": user_id,
+                "type": notification_type,
+                "title": title,
+                "message": message,
+                "actor_id": actor_id,
+                "target_type": target_type,
+                "target_id": target_id,
+                "metadata": metadata
+            }])
+            return documents[0] if documents else None
+        
         try:
             # Check user settings
             user = await get_collection("users").find_one({"_id": ObjectId(user_id)})
@@ -69,12 +128,14 @@ class NotificationService:
                 logger.info(f"Notification {type} suppressed for user {user_id} by setting {setting_key}")
                 return None
 
+            snapshots = await self.notification_repo.actor_snapshots([ObjectId(actor_id)])
             notification_data = {
                 "user_id": ObjectId(user_id),
                 "type": type,
                 "title": title,
                 "message": message,
                 "actor_id": ObjectId(actor_id),
+                **snapshots[ObjectId(actor_id)],
                 "is_read": False,
                 "created_at": datetime.utcnow(),
                 "metadata": metadata or {}
@@ -108,6 +169,7 @@ class NotificationService:
 
             result = await get_collection("notifications").insert_one(notification_data)
             notification_data["_id"] = result.inserted_id
+            await self.notification_repo.increment_unread({notification_data["user_id"]: 1})
             
             # Broadcast via WebSocket
             await self._broadcast_notification_created(user_id, notification_data)
@@ -131,6 +193,149 @@ class NotificationService:
             logger.error(f"Error creating notification: {str(e)}")
             return None
 
+    async def create_notifications_batch(
+        self,
+        notifications: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several notifications with one settings lookup and one insert.
+        
+        Each item takes the keys of create_notification (user_id, type, title,
+        message, actor_id, target_type, target_id, metadata); any other keys are
+        stored on the notification as-is. Callers are expected to have already
+        coalesced items so each recipient gets a single WebSocket event.
+        """
+        if not notifications:
+            return []
+        try:
+            users = await self._load_recipients([n["user_id"] for n in notifications])
+            snapshots = await self.notification_repo.actor_snapshots(n["actor_id"] for n in notifications)
+            
+            documents = []
+            now = datetime.utcnow()
+            for item in notifications:
+                item = dict(item)
+                user_id = str(item.pop("user_id"))
+                notification_type = item.pop("type")
+                if not self._is_allowed(users.get(user_id), user_id, notification_type):
+                    continue
+                
+                target_id = item.pop("target_id", None)
+                actor_oid = ObjectId(item.pop("actor_id"))
+                document = {
+                    "user_id": ObjectId(user_id),
+                    "type": notification_type,
+                    "title": item.pop("title"),
+                    "message": item.pop("message"),
+                    "actor_id": actor_oid,
+                    **snapshots[actor_oid],
+                    "is_read": False,
+                    "created_at": now,
+                    "metadata": item.pop("metadata", None) or {}
+                }
+                if target_id:
+                    document["target_id"] = ObjectId(target_id)
+                document.update({k: v for k, v in item.items() if v is not None})
+                if notification_type == NotificationType.HEALTH_RECORD_ASSIGNED:
+                    document.setdefault("approval_status", NotificationStatus.PENDING.value)
+                documents.append(document)
+            
+            if not documents:
+                return []
+            
+            await get_collection("notifications").insert_many(documents, ordered=False)
+            
+            unread: Dict[ObjectId, int] = {}
+            for document in documents:
+                unread[document["user_id"]] = unread.get(document["user_id"], 0) + 1
+            await self.notification_repo.increment_unread(unread)
+            
+            for document in documents:
+                user_id = str(document["user_id"])
+                await self._broadcast_notification_created(user_id, document)
+                if users[user_id].get("fcm_tokens"):
+                    await self.send_push_notification(
+                        user_id=user_id,
+                        title=document["title"],
+                        body=document["message"],
+                        data={
+                            "type": document["type"],
+                            "id": str(document["_id"]),
+                            "click_action": "FLUTTER_NOTIFICATION_CLICK"
+                        }
+                    )
+            
+            logger.info(f"{len(documents)} notifications created in batch")
+            return documents
+        
+        except Exception as e:
+            logger.error(f"Error creating notifications in batch: {str(e)}")
+            return []
+
+    async def create_coalesced_notifications(
+        self,
+        notifications: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create notifications that fold into an existing one for the same
+        recipient, type and target within the coalescing window.
+        
+        Items take the keys of create_notifications_batch plus optional
+        actor_name/actor_avatar for the coalesced actor list. Every item of a
+        call is written with one bulk upsert; WebSocket events are debounced
+        per recipient and push notifications are only sent when a
+        notification is first created, not for every event folded into it.
+        """
+        if not notifications:
+            return []
+        try:
+            users = await self._load_recipients([n["user_id"] for n in notifications])
+            allowed = [
+                n for n in notifications
+                if self._is_allowed(users.get(str(n["user_id"])), str(n["user_id"]), n["type"])
+            ]
+            
+            missing = [n["actor_id"] for n in allowed if "actor_name" not in n]
+            if missing:
+                snapshots = await self.notification_repo.actor_snapshots(missing)
+                allowed = [
+                    n if "actor_name" in n else {
+                        **n,
+                        "actor_name": snapshots[ObjectId(n["actor_id"])]["actor_name"],
+                        "actor_avatar": snapshots[ObjectId(n["actor_id"])]["actor_avatar"]
+                    }
+                    for n in allowed
+                ]
+            
+            results = await notification_coalescer.write(allowed)
+            await self.notification_repo.increment_unread({
+                document["user_id"]: 1 for document, _, became_unread in results if became_unread
+            })
+            
+            documents = []
+            for document, folded, _ in results:
+                user_id = str(document["user_id"])
+                notification_coalescer.broadcast(user_id, document)
+                if document["count"] == folded and users[user_id].get("fcm_tokens"):
+                    await self.send_push_notification(
+                        user_id=user_id,
+                        title=document["title"],
+                        body=document["message"],
+                        data={
+                            "type": document["type"],
+                            "id": str(document["_id"]),
+                            "click_action": "FLUTTER_NOTIFICATION_CLICK"
+                        }
+                    )
+                documents.append(document)
+            
+            logger.info(f"{len(allowed)} notification events coalesced into {len(documents)} notifications")
+            return documents
+        
+        except Exception as e:
+            logger.error(f"Error creating coalesced notifications: {str(e)}")
+            return []
+
     async def create_health_record_assignment_notification(
         self,
         assignee_id: str,
@@ -374,3 +579,21 @@ class NotificationService:
         except Exception as e:
             logger.error(f"Error creating audit log: {str(e)}")
             return False
+    
+    async def create_audit_logs(self, entries: List[Dict[str, Any]]) -> bool:
+        """
+        Create several audit log entries with a single insert.
+        
+        Each entry takes the keyword arguments of create_audit_log.
+        """
+        try:
+            logs = [
+                AuditLogCreate(**{**entry, "metadata": entry.get("metadata") or {}})
+                for entry in entries
+            ]
+            await self.audit_repo.create_logs(logs)
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error creating audit logs: {str(e)}")
+            return False
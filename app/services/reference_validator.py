@@ -0,0 +1,141 @@
+"""
+Reference validation for writes that point at many users, relatives or circles.
+
+A memory, circle or calendar event can reference dozens of users and circles.
+Checking them one find_one at a time costs a round trip per ID; here each list
+is checked as a whole:
+
+- users: one $in over the IDs not already known to exist. Existing users are
+  remembered for REFERENCE_CACHE_TTL_SECONDS. Accounts are normally only
+  deactivated; the admin hard delete calls forget_users(), and other workers
+  may still accept a deleted user until their entry expires.
+- relatives and circle membership: read from the writer's principal set
+  (ViewerPrincipalsRepository), which relationship and circle changes
+  invalidate, so a warm write costs no query for them at all.
+"""
+from typing import Any, Dict, Iterable, List, Set
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.core.cache import AsyncLRUCache
+from app.core.config import settings
+from app.db.mongodb import get_collection
+from app.repositories.viewer_principals_repository import (
+    ViewerPrincipalsRepository,
+    circle_principal,
+    family_principal,
+)
+
+_known_users = AsyncLRUCache(
+    "known_users",
+    capacity=16384,
+    default_ttl=settings.REFERENCE_CACHE_TTL_SECONDS
+)
+
+
+def parse_object_ids(ids: Iterable[Any], field_name: str = "IDs", strict: bool = True) -> List[ObjectId]:
+    """
+    Convert a list of IDs to ObjectIds, dropping duplicates but keeping order.
+
+    Args:
+        ids: ID strings (or ObjectIds)
+        field_name: Name of the field for error messages
+        strict: Raise on malformed IDs; otherwise skip them
+
+    Raises:
+        HTTPException: 400 listing the malformed IDs, when strict
+    """
+    parsed: List[ObjectId] = []
+    seen: Set[ObjectId] = set()
+    invalid: List[str] = []
+    for idx, value in enumerate(ids or []):
+        if isinstance(value, ObjectId):
+            oid = value
+        elif isinstance(value, str) and ObjectId.is_valid(value):
+            oid = ObjectId(value)
+        else:
+            invalid.append(f"{field_name}[{idx}]='{value}'")
+            continue
+        if oid not in seen:
+            seen.add(oid)
+            parsed.append(oid)
+
+    if invalid and strict:
+        raise HTTPException(status_code=400, detail=f"Invalid {field_name}: {', '.join(invalid)}")
+    return parsed
+
+
+class ReferenceValidator:
+    """Checks lists of referenced IDs with at most one query per collection."""
+
+    def __init__(self):
+        self.principals = ViewerPrincipalsRepository()
+
+    async def existing_users(self, user_oids: Iterable[ObjectId]) -> Set[ObjectId]:
+        """The subset of user_oids that belong to existing users."""
+        found: Set[ObjectId] = set()
+        unknown: List[ObjectId] = []
+        for oid in user_oids:
+            if _known_users.get((str(oid),))[0]:
+                found.add(oid)
+            else:
+                unknown.append(oid)
+
+        if unknown:
+            for oid in await get_collection("users").distinct("_id", {"_id": {"$in": unknown}}):
+                _known_users.set((str(oid),), True)
+                found.add(oid)
+        return found
+
+    def forget_users(self, user_oids: Iterable[ObjectId]) -> None:
+        """Drop deleted users from this process's known-users cache."""
+        for oid in user_oids:
+            _known_users.invalidate_prefix(str(oid))
+
+    async def require_users(self, ids: Iterable[Any], field_name: str = "user_ids") -> List[ObjectId]:
+        """
+        Parse a list of user IDs and check that every one exists.
+
+        Raises:
+            HTTPException: 400 for malformed IDs, 404 listing users that do not exist
+        """
+        user_oids = parse_object_ids(ids, field_name)
+        existing = await self.existing_users(user_oids)
+        missing = [str(oid) for oid in user_oids if oid not in existing]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Users not found in {field_name}: {', '.join(missing)}")
+        return user_oids
+
+    async def relatives_of(self, user_id: str, candidate_oids: Iterable[ObjectId]) -> Set[ObjectId]:
+        """The candidates user_id has a family relationship with."""
+        principals = set(await self.principals.get(user_id))
+        return {oid for oid in candidate_oids if family_principal(oid) in principals}
+
+    async def circles_of(self, user_id: str, circle_oids: Iterable[ObjectId]) -> Set[ObjectId]:
+        """The circles user_id owns or belongs to."""
+        principals = set(await self.principals.get(user_id))
+        return {oid for oid in circle_oids if circle_principal(oid) in principals}
+
+    async def owned_circles(self, user_id: str, circle_oids: List[ObjectId]) -> Dict[ObjectId, Dict[str, Any]]:
+        """
+        Circle documents for circle_oids, in one query, checked to be owned by user_id.
+
+        Raises:
+            HTTPException: 404 if a circle does not exist, 403 if one is not owned by user_id
+        """
+        user_oid = ObjectId(user_id)
+        circles = {
+            circle["_id"]: circle
+            async for circle in get_collection("family_circles").find({"_id": {"$in": circle_oids}})
+        }
+        for circle_oid in circle_oids:
+            circle = circles.get(circle_oid)
+            if circle is None:
+                raise HTTPException(status_code=404, detail=f"Circle with ID {circle_oid} not found")
+            if circle.get("owner_id") != user_oid:
+                raise HTTPException(status_code=403, detail=f"You do not own circle: {circle.get('name', 'Unknown')}")
+        return circles
+
+
+reference_validator = ReferenceValidator()
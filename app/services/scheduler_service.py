@@ -27,6 +27,20 @@ class SchedulerService:
                 id="check_health_reminders",
                 replace_existing=True
             )
+            self.scheduler.add_job(
+                self.maintain_audit_buckets,
+                trigger=IntervalTrigger(hours=24),
+                id="maintain_audit_buckets",
+                next_run_time=datetime.now() + timedelta(minutes=5),
+                replace_existing=True
+            )
+            self.scheduler.add_job(
+                self.maintain_notifications,
+                trigger=IntervalTrigger(hours=24),
+                id="maintain_notifications",
+                next_run_time=datetime.now() + timedelta(minutes=10),
+                replace_existing=True
+            )
             self.scheduler.start()
             logger.info("Scheduler service started")
 
@@ -54,6 +68,26 @@ class SchedulerService:
         except Exception as e:
             logger.error(f"Error in check_due_reminders: {str(e)}")
 
+    async def maintain_audit_buckets(self):
+        """Pre-create upcoming monthly audit buckets and archive the expired ones"""
+        try:
+            from app.services.audit_archive_service import get_audit_archive_service
+            archived = await get_audit_archive_service().maintain()
+            if archived:
+                logger.info(f"Archived {len(archived)} audit buckets")
+        except Exception as e:
+            logger.error(f"Error in maintain_audit_buckets: {str(e)}")
+
+    async def maintain_notifications(self):
+        """Cap per-user notification history and archive old notifications"""
+        try:
+            from app.services.notification_retention_service import get_notification_retention_service
+            summary = await get_notification_retention_service().maintain()
+            if any(summary.values()):
+                logger.info(f"Notification retention: {summary}")
+        except Exception as e:
+            logger.error(f"Error in maintain_notifications: {str(e)}")
+
     async def _process_reminder(self, reminder: dict):
         """Process a single reminder"""
         try:
@@ -0,0 +1,71 @@
+"""
+Cold-storage archive helpers.
+
+Archives are gzip-compressed NDJSON in the export/backup encoding, uploaded to
+R2 when it is configured or copied under a local directory otherwise.
+"""
+import asyncio
+import gzip
+import hashlib
+import os
+import shutil
+from typing import Any, AsyncIterator, Dict, List
+
+from app.utils.export_utils import encode_line
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_WRITE_CHUNK = 1000
+
+
+async def write_gzip_ndjson(path: str, collection: str, documents: AsyncIterator[Dict[str, Any]]) -> int:
+    """
+    Write documents to a gzip NDJSON file, off the event loop in chunks.
+
+    Returns:
+        Number of documents written
+    """
+    written = 0
+    with gzip.open(path, "wb") as archive:
+        chunk: List[bytes] = []
+        async for doc in documents:
+            chunk.append(encode_line({"type": "document", "collection": collection, "document": doc}))
+            if len(chunk) >= _WRITE_CHUNK:
+                await asyncio.to_thread(archive.write, b"".join(chunk))
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            await asyncio.to_thread(archive.write, b"".join(chunk))
+            written += len(chunk)
+    return written
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def store_archive(path: str, key: str, metadata: Dict[str, Any], local_dir: str) -> Dict[str, str]:
+    """Upload to R2 when configured, otherwise keep the archive under local_dir"""
+    try:
+        from app.services.r2_storage import get_r2_storage
+        storage = get_r2_storage()
+    except (ImportError, ValueError):
+        storage = None
+
+    if storage is not None:
+        with open(path, "rb") as f:
+            result = storage.upload_file(f, key, content_type="application/gzip", metadata=metadata)
+        if not result.get("success"):
+            raise RuntimeError(result.get("error", "R2 upload failed"))
+        return {"storage": "r2", "location": key}
+
+    if not os.path.isabs(local_dir):
+        local_dir = os.path.join(_PROJECT_ROOT, local_dir)
+    destination = os.path.join(local_dir, key)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    shutil.copyfile(path, destination)
+    return {"storage": "local", "location": destination}
@@ -2,10 +2,15 @@
 Audit logging utilities for GDPR compliance and security tracking.
 Logs critical user actions for compliance and security auditing.
 """
+import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from bson import ObjectId
-from app.db.mongodb import get_collection
+from app.repositories.audit_log_repository import AuditLogRepository
+
+logger = logging.getLogger(__name__)
+
+_audit_repo = AuditLogRepository()
 
 
 async def log_audit_event(
@@ -18,6 +23,9 @@ async def log_audit_event(
     """
     Log an audit event for GDPR compliance and security tracking.
     
+    The entry is routed to its monthly audit bucket and handed to the
+    background audit writer; outside the app (scripts) it is written immediately.
+    
     Args:
         user_id: The ID of the user performing the action
         event_type: Type of event (e.g., 'data_export', 'data_deletion', 'consent_update')
@@ -36,9 +44,38 @@ async def log_audit_event(
             "created_at": datetime.utcnow()
         }
         
-        await get_collection("audit_logs").insert_one(audit_log)
-    except Exception as e:
-        print(f"Failed to log audit event: {str(e)}")
+        await _audit_repo.write([audit_log])
+    except Exception:
+        logger.exception(f"Failed to log audit event {event_type} for user {user_id}")
+
+
+async def log_audit_events(events: List[Dict[str, Any]]):
+    """
+    Log several audit events with a single insert.
+    
+    Args:
+        events: Dicts with the same keys as log_audit_event's arguments
+    """
+    if not events:
+        return
+    try:
+        now = datetime.utcnow()
+        audit_logs = [
+            {
+                "user_id": ObjectId(event["user_id"]),
+                "event_type": event["event_type"],
+                "event_details": event["event_details"],
+                "ip_address": event.get("ip_address"),
+                "user_agent": event.get("user_agent"),
+                "timestamp": now,
+                "created_at": now
+            }
+            for event in events
+        ]
+        
+        await _audit_repo.write(audit_logs)
+    except Exception:
+        logger.exception(f"Failed to log {len(events)} audit events")
 
 
 async def log_data_export(user_id: str, export_format: str, ip_address: Optional[str] = None):
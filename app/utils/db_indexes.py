@@ -1,160 +1,426 @@
 """
 Database index management for optimal query performance.
-Creates indexes for frequently queried fields across all collections.
+
+Indexes are declared in INDEX_REGISTRY and applied by ensure_indexes() at
+startup. The registry, DROPPED_INDEXES and the current audit buckets are
+hashed; when the hash matches the last applied run recorded in
+index_migrations, boot skips index work after a single lookup. Otherwise one
+worker takes the migration lock and builds the collections concurrently.
+Each index is created on its own, so a conflict is reported for that index
+only instead of aborting the rest, and the run is recorded with a version.
 """
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import json_util
+from pymongo import IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
 from app.db.mongodb import get_collection
 
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "index_migrations"
+LOCKS_COLLECTION = "migration_locks"
+_LOCK_ID = "indexes"
+_LOCK_TTL = timedelta(minutes=10)
+
+# Server codes for an index that exists with other options or another name
+_CONFLICT_CODES = {85, 86}
+_INDEX_NOT_FOUND = 27
+
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        # User collection indexes with explicit names to prevent conflicts
+        IndexModel("email", unique=True, name="email_unique"),
+        IndexModel("username", unique=True, sparse=True, name="username_unique_sparse"),
+        IndexModel("created_at", name="created_at_1"),
+        # Text index for user search on full_name and email (for efficient search queries)
+        IndexModel([("full_name", "text"), ("email", "text"), ("username", "text")], name="users_text_search"),
+    ],
+    "family_relationships": [
+        # Family relationships indexes
+        IndexModel([("user_id", 1), ("relation_type", 1)]),
+        IndexModel("related_user_id"),
+        IndexModel("created_at"),
+    ],
+    "family_circles": [
+        # Family circles indexes
+        IndexModel("owner_id"),
+        IndexModel("member_ids"),
+        IndexModel([("owner_id", 1), ("created_at", -1)]),
+        IndexModel("circle_type"),
+    ],
+    "family_invitations": [
+        # Family invitations indexes
+        IndexModel("token", unique=True),
+        IndexModel("invited_by"),
+        IndexModel([("expires_at", 1), ("status", 1)]),
+        IndexModel("email"),
+    ],
+    "family_albums": [
+        # Family albums indexes
+        IndexModel("created_by"),
+        IndexModel("member_ids"),
+        IndexModel([("privacy", 1), ("updated_at", -1)]),
+        IndexModel("family_circle_ids"),
+    ],
+    "album_photos": [
+        # Photos are paged per album in upload order
+        IndexModel([("album_id", 1), ("uploaded_at", 1), ("_id", 1)]),
+    ],
+    "family_events": [
+        # Family calendar events indexes (collection is named "family_events")
+        IndexModel("created_by"),
+        IndexModel("attendee_ids"),
+        IndexModel([("event_date", 1), ("event_type", 1)]),
+        IndexModel("family_circle_ids"),
+        IndexModel([("reminder_sent", 1), ("event_date", 1)]),
+    ],
+    "memories": [
+        # Memories collection indexes (memories are owned via owner_id)
+        IndexModel([("owner_id", 1), ("created_at", -1)]),
+        # Visibility: every read filters visible_to $in the viewer's principals
+        IndexModel([("visible_to", 1), ("created_at", -1)]),
+        IndexModel("privacy"),
+        IndexModel("tags"),
+        # Map: radius and bounding-box reads of visible located memories
+        IndexModel([("geo", "2dsphere"), ("visible_to", 1)]),
+    ],
+    "places": [
+        # Nearby and bounding-box reads of a user's places
+        IndexModel([("user_id", 1), ("geo", "2dsphere")]),
+    ],
+    "viewer_principals": [
+        # Principal sets not rebuilt within VIEWER_PRINCIPALS_MAX_AGE_SECONDS
+        IndexModel("expires_at", expireAfterSeconds=0),
+    ],
+    "collections": [
+        # Collections/Albums indexes
+        IndexModel([("owner_id", 1), ("updated_at", -1)]),
+        IndexModel("privacy"),
+    ],
+    "collection_memories": [
+        # Ordered membership: one link per memory, pages read in position order
+        IndexModel([("collection_id", 1), ("memory_id", 1)], unique=True),
+        IndexModel([("collection_id", 1), ("position", 1)]),
+        # Removing deleted memories from every collection
+        IndexModel("memory_id"),
+    ],
+    "dashboard_snapshots": [
+        # Snapshots of users who stopped opening the dashboard
+        IndexModel("expires_at", expireAfterSeconds=0),
+    ],
+    "files": [
+        # Files and hub items are listed, counted and deleted per owner
+        IndexModel([("owner_id", 1), ("created_at", -1)]),
+    ],
+    "hub_items": [
+        # Files and hub items are listed, counted and deleted per owner
+        IndexModel([("owner_id", 1), ("created_at", -1)]),
+    ],
+    "engagements": [
+        # One like/bookmark per user and target; removed per target
+        IndexModel([("target_type", 1), ("target_id", 1), ("user_id", 1), ("kind", 1)], unique=True),
+        # Viewer state over a page of targets
+        IndexModel([("user_id", 1), ("target_type", 1), ("target_id", 1)]),
+    ],
+    "counter_shards": [
+        # Summed by value() for a single counter
+        IndexModel([("target_type", 1), ("target_id", 1), ("field", 1)]),
+    ],
+    "share_links": [
+        # Sharing links indexes
+        IndexModel("token", unique=True),
+        IndexModel("created_by"),
+        IndexModel([("expires_at", 1), ("is_active", 1)]),
+    ],
+    "notifications": [
+        # Notifications indexes, matching the list (user_id [+ is_read | type], newest first) and badge query shapes
+        IndexModel([("user_id", 1), ("created_at", -1)]),
+        IndexModel([("user_id", 1), ("is_read", 1), ("created_at", -1)]),
+        IndexModel([("user_id", 1), ("type", 1), ("created_at", -1)]),
+        # Age-based archival scans
+        IndexModel("created_at"),
+        # Read notifications of types with a retention period expire here
+        IndexModel("expires_at", expireAfterSeconds=0, partialFilterExpression={"expires_at": {"$exists": True}}),
+        IndexModel("coalesce_key", unique=True, partialFilterExpression={"coalesce_key": {"$exists": True}}),
+        # Actor snapshot refresh after profile changes
+        IndexModel("actor_id"),
+        IndexModel("recent_actors.id", sparse=True),
+    ],
+    "genealogy_persons": [
+        # Genealogy persons indexes
+        IndexModel("family_id"),
+        IndexModel([("family_id", 1), ("linked_user_id", 1)], unique=True, sparse=True),
+        IndexModel([("family_id", 1), ("created_at", -1)]),
+        IndexModel("source"),
+    ],
+    "genealogy_relationships": [
+        # Genealogy relationships indexes
+        IndexModel("family_id"),
+        IndexModel([("person1_id", 1), ("relationship_type", 1)]),
+        IndexModel([("person2_id", 1), ("relationship_type", 1)]),
+        IndexModel([("family_id", 1), ("created_at", -1)]),
+    ],
+    "genealogy_tree_memberships": [
+        # Genealogy tree memberships indexes (for shared trees)
+        IndexModel([("tree_id", 1), ("user_id", 1)], unique=True),
+        IndexModel("user_id"),
+        IndexModel([("tree_id", 1), ("role", 1)]),
+    ],
+    "genealogy_invite_links": [
+        # Genealogy invitation links indexes
+        IndexModel("token", unique=True),
+        IndexModel([("family_id", 1), ("status", 1)]),
+        IndexModel("person_id"),
+        IndexModel([("expires_at", 1), ("status", 1)]),
+    ],
+    "health_records": [
+        # Health records indexes
+        IndexModel("family_id"),
+        IndexModel("family_member_id"),
+        IndexModel([("family_id", 1), ("subject_type", 1)]),
+        IndexModel("subject_user_id"),
+        IndexModel("subject_family_member_id"),
+        IndexModel("subject_friend_circle_id"),
+        IndexModel("assigned_user_ids"),
+        IndexModel("visibility_user_ids"),
+        IndexModel([("family_id", 1), ("date", -1)]),
+        IndexModel([("family_id", 1), ("record_type", 1)]),
+        IndexModel("created_by"),
+    ],
+    "health_record_reminders": [
+        # Health record reminders indexes (compound index for efficient queries)
+        IndexModel("record_id"),
+        IndexModel([("assigned_user_id", 1), ("status", 1), ("due_at", 1)]),
+        IndexModel([("assigned_user_id", 1), ("due_at", 1)]),
+        IndexModel([("status", 1), ("due_at", 1)]),
+        IndexModel("created_by"),
+    ],
+    "vaccination_records": [
+        # Vaccination records indexes
+        IndexModel("family_id"),
+        IndexModel("family_member_id"),
+        IndexModel([("family_id", 1), ("date_administered", -1)]),
+    ],
+    "user_milestones": [
+        # User milestones indexes (timeline system)
+        IndexModel([("owner_id", 1), ("created_at", -1)]),
+        IndexModel([("audience_scope", 1), ("created_at", -1)]),
+        IndexModel("owner_id"),
+        IndexModel("circle_ids"),
+    ],
+    "milestone_comments": [
+        # Top-level page of a milestone's comments
+        IndexModel([("milestone_id", 1), ("parent_comment_id", 1), ("created_at", 1)]),
+        IndexModel([("milestone_id", 1), ("created_at", 1)]),
+        # First replies of each thread, in thread order
+        IndexModel([("thread_id", 1), ("path", 1)]),
+        # Replies under any comment (load more, subtree delete)
+        IndexModel([("ancestor_ids", 1), ("path", 1)]),
+        IndexModel("author_id"),
+        IndexModel("parent_comment_id"),
+    ],
+    "comments": [
+        # Page of a target's comments, newest first
+        IndexModel([("target_type", 1), ("target_id", 1), ("created_at", -1)]),
+    ],
+    "comment_likes": [
+        # Counted, and checked for the viewer, per page of comments
+        IndexModel([("comment_id", 1), ("user_id", 1)]),
+    ],
+    "milestone_reactions": [
+        # Milestone reactions indexes
+        IndexModel([("milestone_id", 1), ("actor_id", 1)], unique=True),
+        IndexModel([("milestone_id", 1), ("created_at", -1)]),
+        IndexModel("milestone_id"),
+        IndexModel("actor_id"),
+    ],
+    "reactions": [
+        # One emoji reaction per user and target, written with an upsert; also
+        # serves the $group that rebuilds a target's histogram
+        IndexModel([("target_type", 1), ("target_id", 1), ("user_id", 1)], unique=True),
+        # Rebuilding a user's histogram
+        IndexModel("user_id"),
+    ],
+    "relationships": [
+        # Relationships indexes (dual-row pattern)
+        IndexModel([("user_id", 1), ("status", 1)]),
+        IndexModel([("user_id", 1), ("relationship_type", 1)]),
+        IndexModel("user_id"),
+        IndexModel("related_user_id"),
+        IndexModel([("user_id", 1), ("related_user_id", 1)]),
+        IndexModel("requester_id"),
+        # Follow-style rows (follower counts, GDPR export/deletion)
+        IndexModel([("follower_id", 1), ("status", 1)]),
+        IndexModel([("following_id", 1), ("status", 1)]),
+    ],
+    "index_migrations": [
+        IndexModel("version", unique=True),
+        IndexModel("spec_hash"),
+    ],
+}
+
+# Indexes superseded by registry entries, dropped before the registry is applied
+DROPPED_INDEXES: Dict[str, List[str]] = {
+    # Unnamed predecessors of email_unique / username_unique_sparse (scripts/fix_user_indexes.py)
+    "users": ["email_1", "username_1"],
+    # Replaced by the (family_id, linked_user_id) unique sparse index (drop_index.py)
+    "genealogy_persons": ["linked_user_id_1"],
+    # Keyed on user_id, but memories and collections are owned via owner_id
+    "memories": ["user_id_1", "user_id_1_created_at_-1"],
+    "collections": ["user_id_1", "user_id_1_updated_at_-1"],
+    # Keyed on "read", a field notifications are not written with
+    "notifications": ["user_id_1_read_1_created_at_-1"],
+    # Prefix of (milestone_id, parent_comment_id, created_at)
+    "milestone_comments": ["milestone_id_1"],
+}
+
+
+def _audit_buckets(now: datetime) -> List[str]:
+    from app.repositories.audit_log_repository import bucket_name, next_month
+    return [bucket_name(now), bucket_name(next_month(now))]
+
+
+def spec_hash(now: Optional[datetime] = None) -> str:
+    """Digest of everything ensure_indexes applies; changes whenever a declaration or the audit month does"""
+    spec = {
+        "indexes": {name: [model.document for model in models] for name, models in INDEX_REGISTRY.items()},
+        "dropped": DROPPED_INDEXES,
+        "audit_buckets": _audit_buckets(now or datetime.utcnow()),
+    }
+    return hashlib.sha256(json_util.dumps(spec).encode()).hexdigest()
+
+
+async def _build_collection(name: str, models: List[IndexModel]) -> Dict[str, str]:
+    """Drop superseded indexes, then create each declared index; returns a status per index name"""
+    collection = get_collection(name)
+    results: Dict[str, str] = {}
+    for index_name in DROPPED_INDEXES.get(name, []):
+        try:
+            await collection.drop_index(index_name)
+            results[index_name] = "dropped"
+        except OperationFailure as e:
+            if e.code != _INDEX_NOT_FOUND:
+                results[index_name] = f"error: {e.details.get('errmsg', str(e)) if e.details else str(e)}"
+
+    for model in models:
+        index_name = model.document["name"]
+        try:
+            await collection.create_indexes([model])
+            results[index_name] = "ok"
+        except OperationFailure as e:
+            message = e.details.get("errmsg", str(e)) if e.details else str(e)
+            results[index_name] = f"{'conflict' if e.code in _CONFLICT_CODES else 'error'}: {message}"
+    return results
+
+
+async def _acquire_lock(owner: str) -> bool:
+    """Take the migration lock unless another live worker holds it"""
+    now = datetime.utcnow()
+    try:
+        await get_collection(LOCKS_COLLECTION).find_one_and_update(
+            {"_id": _LOCK_ID, "$or": [{"expires_at": {"$lt": now}}, {"owner": owner}]},
+            {"$set": {"owner": owner, "acquired_at": now, "expires_at": now + _LOCK_TTL}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def _release_lock(owner: str) -> None:
+    await get_collection(LOCKS_COLLECTION).delete_one({"_id": _LOCK_ID, "owner": owner})
+
+
+async def ensure_indexes(force: bool = False) -> Dict[str, Any]:
+    """
+    Apply the index registry unless the same spec has already been applied.
+
+    Returns:
+        {"status": "current" | "locked", "spec_hash": ...} when nothing was
+        built, otherwise the migration record written to index_migrations
+    """
+    digest = spec_hash()
+    migrations = get_collection(MIGRATIONS_COLLECTION)
+    if not force and await migrations.find_one({"spec_hash": digest, "status": "applied"}, {"_id": 1}):
+        return {"status": "current", "spec_hash": digest}
+
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    if not await _acquire_lock(owner):
+        logger.info("Index migration is running in another worker; skipping")
+        return {"status": "locked", "spec_hash": digest}
+
+    try:
+        started_at = datetime.utcnow()
+        names = list(INDEX_REGISTRY)
+        outcomes = await asyncio.gather(*(_build_collection(name, INDEX_REGISTRY[name]) for name in names))
+        results = dict(zip(names, outcomes))
+
+        # Audit logs live in monthly buckets; each bucket carries its own partial and TTL indexes
+        from app.repositories.audit_log_repository import AuditLogRepository
+        try:
+            await AuditLogRepository().ensure_upcoming_buckets()
+            results["audit_buckets"] = {name: "ok" for name in _audit_buckets(started_at)}
+        except OperationFailure as e:
+            results["audit_buckets"] = {name: f"error: {str(e)}" for name in _audit_buckets(started_at)}
+
+        failures = {
+            f"{collection}.{index_name}": status
+            for collection, statuses in results.items()
+            for index_name, status in statuses.items()
+            if status not in ("ok", "dropped")
+        }
+        for index_key, status in failures.items():
+            logger.warning(f"Index {index_key}: {status}")
+
+        last = await migrations.find_one({}, {"version": 1}, sort=[("version", -1)])
+        record = {
+            "version": (last["version"] + 1) if last else 1,
+            "spec_hash": digest,
+            "status": "failed" if failures else "applied",
+            "worker": owner,
+            "started_at": started_at,
+            "finished_at": datetime.utcnow(),
+            # Index names may contain dots, so statuses are stored as lists
+            "results": [
+                {"collection": collection, "index": index_name, "status": status}
+                for collection, statuses in results.items()
+                for index_name, status in statuses.items()
+            ],
+            "failures": len(failures),
+        }
+        await migrations.insert_one(record)
+        logger.info(
+            f"Index migration v{record['version']} {record['status']}: "
+            f"{len(record['results'])} indexes in {(record['finished_at'] - started_at).total_seconds():.2f}s"
+        )
+        return record
+    finally:
+        await _release_lock(owner)
+
 
 async def create_all_indexes():
-    """Create all database indexes for optimal performance"""
-    
-    # User collection indexes with explicit names to prevent conflicts
-    await get_collection("users").create_index("email", unique=True, name="email_unique")
-    await get_collection("users").create_index("username", unique=True, sparse=True, name="username_unique_sparse")
-    await get_collection("users").create_index("created_at", name="created_at_1")
-    # Text index for user search on full_name and email (for efficient search queries)
-    await get_collection("users").create_index([("full_name", "text"), ("email", "text"), ("username", "text")], name="users_text_search")
-    
-    # Family relationships indexes
-    await get_collection("family_relationships").create_index([("user_id", 1), ("relation_type", 1)])
-    await get_collection("family_relationships").create_index("related_user_id")
-    await get_collection("family_relationships").create_index("created_at")
-    
-    # Family circles indexes
-    await get_collection("family_circles").create_index("owner_id")
-    await get_collection("family_circles").create_index("member_ids")
-    await get_collection("family_circles").create_index([("owner_id", 1), ("created_at", -1)])
-    await get_collection("family_circles").create_index("circle_type")
-    
-    # Family invitations indexes
-    await get_collection("family_invitations").create_index("token", unique=True)
-    await get_collection("family_invitations").create_index("invited_by")
-    await get_collection("family_invitations").create_index([("expires_at", 1), ("status", 1)])
-    await get_collection("family_invitations").create_index("email")
-    
-    # Family albums indexes
-    await get_collection("family_albums").create_index("created_by")
-    await get_collection("family_albums").create_index("member_ids")
-    await get_collection("family_albums").create_index([("privacy", 1), ("updated_at", -1)])
-    await get_collection("family_albums").create_index("family_circle_ids")
-    
-    # Family calendar events indexes (collection is named "family_events")
-    await get_collection("family_events").create_index("created_by")
-    await get_collection("family_events").create_index("attendee_ids")
-    await get_collection("family_events").create_index([("event_date", 1), ("event_type", 1)])
-    await get_collection("family_events").create_index("family_circle_ids")
-    await get_collection("family_events").create_index([("reminder_sent", 1), ("event_date", 1)])
-    
-    # Memories collection indexes
-    await get_collection("memories").create_index("user_id")
-    await get_collection("memories").create_index([("user_id", 1), ("created_at", -1)])
-    await get_collection("memories").create_index("privacy")
-    await get_collection("memories").create_index("tags")
-    
-    # Collections/Albums indexes
-    await get_collection("collections").create_index("user_id")
-    await get_collection("collections").create_index([("user_id", 1), ("updated_at", -1)])
-    await get_collection("collections").create_index("privacy")
-    
-    # Sharing links indexes
-    await get_collection("share_links").create_index("token", unique=True)
-    await get_collection("share_links").create_index("created_by")
-    await get_collection("share_links").create_index([("expires_at", 1), ("is_active", 1)])
-    
-    # Audit logs indexes (for GDPR compliance)
-    await get_collection("audit_logs").create_index([("user_id", 1), ("timestamp", -1)])
-    await get_collection("audit_logs").create_index("event_type")
-    await get_collection("audit_logs").create_index("timestamp")
-    
-    # Notifications indexes
-    await get_collection("notifications").create_index([("user_id", 1), ("read", 1), ("created_at", -1)])
-    await get_collection("notifications").create_index("created_at")
-    
-    # Genealogy persons indexes
-    await get_collection("genealogy_persons").create_index("family_id")
-    await get_collection("genealogy_persons").create_index([("family_id", 1), ("linked_user_id", 1)], unique=True, sparse=True)
-    await get_collection("genealogy_persons").create_index([("family_id", 1), ("created_at", -1)])
-    await get_collection("genealogy_persons").create_index("source")
-    
-    # Genealogy relationships indexes
-    await get_collection("genealogy_relationships").create_index("family_id")
-    await get_collection("genealogy_relationships").create_index([("person1_id", 1), ("relationship_type", 1)])
-    await get_collection("genealogy_relationships").create_index([("person2_id", 1), ("relationship_type", 1)])
-    await get_collection("genealogy_relationships").create_index([("family_id", 1), ("created_at", -1)])
-    
-    # Genealogy tree memberships indexes (for shared trees)
-    await get_collection("genealogy_tree_memberships").create_index([("tree_id", 1), ("user_id", 1)], unique=True)
-    await get_collection("genealogy_tree_memberships").create_index("user_id")
-    await get_collection("genealogy_tree_memberships").create_index([("tree_id", 1), ("role", 1)])
-    
-    # Genealogy invitation links indexes
-    await get_collection("genealogy_invite_links").create_index("token", unique=True)
-    await get_collection("genealogy_invite_links").create_index([("family_id", 1), ("status", 1)])
-    await get_collection("genealogy_invite_links").create_index("person_id")
-    await get_collection("genealogy_invite_links").create_index([("expires_at", 1), ("status", 1)])
-    
-    # Health records indexes
-    await get_collection("health_records").create_index("family_id")
-    await get_collection("health_records").create_index("family_member_id")
-    await get_collection("health_records").create_index([("family_id", 1), ("subject_type", 1)])
-    await get_collection("health_records").create_index("subject_user_id")
-    await get_collection("health_records").create_index("subject_family_member_id")
-    await get_collection("health_records").create_index("subject_friend_circle_id")
-    await get_collection("health_records").create_index("assigned_user_ids")
-    await get_collection("health_records").create_index([("family_id", 1), ("date", -1)])
-    await get_collection("health_records").create_index([("family_id", 1), ("record_type", 1)])
-    await get_collection("health_records").create_index("created_by")
-    
-    # Health record reminders indexes (compound index for efficient queries)
-    await get_collection("health_record_reminders").create_index("record_id")
-    await get_collection("health_record_reminders").create_index([("assigned_user_id", 1), ("status", 1), ("due_at", 1)])
-    await get_collection("health_record_reminders").create_index([("assigned_user_id", 1), ("due_at", 1)])
-    await get_collection("health_record_reminders").create_index([("status", 1), ("due_at", 1)])
-    await get_collection("health_record_reminders").create_index("created_by")
-    
-    # Vaccination records indexes
-    await get_collection("vaccination_records").create_index("family_id")
-    await get_collection("vaccination_records").create_index("family_member_id")
-    await get_collection("vaccination_records").create_index([("family_id", 1), ("date_administered", -1)])
-    
-    # User milestones indexes (timeline system)
-    await get_collection("user_milestones").create_index([("owner_id", 1), ("created_at", -1)])
-    await get_collection("user_milestones").create_index([("audience_scope", 1), ("created_at", -1)])
-    await get_collection("user_milestones").create_index("owner_id")
-    await get_collection("user_milestones").create_index("circle_ids")
-    
-    # Milestone comments indexes
-    await get_collection("milestone_comments").create_index([("milestone_id", 1), ("created_at", 1)])
-    await get_collection("milestone_comments").create_index("milestone_id")
-    await get_collection("milestone_comments").create_index("author_id")
-    await get_collection("milestone_comments").create_index("parent_comment_id")
-    
-    # Milestone reactions indexes
-    await get_collection("milestone_reactions").create_index([("milestone_id", 1), ("actor_id", 1)], unique=True)
-    await get_collection("milestone_reactions").create_index([("milestone_id", 1), ("created_at", -1)])
-    await get_collection("milestone_reactions").create_index("milestone_id")
-    await get_collection("milestone_reactions").create_index("actor_id")
-    
-    # Relationships indexes (dual-row pattern)
-    await get_collection("relationships").create_index([("user_id", 1), ("status", 1)])
-    await get_collection("relationships").create_index([("user_id", 1), ("relationship_type", 1)])
-    await get_collection("relationships").create_index("user_id")
-    await get_collection("relationships").create_index("related_user_id")
-    await get_collection("relationships").create_index([("user_id", 1), ("related_user_id", 1)])
-    await get_collection("relationships").create_index("requester_id")
-    
-    print("✅ All database indexes created successfully")
+    """Create all database indexes for optimal performance, even if the current spec was already applied"""
+    record = await ensure_indexes(force=True)
+    if record.get("status") == "locked":
+        print("⏳ Another process holds the index migration lock; no indexes were created here")
+    elif record.get("failures"):
+        print(f"⚠️  {record['failures']} indexes could not be created; see index_migrations v{record['version']}")
+    else:
+        print("✅ All database indexes created successfully")
 
 
 async def drop_all_indexes():
     """Drop all custom indexes (useful for testing)"""
-    collections = [
-        "users", "family_relationships", "family_circles", "family_invitations",
-        "family_albums", "family_calendar_events", "memories", "collections",
-        "share_links", "audit_logs", "notifications", "genealogy_persons", "genealogy_relationships"
-    ]
-    
-    for collection_name in collections:
+    for collection_name in INDEX_REGISTRY:
         await get_collection(collection_name).drop_indexes()
+    await get_collection(MIGRATIONS_COLLECTION).delete_many({})
     
     print("✅ All custom indexes dropped")
@@ -0,0 +1,146 @@
+"""
+NDJSON export/import helpers.
+
+Documents are streamed straight from Motor cursors and encoded one per line
+with bson.json_util (relaxed Extended JSON), so ObjectIds and datetimes survive
+a round trip through export and import without any per-field conversion.
+"""
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from bson import json_util
+from bson.json_util import JSONOptions, JSONMode
+from fastapi import UploadFile
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+
+NDJSON_FORMAT = "memoryhub.ndjson"
+NDJSON_VERSION = 1
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Collections a user may export and import, keyed to their ownership field
+BACKUP_COLLECTIONS: Dict[str, str] = {
+    "memories": "owner_id",
+    "files": "owner_id",
+    "hub_items": "owner_id",
+    "collections": "owner_id",
+}
+
+_JSON_OPTIONS = JSONOptions(json_mode=JSONMode.RELAXED, tz_aware=False)
+
+MIN_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 10000
+
+
+def clamp_batch_size(batch_size: Optional[int], default: int) -> int:
+    """Keep a client-supplied batch size within sane cursor limits"""
+    if not batch_size:
+        return default
+    return max(MIN_BATCH_SIZE, min(batch_size, MAX_BATCH_SIZE))
+
+
+def encode_line(record: Dict[str, Any]) -> bytes:
+    """Encode a single record as one NDJSON line"""
+    return (json_util.dumps(record, json_options=_JSON_OPTIONS) + "\n").encode("utf-8")
+
+
+def decode_line(line: bytes) -> Dict[str, Any]:
+    """Decode one NDJSON line back into a BSON-ready dict"""
+    return json_util.loads(line, json_options=_JSON_OPTIONS)
+
+
+def build_header(user_id: str, collections: List[str]) -> Dict[str, Any]:
+    """Header record written as the first line of every export stream"""
+    return {
+        "type": "header",
+        "format": NDJSON_FORMAT,
+        "version": NDJSON_VERSION,
+        "user_id": user_id,
+        "collections": collections,
+        "exported_at": datetime.utcnow(),
+    }
+
+
+async def stream_collection(
+    collection: AsyncIOMotorCollection,
+    name: str,
+    query: Dict[str, Any],
+    batch_size: int,
+    counts: Dict[str, int],
+) -> AsyncIterator[bytes]:
+    """Yield one encoded document record per line from a Motor cursor"""
+    cursor = collection.find(query, batch_size=batch_size).sort("_id", 1)
+    count = 0
+    async for doc in cursor:
+        yield encode_line({"type": "document", "collection": name, "document": doc})
+        count += 1
+    counts[name] = count
+
+
+async def stream_export(
+    user_id: str,
+    queries: Dict[str, Dict[str, Any]],
+    get_collection,
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a complete NDJSON export: header, one line per document, footer.
+
+    Args:
+        user_id: Owner of the exported data
+        queries: Mapping of collection name to the filter to export
+        get_collection: Collection accessor (injected to keep this module DB-agnostic)
+        batch_size: Cursor batch size; clamped to MIN/MAX_BATCH_SIZE
+    """
+    batch_size = clamp_batch_size(batch_size, settings.EXPORT_CURSOR_BATCH_SIZE)
+    counts: Dict[str, int] = {}
+
+    yield encode_line(build_header(user_id, list(queries.keys())))
+    for name, query in queries.items():
+        async for line in stream_collection(get_collection(name), name, query, batch_size, counts):
+            yield line
+    yield encode_line({"type": "footer", "counts": counts, "completed_at": datetime.utcnow()})
+
+
+async def iter_chunked_lines(read_chunk: Callable[[int], Awaitable[bytes]], chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Pull chunks from an async reader and yield complete, non-blank lines"""
+    remainder = b""
+    while True:
+        chunk = await read_chunk(chunk_size)
+        if not chunk:
+            break
+        remainder += chunk
+        lines = remainder.split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    if remainder.strip():
+        yield remainder
+
+
+def iter_upload_lines(upload: UploadFile, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Read an uploaded NDJSON file chunk by chunk and yield complete lines"""
+    return iter_chunked_lines(upload.read, chunk_size)
+
+
+async def insert_batch(collection: AsyncIOMotorCollection, documents: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Insert a batch with ordered=False so one duplicate does not stop the rest.
+
+    Returns:
+        Dict with inserted and skipped (duplicate key) counts
+    """
+    if not documents:
+        return {"inserted": 0, "skipped": 0}
+    try:
+        result = await collection.insert_many(documents, ordered=False)
+        return {"inserted": len(result.inserted_ids), "skipped": 0}
+    except BulkWriteError as e:
+        inserted = e.details.get("nInserted", 0)
+        duplicates = sum(1 for err in e.details.get("writeErrors", []) if err.get("code") == 11000)
+        if duplicates != len(e.details.get("writeErrors", [])):
+            raise
+        return {"inserted": inserted, "skipped": duplicates}
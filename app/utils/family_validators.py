@@ -7,6 +7,7 @@ from bson import ObjectId
 from fastapi import HTTPException
 from app.db.mongodb import get_collection
 from app.utils.audit_logger import log_audit_event
+from app.services.reference_validator import reference_validator
 
 
 async def validate_family_ownership(
@@ -171,6 +172,23 @@ async def validate_user_exists(user_id: str, field_name: str = "user") -> Dict[s
     return user
 
 
+async def validate_users_exist(user_ids: List[str], field_name: str = "user_ids") -> List[ObjectId]:
+    """
+    Validate that every user in a list exists, with one query for the whole list.
+    
+    Args:
+        user_ids: List of string representations of user IDs
+        field_name: Name of the field for error messages
+        
+    Returns:
+        List of user ObjectIds, without duplicates
+        
+    Raises:
+        HTTPException: If any ID is invalid (400) or any user doesn't exist (404)
+    """
+    return await reference_validator.require_users(user_ids, field_name)
+
+
 async def validate_relationship_ownership(
     user_id: str,
     relationship_id: str
@@ -292,26 +310,9 @@ async def validate_circle_ownership_for_invitations(
         raise HTTPException(status_code=400, detail="Invalid user ID")
     
     circle_oids = validate_object_id_list(circle_ids, "circle_ids")
+    circles = await reference_validator.owned_circles(str(user_oid), circle_oids)
     
-    circles = []
-    for circle_oid in circle_oids:
-        circle = await get_collection("family_circles").find_one({"_id": circle_oid})
-        
-        if not circle:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Circle with ID {str(circle_oid)} not found"
-            )
-        
-        if circle.get("owner_id") != user_oid:
-            raise HTTPException(
-                status_code=403,
-                detail=f"You do not own circle: {circle.get('name', 'Unknown')}"
-            )
-        
-        circles.append(circle)
-    
-    return circles
+    return [circles[circle_oid] for circle_oid in circle_oids]
 
 
 async def validate_no_duplicate_relationship(
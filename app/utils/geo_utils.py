@@ -0,0 +1,149 @@
+"""
+Geospatial helpers for places and memories.
+
+Coordinates are stored as a GeoJSON point in geo (covered by a 2dsphere
+index) next to a geohash string. Radius and bounding-box queries go through
+the 2dsphere index; the map groups memories by a geohash prefix whose length
+depends on how much of the world the viewport covers.
+"""
+import math
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Stored geohash length (cells of about 5m x 5m); the deepest map zoom
+GEOHASH_PRECISION = 9
+
+# Longest bounding-box edge between two vertices, in degrees. 2dsphere polygon
+# edges are great circles, not parallels, so top and bottom edges are split up
+# to stay close to their latitude.
+_EDGE_STEP_DEGREES = 1.0
+
+# 2dsphere polygons must be smaller than a hemisphere; wider boxes are queried
+# as several slices
+_SLICE_DEGREES = 90
+
+# Polygon vertices at the poles would all be the same point
+_MAX_LATITUDE = 89.999
+
+
+def geo_point(latitude: float, longitude: float) -> Dict[str, Any]:
+    """
+    GeoJSON point for a coordinate pair.
+
+    Raises:
+        ValueError: If the coordinates are out of range
+    """
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValueError(f"Coordinates out of range: {latitude},{longitude}")
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash of a coordinate pair"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        coord, span = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (span[0] + span[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            span[0] = mid
+        else:
+            span[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def geo_fields(latitude: float, longitude: float) -> Dict[str, Any]:
+    """
+    The geo and geohash fields of a place or memory.
+
+    Raises:
+        ValueError: If the coordinates are out of range
+    """
+    return {
+        "geo": geo_point(latitude, longitude),
+        "geohash": encode_geohash(latitude, longitude)
+    }
+
+
+def parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    """
+    Parse a "west,south,east,north" bounding box.
+
+    west may be greater than east for a box crossing the antimeridian.
+
+    Raises:
+        HTTPException: 400 if the box is malformed
+    """
+    try:
+        west, south, east, north = (float(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be west,south,east,north")
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and west != east and -90 <= south < north <= 90):
+        raise HTTPException(status_code=400, detail=f"Invalid bbox: {bbox}")
+    return west, south, east, north
+
+
+def _box_polygon(west: float, south: float, east: float, north: float) -> Dict[str, Any]:
+    steps = max(1, math.ceil((east - west) / _EDGE_STEP_DEGREES))
+    lngs = [west + (east - west) * i / steps for i in range(steps)] + [east]
+    ring = [[lng, south] for lng in lngs] + [[lng, north] for lng in reversed(lngs)] + [[west, south]]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def bbox_filter(field: str, west: float, south: float, east: float, north: float) -> Dict[str, Any]:
+    """
+    Filter matching points of field inside a bounding box, served by its 2dsphere index.
+
+    Boxes wider than _SLICE_DEGREES or crossing the antimeridian become an $or
+    of slices.
+    """
+    if east < west:
+        east += 360
+    south = max(south, -_MAX_LATITUDE)
+    north = min(north, _MAX_LATITUDE)
+
+    conditions: List[Dict[str, Any]] = []
+    # The part east of the antimeridian is shifted back into -180..180
+    for start, end, shift in ((west, min(east, 180), 0), (180, east, 360)):
+        if end <= start:
+            continue
+        parts = math.ceil((end - start) / _SLICE_DEGREES)
+        edges = [start + (end - start) * i / parts for i in range(parts)] + [end]
+        for lo, hi in zip(edges, edges[1:]):
+            polygon = _box_polygon(lo - shift, south, hi - shift, north)
+            conditions.append({field: {"$geoWithin": {"$geometry": polygon}}})
+    return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
+
+def cluster_precision(west: float, south: float, east: float, north: float, target_cells: int) -> int:
+    """
+    Longest geohash prefix that splits a bounding box into at most target_cells cells.
+
+    A geohash of length p has ceil(5p/2) longitude bits and floor(5p/2)
+    latitude bits; the box is counted as covering every cell it touches.
+    """
+    width = (east - west) % 360 or 360
+    height = north - south
+    precision = 1
+    for p in range(1, GEOHASH_PRECISION + 1):
+        cell_width = 360 / 2 ** math.ceil(5 * p / 2)
+        cell_height = 180 / 2 ** math.floor(5 * p / 2)
+        cells = (math.ceil(width / cell_width) + 1) * (math.ceil(height / cell_height) + 1)
+        if cells > target_cells:
+            break
+        precision = p
+    return precision
@@ -3,24 +3,20 @@ from datetime import datetime
 from bson import ObjectId
 from app.core.config import settings
 
+# Target type of memories in engagements and the counter service
+MEMORY_TARGET = "memory"
+
 async def process_memory_search_filters(
     search_params: Dict[str, Any], 
     current_user_id: str
 ) -> Dict[str, Any]:
-    filters = {}
+    # Only memories the viewer may see: one $in over their principals
+    from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository
+    filters = await ViewerPrincipalsRepository().visibility_filter(current_user_id)
     
     # Privacy filter
     if search_params.get('privacy'):
         filters['privacy'] = search_params['privacy']
-    else:
-        filters['$or'] = [
-            {'owner_id': ObjectId(current_user_id)},
-            {'privacy': 'public'},
-            {
-                'privacy': 'friends',
-                'owner_id': {'$in': []}  # Will be populated with friend IDs
-            }
-        ]
     
     # Text search
     if search_params.get('query'):
@@ -63,8 +59,6 @@ def get_sort_params(sort_by: str, sort_order: str) -> list:
     return [(sort_field, sort_direction)]
 
 async def increment_memory_counter(memory_id: str, field: str, value: int = 1):
-    from app.db.mongodb import get_collection
-    await get_collection("memories").update_one(
-        {"_id": ObjectId(memory_id)},
-        {"$inc": {field: value}}
-    )
\ No newline at end of file
+    # Buffered and flushed in batches by the counter service
+    from app.services.counter_service import counter_service
+    await counter_service.increment(MEMORY_TARGET, ObjectId(memory_id), field, value)
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Reaction Dedupe Script - Remove duplicate reactions left by the old find-then-insert path
+
+Reactions used to be written with a find followed by an insert, so concurrent
+requests could leave a user with several reactions on one target, which blocks
+the unique (target_type, target_id, user_id) index. For each duplicated
+(user, target) the most recently written reaction is kept and the others are
+deleted; the histograms of the affected targets and users are dropped so they
+are rebuilt from the remaining reactions on their next read. Indexes are
+re-applied afterwards.
+
+Usage: python scripts/dedupe_reactions.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from app.utils.db_indexes import ensure_indexes
+
+
+async def dedupe_reactions():
+    print("=" * 70)
+    print("Reaction Dedupe")
+    print("=" * 70)
+
+    reactions = get_collection("reactions")
+    duplicates = reactions.aggregate([
+        {"$sort": {"_id": -1}},
+        {"$group": {
+            "_id": {"target_type": "$target_type", "target_id": "$target_id", "user_id": "$user_id"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ], allowDiskUse=True)
+
+    groups = removed = 0
+    stale_histograms = set()
+    async for group in duplicates:
+        # ids are newest first; keep the first
+        result = await reactions.delete_many({"_id": {"$in": group["ids"][1:]}})
+        key = group["_id"]
+        stale_histograms.add(f"{key['target_type']}:{key['target_id']}")
+        stale_histograms.add(f"user:{key['user_id']}")
+        groups += 1
+        removed += result.deleted_count
+
+    if stale_histograms:
+        await get_collection("reaction_counts").delete_many({"_id": {"$in": list(stale_histograms)}})
+    print(f"\n✓ {removed} duplicate reactions removed across {groups} (user, target) pairs")
+
+    result = await ensure_indexes(force=True)
+    print(f"✓ Indexes: {result.get('status')}")
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        await dedupe_reactions()
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
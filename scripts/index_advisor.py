@@ -0,0 +1,233 @@
+"""
+Index Advisor - Check recorded query shapes against the declared indexes
+
+Replays every query shape recorded by the query profiler
+(QUERY_PROFILER_ENABLED=true, merged into QUERY_PROFILER_OUTPUT on shutdown)
+through explain() on a local mongod, then reports:
+  - shapes whose winning plan is a COLLSCAN, with a proposed index
+    (equality fields, then sort fields, then range fields)
+  - declared indexes that no recorded shape's winning plan used
+and writes the proposed additions to INDEX_REGISTRY as a unified diff of
+app/utils/db_indexes.py.
+
+By default a scratch database is created and create_all_indexes() is run
+against it, so the declared indexes are what gets checked. Point --db at a
+restored copy of real data (with --no-create-indexes) to also see
+planner choices that depend on data distribution.
+
+Usage: python scripts/index_advisor.py [--shapes FILE] [--url URL] [--db NAME]
+                                       [--no-create-indexes] [--diff-output FILE]
+                                       [--fail-on-collscan]
+"""
+import argparse
+import asyncio
+import difflib
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.db.mongodb import get_collection, get_database, connect_to_mongo, close_mongo_connection
+from app.db.query_profiler import load_sample, load_shapes
+
+DB_INDEXES_PATH = Path(__file__).parent.parent / "app" / "utils" / "db_indexes.py"
+_REGISTRY_START = "INDEX_REGISTRY: "
+
+
+def _plan_stages(plan: Any) -> Iterator[Dict[str, Any]]:
+    """Every stage of an explain plan, across classic and slot-based plan layouts"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan
+        for key in ("queryPlan", "inputStage", "inputStages", "shards"):
+            if key in plan:
+                yield from _plan_stages(plan[key])
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def propose_index(shape: Dict[str, Any]) -> Optional[List[Tuple[str, int]]]:
+    """
+    Index key pattern for a shape, following equality-sort-range ordering.
+
+    Returns None for shapes an index cannot serve as a whole ($or clauses,
+    $expr, unfiltered scans).
+    """
+    fields = shape["filter"]
+    if any(field.startswith("$") for field in fields):
+        return None
+    equality = [field for field, kind in fields.items() if kind == "eq"]
+    ranges = [field for field, kind in fields.items() if kind != "eq"]
+    sort = [(field, int(direction)) for field, direction in shape["sort"]]
+    keys = [(field, 1) for field in equality]
+    keys += [(field, direction) for field, direction in sort if field not in equality]
+    keys += [(field, 1) for field in ranges if field not in dict(keys)]
+    return keys or None
+
+
+def format_index_model(keys: List[Tuple[str, int]]) -> str:
+    if len(keys) == 1 and keys[0][1] == 1:
+        return f'        IndexModel("{keys[0][0]}"),'
+    pattern = ", ".join(f'("{field}", {direction})' for field, direction in keys)
+    return f'        IndexModel([{pattern}]),'
+
+
+def _covers(existing: List[Tuple[str, int]], proposed: List[Tuple[str, int]]) -> bool:
+    return existing[:len(proposed)] == proposed
+
+
+async def explain_shape(shape: Dict[str, Any]) -> Dict[str, Any]:
+    """Winning plan stages and index names for one shape"""
+    sample = load_sample(shape)
+    command: Dict[str, Any] = {"find": shape["collection"], "filter": sample["filter"]}
+    if sample.get("sort"):
+        command["sort"] = sample["sort"]
+    explained = await get_database().command({"explain": command, "verbosity": "queryPlanner"})
+    stages = list(_plan_stages(explained["queryPlanner"]["winningPlan"]))
+    return {
+        "stages": {stage["stage"] for stage in stages},
+        "indexes": {stage["indexName"] for stage in stages if stage.get("indexName")},
+    }
+
+
+async def declared_indexes(collection: str) -> Dict[str, Dict[str, Any]]:
+    return {index["name"]: index async for index in get_collection(collection).list_indexes()}
+
+
+def _is_structural(index: Dict[str, Any]) -> bool:
+    """Indexes kept for constraints or housekeeping rather than query speed"""
+    return (
+        index["name"] == "_id_"
+        or index.get("unique")
+        or "expireAfterSeconds" in index
+        or any(direction in ("text", "2dsphere") for direction in index["key"].values())
+    )
+
+
+def build_diff(proposals: Dict[str, List[List[Tuple[str, int]]]]) -> str:
+    """Unified diff adding the proposed indexes to INDEX_REGISTRY"""
+    original = DB_INDEXES_PATH.read_text().splitlines(keepends=True)
+    updated = list(original)
+    start = next(i for i, line in enumerate(updated) if line.startswith(_REGISTRY_START))
+    comment = "        # Proposed by scripts/index_advisor.py for COLLSCAN query shapes; review before merging\n"
+
+    for collection in sorted(proposals):
+        entries = [comment] + [format_index_model(keys) + "\n" for keys in proposals[collection]]
+        end = next(i for i in range(start, len(updated)) if updated[i].rstrip("\n") == "}")
+        opening = next(
+            (i for i in range(start, end) if updated[i].rstrip("\n") == f'    "{collection}": ['), None
+        )
+        if opening is None:
+            updated[end:end] = [f'    "{collection}": [\n'] + entries + ["    ],\n"]
+            continue
+        closing = next(i for i in range(opening, end) if updated[i].rstrip("\n") == "    ],")
+        updated[closing:closing] = entries
+
+    return "".join(difflib.unified_diff(
+        original, updated, fromfile="a/app/utils/db_indexes.py", tofile="b/app/utils/db_indexes.py"
+    ))
+
+
+async def run_advisor(shapes: List[Dict[str, Any]], create_indexes: bool) -> Tuple[Dict[str, List[List[Tuple[str, int]]]], int]:
+    print("=" * 70)
+    print(f"Index Advisor - {len(shapes)} query shapes against '{settings.DB_NAME}'")
+    print("=" * 70)
+
+    if create_indexes:
+        from app.utils.db_indexes import create_all_indexes
+        await create_all_indexes()
+
+    existing_collections = set(await get_database().list_collection_names())
+    for collection in {shape["collection"] for shape in shapes} - existing_collections:
+        # Explain on a missing collection reports EOF instead of the real plan
+        await get_database().create_collection(collection)
+
+    used: Dict[str, Set[str]] = {}
+    proposals: Dict[str, List[List[Tuple[str, int]]]] = {}
+    collscans = 0
+
+    print("\nQuery shapes:")
+    for shape in shapes:
+        collection = shape["collection"]
+        label = f"{collection} {shape['filter']} sort={shape['sort']} (x{shape['count']})"
+        if not shape["filter"] and not shape["sort"]:
+            continue
+        try:
+            plan = await explain_shape(shape)
+        except Exception as e:
+            print(f"  ? {label}: explain failed ({str(e)})")
+            continue
+
+        used.setdefault(collection, set()).update(plan["indexes"])
+        if "COLLSCAN" not in plan["stages"]:
+            print(f"  ✓ {label} -> {', '.join(sorted(plan['indexes'])) or ', '.join(sorted(plan['stages']))}")
+            continue
+
+        collscans += 1
+        keys = propose_index(shape)
+        if keys is None:
+            print(f"  ⚠ COLLSCAN {label}: no single index can serve this shape")
+            continue
+        print(f"  ⚠ COLLSCAN {label}: propose {keys}")
+        pending = proposals.setdefault(collection, [])
+        if not any(_covers(other, keys) for other in pending):
+            pending[:] = [other for other in pending if not _covers(keys, other)] + [keys]
+
+    print("\nIndexes unused by the recorded workload:")
+    unused = 0
+    for collection in sorted({shape["collection"] for shape in shapes}):
+        for name, index in (await declared_indexes(collection)).items():
+            if _is_structural(index) or name in used.get(collection, set()):
+                continue
+            unused += 1
+            print(f"  - {collection}.{name} {dict(index['key'])}")
+    if not unused:
+        print("  (none)")
+
+    print(f"\n{collscans} COLLSCAN shapes, {sum(len(p) for p in proposals.values())} proposed indexes, {unused} unused indexes")
+    return proposals, collscans
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Explain recorded query shapes and propose db_indexes.py changes")
+    parser.add_argument("--shapes", default=settings.QUERY_PROFILER_OUTPUT, help="Query shapes file written by the profiler")
+    parser.add_argument("--url", default="mongodb://localhost:27017", help="Local mongod to explain against")
+    parser.add_argument("--db", default=f"{settings.DB_NAME}_index_advisor", help="Database to explain against")
+    parser.add_argument("--no-create-indexes", action="store_true", help="Use the database's indexes as they are")
+    parser.add_argument("--diff-output", help="Write the proposed db_indexes.py diff here instead of stdout")
+    parser.add_argument("--fail-on-collscan", action="store_true", help="Exit with status 1 if any shape scans its collection")
+    args = parser.parse_args()
+
+    shapes_path = Path(args.shapes)
+    if not shapes_path.is_absolute():
+        shapes_path = Path(__file__).parent.parent / shapes_path
+    shapes = load_shapes(str(shapes_path))
+    if not shapes:
+        print(f"No query shapes in {shapes_path}; run the app with QUERY_PROFILER_ENABLED=true first")
+        return 1
+
+    settings.MONGODB_URL = args.url
+    settings.DB_NAME = args.db
+    settings.QUERY_PROFILER_ENABLED = False
+    await connect_to_mongo()
+    try:
+        proposals, collscans = await run_advisor(shapes, create_indexes=not args.no_create_indexes)
+    finally:
+        await close_mongo_connection()
+
+    if proposals:
+        diff = build_diff(proposals)
+        if args.diff_output:
+            Path(args.diff_output).write_text(diff)
+            print(f"Proposed diff written to {args.diff_output}")
+        else:
+            print("\n" + diff)
+
+    return 1 if args.fail_on_collscan and collscans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,73 @@
+"""
+Audit Log Migration Script - Move the legacy audit_logs collection into monthly buckets
+
+Entries are copied batch by batch into audit_logs_YYYY_MM by their created_at
+(falling back to timestamp or the ObjectId time), TTL tiers are applied, and
+each batch is removed from the legacy collection once it has been written.
+Re-running is safe: entries keep their _id and duplicates are skipped.
+
+Usage: python scripts/migrate_audit_logs.py [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from app.repositories.audit_log_repository import AuditLogRepository, LEGACY_COLLECTION
+from app.utils.export_utils import insert_batch
+
+
+async def migrate_audit_logs(batch_size: int):
+    """Copy legacy audit entries into their buckets and remove them from audit_logs"""
+    print("=" * 70)
+    print("Audit Log Migration - Monthly Buckets")
+    print("=" * 70)
+
+    repo = AuditLogRepository()
+    legacy = get_collection(LEGACY_COLLECTION)
+    total = await legacy.count_documents({})
+    print(f"\nFound {total} entries in '{LEGACY_COLLECTION}'")
+
+    moved = 0
+    while True:
+        batch = await legacy.find({}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        by_bucket: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in batch:
+            if not doc.get("created_at"):
+                doc["created_at"] = doc.get("timestamp") or doc["_id"].generation_time.replace(tzinfo=None)
+            by_bucket.setdefault(repo.route(doc), []).append(doc)
+
+        for name, docs in by_bucket.items():
+            await repo.ensure_bucket(name)
+            await insert_batch(get_collection(name), docs)
+
+        await legacy.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        moved += len(batch)
+        print(f"  ✓ {moved}/{total} entries moved ({', '.join(sorted(by_bucket))})")
+
+    if await legacy.count_documents({}) == 0:
+        await legacy.drop()
+        print(f"\n✓ '{LEGACY_COLLECTION}' is empty and has been dropped")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Move legacy audit logs into monthly buckets")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Entries moved per batch")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await migrate_audit_logs(args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
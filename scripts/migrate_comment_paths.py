@@ -0,0 +1,143 @@
+"""
+Comment Path Migration Script - Backfill the comment tree fields on milestone comments
+
+Milestone comments are stored as a tree with materialized paths (path,
+thread_id, ancestor_ids, depth) and a reply_count of all descendants on every
+comment. Comments written before that only have parent_comment_id. This fills
+in the tree fields level by level, top-level comments first, then recomputes
+reply_count. Replies whose parent no longer exists (the old delete removed a
+single comment and left its replies) were never shown and are only reported.
+Re-running is safe.
+
+Usage: python scripts/migrate_comment_paths.py [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from app.utils.db_indexes import ensure_indexes
+
+
+def tree_fields(comment: dict, parent: dict = None) -> dict:
+    """Tree fields of a comment, given its parent's"""
+    if parent is None:
+        return {"thread_id": comment["_id"], "ancestor_ids": [], "depth": 0, "path": str(comment["_id"])}
+    ancestor_ids = parent["ancestor_ids"] + [parent["_id"]]
+    return {
+        "thread_id": parent["thread_id"],
+        "ancestor_ids": ancestor_ids,
+        "depth": len(ancestor_ids),
+        "path": f"{parent['path']}/{comment['_id']}"
+    }
+
+
+async def backfill_paths(batch_size: int) -> int:
+    """Set the tree fields of every comment whose parent has them; returns the number updated"""
+    comments = get_collection("milestone_comments")
+    pending = {"path": {"$exists": False}}
+    updated = 0
+    after = None
+
+    while True:
+        page_filter = {**pending, "_id": {"$gt": after}} if after else pending
+        batch = await comments.find(page_filter, {"parent_comment_id": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return updated
+        after = batch[-1]["_id"]
+
+        parent_oids = list({doc["parent_comment_id"] for doc in batch if doc.get("parent_comment_id")})
+        parents = {
+            parent["_id"]: parent
+            async for parent in comments.find(
+                {"_id": {"$in": parent_oids}, "path": {"$exists": True}},
+                {"thread_id": 1, "ancestor_ids": 1, "path": 1}
+            )
+        }
+
+        operations = []
+        for doc in batch:
+            parent_oid = doc.get("parent_comment_id")
+            if parent_oid is None:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": tree_fields(doc)}))
+            elif parent_oid in parents:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": tree_fields(doc, parents[parent_oid])}))
+        if operations:
+            await comments.bulk_write(operations, ordered=False)
+            updated += len(operations)
+
+
+async def recount_replies(batch_size: int):
+    """Set reply_count on every comment from the ancestor_ids of its descendants"""
+    comments = get_collection("milestone_comments")
+    await comments.update_many({"path": {"$exists": True}}, {"$set": {"reply_count": 0}})
+
+    counts = comments.aggregate([
+        {"$match": {"depth": {"$gt": 0}}},
+        {"$unwind": "$ancestor_ids"},
+        {"$group": {"_id": "$ancestor_ids", "count": {"$sum": 1}}}
+    ], allowDiskUse=True)
+
+    operations = []
+    async for group in counts:
+        operations.append(UpdateOne({"_id": group["_id"]}, {"$set": {"reply_count": group["count"]}}))
+        if len(operations) >= batch_size:
+            await comments.bulk_write(operations, ordered=False)
+            operations = []
+    if operations:
+        await comments.bulk_write(operations, ordered=False)
+
+
+async def migrate_comment_paths(batch_size: int):
+    print("=" * 70)
+    print("Comment Path Migration - Milestone Comment Trees")
+    print("=" * 70)
+
+    result = await ensure_indexes()
+    if result.get("status") == "locked":
+        print("\n✗ An index migration is running in another worker; try again once it has finished")
+        return
+    print(f"\nIndexes: {result.get('status')}")
+
+    comments = get_collection("milestone_comments")
+    total = await comments.count_documents({"path": {"$exists": False}})
+    print(f"\nFound {total} comments without tree fields")
+
+    # Each pass reaches one more level of replies
+    level = 0
+    while True:
+        updated = await backfill_paths(batch_size)
+        if not updated:
+            break
+        print(f"  ✓ Pass {level}: {updated} comments updated")
+        level += 1
+
+    await recount_replies(batch_size)
+    print("✓ Reply counts recomputed")
+
+    orphans = await comments.count_documents({"path": {"$exists": False}})
+    if orphans:
+        print(f"  ! {orphans} replies have no surviving parent and were left as they are")
+
+    print("\n✓ Migration complete")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill materialized paths and reply counts on milestone comments")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Comments updated per batch")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await migrate_comment_paths(args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Embedded Array Migration Script - Move album photos and hub item engagement into their own collections
+
+Album photos move from family_albums.photos into album_photos; their likes,
+and hub item likes and bookmarks (hub_items.likes/bookmarks), move into
+engagements. The parent documents get photos_count, like_count and
+bookmark_count and lose the arrays. Indexes are ensured first, since the
+unique indexes are what make a re-run skip what was already copied.
+
+Usage: python scripts/migrate_embedded_arrays.py [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from app.repositories.family.album_photos import AlbumPhotosRepository
+from app.repositories.engagement_repository import EngagementRepository, ENGAGEMENT_COUNTERS
+from app.repositories.family.hub_items import HUB_ITEM_TARGET
+from app.utils.db_indexes import ensure_indexes
+
+
+async def migrate_album_photos(batch_size: int):
+    """Extract the photos array of every album that still has one"""
+    repo = AlbumPhotosRepository()
+    albums = get_collection("family_albums")
+    pending = {"photos": {"$exists": True}}
+    total = await albums.count_documents(pending)
+    print(f"\nFound {total} albums with embedded photos")
+
+    migrated = photos = likes = 0
+    while True:
+        batch = await albums.find(pending).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        for album in batch:
+            copied_photos, copied_likes = await repo.extract_embedded(album)
+            photos += copied_photos
+            likes += copied_likes
+        migrated += len(batch)
+        print(f"  ✓ {migrated}/{total} albums ({photos} photos, {likes} likes copied)")
+
+
+async def migrate_hub_engagement(kind: str, batch_size: int):
+    """Extract the likes or bookmarks array of every hub item that still has one"""
+    repo = EngagementRepository()
+    items = get_collection("hub_items")
+    field = f"{kind}s"
+    pending = {field: {"$exists": True}}
+    total = await items.count_documents(pending)
+    print(f"\nFound {total} hub items with embedded {kind}s")
+
+    migrated = copied = 0
+    while True:
+        batch = await items.find(pending).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        engagements = [
+            {
+                "target_id": item["_id"],
+                "user_id": user_oid,
+                "created_at": item.get("updated_at") or item.get("created_at")
+            }
+            for item in batch
+            for user_oid in item.get(field) or []
+        ]
+        copied += (await repo.import_engagements(HUB_ITEM_TARGET, kind, engagements))["inserted"]
+        item_oids = [item["_id"] for item in batch]
+        await repo.recount(HUB_ITEM_TARGET, kind, item_oids)
+        await items.update_many({"_id": {"$in": item_oids}}, {"$unset": {field: ""}})
+        migrated += len(batch)
+        print(f"  ✓ {migrated}/{total} hub items ({copied} {kind}s copied)")
+
+
+async def migrate_embedded_arrays(batch_size: int):
+    print("=" * 70)
+    print("Embedded Array Migration - Album Photos and Hub Engagement")
+    print("=" * 70)
+
+    result = await ensure_indexes()
+    if result.get("status") == "locked":
+        print("\n✗ An index migration is running in another worker; try again once it has finished")
+        return
+    print(f"\nIndexes: {result.get('status')}")
+
+    await migrate_album_photos(batch_size)
+    for kind in ENGAGEMENT_COUNTERS:
+        await migrate_hub_engagement(kind, batch_size)
+
+    print("\n✓ Migration complete")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Move embedded album photos and hub engagement into their own collections")
+    parser.add_argument("--batch-size", type=int, default=100, help="Parent documents migrated per batch")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await migrate_embedded_arrays(args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Engagement Migration Script - Move per-feature like/bookmark collections into engagements
+
+Memory likes and bookmarks (likes, bookmarks) are copied batch by batch into
+engagements, the counters of the affected memories are recomputed, and each
+batch is removed from its source once written. Emptied sources are dropped.
+Re-running is safe: the unique engagement index skips records already copied.
+Hub item and album photo engagement never had collections of their own; their
+embedded arrays are moved by migrate_embedded_arrays.py.
+
+Usage: python scripts/migrate_engagements.py [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from app.repositories.engagement_repository import EngagementRepository
+from app.utils.db_indexes import ensure_indexes
+
+# Legacy collection -> (target type, kind, field holding the target id)
+LEGACY_SOURCES = {
+    "likes": ("memory", "like", "memory_id"),
+    "bookmarks": ("memory", "bookmark", "memory_id"),
+}
+
+
+async def migrate_source(name: str, batch_size: int):
+    """Copy one legacy collection into engagements and remove it"""
+    target_type, kind, target_field = LEGACY_SOURCES[name]
+    repo = EngagementRepository()
+    legacy = get_collection(name)
+    total = await legacy.count_documents({})
+    print(f"\nFound {total} {target_type} {kind}s in '{name}'")
+
+    moved = 0
+    while True:
+        batch = await legacy.find({}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        await repo.import_engagements(target_type, kind, [
+            {"target_id": doc[target_field], "user_id": doc["user_id"], "created_at": doc.get("created_at")}
+            for doc in batch
+        ])
+        await repo.recount(target_type, kind, list({doc[target_field] for doc in batch}))
+
+        await legacy.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        moved += len(batch)
+        print(f"  ✓ {moved}/{total} moved")
+
+    if await legacy.count_documents({}) == 0:
+        await legacy.drop()
+        print(f"  ✓ '{name}' is empty and has been dropped")
+
+
+async def migrate_engagements(batch_size: int):
+    print("=" * 70)
+    print("Engagement Migration - Unified Engagements Collection")
+    print("=" * 70)
+
+    result = await ensure_indexes()
+    if result.get("status") == "locked":
+        print("\n✗ An index migration is running in another worker; try again once it has finished")
+        return
+    print(f"\nIndexes: {result.get('status')}")
+
+    for name in LEGACY_SOURCES:
+        await migrate_source(name, batch_size)
+
+    print("\n✓ Migration complete")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Move legacy like/bookmark collections into engagements")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Records moved per batch")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await migrate_engagements(args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Geo Location Migration Script - Backfill GeoJSON points on memories and places
+
+Radius, bounding-box and map cluster reads use geo, a GeoJSON point covered
+by a 2dsphere index, and geohash. Memories written before that only have
+location {lat, lng}; places only have location {latitude, longitude}. This
+sets geo and geohash from those. Coordinates out of range cannot be indexed
+and are only reported. Re-running is safe.
+
+Usage: python scripts/migrate_geo_locations.py [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from app.utils.db_indexes import ensure_indexes
+from app.utils.geo_utils import geo_fields
+
+# Where each collection keeps its legacy coordinates
+LEGACY_FIELDS = {
+    "memories": ("location.lat", "location.lng"),
+    "places": ("location.latitude", "location.longitude"),
+}
+
+
+def _get_path(doc: dict, path: str):
+    for key in path.split("."):
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(key)
+    return doc
+
+
+async def backfill_collection(name: str, batch_size: int):
+    lat_field, lng_field = LEGACY_FIELDS[name]
+    collection = get_collection(name)
+    pending = {"geo": {"$exists": False}, lat_field: {"$type": "number"}, lng_field: {"$type": "number"}}
+    total = await collection.count_documents(pending)
+    print(f"\n{name}: {total} documents without geo")
+
+    updated = invalid = 0
+    after = None
+    while True:
+        page_filter = {**pending, "_id": {"$gt": after}} if after else pending
+        batch = await collection.find(page_filter, {"location": 1}).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        after = batch[-1]["_id"]
+
+        operations = []
+        for doc in batch:
+            try:
+                fields = geo_fields(_get_path(doc, lat_field), _get_path(doc, lng_field))
+            except ValueError:
+                invalid += 1
+                continue
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+        print(f"  ✓ {updated}/{total} {name} updated")
+
+    if invalid:
+        print(f"  ! {invalid} {name} have coordinates out of range and were left without geo")
+
+
+async def migrate_geo_locations(batch_size: int):
+    print("=" * 70)
+    print("Geo Location Migration - GeoJSON Points")
+    print("=" * 70)
+
+    result = await ensure_indexes()
+    if result.get("status") == "locked":
+        print("\n✗ An index migration is running in another worker; try again once it has finished")
+        return
+    print(f"\nIndexes: {result.get('status')}")
+
+    for name in LEGACY_FIELDS:
+        await backfill_collection(name, batch_size)
+
+    print("\n✓ Migration complete")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill GeoJSON points and geohashes on memories and places")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Documents updated per batch")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await migrate_geo_locations(args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
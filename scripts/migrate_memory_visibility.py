@@ -0,0 +1,87 @@
+"""
+Memory Visibility Migration Script - Backfill visible_to on memories
+
+Memory reads filter on visible_to, the principals allowed to see a memory
+(see app/repositories/viewer_principals_repository.py), so memories written
+before it existed are not shown to anyone until it is set. This computes it
+from each memory's owner, privacy and audience fields. Memories without an
+owner_id (written by older scheduled posts or templates with user_id) are
+given the principal of that user. Re-running recomputes every memory.
+
+Usage: python scripts/migrate_memory_visibility.py [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongodb import get_collection, connect_to_mongo, close_mongo_connection
+from app.repositories.viewer_principals_repository import memory_visible_to
+from app.utils.db_indexes import ensure_indexes
+
+AUDIENCE_FIELDS = {"owner_id": 1, "user_id": 1, "privacy": 1, "family_circle_ids": 1, "allowed_user_ids": 1}
+
+
+async def migrate_memory_visibility(batch_size: int):
+    print("=" * 70)
+    print("Memory Visibility Migration - visible_to Principals")
+    print("=" * 70)
+
+    result = await ensure_indexes()
+    if result.get("status") == "locked":
+        print("\n✗ An index migration is running in another worker; try again once it has finished")
+        return
+    print(f"\nIndexes: {result.get('status')}")
+
+    memories = get_collection("memories")
+    total = await memories.count_documents({})
+    print(f"\nFound {total} memories")
+
+    updated = skipped = 0
+    after = None
+    while True:
+        page_filter = {"_id": {"$gt": after}} if after else {}
+        batch = await memories.find(page_filter, AUDIENCE_FIELDS).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        after = batch[-1]["_id"]
+
+        operations = []
+        for memory in batch:
+            owner_id = memory.get("owner_id") or memory.get("user_id")
+            if owner_id is None:
+                skipped += 1
+                continue
+            operations.append(UpdateOne(
+                {"_id": memory["_id"]},
+                {"$set": {"visible_to": memory_visible_to({**memory, "owner_id": owner_id})}}
+            ))
+        if operations:
+            await memories.bulk_write(operations, ordered=False)
+            updated += len(operations)
+        print(f"  ✓ {updated}/{total} memories updated")
+
+    if skipped:
+        print(f"  ! {skipped} memories have no owner and were left without visible_to")
+
+    print("\n✓ Migration complete")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Backfill visible_to principals on memories")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Memories updated per batch")
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await migrate_memory_visibility(args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script to restore or clone an NDJSON (or zipped NDJSON) backup into a user account.
+
+Usage:
+    python scripts/restore_backup.py <backup.ndjson|backup.zip> <target_user_id> [--clone] [--overwrite]
+        [--batch-size N] [--concurrency N]
+
+Use --clone to migrate a backup into a different account: every document gets a
+new ObjectId and references between restored documents are rewritten.
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.services.backup_restore_service import get_backup_restore_service
+from app.utils.export_utils import iter_chunked_lines
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Restore a Memory Hub NDJSON backup")
+    parser.add_argument("backup", help="Path to a .ndjson backup or a .zip of .ndjson backups")
+    parser.add_argument("target_user_id", help="User that will own the restored documents")
+    parser.add_argument("--clone", action="store_true", help="Remap every ObjectId (restore into another account)")
+    parser.add_argument("--overwrite", action="store_true", help="Replace documents that already exist")
+    parser.add_argument("--batch-size", type=int, default=None, help="Documents per write batch")
+    parser.add_argument("--concurrency", type=int, default=None, help="Write batches in flight")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Restoring Memory Hub Backup")
+    print("=" * 60)
+
+    await connect_to_mongo()
+    print("✓ Connected to database\n")
+
+    service = get_backup_restore_service(batch_size=args.batch_size, max_concurrency=args.concurrency)
+
+    try:
+        with open(args.backup, "rb") as f:
+            if args.backup.endswith(".zip"):
+                report = await service.restore_zip(f, args.target_user_id, args.clone, args.overwrite)
+                reports = report["archives"]
+            else:
+                lines = iter_chunked_lines(lambda size: asyncio.to_thread(f.read, size))
+                reports = [await service.restore_lines(lines, args.target_user_id, args.clone, args.overwrite)]
+    finally:
+        await close_mongo_connection()
+
+    for report in reports:
+        if "member" in report:
+            print(f"Archive member: {report['member']}")
+        for name, counts in report["collections"].items():
+            print(f"  {name:15} inserted={counts['inserted']:>8}  skipped={counts['skipped']:>8}")
+        print(f"  ✓ {report['documents_written']} documents in {report['elapsed_seconds']}s "
+              f"({report['documents_per_second']} docs/s, {report['batches']} batches)")
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+"""
+Shared fixtures for the unit tests.
+
+The mongo fixture points app.db.mongodb at an in-memory mongomock database
+behind a thin async wrapper, so repositories and services run unchanged
+against it. mongomock lacks a few server features ($lookup with let,
+$geoNear, $substrCP, geo query operators); code using them is tested up to
+the pipeline it builds.
+"""
+import mongomock
+import pytest
+from pymongo import InsertOne, ReplaceOne, UpdateMany, UpdateOne, DeleteOne, DeleteMany
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.results import BulkWriteResult
+
+from app.core.config import settings
+from app.db import mongodb
+
+# Server-side options mongomock does not accept
+_IGNORED_OPTIONS = ("maxTimeMS", "batch_size", "allowDiskUse", "hint", "read_preference")
+
+
+def _strip(kwargs):
+    return {k: v for k, v in kwargs.items() if k not in _IGNORED_OPTIONS}
+
+
+class AsyncCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, n):
+        self._cursor = self._cursor.skip(n)
+        return self
+
+    def limit(self, n):
+        self._cursor = self._cursor.limit(n)
+        return self
+
+    def max_time_ms(self, _ms):
+        return self
+
+    async def to_list(self, length=None):
+        docs = list(self._cursor)
+        return docs[:length] if length else docs
+
+    def __aiter__(self):
+        self._iter = iter(self._cursor)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class AsyncCollection:
+    def __init__(self, collection):
+        self._collection = collection
+
+    @property
+    def name(self):
+        return self._collection.name
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **_strip(kwargs)))
+
+    def aggregate(self, pipeline, **kwargs):
+        return AsyncCursor(self._collection.aggregate(pipeline))
+
+    async def bulk_write(self, operations, ordered=True, **kwargs):
+        """Apply operations one by one, reporting duplicate keys like the server does"""
+        counts = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []}
+        errors = []
+        for index, op in enumerate(operations):
+            try:
+                if isinstance(op, InsertOne):
+                    self._collection.insert_one(op._doc)
+                    counts["nInserted"] += 1
+                elif isinstance(op, (ReplaceOne, UpdateOne, UpdateMany)):
+                    if isinstance(op, ReplaceOne):
+                        result = self._collection.replace_one(op._filter, op._doc, upsert=op._upsert)
+                    elif isinstance(op, UpdateOne):
+                        result = self._collection.update_one(op._filter, op._doc, upsert=op._upsert)
+                    else:
+                        result = self._collection.update_many(op._filter, op._doc, upsert=op._upsert)
+                    counts["nMatched"] += result.matched_count
+                    counts["nModified"] += result.modified_count
+                    if result.upserted_id is not None:
+                        counts["nUpserted"] += 1
+                        counts["upserted"].append({"index": index, "_id": result.upserted_id})
+                elif isinstance(op, (DeleteOne, DeleteMany)):
+                    delete = self._collection.delete_one if isinstance(op, DeleteOne) else self._collection.delete_many
+                    counts["nRemoved"] += delete(op._filter).deleted_count
+                else:
+                    raise NotImplementedError(type(op).__name__)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({**counts, "writeErrors": errors})
+        return BulkWriteResult(counts, True)
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **_strip(kwargs))
+        return call
+
+
+class AsyncDatabase:
+    def __init__(self, database):
+        self._database = database
+
+    def get_collection(self, name, **kwargs):
+        return AsyncCollection(self._database[name])
+
+    def __getitem__(self, name):
+        return self.get_collection(name)
+
+    def __getattr__(self, name):
+        return self.get_collection(name)
+
+
+class AsyncClient:
+    def __init__(self):
+        self.sync = mongomock.MongoClient()
+
+    def __getitem__(self, name):
+        return AsyncDatabase(self.sync[name])
+
+
+@pytest.fixture
+def mongo():
+    """A fresh in-memory database; yields its synchronous mongomock handle for seeding and asserts"""
+    previous = mongodb.db.client
+    client = AsyncClient()
+    mongodb.db.client = client
+    try:
+        yield client.sync[settings.DB_NAME]
+    finally:
+        mongodb.db.client = previous
@@ -0,0 +1,90 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository
+from app.services.backup_restore_service import BackupRestoreService, IdRemapper
+from app.utils.export_utils import build_header, encode_line
+
+
+async def _lines(user_id, documents):
+    yield encode_line(build_header(user_id, ["memories"]))
+    for document in documents:
+        yield encode_line({"type": "document", "collection": "memories", "document": document})
+
+
+async def test_overwrite_replaces_own_documents(mongo):
+    owner = ObjectId()
+    memory_id = mongo.memories.insert_one({"owner_id": owner, "title": "old"}).inserted_id
+
+    report = await BackupRestoreService().restore_lines(
+        _lines(str(owner), [{"_id": memory_id, "owner_id": owner, "title": "new"}]),
+        str(owner),
+        overwrite=True
+    )
+
+    assert mongo.memories.find_one({"_id": memory_id})["title"] == "new"
+    assert report["collections"]["memories"] == {"inserted": 1, "skipped": 0}
+
+
+async def test_overwrite_skips_documents_owned_by_another_account(mongo):
+    victim, attacker = ObjectId(), ObjectId()
+    memory_id = mongo.memories.insert_one({"owner_id": victim, "title": "mine"}).inserted_id
+
+    # A crafted backup claiming the attacker's account but carrying the victim's _id
+    report = await BackupRestoreService().restore_lines(
+        _lines(str(attacker), [{"_id": memory_id, "owner_id": victim, "title": "taken"}]),
+        str(attacker),
+        overwrite=True
+    )
+
+    stored = mongo.memories.find_one({"_id": memory_id})
+    assert stored["owner_id"] == victim
+    assert stored["title"] == "mine"
+    assert report["collections"]["memories"] == {"inserted": 0, "skipped": 1}
+
+
+async def test_restored_memories_are_visible_to_their_new_owner(mongo):
+    source, target = ObjectId(), ObjectId()
+    circle_id = ObjectId()
+    backup = [
+        {"_id": ObjectId(), "owner_id": source, "privacy": "private", "visible_to": [f"user:{source}"]},
+        {"_id": ObjectId(), "owner_id": source, "privacy": "family_circle", "family_circle_ids": [circle_id]},
+    ]
+
+    await BackupRestoreService().restore_lines(_lines(str(source), backup), str(target), remap_ids=True)
+
+    restored = list(mongo.memories.find({"owner_id": target}))
+    assert len(restored) == 2
+    assert all(memory["_id"] not in {doc["_id"] for doc in backup} for memory in restored)
+    visible = {tuple(memory["visible_to"]) for memory in restored}
+    assert visible == {(f"user:{target}",), (f"user:{target}", f"circle:{circle_id}")}
+    assert mongo.memories.count_documents(await ViewerPrincipalsRepository().visibility_filter(str(target))) == 2
+
+
+@pytest.mark.parametrize("line, detail", [
+    (b'{"type": "document", "collection": "memories", "docum', "line 2"),
+    (b'["not", "a", "record"]', "line 2: not a record"),
+    (b'{"type": "document", "collection": "memories"}', "line 2: document record has no document"),
+])
+async def test_malformed_lines_are_rejected_with_their_line_number(mongo, line, detail):
+    owner = ObjectId()
+
+    async def lines():
+        yield encode_line(build_header(str(owner), ["memories"]))
+        yield line
+
+    with pytest.raises(HTTPException) as raised:
+        await BackupRestoreService().restore_lines(lines(), str(owner))
+    assert raised.value.status_code == 400
+    assert raised.value.detail.endswith(detail)
+
+
+def test_id_remapper_is_capped():
+    remapper = IdRemapper(None, str(ObjectId()), max_ids=2)
+    remapper.assign({"_id": ObjectId()})
+    remapper.assign({"_id": ObjectId()})
+
+    with pytest.raises(HTTPException) as raised:
+        remapper.assign({"_id": ObjectId()})
+    assert raised.value.status_code == 413
@@ -0,0 +1,74 @@
+import pytest
+
+from app.db.mongodb import get_collection
+from app.services.counter_service import COUNTER_SHARDS_COLLECTION, CounterService
+
+
+async def _hot_likes(mongo, service, amount):
+    memory_id = mongo.memories.insert_one({"like_count": 0}).inserted_id
+    service._running = True
+    for _ in range(amount):
+        await service.increment("memory", memory_id, "like_count")
+    await service.flush()
+    return memory_id
+
+
+async def test_fold_moves_shards_into_the_target(mongo):
+    service = CounterService(hot_threshold=3, shard_count=4)
+    memory_id = await _hot_likes(mongo, service, 5)
+
+    assert mongo.memories.find_one({"_id": memory_id})["like_count"] == 0
+    assert await service.value("memory", memory_id, "like_count") == 5
+
+    assert await service.fold() == 1
+    assert mongo.memories.find_one({"_id": memory_id})["like_count"] == 5
+    assert mongo[COUNTER_SHARDS_COLLECTION].count_documents({}) == 0
+    assert await service.value("memory", memory_id, "like_count") == 5
+
+
+async def test_failed_fold_puts_claimed_increments_back(mongo, monkeypatch):
+    service = CounterService(hot_threshold=3, shard_count=4)
+    memory_id = await _hot_likes(mongo, service, 5)
+    collection_class = type(get_collection("memories"))
+    bulk_write = collection_class.bulk_write
+
+    async def failing_bulk_write(self, operations, ordered=True, **kwargs):
+        if self.name == "memories":
+            raise ConnectionError("primary stepped down")
+        return await bulk_write(self, operations, ordered, **kwargs)
+    monkeypatch.setattr(collection_class, "bulk_write", failing_bulk_write)
+
+    with pytest.raises(ConnectionError):
+        await service.fold()
+
+    assert mongo.memories.find_one({"_id": memory_id})["like_count"] == 0
+    assert await service.value("memory", memory_id, "like_count") == 5
+
+    monkeypatch.setattr(collection_class, "bulk_write", bulk_write)
+    assert await service.fold() == 1
+    assert mongo.memories.find_one({"_id": memory_id})["like_count"] == 5
+
+
+async def test_failed_flush_rebuffers_only_the_unwritten_collection(mongo, monkeypatch):
+    service = CounterService(hot_threshold=100)
+    memory_id = mongo.memories.insert_one({"like_count": 0}).inserted_id
+    item_id = mongo.hub_items.insert_one({"like_count": 0}).inserted_id
+    service._running = True
+    await service.increment("memory", memory_id, "like_count")
+    await service.increment("hub_item", item_id, "like_count")
+    collection_class = type(get_collection("hub_items"))
+    bulk_write = collection_class.bulk_write
+
+    async def failing_bulk_write(self, operations, ordered=True, **kwargs):
+        if self.name == "hub_items":
+            raise ConnectionError("primary stepped down")
+        return await bulk_write(self, operations, ordered, **kwargs)
+    monkeypatch.setattr(collection_class, "bulk_write", failing_bulk_write)
+
+    with pytest.raises(ConnectionError):
+        await service.flush()
+
+    monkeypatch.setattr(collection_class, "bulk_write", bulk_write)
+    await service.flush()
+    assert mongo.memories.find_one({"_id": memory_id})["like_count"] == 1
+    assert mongo.hub_items.find_one({"_id": item_id})["like_count"] == 1
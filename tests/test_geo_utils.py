@@ -0,0 +1,57 @@
+import pytest
+from fastapi import HTTPException
+
+from app.utils.geo_utils import bbox_filter, cluster_precision, encode_geohash, parse_bbox
+
+
+def _rings(condition):
+    slices = condition["$or"] if "$or" in condition else [condition]
+    return [s["geo"]["$geoWithin"]["$geometry"]["coordinates"][0] for s in slices]
+
+
+def _lngs(ring):
+    return [lng for lng, _ in ring]
+
+
+def test_encode_geohash():
+    assert encode_geohash(42.6, -5.6, 5) == "ezs42"
+
+
+def test_small_box_is_one_closed_polygon():
+    condition = bbox_filter("geo", -0.5, 51.3, 0.3, 51.7)
+
+    assert "$or" not in condition
+    ring, = _rings(condition)
+    assert ring[0] == ring[-1]
+    assert min(_lngs(ring)) == -0.5 and max(_lngs(ring)) == 0.3
+    assert {lat for _, lat in ring} == {51.3, 51.7}
+
+
+def test_antimeridian_box_is_split_into_both_sides():
+    rings = _rings(bbox_filter("geo", 170, -10, -170, 10))
+
+    assert [(min(_lngs(ring)), max(_lngs(ring))) for ring in rings] == [(170, 180), (-180, -170)]
+
+
+def test_world_box_is_sliced_below_a_hemisphere():
+    rings = _rings(bbox_filter("geo", -180, -90, 180, 90))
+
+    assert len(rings) == 4
+    assert all(max(_lngs(ring)) - min(_lngs(ring)) <= 90 for ring in rings)
+    assert all(abs(lat) < 90 for ring in rings for _, lat in ring)
+
+
+@pytest.mark.parametrize("bbox, precision", [
+    ((-180, -90, 180, 90), 1),
+    ((-0.5, 51.3, 0.3, 51.7), 5),
+    ((-0.1280, 51.5070, -0.1270, 51.5075), 8),
+    ((170, -10, -170, 10), 3),
+])
+def test_cluster_precision_follows_the_viewport(bbox, precision):
+    assert cluster_precision(*bbox, target_cells=256) == precision
+
+
+def test_parse_bbox_rejects_an_inverted_latitude_range():
+    assert parse_bbox("170,-10,-170,10") == (170, -10, -170, 10)
+    with pytest.raises(HTTPException):
+        parse_bbox("0,10,1,5")
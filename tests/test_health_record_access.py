@@ -0,0 +1,87 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+from app.api.v1.endpoints.family import health_records as health_records_endpoints
+
+from app.features.health_records.repositories.health_records_repository import HealthRecordsRepository
+from app.features.health_records.services.health_record_service import HealthRecordService
+from app.repositories.family.family_circles import FamilyRepository
+
+
+async def test_circle_ids_drop_a_removed_member(mongo):
+    owner, member = ObjectId(), ObjectId()
+    circle_id = mongo.family_circles.insert_one({"owner_id": owner, "member_ids": [owner, member]}).inserted_id
+    repo = HealthRecordsRepository()
+
+    assert await repo.get_user_circle_ids(str(member)) == [circle_id]
+
+    await FamilyRepository().remove_member(str(circle_id), str(member), str(owner))
+
+    assert await repo.get_user_circle_ids(str(member)) == []
+
+
+async def test_listing_filter_and_record_check_agree(mongo):
+    user, other = ObjectId(), ObjectId()
+    circle_id = mongo.family_circles.insert_one({"owner_id": other, "member_ids": [other, user]}).inserted_id
+    other_circle = mongo.family_circles.insert_one({"owner_id": other, "member_ids": [other]}).inserted_id
+    tree_id, stranger_tree = ObjectId(), ObjectId()
+    mongo.genealogy_tree_memberships.insert_one({"tree_id": tree_id, "user_id": user})
+
+    fixtures = {
+        "created_approved": {"created_by": user, "approval_status": "approved"},
+        "created_pending": {"created_by": user, "approval_status": "pending_approval"},
+        "created_rejected": {"created_by": user, "approval_status": "rejected"},
+        "subject_pending": {"created_by": other, "subject_user_id": user, "approval_status": "pending_approval"},
+        "assigned_approved": {"created_by": other, "assigned_user_ids": [other, user], "approval_status": "approved"},
+        "personal": {"created_by": other, "family_id": user, "approval_status": "rejected"},
+        "circle_family": {"created_by": other, "family_id": circle_id, "approval_status": "approved", "visibility_scope": "family"},
+        "circle_private": {"created_by": other, "family_id": circle_id, "approval_status": "approved", "visibility_scope": "private"},
+        "circle_pending": {"created_by": other, "family_id": circle_id, "approval_status": "pending_approval", "visibility_scope": "family"},
+        "other_circle": {"created_by": other, "family_id": other_circle, "approval_status": "approved", "visibility_scope": "public"},
+        "personal_of_other": {"created_by": other, "family_id": other, "approval_status": "approved"},
+        "tree_approved": {"created_by": other, "family_id": tree_id, "visibility_type": "family_tree", "approval_status": "approved"},
+        "tree_pending": {"created_by": other, "family_id": tree_id, "visibility_type": "family_tree", "approval_status": "pending_approval"},
+        "stranger_tree": {"created_by": other, "family_id": stranger_tree, "visibility_type": "family_tree", "approval_status": "approved"},
+        "selected": {"created_by": other, "visibility_type": "select_users", "visibility_user_ids": [user], "approval_status": "approved"},
+        "not_selected": {"created_by": other, "visibility_type": "select_users", "visibility_user_ids": [other], "approval_status": "approved"},
+    }
+    ids = {name: mongo.health_records.insert_one(doc).inserted_id for name, doc in fixtures.items()}
+    repo = HealthRecordsRepository()
+
+    listed = {doc["_id"] for doc in mongo.health_records.find(await repo.get_access_filter(str(user)))}
+    checked = {oid for oid in ids.values() if await repo.check_user_access(str(oid), str(user))}
+
+    assert listed == checked
+    assert {name for name, oid in ids.items() if oid in listed} == {
+        "created_approved", "created_pending", "created_rejected", "subject_pending", "assigned_approved",
+        "personal", "circle_family", "tree_approved", "selected"
+    }
+
+
+def _record(**fields):
+    """A health record with the fields the record view requires"""
+    now = datetime.utcnow()
+    return {"record_type": "medical", "title": "Checkup", "date": "2024-01-01", "created_at": now, "updated_at": now, **fields}
+
+
+async def test_every_listed_record_opens(mongo):
+    user, other = ObjectId(), ObjectId()
+    mongo.users.insert_many([{"_id": user, "full_name": "User"}, {"_id": other, "full_name": "Other"}])
+    tree_id = ObjectId()
+    mongo.genealogy_tree_memberships.insert_one({"tree_id": tree_id, "user_id": user})
+    mongo.health_records.insert_many([
+        _record(created_by=user, family_id=user, approval_status="rejected"),
+        _record(created_by=other, family_id=tree_id, visibility_type="family_tree", approval_status="approved"),
+        _record(created_by=other, family_id=other, visibility_type="select_users", visibility_user_ids=[user], approval_status="approved"),
+    ])
+    current_user = SimpleNamespace(id=str(user))
+
+    listed = list(mongo.health_records.find(await HealthRecordsRepository().get_access_filter(str(user))))
+
+    assert len(listed) == 3
+    for record in listed:
+        response = await health_records_endpoints.get_health_record(str(record["_id"]), current_user=current_user)
+        assert response["data"]["id"] == str(record["_id"])
+        assert await HealthRecordService().check_user_has_access(record, str(user))
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import REQUEST_LATENCY, MetricsMiddleware
+
+
+def _router():
+    router = APIRouter()
+
+    @router.get("/{item_id}")
+    async def read(item_id: str):
+        return {"id": item_id}
+    return router
+
+
+def test_routes_under_different_prefixes_get_distinct_labels():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(_router(), prefix="/albums")
+    app.include_router(_router(), prefix="/hubs")
+    client = TestClient(app)
+
+    client.get("/albums/1")
+    client.get("/hubs/2")
+
+    templates = {label_values[1] for label_values in REQUEST_LATENCY._series}
+    assert {"/albums/{item_id}", "/hubs/{item_id}"} <= templates
+    assert "/{item_id}" not in templates
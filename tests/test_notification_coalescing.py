@@ -0,0 +1,50 @@
+import pytest
+from bson import ObjectId
+
+from app.repositories.family.notifications import UNREAD_COUNTERS_COLLECTION
+from app.schemas.notification import NotificationType
+from app.services.notification_coalescer import notification_coalescer
+from app.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def broadcasts(monkeypatch):
+    """WebSocket events queued by the coalescer, instead of debounced sends"""
+    sent = []
+    monkeypatch.setattr(notification_coalescer, "broadcast", lambda user_id, document: sent.append(user_id))
+    return sent
+
+
+async def test_repeated_likes_fold_into_one_notification(mongo, broadcasts):
+    recipient, actor = ObjectId(), ObjectId()
+    mongo.users.insert_many([{"_id": recipient}, {"_id": actor, "full_name": "Actor"}])
+    mongo[UNREAD_COUNTERS_COLLECTION].insert_one({"_id": recipient, "unread": 0})
+    memory_id = str(ObjectId())
+    service = NotificationService()
+
+    for _ in range(3):
+        notification = await service.create_notification(
+            str(recipient), NotificationType.LIKE.value, "New like", "Someone liked your memory",
+            str(actor), target_type="memory", target_id=memory_id
+        )
+
+    assert notification["count"] == 3
+    assert mongo.notifications.count_documents({"user_id": recipient}) == 1
+    assert mongo[UNREAD_COUNTERS_COLLECTION].find_one({"_id": recipient})["unread"] == 1
+
+
+async def test_approval_notifications_stay_distinct(mongo, broadcasts):
+    recipient, actor = ObjectId(), ObjectId()
+    mongo.users.insert_many([{"_id": recipient}, {"_id": actor, "full_name": "Actor"}])
+    service = NotificationService()
+
+    for _ in range(2):
+        await service.create_notification(
+            str(recipient), NotificationType.HEALTH_RECORD_ASSIGNED.value, "Assigned", "Please review",
+            str(actor), target_type="health_record", target_id=str(ObjectId())
+        )
+
+    notifications = list(mongo.notifications.find({"user_id": recipient}))
+    assert len(notifications) == 2
+    assert all(n["approval_status"] == "pending" for n in notifications)
+    assert broadcasts == []
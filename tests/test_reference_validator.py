@@ -0,0 +1,17 @@
+import pytest
+from fastapi import HTTPException
+
+from app.services.reference_validator import reference_validator
+
+
+async def test_forgotten_users_are_checked_again(mongo):
+    user = mongo.users.insert_one({"full_name": "Gone soon"}).inserted_id
+
+    assert await reference_validator.require_users([str(user)]) == [user]
+
+    mongo.users.delete_one({"_id": user})
+    reference_validator.forget_users([user])
+
+    with pytest.raises(HTTPException) as raised:
+        await reference_validator.require_users([str(user)])
+    assert raised.value.status_code == 404
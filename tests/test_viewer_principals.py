@@ -0,0 +1,54 @@
+from bson import ObjectId
+
+from app.repositories.viewer_principals_repository import ViewerPrincipalsRepository, memory_visible_to
+
+
+async def test_memory_visibility_follows_viewer_principals(mongo):
+    owner, follower, relative, member, named, stranger = (ObjectId() for _ in range(6))
+    circle_id = mongo.family_circles.insert_one({"owner_id": owner, "member_ids": [owner, member]}).inserted_id
+    mongo.relationships.insert_one({"follower_id": follower, "following_id": owner, "status": "accepted"})
+    mongo.family_relationships.insert_one({"user_id": relative, "related_user_id": owner})
+
+    memories = {
+        "private": {"privacy": "private"},
+        "public": {"privacy": "public"},
+        "friends": {"privacy": "friends"},
+        "family": {"privacy": "family"},
+        "family_circle": {"privacy": "family_circle", "family_circle_ids": [circle_id]},
+        "specific_users": {"privacy": "specific_users", "allowed_user_ids": [named]},
+    }
+    ids = {}
+    for name, memory in memories.items():
+        memory["owner_id"] = owner
+        memory["visible_to"] = memory_visible_to(memory)
+        ids[mongo.memories.insert_one(memory).inserted_id] = name
+    repo = ViewerPrincipalsRepository()
+
+    async def visible(viewer, include_public=True):
+        query = await repo.visibility_filter(str(viewer), include_public)
+        return {ids[doc["_id"]] for doc in mongo.memories.find(query)}
+
+    assert await visible(owner) == set(memories)
+    assert await visible(follower) == {"public", "friends"}
+    assert await visible(relative) == {"public", "family"}
+    assert await visible(member) == {"public", "family_circle"}
+    assert await visible(named) == {"public", "specific_users"}
+    assert await visible(stranger) == {"public"}
+    # Feeds leave out the public principal but keep followed owners' public memories
+    assert await visible(stranger, include_public=False) == set()
+    assert await visible(follower, include_public=False) == {"public", "friends"}
+
+
+async def test_invalidation_picks_up_a_new_follow(mongo):
+    owner, viewer = ObjectId(), ObjectId()
+    memory = {"owner_id": owner, "privacy": "friends"}
+    memory["visible_to"] = memory_visible_to(memory)
+    mongo.memories.insert_one(memory)
+    repo = ViewerPrincipalsRepository()
+
+    assert mongo.memories.count_documents(await repo.visibility_filter(str(viewer))) == 0
+
+    mongo.relationships.insert_one({"follower_id": viewer, "following_id": owner, "status": "accepted"})
+    await repo.invalidate([viewer])
+
+    assert mongo.memories.count_documents(await repo.visibility_filter(str(viewer))) == 1